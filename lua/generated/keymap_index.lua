@@ -0,0 +1,429 @@
+-- Índice de atajos generado por scripts/update_keybindings.py --formats lua. No editar a mano.
+-- keybindings-fingerprint: a61aecdaf1b49539daa0504b53b2610ea2733794f9956f7ed2a7781b71ab558e
+return {
+  -- { lhs, mode, desc, file, line }, ordenados por modo y secuencia canónica
+  bindings = {
+    { lhs = ",", mode = "i", desc = "Punto de interrupción de undo tras ciertos caracteres en insert", file = "lua/core/keys.lua", line = 84 },
+    { lhs = ".", mode = "i", desc = "Punto de interrupción de undo tras ciertos caracteres en insert", file = "lua/core/keys.lua", line = 85 },
+    { lhs = ";", mode = "i", desc = "", file = "lua/core/keys.lua", line = 86 },
+    { lhs = "<Esc>", mode = "i", desc = "Escape y limpia búsqueda", file = "lua/core/keys.lua", line = 69 },
+    { lhs = "jj", mode = "i", desc = "Rápido escape en Insert Mode", file = "lua/core/keys.lua", line = 32 },
+    { lhs = "-", mode = "n", desc = "Placeholder para decremento", file = "lua/core/keys.lua", line = 46 },
+    { lhs = "<C-d>", mode = "n", desc = "Half-page down y centrar", file = "lua/core/keys.lua", line = 55 },
+    { lhs = "<C-u>", mode = "n", desc = "Half-page up y centrar", file = "lua/core/keys.lua", line = 56 },
+    { lhs = "<cr>", mode = "n", desc = "Execute buffer", file = "lua/plugins/ui/snacks.lua", line = 324 },
+    { lhs = "<cr>", mode = "n", desc = "goto current file", file = "lua/plugins/tools/spectre.lua", line = 37 },
+    { lhs = "<Esc>", mode = "n", desc = "Escape y limpia búsqueda", file = "lua/core/keys.lua", line = 69 },
+    { lhs = "<leader>cr", mode = "n", desc = "Source buffer", file = "lua/plugins/ui/snacks.lua", line = 338 },
+    { lhs = "<leader>eE", mode = "n", desc = "File Explorer", file = "lua/plugins/ui/which-key.lua", line = 86 },
+    { lhs = "<leader>ea", mode = "n", desc = "Alternate File", file = "lua/plugins/ui/which-key.lua", line = 69 },
+    { lhs = "<leader>ecA", mode = "n", desc = "Alacritty Config", file = "lua/plugins/ui/which-key.lua", line = 72 },
+    { lhs = "<leader>ecZ", mode = "n", desc = "Zsh Prompt Config", file = "lua/plugins/ui/which-key.lua", line = 85 },
+    { lhs = "<leader>eca", mode = "n", desc = "Shell Aliases", file = "lua/plugins/ui/which-key.lua", line = 71 },
+    { lhs = "<leader>ecb", mode = "n", desc = "Bash Config", file = "lua/plugins/ui/which-key.lua", line = 73 },
+    { lhs = "<leader>ece", mode = "n", desc = "Environment Config", file = "lua/plugins/ui/which-key.lua", line = 74 },
+    { lhs = "<leader>ecf", mode = "n", desc = "Shell Functions", file = "lua/plugins/ui/which-key.lua", line = 75 },
+    { lhs = "<leader>ecg", mode = "n", desc = "Git Config", file = "lua/plugins/ui/which-key.lua", line = 76 },
+    { lhs = "<leader>eck", mode = "n", desc = "Kitty Config", file = "lua/plugins/ui/which-key.lua", line = 77 },
+    { lhs = "<leader>ecl", mode = "n", desc = "Local Env", file = "lua/plugins/ui/which-key.lua", line = 78 },
+    { lhs = "<leader>ecn", mode = "n", desc = "Neovim Init", file = "lua/plugins/ui/which-key.lua", line = 79 },
+    { lhs = "<leader>ecp", mode = "n", desc = "Plugin List", file = "lua/plugins/ui/which-key.lua", line = 80 },
+    { lhs = "<leader>ecq", mode = "n", desc = "Qutebrowser Config", file = "lua/plugins/ui/which-key.lua", line = 81 },
+    { lhs = "<leader>ect", mode = "n", desc = "Tmux Config", file = "lua/plugins/ui/which-key.lua", line = 82 },
+    { lhs = "<leader>ecv", mode = "n", desc = "Vim Config", file = "lua/plugins/ui/which-key.lua", line = 83 },
+    { lhs = "<leader>ecz", mode = "n", desc = "Zsh Config", file = "lua/plugins/ui/which-key.lua", line = 84 },
+    { lhs = "<leader>ef", mode = "n", desc = "File Under Cursor", file = "lua/plugins/ui/which-key.lua", line = 88 },
+    { lhs = "<leader>em", mode = "n", desc = "Readme", file = "lua/plugins/ui/which-key.lua", line = 89 },
+    { lhs = "<leader>en", mode = "n", desc = "New File", file = "lua/plugins/ui/which-key.lua", line = 90 },
+    { lhs = "<leader>et", mode = "n", desc = "Explore Tree", file = "lua/plugins/ui/which-key.lua", line = 87 },
+    { lhs = "<leader>exa", mode = "n", desc = "", file = "lua/plugins/list.lua", line = 183 },
+    { lhs = "<leader>exa", mode = "n", desc = "All Exercism Languages", file = "lua/plugins/tools/exercism.lua", line = 22 },
+    { lhs = "<leader>exl", mode = "n", desc = "", file = "lua/plugins/list.lua", line = 183 },
+    { lhs = "<leader>exl", mode = "n", desc = "List Default Language Exercises", file = "lua/plugins/tools/exercism.lua", line = 23 },
+    { lhs = "<leader>exr", mode = "n", desc = "", file = "lua/plugins/list.lua", line = 183 },
+    { lhs = "<leader>exr", mode = "n", desc = "Recent Exercises", file = "lua/plugins/tools/exercism.lua", line = 24 },
+    { lhs = "<leader>exs", mode = "n", desc = "Submit Exercise", file = "lua/plugins/tools/exercism.lua", line = 26 },
+    { lhs = "<leader>ext", mode = "n", desc = "Test Exercise", file = "lua/plugins/tools/exercism.lua", line = 25 },
+    { lhs = "<leader>f1", mode = "n", desc = "File 1", file = "lua/plugins/ui/which-key.lua", line = 167 },
+    { lhs = "<leader>f2", mode = "n", desc = "File 2", file = "lua/plugins/ui/which-key.lua", line = 167 },
+    { lhs = "<leader>f3", mode = "n", desc = "File 3", file = "lua/plugins/ui/which-key.lua", line = 167 },
+    { lhs = "<leader>f4", mode = "n", desc = "File 4", file = "lua/plugins/ui/which-key.lua", line = 167 },
+    { lhs = "<leader>f5", mode = "n", desc = "File 5", file = "lua/plugins/ui/which-key.lua", line = 167 },
+    { lhs = "<leader>f6", mode = "n", desc = "File 6", file = "lua/plugins/ui/which-key.lua", line = 167 },
+    { lhs = "<leader>f7", mode = "n", desc = "File 7", file = "lua/plugins/ui/which-key.lua", line = 167 },
+    { lhs = "<leader>f8", mode = "n", desc = "File 8", file = "lua/plugins/ui/which-key.lua", line = 167 },
+    { lhs = "<leader>f9", mode = "n", desc = "File 9", file = "lua/plugins/ui/which-key.lua", line = 167 },
+    { lhs = "<leader>gC", mode = "n", desc = "Co-Authors", file = "lua/plugins/ui/which-key.lua", line = 95 },
+    { lhs = "<leader>goA", mode = "n", desc = "Archived Repos", file = "lua/plugins/tools/octohub.lua", line = 50 },
+    { lhs = "<leader>goF", mode = "n", desc = "Forked Repos", file = "lua/plugins/tools/octohub.lua", line = 51 },
+    { lhs = "<leader>goL", mode = "n", desc = "Filter by Language", file = "lua/plugins/tools/octohub.lua", line = 55 },
+    { lhs = "<leader>goP", mode = "n", desc = "Private Repos", file = "lua/plugins/tools/octohub.lua", line = 52 },
+    { lhs = "<leader>goS", mode = "n", desc = "Starred Repos", file = "lua/plugins/tools/octohub.lua", line = 53 },
+    { lhs = "<leader>goT", mode = "n", desc = "Template Repos", file = "lua/plugins/tools/octohub.lua", line = 54 },
+    { lhs = "<leader>goU", mode = "n", desc = "Repos by Pushed", file = "lua/plugins/tools/octohub.lua", line = 49 },
+    { lhs = "<leader>goa", mode = "n", desc = "Activity Stats", file = "lua/plugins/tools/octohub.lua", line = 56 },
+    { lhs = "<leader>gob", mode = "n", desc = "Repos by Size", file = "lua/plugins/tools/octohub.lua", line = 42 },
+    { lhs = "<leader>goc", mode = "n", desc = "Repos by Created", file = "lua/plugins/tools/octohub.lua", line = 43 },
+    { lhs = "<leader>gof", mode = "n", desc = "Repos by Forks", file = "lua/plugins/tools/octohub.lua", line = 44 },
+    { lhs = "<leader>gog", mode = "n", desc = "Contribution Graph", file = "lua/plugins/tools/octohub.lua", line = 57 },
+    { lhs = "<leader>goi", mode = "n", desc = "Repos by Issues", file = "lua/plugins/tools/octohub.lua", line = 45 },
+    { lhs = "<leader>gol", mode = "n", desc = "Repos by Language", file = "lua/plugins/tools/octohub.lua", line = 46 },
+    { lhs = "<leader>goo", mode = "n", desc = "", file = "lua/plugins/list.lua", line = 172 },
+    { lhs = "<leader>goo", mode = "n", desc = "All Repos", file = "lua/plugins/tools/octohub.lua", line = 41 },
+    { lhs = "<leader>gop", mode = "n", desc = "Open GitHub Profile", file = "lua/plugins/tools/octohub.lua", line = 60 },
+    { lhs = "<leader>gor", mode = "n", desc = "Repo Stats", file = "lua/plugins/tools/octohub.lua", line = 58 },
+    { lhs = "<leader>gos", mode = "n", desc = "Repos by Stars", file = "lua/plugins/tools/octohub.lua", line = 47 },
+    { lhs = "<leader>got", mode = "n", desc = "All Stats", file = "lua/plugins/tools/octohub.lua", line = 59 },
+    { lhs = "<leader>gou", mode = "n", desc = "Repos by Updated", file = "lua/plugins/tools/octohub.lua", line = 48 },
+    { lhs = "<leader>gow", mode = "n", desc = "Open Repo in Browser", file = "lua/plugins/tools/octohub.lua", line = 61 },
+    { lhs = "<leader>iN", mode = "n", desc = "", file = "lua/plugins/list.lua", line = 149 },
+    { lhs = "<leader>iN", mode = "n", desc = "Nerdy: Recent Icons", file = "lua/plugins/tools/nerdy.lua", line = 21 },
+    { lhs = "<leader>in", mode = "n", desc = "", file = "lua/plugins/list.lua", line = 149 },
+    { lhs = "<leader>in", mode = "n", desc = "Nerdy: List Icons", file = "lua/plugins/tools/nerdy.lua", line = 20 },
+    { lhs = "<leader>mD", mode = "n", desc = "Delete Marks In Buffer", file = "lua/plugins/ui/markit.lua", line = 29 },
+    { lhs = "<leader>mM", mode = "n", desc = "Buffer Marks", file = "lua/plugins/ui/markit.lua", line = 20 },
+    { lhs = "<leader>mP", mode = "n", desc = "Preview Mark", file = "lua/plugins/ui/markit.lua", line = 27 },
+    { lhs = "<leader>mS", mode = "n", desc = "Set Mark (Interactive)", file = "lua/plugins/ui/markit.lua", line = 22 },
+    { lhs = "<leader>mT", mode = "n", desc = "Toggle Mark (Interactive)", file = "lua/plugins/ui/markit.lua", line = 24 },
+    { lhs = "<leader>mX", mode = "n", desc = "Delete Mark (Interactive)", file = "lua/plugins/ui/markit.lua", line = 30 },
+    { lhs = "<leader>ma", mode = "n", desc = "Annotate Bookmark", file = "lua/plugins/ui/markit.lua", line = 33 },
+    { lhs = "<leader>mb", mode = "n", desc = "All Bookmarks", file = "lua/plugins/ui/markit.lua", line = 31 },
+    { lhs = "<leader>md", mode = "n", desc = "Delete Marks In Line", file = "lua/plugins/ui/markit.lua", line = 28 },
+    { lhs = "<leader>mh", mode = "n", desc = "Previous Bookmark", file = "lua/plugins/ui/markit.lua", line = 35 },
+    { lhs = "<leader>mj", mode = "n", desc = "Next Mark", file = "lua/plugins/ui/markit.lua", line = 25 },
+    { lhs = "<leader>mk", mode = "n", desc = "Previous Mark", file = "lua/plugins/ui/markit.lua", line = 26 },
+    { lhs = "<leader>ml", mode = "n", desc = "Next Bookmark", file = "lua/plugins/ui/markit.lua", line = 34 },
+    { lhs = "<leader>mm", mode = "n", desc = "All Marks", file = "lua/plugins/ui/markit.lua", line = 19 },
+    { lhs = "<leader>mqM", mode = "n", desc = "Buffer Marks → QuickFix", file = "lua/plugins/ui/markit.lua", line = 39 },
+    { lhs = "<leader>mqb", mode = "n", desc = "All Bookmarks → QuickFix", file = "lua/plugins/ui/markit.lua", line = 38 },
+    { lhs = "<leader>mqg", mode = "n", desc = "All Marks → QuickFix", file = "lua/plugins/ui/markit.lua", line = 40 },
+    { lhs = "<leader>mqm", mode = "n", desc = "All Marks → QuickFix", file = "lua/plugins/ui/markit.lua", line = 37 },
+    { lhs = "<leader>ms", mode = "n", desc = "Set Next Available Mark", file = "lua/plugins/ui/markit.lua", line = 21 },
+    { lhs = "<leader>mt", mode = "n", desc = "Toggle Mark at Cursor", file = "lua/plugins/ui/markit.lua", line = 23 },
+    { lhs = "<leader>mv", mode = "n", desc = "Toggle Signs", file = "lua/plugins/ui/markit.lua", line = 36 },
+    { lhs = "<leader>mx", mode = "n", desc = "Delete Bookmark at Cursor", file = "lua/plugins/ui/markit.lua", line = 32 },
+    { lhs = "<leader>nc", mode = "n", desc = "Create Note", file = "lua/plugins/tools/tdo.lua", line = 22 },
+    { lhs = "<leader>nf", mode = "n", desc = "All Notes", file = "lua/plugins/tools/tdo.lua", line = 20 },
+    { lhs = "<leader>ng", mode = "n", desc = "Find Notes", file = "lua/plugins/tools/tdo.lua", line = 21 },
+    { lhs = "<leader>nn", mode = "n", desc = "", file = "lua/plugins/list.lua", line = 164 },
+    { lhs = "<leader>nt", mode = "n", desc = "", file = "lua/plugins/list.lua", line = 164 },
+    { lhs = "<leader>nt", mode = "n", desc = "Incomplete Todos", file = "lua/plugins/tools/tdo.lua", line = 23 },
+    { lhs = "<leader>nx", mode = "n", desc = "", file = "lua/plugins/list.lua", line = 164 },
+    { lhs = "<leader>nx", mode = "n", desc = "Toggle Todo", file = "lua/plugins/tools/tdo.lua", line = 24 },
+    { lhs = "<leader>ot", mode = "n", desc = "Tecla para alternar entre los diferentes estilos del tema", file = "lua/plugins/ui/onedark.lua", line = 37 },
+    { lhs = "<leader>qa", mode = "n", desc = "Quit All", file = "lua/plugins/ui/which-key.lua", line = 116 },
+    { lhs = "<leader>qb", mode = "n", desc = "Close Buffer", file = "lua/plugins/ui/which-key.lua", line = 117 },
+    { lhs = "<leader>qd", mode = "n", desc = "Delete Buffer", file = "lua/plugins/ui/which-key.lua", line = 118 },
+    { lhs = "<leader>qf", mode = "n", desc = "Force Quit", file = "lua/plugins/ui/which-key.lua", line = 119 },
+    { lhs = "<leader>qo", mode = "n", desc = "Close Others", file = "lua/plugins/ui/which-key.lua", line = 120 },
+    { lhs = "<leader>qq", mode = "n", desc = "Quit", file = "lua/plugins/ui/which-key.lua", line = 121 },
+    { lhs = "<leader>qs", mode = "n", desc = "Close Split", file = "lua/plugins/ui/which-key.lua", line = 122 },
+    { lhs = "<leader>qw", mode = "n", desc = "Write and Quit", file = "lua/plugins/ui/which-key.lua", line = 123 },
+    { lhs = "<leader>ra", mode = "n", desc = "Replace All", file = "lua/plugins/ui/which-key.lua", line = 126 },
+    { lhs = "<leader>rb", mode = "n", desc = "Replace Buffer", file = "lua/plugins/ui/which-key.lua", line = 127 },
+    { lhs = "<leader>rd", mode = "n", desc = "Go To Definition", file = "lua/plugins/ui/which-key.lua", line = 128 },
+    { lhs = "<leader>rh", mode = "n", desc = "List Definition Head", file = "lua/plugins/ui/which-key.lua", line = 129 },
+    { lhs = "<leader>rj", mode = "n", desc = "Next Usage", file = "lua/plugins/ui/which-key.lua", line = 130 },
+    { lhs = "<leader>rk", mode = "n", desc = "Previous Usage", file = "lua/plugins/ui/which-key.lua", line = 131 },
+    { lhs = "<leader>rl", mode = "n", desc = "List Definition", file = "lua/plugins/ui/which-key.lua", line = 132 },
+    { lhs = "<leader>rn", mode = "n", desc = "Swap Next", file = "lua/plugins/ui/which-key.lua", line = 133 },
+    { lhs = "<leader>rp", mode = "n", desc = "Swap Previous", file = "lua/plugins/ui/which-key.lua", line = 134 },
+    { lhs = "<leader>rr", mode = "n", desc = "Smart Rename", file = "lua/plugins/ui/which-key.lua", line = 135 },
+    { lhs = "<leader>rs", mode = "n", desc = "Replace Word Buffer", file = "lua/plugins/ui/which-key.lua", line = 136 },
+    { lhs = "<leader>rw", mode = "n", desc = "Replace Word Everywhere", file = "lua/plugins/ui/which-key.lua", line = 137 },
+    { lhs = "<leader>t`", mode = "n", desc = "Horizontal Terminal", file = "lua/plugins/ui/which-key.lua", line = 142 },
+    { lhs = "<leader>tc", mode = "n", desc = "Rails Console", file = "lua/plugins/ui/which-key.lua", line = 143 },
+    { lhs = "<leader>td", mode = "n", desc = "Exe Launcher", file = "lua/plugins/ui/which-key.lua", line = 144 },
+    { lhs = "<leader>tn", mode = "n", desc = "Node", file = "lua/plugins/ui/which-key.lua", line = 145 },
+    { lhs = "<leader>tp", mode = "n", desc = "Python", file = "lua/plugins/ui/which-key.lua", line = 146 },
+    { lhs = "<leader>tr", mode = "n", desc = "Ruby", file = "lua/plugins/ui/which-key.lua", line = 147 },
+    { lhs = "<leader>ts", mode = "n", desc = "Horizontal Terminal", file = "lua/plugins/ui/which-key.lua", line = 148 },
+    { lhs = "<leader>tt", mode = "n", desc = "Terminal", file = "lua/plugins/ui/which-key.lua", line = 149 },
+    { lhs = "<leader>tv", mode = "n", desc = "Vertical Terminal", file = "lua/plugins/ui/which-key.lua", line = 150 },
+    { lhs = "<leader>tw", mode = "n", desc = "Exe Launcher, Wait", file = "lua/plugins/ui/which-key.lua", line = 151 },
+    { lhs = "<leader>x", mode = "n", desc = " Save and Quit", file = "lua/plugins/ui/which-key.lua", line = 62 },
+    { lhs = "<leader>yL", mode = "n", desc = "Absolute Path with Line", file = "lua/plugins/ui/which-key.lua", line = 156 },
+    { lhs = "<leader>yP", mode = "n", desc = "Absolute Path", file = "lua/plugins/ui/which-key.lua", line = 157 },
+    { lhs = "<leader>ya", mode = "n", desc = "Copy Whole File", file = "lua/plugins/ui/which-key.lua", line = 158 },
+    { lhs = "<leader>yf", mode = "n", desc = "File Name", file = "lua/plugins/ui/which-key.lua", line = 159 },
+    { lhs = "<leader>yg", mode = "n", desc = "", file = "lua/plugins/list.lua", line = 107 },
+    { lhs = "<leader>yg", mode = "n", desc = "Copy Git URL", file = "lua/plugins/ui/which-key.lua", line = 160 },
+    { lhs = "<leader>yl", mode = "n", desc = "Relative Path with Line", file = "lua/plugins/ui/which-key.lua", line = 161 },
+    { lhs = "<leader>yp", mode = "n", desc = "Relative Path", file = "lua/plugins/ui/which-key.lua", line = 162 },
+    { lhs = "=", mode = "n", desc = "Placeholder para incremento", file = "lua/core/keys.lua", line = 47 },
+    { lhs = "H", mode = "n", desc = "toggle search hidden", file = "lua/plugins/tools/spectre.lua", line = 79 },
+    { lhs = "I", mode = "n", desc = "toggle ignore case", file = "lua/plugins/tools/spectre.lua", line = 73 },
+    { lhs = "J", mode = "n", desc = "Unir líneas y centrar cursor", file = "lua/core/keys.lua", line = 54 },
+    { lhs = "N", mode = "n", desc = "Anterior resultado", file = "lua/core/keys.lua", line = 75 },
+    { lhs = "N", mode = "n", desc = "Buscar anterior y centrar", file = "lua/core/keys.lua", line = 58 },
+    { lhs = "Q", mode = "n", desc = "send all item to quickfix", file = "lua/plugins/tools/spectre.lua", line = 43 },
+    { lhs = "R", mode = "n", desc = "replace all", file = "lua/plugins/tools/spectre.lua", line = 61 },
+    { lhs = "README.md", mode = "n", desc = "todos.sh", file = "lua/plugins/tools/tdo.lua", line = 19 },
+    { lhs = "X", mode = "n", desc = "Eliminar hasta el final, sin copiar", file = "lua/core/keys.lua", line = 42 },
+    { lhs = "[a", mode = "n", desc = "jump to top edge of scope", file = "lua/plugins/ui/snacks.lua", line = 271 },
+    { lhs = "[e", mode = "n", desc = "Navegación: hunk anterior", file = "lua/plugins/ui/gitsigns.lua", line = 70 },
+    { lhs = "[t", mode = "n", desc = "", file = "lua/plugins/list.lua", line = 164 },
+    { lhs = "]a", mode = "n", desc = "jump to bottom edge of scope", file = "lua/plugins/ui/snacks.lua", line = 279 },
+    { lhs = "]e", mode = "n", desc = "Navegación: siguiente hunk", file = "lua/plugins/ui/gitsigns.lua", line = 59 },
+    { lhs = "]t", mode = "n", desc = "", file = "lua/plugins/list.lua", line = 164 },
+    { lhs = "ag", mode = "n", desc = "ignore case", file = "lua/plugins/tools/spectre.lua", line = 111 },
+    { lhs = "c", mode = "n", desc = "input replace vim command", file = "lua/plugins/tools/spectre.lua", line = 49 },
+    { lhs = "gh", mode = "n", desc = "Inicio de línea", file = "lua/core/keys.lua", line = 51 },
+    { lhs = "gl", mode = "n", desc = "Fin de línea", file = "lua/core/keys.lua", line = 50 },
+    { lhs = "hidden", mode = "n", desc = "hidden file", file = "lua/plugins/tools/spectre.lua", line = 104 },
+    { lhs = "ignore-case", mode = "n", desc = "ignore case", file = "lua/plugins/tools/spectre.lua", line = 99 },
+    { lhs = "j", mode = "n", desc = "Bajar línea real", file = "lua/core/keys.lua", line = 61 },
+    { lhs = "k", mode = "n", desc = "Subir línea real", file = "lua/core/keys.lua", line = 62 },
+    { lhs = "m", mode = "n", desc = "change result view mode", file = "lua/plugins/tools/spectre.lua", line = 67 },
+    { lhs = "n", mode = "n", desc = "Buscar siguiente y centrar", file = "lua/core/keys.lua", line = 57 },
+    { lhs = "n", mode = "n", desc = "Siguiente resultado", file = "lua/core/keys.lua", line = 72 },
+    { lhs = "o", mode = "n", desc = "show option", file = "lua/plugins/tools/spectre.lua", line = 55 },
+    { lhs = "q", mode = "n", desc = "", file = "lua/core/autocmd.lua", line = 86 },
+    { lhs = "rg", mode = "n", desc = "ignore case", file = "lua/plugins/tools/spectre.lua", line = 87 },
+    { lhs = "sed", mode = "n", desc = "Motor de reemplazo (externo). Por defecto se usa 'sed'", file = "lua/plugins/tools/spectre.lua", line = 135 },
+    { lhs = "t", mode = "n", desc = "toggle current item", file = "lua/plugins/tools/spectre.lua", line = 31 },
+    { lhs = "N", mode = "o", desc = "Anterior resultado", file = "lua/core/keys.lua", line = 77 },
+    { lhs = "ih", mode = "o", desc = "Objeto de texto para seleccionar un hunk", file = "lua/plugins/ui/gitsigns.lua", line = 81 },
+    { lhs = "n", mode = "o", desc = "Siguiente resultado", file = "lua/core/keys.lua", line = 74 },
+    { lhs = "JJ", mode = "t", desc = "Escape en Terminal Mode", file = "lua/core/keys.lua", line = 33 },
+    { lhs = "-", mode = "v", desc = "Placeholder para decremento", file = "lua/core/keys.lua", line = 46 },
+    { lhs = "<", mode = "v", desc = "Indentado persistente en modo visual", file = "lua/core/keys.lua", line = 80 },
+    { lhs = "<cr>", mode = "v", desc = "Execute buffer", file = "lua/plugins/ui/snacks.lua", line = 324 },
+    { lhs = "<leader>cr", mode = "v", desc = "Source buffer", file = "lua/plugins/ui/snacks.lua", line = 338 },
+    { lhs = "<leader>yg", mode = "v", desc = "Copy Git URL", file = "lua/plugins/ui/which-key.lua", line = 187 },
+    { lhs = "=", mode = "v", desc = "Placeholder para incremento", file = "lua/core/keys.lua", line = 47 },
+    { lhs = ">", mode = "v", desc = "Indentado persistente en modo visual", file = "lua/core/keys.lua", line = 81 },
+    { lhs = "J", mode = "v", desc = "Mover bloques de texto seleccionados arriba y abajo en visual", file = "lua/core/keys.lua", line = 65 },
+    { lhs = "K", mode = "v", desc = "Mover bloques de texto seleccionados arriba y abajo en visual", file = "lua/core/keys.lua", line = 66 },
+    { lhs = "N", mode = "v", desc = "Anterior resultado", file = "lua/core/keys.lua", line = 76 },
+    { lhs = "X", mode = "v", desc = "Eliminar selección, sin copiar", file = "lua/core/keys.lua", line = 43 },
+    { lhs = "gh", mode = "v", desc = "Inicio de línea", file = "lua/core/keys.lua", line = 51 },
+    { lhs = "gl", mode = "v", desc = "Fin de línea", file = "lua/core/keys.lua", line = 50 },
+    { lhs = "ih", mode = "v", desc = "Objeto de texto para seleccionar un hunk", file = "lua/plugins/ui/gitsigns.lua", line = 81 },
+    { lhs = "n", mode = "v", desc = "Siguiente resultado", file = "lua/core/keys.lua", line = 73 },
+    { lhs = "p", mode = "v", desc = "Pegar sobre texto visual seleccionado sin sobreescribir el registro (\"paste sin perder el clipboard\")", file = "lua/core/keys.lua", line = 36 },
+    { lhs = "x", mode = "v", desc = "Eliminar texto en visual sin copiar al registro principal", file = "lua/core/keys.lua", line = 39 },
+  },
+  -- prefijo -> etiqueta del grupo de which-key
+  groups = {
+    ["<leader>a"] = " AI",
+    ["<leader>c"] = " Code",
+    ["<leader>e"] = " Edit",
+    ["<leader>ec"] = "Edit Configs",
+    ["<leader>f"] = " Find",
+    ["<leader>g"] = " Git",
+    ["<leader>i"] = " Insert",
+    ["<leader>j"] = " Jump",
+    ["<leader>l"] = " LSP",
+    ["<leader>m"] = " Marks",
+    ["<leader>mg"] = "Group Bookmarks",
+    ["<leader>mG"] = "Group Bookmarks In Project",
+    ["<leader>mn"] = "Next Bookmark In Group",
+    ["<leader>mp"] = "Previous Bookmark In Group",
+    ["<leader>n"] = " Notes",
+    ["<leader>o"] = " Options",
+    ["<leader>p"] = " Packages",
+    ["<leader>q"] = " Quit",
+    ["<leader>r"] = " Refactor",
+    ["<leader>s"] = " Split",
+    ["<leader>t"] = " Terminal",
+    ["<leader>w"] = " Writing",
+    ["<leader>y"] = " Yank",
+  },
+  -- modo -> lhs -> descripción
+  descriptions = {
+    i = {
+      [","] = "Punto de interrupción de undo tras ciertos caracteres en insert",
+      ["."] = "Punto de interrupción de undo tras ciertos caracteres en insert",
+      ["<Esc>"] = "Escape y limpia búsqueda",
+      ["jj"] = "Rápido escape en Insert Mode",
+    },
+    n = {
+      ["-"] = "Placeholder para decremento",
+      ["<C-d>"] = "Half-page down y centrar",
+      ["<C-u>"] = "Half-page up y centrar",
+      ["<cr>"] = "Execute buffer",
+      ["<Esc>"] = "Escape y limpia búsqueda",
+      ["<leader>cr"] = "Source buffer",
+      ["<leader>eE"] = "File Explorer",
+      ["<leader>ea"] = "Alternate File",
+      ["<leader>ecA"] = "Alacritty Config",
+      ["<leader>ecZ"] = "Zsh Prompt Config",
+      ["<leader>eca"] = "Shell Aliases",
+      ["<leader>ecb"] = "Bash Config",
+      ["<leader>ece"] = "Environment Config",
+      ["<leader>ecf"] = "Shell Functions",
+      ["<leader>ecg"] = "Git Config",
+      ["<leader>eck"] = "Kitty Config",
+      ["<leader>ecl"] = "Local Env",
+      ["<leader>ecn"] = "Neovim Init",
+      ["<leader>ecp"] = "Plugin List",
+      ["<leader>ecq"] = "Qutebrowser Config",
+      ["<leader>ect"] = "Tmux Config",
+      ["<leader>ecv"] = "Vim Config",
+      ["<leader>ecz"] = "Zsh Config",
+      ["<leader>ef"] = "File Under Cursor",
+      ["<leader>em"] = "Readme",
+      ["<leader>en"] = "New File",
+      ["<leader>et"] = "Explore Tree",
+      ["<leader>exa"] = "All Exercism Languages",
+      ["<leader>exl"] = "List Default Language Exercises",
+      ["<leader>exr"] = "Recent Exercises",
+      ["<leader>exs"] = "Submit Exercise",
+      ["<leader>ext"] = "Test Exercise",
+      ["<leader>f1"] = "File 1",
+      ["<leader>f2"] = "File 2",
+      ["<leader>f3"] = "File 3",
+      ["<leader>f4"] = "File 4",
+      ["<leader>f5"] = "File 5",
+      ["<leader>f6"] = "File 6",
+      ["<leader>f7"] = "File 7",
+      ["<leader>f8"] = "File 8",
+      ["<leader>f9"] = "File 9",
+      ["<leader>gC"] = "Co-Authors",
+      ["<leader>goA"] = "Archived Repos",
+      ["<leader>goF"] = "Forked Repos",
+      ["<leader>goL"] = "Filter by Language",
+      ["<leader>goP"] = "Private Repos",
+      ["<leader>goS"] = "Starred Repos",
+      ["<leader>goT"] = "Template Repos",
+      ["<leader>goU"] = "Repos by Pushed",
+      ["<leader>goa"] = "Activity Stats",
+      ["<leader>gob"] = "Repos by Size",
+      ["<leader>goc"] = "Repos by Created",
+      ["<leader>gof"] = "Repos by Forks",
+      ["<leader>gog"] = "Contribution Graph",
+      ["<leader>goi"] = "Repos by Issues",
+      ["<leader>gol"] = "Repos by Language",
+      ["<leader>goo"] = "All Repos",
+      ["<leader>gop"] = "Open GitHub Profile",
+      ["<leader>gor"] = "Repo Stats",
+      ["<leader>gos"] = "Repos by Stars",
+      ["<leader>got"] = "All Stats",
+      ["<leader>gou"] = "Repos by Updated",
+      ["<leader>gow"] = "Open Repo in Browser",
+      ["<leader>iN"] = "Nerdy: Recent Icons",
+      ["<leader>in"] = "Nerdy: List Icons",
+      ["<leader>mD"] = "Delete Marks In Buffer",
+      ["<leader>mM"] = "Buffer Marks",
+      ["<leader>mP"] = "Preview Mark",
+      ["<leader>mS"] = "Set Mark (Interactive)",
+      ["<leader>mT"] = "Toggle Mark (Interactive)",
+      ["<leader>mX"] = "Delete Mark (Interactive)",
+      ["<leader>ma"] = "Annotate Bookmark",
+      ["<leader>mb"] = "All Bookmarks",
+      ["<leader>md"] = "Delete Marks In Line",
+      ["<leader>mh"] = "Previous Bookmark",
+      ["<leader>mj"] = "Next Mark",
+      ["<leader>mk"] = "Previous Mark",
+      ["<leader>ml"] = "Next Bookmark",
+      ["<leader>mm"] = "All Marks",
+      ["<leader>mqM"] = "Buffer Marks → QuickFix",
+      ["<leader>mqb"] = "All Bookmarks → QuickFix",
+      ["<leader>mqg"] = "All Marks → QuickFix",
+      ["<leader>mqm"] = "All Marks → QuickFix",
+      ["<leader>ms"] = "Set Next Available Mark",
+      ["<leader>mt"] = "Toggle Mark at Cursor",
+      ["<leader>mv"] = "Toggle Signs",
+      ["<leader>mx"] = "Delete Bookmark at Cursor",
+      ["<leader>nc"] = "Create Note",
+      ["<leader>nf"] = "All Notes",
+      ["<leader>ng"] = "Find Notes",
+      ["<leader>nt"] = "Incomplete Todos",
+      ["<leader>nx"] = "Toggle Todo",
+      ["<leader>ot"] = "Tecla para alternar entre los diferentes estilos del tema",
+      ["<leader>qa"] = "Quit All",
+      ["<leader>qb"] = "Close Buffer",
+      ["<leader>qd"] = "Delete Buffer",
+      ["<leader>qf"] = "Force Quit",
+      ["<leader>qo"] = "Close Others",
+      ["<leader>qq"] = "Quit",
+      ["<leader>qs"] = "Close Split",
+      ["<leader>qw"] = "Write and Quit",
+      ["<leader>ra"] = "Replace All",
+      ["<leader>rb"] = "Replace Buffer",
+      ["<leader>rd"] = "Go To Definition",
+      ["<leader>rh"] = "List Definition Head",
+      ["<leader>rj"] = "Next Usage",
+      ["<leader>rk"] = "Previous Usage",
+      ["<leader>rl"] = "List Definition",
+      ["<leader>rn"] = "Swap Next",
+      ["<leader>rp"] = "Swap Previous",
+      ["<leader>rr"] = "Smart Rename",
+      ["<leader>rs"] = "Replace Word Buffer",
+      ["<leader>rw"] = "Replace Word Everywhere",
+      ["<leader>t`"] = "Horizontal Terminal",
+      ["<leader>tc"] = "Rails Console",
+      ["<leader>td"] = "Exe Launcher",
+      ["<leader>tn"] = "Node",
+      ["<leader>tp"] = "Python",
+      ["<leader>tr"] = "Ruby",
+      ["<leader>ts"] = "Horizontal Terminal",
+      ["<leader>tt"] = "Terminal",
+      ["<leader>tv"] = "Vertical Terminal",
+      ["<leader>tw"] = "Exe Launcher, Wait",
+      ["<leader>x"] = " Save and Quit",
+      ["<leader>yL"] = "Absolute Path with Line",
+      ["<leader>yP"] = "Absolute Path",
+      ["<leader>ya"] = "Copy Whole File",
+      ["<leader>yf"] = "File Name",
+      ["<leader>yg"] = "Copy Git URL",
+      ["<leader>yl"] = "Relative Path with Line",
+      ["<leader>yp"] = "Relative Path",
+      ["="] = "Placeholder para incremento",
+      ["H"] = "toggle search hidden",
+      ["I"] = "toggle ignore case",
+      ["J"] = "Unir líneas y centrar cursor",
+      ["N"] = "Anterior resultado",
+      ["Q"] = "send all item to quickfix",
+      ["R"] = "replace all",
+      ["README.md"] = "todos.sh",
+      ["X"] = "Eliminar hasta el final, sin copiar",
+      ["[a"] = "jump to top edge of scope",
+      ["[e"] = "Navegación: hunk anterior",
+      ["]a"] = "jump to bottom edge of scope",
+      ["]e"] = "Navegación: siguiente hunk",
+      ["ag"] = "ignore case",
+      ["c"] = "input replace vim command",
+      ["gh"] = "Inicio de línea",
+      ["gl"] = "Fin de línea",
+      ["hidden"] = "hidden file",
+      ["ignore-case"] = "ignore case",
+      ["j"] = "Bajar línea real",
+      ["k"] = "Subir línea real",
+      ["m"] = "change result view mode",
+      ["n"] = "Buscar siguiente y centrar",
+      ["o"] = "show option",
+      ["rg"] = "ignore case",
+      ["sed"] = "Motor de reemplazo (externo). Por defecto se usa 'sed'",
+      ["t"] = "toggle current item",
+    },
+    o = {
+      ["N"] = "Anterior resultado",
+      ["ih"] = "Objeto de texto para seleccionar un hunk",
+      ["n"] = "Siguiente resultado",
+    },
+    t = {
+      ["JJ"] = "Escape en Terminal Mode",
+    },
+    v = {
+      ["-"] = "Placeholder para decremento",
+      ["<"] = "Indentado persistente en modo visual",
+      ["<cr>"] = "Execute buffer",
+      ["<leader>cr"] = "Source buffer",
+      ["<leader>yg"] = "Copy Git URL",
+      ["="] = "Placeholder para incremento",
+      [">"] = "Indentado persistente en modo visual",
+      ["J"] = "Mover bloques de texto seleccionados arriba y abajo en visual",
+      ["K"] = "Mover bloques de texto seleccionados arriba y abajo en visual",
+      ["N"] = "Anterior resultado",
+      ["X"] = "Eliminar selección, sin copiar",
+      ["gh"] = "Inicio de línea",
+      ["gl"] = "Fin de línea",
+      ["ih"] = "Objeto de texto para seleccionar un hunk",
+      ["n"] = "Siguiente resultado",
+      ["p"] = "Pegar sobre texto visual seleccionado sin sobreescribir el registro (\"paste sin perder el clipboard\")",
+      ["x"] = "Eliminar texto en visual sin copiar al registro principal",
+    },
+  },
+}
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Pipeline asíncrono de extracción: lecturas (disco o git) solapadas con el parseo.
+
+La lectura de archivos y de blobs de git es casi toda espera; el parseo es CPU.
+ExtractionPipeline separa ambas partes con asyncio:
+
+- un productor lee el contenido de cada archivo .lua, del árbol de trabajo
+  (lecturas en hilos, como mucho `io_concurrency` a la vez) o de una revisión
+  (`git ls-tree` + un único `git cat-file --batch` alimentado en paralelo);
+- una cola acotada (`queue_size`) aplica contrapresión: si el parseo va por
+  detrás, los lectores esperan y la memoria queda limitada a
+  queue_size + io_concurrency contenidos;
+- varios consumidores envían cada archivo a un pool de procesos (`jobs`) que
+  ejecuta extract_keybindings_from_content con el extractor ya inicializado.
+
+Con una revisión, los archivos que se extraen son los alcanzables desde init.lua en
+esa revisión: antes de encolar nada se recorre el grafo de módulos sobre sus blobs
+(module_graph_from del extractor), como hace find_lua_files con el árbol de trabajo.
+
+Los resultados se reordenan por archivo, así que la salida es idéntica a la de
+extract_all_keybindings. Con el motor AST cada worker indexa sus archivos por
+separado: los alias entre módulos sólo se resuelven en la extracción síncrona.
+
+Este módulo no importa update_keybindings: recibe el extractor ya construido.
+"""
+
+import os
+import asyncio
+import hashlib
+import subprocess
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from require_graph import ModuleGraph
+
+# Valores por defecto de lecturas simultáneas y tamaño de la cola de contenidos
+DEFAULT_IO_CONCURRENCY = 8
+DEFAULT_QUEUE_SIZE = 32
+
+
+class GitSourceError(Exception):
+    """No se pudo leer la revisión pedida con git."""
+
+
+# Extractor de cada proceso del pool (se envía una vez por worker, no por archivo)
+_WORKER_EXTRACTOR = None
+
+
+def _init_worker(extractor):
+    global _WORKER_EXTRACTOR
+    _WORKER_EXTRACTOR = extractor
+
+
+def _extract(file_path: str, content: Optional[str]) -> List:
+    """Extrae un archivo en el worker; sin contenido, el extractor lo lee (p.ej. modo mmap)."""
+    if content is None:
+        return _WORKER_EXTRACTOR.extract_keybindings_from_file(file_path)
+    return _WORKER_EXTRACTOR.extract_keybindings_from_content(file_path, content)
+
+
+def _read_text(file_path: str) -> Tuple[Optional[str], str]:
+    """(contenido, sha256) de un archivo; contenido None si no se puede leer."""
+    try:
+        with open(file_path, 'rb') as f:
+            data = f.read()
+    except OSError as e:
+        print(f"Error leyendo {file_path}: {e}")
+        return None, "unreadable"
+    return data.decode('utf-8', errors='replace'), hashlib.sha256(data).hexdigest()
+
+
+def _hash_file(file_path: str) -> str:
+    """sha256 de un archivo grande leído por bloques (no se carga entero en memoria)."""
+    digest = hashlib.sha256()
+    try:
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+    except OSError:
+        return "unreadable"
+    return digest.hexdigest()
+
+
+class GitBlobReader:
+    """Lectura síncrona de archivos de una revisión con un único git cat-file --batch."""
+
+    def __init__(self, repo_root: str, rev: str):
+        self.repo_root = repo_root
+        self.rev = rev
+        self.proc = subprocess.Popen(['git', 'cat-file', '--batch'], cwd=repo_root,
+                                     stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+
+    def read(self, file_path: str) -> str:
+        """Contenido de `file_path` (ruta absoluta bajo repo_root) en la revisión."""
+        name = os.path.relpath(file_path, self.repo_root).replace(os.sep, '/')
+        self.proc.stdin.write(f"{self.rev}:{name}\n".encode('utf-8'))
+        self.proc.stdin.flush()
+        header = self.proc.stdout.readline().split()
+        if len(header) != 3 or header[1] != b'blob':
+            raise OSError(f"{self.rev}:{name} no es un blob legible")
+        return self.proc.stdout.read(int(header[2]) + 1)[:-1].decode('utf-8', errors='replace')
+
+    def close(self):
+        self.proc.stdin.close()
+        self.proc.stdout.close()
+        self.proc.wait()
+
+
+class ExtractionPipeline:
+    """Extrae los keybindings del repositorio solapando lecturas y parseo."""
+
+    def __init__(self, extractor, jobs: Optional[int] = None, io_concurrency: int = DEFAULT_IO_CONCURRENCY,
+                 queue_size: int = DEFAULT_QUEUE_SIZE):
+        self.extractor = extractor
+        self.jobs = jobs or os.cpu_count() or 1
+        self.io_concurrency = max(1, io_concurrency)
+        self.queue_size = max(1, queue_size)
+        # sha256 del contenido leído por ruta relativa (para la huella de las entradas)
+        self.file_hashes: Dict[str, str] = {}
+        # Grafo de módulos de la revisión leída (None sin revisión o con all_files)
+        self.graph: Optional[ModuleGraph] = None
+
+    def rel_path(self, file_path: str) -> str:
+        return os.path.relpath(file_path, self.extractor.repo_root).replace(os.sep, '/')
+
+    def run(self, rev: Optional[str] = None) -> List:
+        """Extrae el árbol de trabajo (rev=None) o la revisión de git dada; devuelve la lista deduplicada."""
+        return asyncio.run(self._run(rev))
+
+    async def _run(self, rev: Optional[str]) -> List:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        results: Dict[int, List] = {}
+        if self.jobs > 1:
+            cpu_pool: Executor = ProcessPoolExecutor(
+                max_workers=self.jobs, initializer=_init_worker, initargs=(self.extractor,)
+            )
+        else:
+            # Un solo proceso: el parseo corre en un hilo y aun así se solapa con las lecturas
+            _init_worker(self.extractor)
+            cpu_pool = ThreadPoolExecutor(max_workers=1)
+        consumers = [asyncio.ensure_future(self._consume(queue, cpu_pool, results)) for _ in range(self.jobs * 2)]
+        try:
+            if rev is None:
+                await self._read_worktree(queue)
+            else:
+                await self._read_revision(rev, queue)
+            for _ in consumers:
+                await queue.put(None)
+            await asyncio.gather(*consumers)
+        finally:
+            for consumer in consumers:
+                consumer.cancel()
+            cpu_pool.shutdown()
+        keybindings = [kb for i in sorted(results) for kb in results[i]]
+        return self.extractor.dedupe_keybindings(keybindings)
+
+    async def _consume(self, queue: asyncio.Queue, cpu_pool: Executor, results: Dict[int, List]):
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            order, file_path, content = item
+            results[order] = await loop.run_in_executor(cpu_pool, _extract, file_path, content)
+
+    async def _read_worktree(self, queue: asyncio.Queue):
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.io_concurrency)
+        threshold = getattr(self.extractor, 'mmap_threshold', 0)
+
+        async def read(order: int, file_path: str, io_pool: Executor):
+            # El semáforo se libera tras encolar: como mucho io_concurrency contenidos esperan a la cola
+            async with semaphore:
+                if threshold and os.path.getsize(file_path) >= threshold:
+                    content, file_hash = None, await loop.run_in_executor(io_pool, _hash_file, file_path)
+                else:
+                    content, file_hash = await loop.run_in_executor(io_pool, _read_text, file_path)
+                    if content is None:
+                        return
+                self.file_hashes[self.rel_path(file_path)] = file_hash
+                await queue.put((order, file_path, content))
+
+        with ThreadPoolExecutor(max_workers=self.io_concurrency) as io_pool:
+            await asyncio.gather(*(
+                read(order, file_path, io_pool)
+                for order, file_path in enumerate(self.extractor.find_lua_files())
+            ))
+
+    async def _git(self, *args: str) -> bytes:
+        proc = await asyncio.create_subprocess_exec(
+            'git', *args, cwd=self.extractor.repo_root,
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+        )
+        stdout, stderr = await proc.communicate()
+        if proc.returncode != 0:
+            raise GitSourceError(f"git {' '.join(args)}: {stderr.decode('utf-8', errors='replace').strip()}")
+        return stdout
+
+    async def resolve_revision(self, rev: str) -> str:
+        """sha del commit de `rev` (para la huella de las entradas)."""
+        return (await self._git('rev-parse', '--verify', f"{rev}^{{commit}}")).decode('ascii').strip()
+
+    async def _read_revision(self, rev: str, queue: asyncio.Queue):
+        """Lee los .lua de `rev` con un único git cat-file --batch.
+
+        Las peticiones se escriben desde otra tarea mientras se leen las respuestas, así
+        que ni git ni este proceso se bloquean con los pipes llenos; la cola acotada frena
+        la lectura de respuestas cuando el parseo va por detrás.
+        """
+        listing = await self._git('ls-tree', '-r', '-z', '--name-only', rev)
+        names = sorted(
+            (name for name in listing.decode('utf-8', errors='replace').split('\0')
+             if name.endswith('.lua') and self.extractor.is_scanned(name)),
+            key=lambda name: os.path.join(self.extractor.repo_root, name),
+        )
+        if not self.extractor.all_files:
+            names = await self._reachable_names(rev, names)
+        proc = await asyncio.create_subprocess_exec(
+            'git', 'cat-file', '--batch', cwd=self.extractor.repo_root,
+            stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE,
+        )
+
+        async def feed():
+            for name in names:
+                proc.stdin.write(f"{rev}:{name}\n".encode('utf-8'))
+                await proc.stdin.drain()
+            proc.stdin.close()
+
+        writer = asyncio.ensure_future(feed())
+        try:
+            for order, name in enumerate(names):
+                header = (await proc.stdout.readline()).split()
+                if len(header) != 3 or header[1] != b'blob':
+                    print(f"Aviso: {rev}:{name} no es un blob legible ({b' '.join(header).decode(errors='replace')})")
+                    continue
+                data = await proc.stdout.readexactly(int(header[2]) + 1)
+                blob = data[:-1]
+                self.file_hashes[name] = hashlib.sha256(blob).hexdigest()
+                file_path = os.path.join(self.extractor.repo_root, *name.split('/'))
+                await queue.put((order, file_path, blob.decode('utf-8', errors='replace')))
+            await writer
+            await proc.wait()
+        finally:
+            if proc.returncode is None:
+                writer.cancel()
+                try:
+                    proc.kill()
+                except ProcessLookupError:
+                    pass
+                await proc.wait()
+
+    async def _reachable_names(self, rev: str, names: List[str]) -> List[str]:
+        """Los nombres de `names` alcanzables desde init.lua según el contenido de la revisión."""
+        root = self.extractor.repo_root
+        file_paths = [os.path.join(root, *name.split('/')) for name in names]
+        reader = GitBlobReader(root, rev)
+        try:
+            loop = asyncio.get_running_loop()
+            self.graph = await loop.run_in_executor(None, self.extractor.module_graph_from, file_paths, reader.read)
+        finally:
+            reader.close()
+        return [name for name, file_path in zip(names, file_paths) if file_path in self.graph.reachable]
+
+    def ordered_hashes(self) -> List[Tuple[str, str]]:
+        """(ruta relativa, sha256) de lo leído, en el orden de find_lua_files."""
+        root = self.extractor.repo_root
+        return sorted(self.file_hashes.items(), key=lambda item: os.path.join(root, *item[0].split('/')))
+
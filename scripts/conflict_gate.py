@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Puerta de conflictos para CI: falla si aparece un conflicto de atajos nuevo.
+
+`update_keybindings.py --fail-on-conflicts` sólo extrae (con la caché por archivo
+de extraction_cache.py) y ejecuta el análisis de conflictos de
+generate_conflicts_section (KeybindingExtractor.find_conflicts), sin renderizar
+nada. Cada conflicto (misma tecla canónica, varias acciones en un modo) se compara
+con la línea base, un archivo de texto editable a mano:
+
+    # modo<TAB>tecla canónica
+    Normal	<Space>yg
+    Visual	p
+
+Los conflictos de la línea base son conocidos; los demás son nuevos y hacen que el
+comando salga con código 1. Las entradas de la línea base que ya no se dan se
+informan como obsoletas (no fallan). --update-conflicts-baseline reescribe el
+archivo con los conflictos actuales.
+
+La salida es JSON Lines: una línea por conflicto nuevo y por entrada obsoleta y una
+línea final de resumen, p.ej.
+    {"conflict": "new", "mode": "Normal", "key": "<leader>x", "canonical": "<Space>x", "actions": [...]}
+    {"status": "fail", "new": 1, "known": 2, "stale": 0, "files": 83, "cached": 82, "ms": 41.3}
+
+Este módulo no importa update_keybindings.
+"""
+
+import os
+import json
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+
+
+# Línea base por defecto, relativa a la raíz del repositorio
+DEFAULT_BASELINE = os.path.join('docs', 'keybinding-conflicts.txt')
+BASELINE_HEADER = (
+    "# Conflictos de atajos conocidos (update_keybindings.py --fail-on-conflicts).\n"
+    "# Una línea por conflicto: modo<TAB>tecla canónica. Regenerar con --update-conflicts-baseline.\n"
+)
+
+
+@dataclass
+class Conflict:
+    """Una tecla con varias acciones en un modo: acción mostrada -> ubicaciones (archivo, línea)."""
+    mode: str
+    key: str
+    canonical: str
+    actions: Dict[str, List[Tuple[str, int]]]
+
+    @property
+    def ident(self) -> Tuple[str, str]:
+        return (self.mode, self.canonical)
+
+    def to_json(self, status: str) -> Dict:
+        return {
+            'conflict': status,
+            'mode': self.mode,
+            'key': self.key,
+            'canonical': self.canonical,
+            'actions': [
+                {'action': action, 'locations': [f"{path}:{line}" for path, line in locations]}
+                for action, locations in self.actions.items()
+            ],
+        }
+
+
+def load_baseline(path: str) -> Optional[Set[Tuple[str, str]]]:
+    """(modo, tecla canónica) de la línea base; None si el archivo no existe."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return None
+    baseline: Set[Tuple[str, str]] = set()
+    for number, line in enumerate(lines, 1):
+        if not line.strip() or line.lstrip().startswith('#'):
+            continue
+        parts = line.split('\t')
+        if len(parts) != 2 or not parts[0] or not parts[1]:
+            print(f"Aviso: {path}:{number}: se esperaba 'modo<TAB>tecla', se ignora")
+            continue
+        baseline.add((parts[0], parts[1]))
+    return baseline
+
+
+def save_baseline(path: str, conflicts: List[Conflict]):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(BASELINE_HEADER)
+        for mode, canonical in sorted({c.ident for c in conflicts}):
+            f.write(f"{mode}\t{canonical}\n")
+
+
+@dataclass
+class GateResult:
+    new: List[Conflict]
+    known: List[Conflict]
+    stale: List[Tuple[str, str]]
+
+    @property
+    def failed(self) -> bool:
+        return bool(self.new)
+
+
+def evaluate(conflicts: List[Conflict], baseline: Set[Tuple[str, str]]) -> GateResult:
+    """Separa los conflictos en nuevos y conocidos; las entradas de la base sin conflicto son obsoletas."""
+    new = [c for c in conflicts if c.ident not in baseline]
+    known = [c for c in conflicts if c.ident in baseline]
+    present = {c.ident for c in conflicts}
+    return GateResult(new, known, sorted(baseline - present))
+
+
+def format_jsonl(result: GateResult, summary: Dict) -> str:
+    """Una línea JSON por conflicto nuevo y por entrada obsoleta, y el resumen al final."""
+    lines = [json.dumps(c.to_json('new'), ensure_ascii=False) for c in result.new]
+    lines.extend(
+        json.dumps({'conflict': 'stale', 'mode': mode, 'canonical': canonical}, ensure_ascii=False)
+        for mode, canonical in result.stale
+    )
+    status = {'status': 'fail' if result.failed else 'ok', 'new': len(result.new),
+              'known': len(result.known), 'stale': len(result.stale)}
+    status.update(summary)
+    lines.append(json.dumps(status, ensure_ascii=False))
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Caché por archivo de la extracción de keybindings.
+
+Guarda, por ruta relativa, el sha256 del contenido y los registros extraídos de ese
+archivo (antes de fusionar duplicados) en un JSON del directorio de caché
+($XDG_CACHE_HOME/nvim-keybindings o --cache-dir), como la caché de plugins. Un
+archivo cuyo hash coincide no se vuelve a extraer.
+
+Todo el archivo de caché pertenece a un ámbito (`scope`): la huella de lo que, además
+del propio archivo, influye en su extracción (SCRIPT_VERSION, motor, plugins
+escaneados y, con el motor ast, los hashes de todos los archivos, porque la tabla
+de símbolos resuelve alias entre módulos). Si el ámbito cambia se descarta entero.
+
+Los registros no dependen de dónde está el checkout: file_path se guarda relativo a
+la raíz del repositorio y quien lee la caché lo vuelve a anclar a la suya, así que
+dos worktrees (o CI) pueden compartir el mismo directorio de caché.
+
+Este módulo no importa update_keybindings: guarda y devuelve diccionarios.
+"""
+
+import os
+import json
+from typing import Dict, List, Optional, Set
+
+from plugin_keymaps import default_cache_dir
+
+# Versión del formato del archivo de caché (2: file_path relativo a la raíz del repositorio)
+CACHE_FORMAT = 2
+
+
+class ExtractionCache:
+    """Registros extraídos por archivo, válidos mientras coincidan el hash y el ámbito."""
+
+    def __init__(self, cache_dir: Optional[str] = None, name: str = 'extraction.json'):
+        self.cache_path = os.path.join(cache_dir or default_cache_dir(), name)
+        self.scope = ""
+        self.files: Dict[str, dict] = {}
+        self.seen: Set[str] = set()
+        self.hits = 0
+        self.dirty = False
+
+    def open(self, scope: str):
+        """Carga la caché del ámbito `scope` (vacía si no existe, no se puede leer o es de otro ámbito)."""
+        self.scope = scope
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        same = data.get('scope') == scope and data.get('format') == CACHE_FORMAT
+        self.files = data.get('files', {}) if same else {}
+        self.dirty = not self.files
+
+    def get(self, rel_path: str, digest: str) -> Optional[List[dict]]:
+        self.seen.add(rel_path)
+        entry = self.files.get(rel_path)
+        if entry is None or entry.get('sha256') != digest:
+            return None
+        self.hits += 1
+        return entry['keybindings']
+
+    def put(self, rel_path: str, digest: str, records: List[dict]):
+        self.seen.add(rel_path)
+        self.files[rel_path] = {'sha256': digest, 'keybindings': records}
+        self.dirty = True
+
+    def save(self):
+        """Escribe la caché si cambió, olvidando los archivos que ya no existen."""
+        for rel_path in list(self.files):
+            if rel_path not in self.seen:
+                del self.files[rel_path]
+                self.dirty = True
+        if not self.dirty:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            tmp_path = self.cache_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'format': CACHE_FORMAT, 'scope': self.scope, 'files': self.files}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.cache_path)
+            self.dirty = False
+        except OSError as e:
+            print(f"Aviso: no se pudo guardar la caché de extracción: {e}")
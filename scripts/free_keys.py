@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Buscador de secuencias de teclas libres por modo.
+
+A partir de los keybindings extraídos se construye, por modo, un trie de
+secuencias ocupadas, con los tokens canónicos de KeyCanonicalizer (<Space>,
+<C-x>, una letra...): <leader>, <Space> y ' ' son la misma tecla. Una secuencia
+candidata está libre si:
+- no es ya un atajo,
+- no es prefijo de otro atajo (provocaría la espera de timeoutlen), y
+- ningún atajo es prefijo suyo (quedaría tapada).
+
+Los grupos de which-key (group = '...') se insertan como nodos internos: no son
+atajos, pero su prefijo tampoco está libre.
+
+La enumeración recorre el trie desde el prefijo pedido y sólo desciende por
+grupos existentes, así que cada consulta cuesta O(nodos visitados × alfabeto).
+Los candidatos se ordenan por ergonomía: fila base del teclado, longitud,
+mayúsculas y cercanía a atajos relacionados (mismo grupo, inicial mnemotécnica).
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from key_canonical import KeyCanonicalizer
+
+
+DEFAULT_ALPHABET = "abcdefghijklmnopqrstuvwxyz"
+
+# Puntuación base por tecla (QWERTY): fila base > fila superior > fila inferior
+_ROW_SCORES = (
+    ("asdfghjkl;", 3.0),
+    ("qwertyuiop", 2.0),
+    ("zxcvbnm,./", 1.0),
+    ("1234567890", 0.5),
+)
+KEY_SCORES: Dict[str, float] = {ch: score for row, score in _ROW_SCORES for ch in row}
+SHIFT_PENALTY = 1.5
+LENGTH_PENALTY = 1.0
+RELATED_GROUP_BONUS = 2.0
+MNEMONIC_BONUS = 1.5
+
+@dataclass
+class TrieNode:
+    """Nodo del trie de secuencias: terminal si es un atajo, group si es un grupo which-key."""
+    children: Dict[str, 'TrieNode'] = field(default_factory=dict)
+    terminal: bool = False
+    group: str = ""
+
+
+class KeyTrie:
+    """Trie de secuencias ocupadas de un modo."""
+
+    def __init__(self):
+        self.root = TrieNode()
+
+    def insert(self, tokens: Tuple[str, ...], group: str = "") -> TrieNode:
+        node = self.root
+        for token in tokens:
+            node = node.children.setdefault(token, TrieNode())
+        if group:
+            node.group = group.strip()
+        else:
+            node.terminal = True
+        return node
+
+    def find(self, tokens: Tuple[str, ...]) -> Optional[TrieNode]:
+        node = self.root
+        for token in tokens:
+            node = node.children.get(token)
+            if node is None:
+                return None
+        return node
+
+    def conflict(self, tokens: Tuple[str, ...]) -> str:
+        """'' si la secuencia está libre; si no, el motivo del conflicto."""
+        node = self.root
+        for depth, token in enumerate(tokens):
+            if node.terminal and depth > 0:
+                return f"tapada por {''.join(tokens[:depth])}"
+            node = node.children.get(token)
+            if node is None:
+                return ""
+        if node.terminal:
+            return "ya asignada"
+        return "prefijo de otros atajos"
+
+
+@dataclass
+class FreeKey:
+    """Secuencia libre candidata con su puntuación y los motivos."""
+    mode: str
+    tokens: Tuple[str, ...]
+    score: float
+    key: str
+    group: str = ""
+    reasons: List[str] = field(default_factory=list)
+
+
+class FreeKeyFinder:
+    """Construye un trie por modo y enumera/ordena las secuencias libres."""
+
+    def __init__(self, keybindings: Iterable, canonicalizer: Optional[KeyCanonicalizer] = None,
+                 group_context: str = 'which-key-group'):
+        self.canonicalizer = canonicalizer or KeyCanonicalizer()
+        self.tries: Dict[str, KeyTrie] = {}
+        self.bindings: Dict[str, List[Tuple[Tuple[str, ...], str]]] = {}
+        for kb in keybindings:
+            is_group = kb.context == group_context
+            for mode in kb.modes or ['Normal']:
+                trie = self.tries.setdefault(mode, KeyTrie())
+                tokens = self.canonicalizer.tokens(kb.key)
+                if not tokens:
+                    continue
+                trie.insert(tokens, group=(kb.description or kb.action or kb.key) if is_group else "")
+                if not is_group:
+                    self.bindings.setdefault(mode, []).append((tokens, f"{kb.description} {kb.action}".lower()))
+
+    def related_prefixes(self, mode: str, related: str) -> Dict[Tuple[str, ...], int]:
+        """Prefijos (secuencia sin la última tecla) de los atajos cuya descripción contiene `related`."""
+        prefixes: Dict[Tuple[str, ...], int] = {}
+        needle = related.lower()
+        for tokens, text in self.bindings.get(mode, []):
+            if needle in text and len(tokens) > 1:
+                prefixes[tokens[:-1]] = prefixes.get(tokens[:-1], 0) + 1
+        return prefixes
+
+    def score(self, prefix_len: int, tokens: Tuple[str, ...], related_prefixes: Dict[Tuple[str, ...], int],
+              mnemonics: str) -> Tuple[float, List[str]]:
+        suffix = tokens[prefix_len:]
+        reasons: List[str] = []
+        key_score = 0.0
+        for token in suffix:
+            if token in KEY_SCORES:
+                key_score += KEY_SCORES[token]
+            elif len(token) == 1 and token.lower() in KEY_SCORES:
+                key_score += KEY_SCORES[token.lower()] - SHIFT_PENALTY
+                reasons.append("mayúscula")
+        score = key_score / len(suffix) - LENGTH_PENALTY * (len(suffix) - 1)
+        if all(tok in "asdfghjkl;" for tok in suffix):
+            reasons.append("fila base")
+        if tokens[:-1] in related_prefixes:
+            score += RELATED_GROUP_BONUS
+            reasons.append("mismo grupo que atajos relacionados")
+        if mnemonics and suffix[-1].lower() in mnemonics:
+            score += MNEMONIC_BONUS
+            reasons.append("inicial mnemotécnica")
+        return score, reasons
+
+    def find(self, mode: str, prefix: str = '<leader>', alphabet: str = DEFAULT_ALPHABET,
+             depth: int = 2, related: str = "") -> List[FreeKey]:
+        """Secuencias libres bajo `prefix` de hasta `depth` teclas, de mejor a peor puntuación.
+
+        Sólo se desciende por nodos que son grupos/prefijos existentes: una tecla libre
+        no genera candidatos más largos (se propondría la corta).
+        """
+        trie = self.tries.get(mode, KeyTrie())
+        prefix_tokens = self.canonicalizer.tokens(prefix)
+        reason = trie.conflict(prefix_tokens) if prefix_tokens else ""
+        if reason and reason != "prefijo de otros atajos":
+            return []
+        start = trie.find(prefix_tokens) or TrieNode()
+        alphabet_tokens = list(dict.fromkeys(self.canonicalizer.tokens(alphabet)))
+        related_prefixes = self.related_prefixes(mode, related) if related else {}
+        mnemonics = ''.join(word[0] for word in related.lower().split()) if related else ""
+
+        results: List[FreeKey] = []
+        stack: List[Tuple[TrieNode, Tuple[str, ...], str]] = [(start, prefix_tokens, start.group)]
+        while stack:
+            node, tokens, group = stack.pop()
+            for token in alphabet_tokens:
+                candidate = tokens + (token,)
+                child = node.children.get(token)
+                if child is None:
+                    score, reasons = self.score(len(prefix_tokens), candidate, related_prefixes, mnemonics)
+                    results.append(FreeKey(mode, candidate, round(score, 2), self.canonicalizer.display(candidate),
+                                           group, reasons))
+                elif not child.terminal and len(candidate) - len(prefix_tokens) < depth:
+                    stack.append((child, candidate, child.group or group))
+        results.sort(key=lambda fk: (-fk.score, len(fk.tokens), fk.key))
+        return results
+
+
+def format_report(results: Dict[str, List[FreeKey]], prefix: str, limit: int) -> str:
+    """Tabla markdown con los mejores candidatos de cada modo."""
+    out: List[str] = []
+    for mode, free in results.items():
+        out.append(f"### Libres en modo {mode} bajo {prefix} ({len(free)} candidatos)\n\n")
+        if not free:
+            out.append("(sin candidatos)\n\n")
+            continue
+        out.append("| Secuencia | Puntuación | Grupo | Motivos |\n")
+        out.append("|-----------|-----------:|-------|---------|\n")
+        for fk in free[:limit]:
+            out.append(f"| `{fk.key}` | {fk.score:.2f} | {fk.group or '—'} | {', '.join(fk.reasons) or '—'} |\n")
+        out.append("\n")
+    return ''.join(out)
@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+Auditoría estática de callbacks "calientes": autocmds y componentes de lualine.
+
+El lag del editor casi nunca viene de los atajos sino de código que se ejecuta
+solo y a menudo: callbacks de autocmds en eventos frecuentes (CursorMoved,
+BufEnter, BufWritePre...) y funciones de componentes de la barra de estado, que
+lualine vuelve a evaluar en cada refresco. HotCallbackAuditor indexa sobre la
+tabla de símbolos del repositorio (lua_symbols.SymbolIndex):
+
+- cada `vim.api.nvim_create_autocmd(eventos, { pattern, callback | command })`,
+  con el callback resuelto aunque sea un nombre o un miembro de otro módulo;
+- cada componente de `require('lualine').setup({...})` (sections, tabline,
+  winbar...): su función, y las funciones de cond, color y fmt, incluidos los
+  componentes devueltos por funciones auxiliares (`mode()`).
+
+En el cuerpo de cada callback (y en las funciones del repo a las que llama,
+transitivamente) busca llamadas bloqueantes de BLOCKING_CALLS. Las funciones
+anidadas no se recorren: se ejecutan más tarde, no al disparar el callback.
+Cada hallazgo lleva archivo:línea, la clase de frecuencia del disparo y una
+severidad (coste de la llamada × frecuencia). Una llamada dentro de un `if` que
+consulta el reloj (os.time, vim.loop.now...) se considera limitada y baja un
+nivel.
+
+Este módulo no importa update_keybindings.
+"""
+
+import os
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+import lua_ast
+from lua_symbols import SymbolIndex
+from options_lint import OptionModel
+
+
+# Clases de frecuencia de disparo, de menor a mayor, con su peso
+FREQUENCY_CLASSES = {'raro': 1, 'buffer': 2, 'tecla': 3, 'redibujado': 4}
+FREQUENCY_LABELS = {
+    'raro': "ocasional (arranque, redimensionado, acciones puntuales)",
+    'buffer': "por buffer/ventana/guardado/foco",
+    'tecla': "por tecla o movimiento del cursor",
+    'redibujado': "en cada refresco de la barra de estado",
+}
+
+# Eventos de autocmd -> clase de frecuencia (los no listados son 'raro')
+EVENT_FREQUENCY = {
+    **dict.fromkeys((
+        'CursorMoved', 'CursorMovedI', 'TextChanged', 'TextChangedI', 'TextChangedP', 'TextChangedT',
+        'InsertCharPre', 'WinScrolled', 'ModeChanged', 'SafeState', 'CmdlineChanged', 'CompleteChanged',
+    ), 'tecla'),
+    **dict.fromkeys((
+        'BufEnter', 'BufLeave', 'BufWinEnter', 'BufWinLeave', 'WinEnter', 'WinLeave', 'WinNew',
+        'BufRead', 'BufReadPre', 'BufReadPost', 'BufNewFile', 'BufWritePre', 'BufWritePost', 'BufWrite',
+        'FileType', 'FocusGained', 'FocusLost', 'InsertEnter', 'InsertLeave', 'TermEnter', 'TermLeave',
+        'CmdlineEnter', 'CmdlineLeave', 'LspAttach', 'DiagnosticChanged', 'CursorHold', 'CursorHoldI',
+    ), 'buffer'),
+}
+# CursorHold salta `updatetime` ms después de cada pausa: con valores bajos es casi por tecla
+CURSORHOLD_EVENTS = ('CursorHold', 'CursorHoldI')
+HOT_UPDATETIME = 300
+
+# Llamadas bloqueantes -> (clase de coste, peso)
+BLOCKING_CALLS = {
+    **dict.fromkeys(('vim.fn.system', 'vim.fn.systemlist', 'io.popen', 'os.execute', 'vim.fn.jobwait',
+                     'vim.system():wait', ':!'), ('proceso externo', 3)),
+    'vim.lsp.buf.format': ('petición LSP síncrona', 3),
+    **dict.fromkeys(('vim.fn.finddir', 'vim.fn.findfile', 'vim.fn.glob', 'vim.fn.globpath', 'vim.fn.readfile',
+                     'vim.fn.writefile', 'io.open', 'io.lines'), ('sistema de archivos', 2)),
+    'vim.fn.expand': ('expansión de rutas', 1),
+}
+# Funciones de reloj que indican una llamada limitada en el tiempo (throttling)
+CLOCK_CALLS = frozenset({'os.time', 'os.clock', 'vim.loop.now', 'vim.uv.now', 'vim.loop.hrtime', 'vim.uv.hrtime',
+                         'vim.fn.reltime', 'vim.fn.localtime'})
+# Secciones de lualine.setup cuyos componentes se evalúan en cada refresco
+LUALINE_BARS = ('sections', 'inactive_sections', 'tabline', 'winbar', 'inactive_winbar')
+LUALINE_FUNCTION_FIELDS = ('cond', 'color', 'fmt')
+SEVERITY_LEVELS = (('alta', 8), ('media', 4), ('baja', 0))
+# Profundidad máxima al seguir llamadas a funciones del repositorio
+MAX_CALL_DEPTH = 4
+
+
+@dataclass
+class HotCallback:
+    """Función que se ejecuta sola: callback de autocmd o función de un componente de lualine."""
+    kind: str
+    label: str
+    file_path: str
+    line: int
+    frequency: str
+    events: List[str] = field(default_factory=list)
+    patterns: List[str] = field(default_factory=list)
+    func: Optional[lua_ast.Function] = field(default=None, repr=False)
+    func_file: str = ""
+    command: Optional[str] = None
+
+
+@dataclass
+class Finding:
+    """Llamada bloqueante dentro de un callback caliente."""
+    callback: HotCallback
+    call: str
+    cost: str
+    file_path: str
+    line: int
+    throttled: bool = False
+    via: List[str] = field(default_factory=list)
+
+    @property
+    def score(self) -> int:
+        score = BLOCKING_CALLS[self.call][1] * FREQUENCY_CLASSES[self.callback.frequency]
+        return score // 2 if self.throttled else score
+
+    @property
+    def severity(self) -> str:
+        return next(name for name, minimum in SEVERITY_LEVELS if self.score >= minimum)
+
+
+def _walk(node: lua_ast.Node) -> Iterator[lua_ast.Node]:
+    """Nodos bajo `node` sin entrar en funciones anidadas."""
+    stack = list(reversed(list(lua_ast.iter_children(node))))
+    while stack:
+        current = stack.pop()
+        yield current
+        if not isinstance(current, lua_ast.Function):
+            stack.extend(reversed(list(lua_ast.iter_children(current))))
+
+
+def _iter_all(node: lua_ast.Node) -> Iterator[lua_ast.Node]:
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        yield current
+        stack.extend(reversed(list(lua_ast.iter_children(current))))
+
+
+class HotCallbackAuditor:
+    """Indexa autocmds y componentes de lualine y busca llamadas bloqueantes en sus callbacks."""
+
+    def __init__(self, symbols: SymbolIndex, updatetime: Optional[int] = None):
+        self.symbols = symbols
+        self.updatetime = updatetime if updatetime is not None else OptionModel(symbols).value('updatetime')
+        self.callbacks: List[HotCallback] = []
+
+    @classmethod
+    def from_files(cls, repo_root: str, file_paths: List[str]) -> 'HotCallbackAuditor':
+        return cls(SymbolIndex.build(repo_root, file_paths))
+
+    def rel(self, file_path: str) -> str:
+        return os.path.relpath(file_path, self.symbols.repo_root) if self.symbols.repo_root else file_path
+
+    # ----- índice de callbacks -----
+    def index(self) -> List[HotCallback]:
+        self.callbacks = []
+        for file_path, file_symbols in self.symbols.files.items():
+            for node in _iter_all(file_symbols.tree):
+                if not isinstance(node, lua_ast.Call):
+                    continue
+                name = self._call_name(file_path, node)
+                if name == 'vim.api.nvim_create_autocmd':
+                    self._autocmd(file_path, node)
+                elif self._is_setup(node.func) and self._is_lualine(file_path, node.func):
+                    self._lualine(file_path, node)
+        self.callbacks.sort(key=lambda cb: (cb.file_path, cb.line))
+        return self.callbacks
+
+    def _call_name(self, file_path: str, call: lua_ast.Call) -> Optional[str]:
+        """Nombre de la función llamada, siguiendo alias locales (`local autocmd = vim.api.nvim_create_autocmd`)."""
+        name = lua_ast.dotted_name(call.func)
+        if isinstance(call.func, lua_ast.Name):
+            _file, target, _env = self.symbols.resolve(file_path, call.func)
+            name = lua_ast.dotted_name(target) or name
+        return name
+
+    @staticmethod
+    def _is_setup(func: lua_ast.Node) -> bool:
+        """`x.setup` con cualquier objeto, también `require('lualine').setup` (sin nombre punteado)."""
+        return isinstance(func, lua_ast.Index) and func.dotted and lua_ast.string_value(func.key) == 'setup'
+
+    def _is_lualine(self, file_path: str, func: lua_ast.Node) -> bool:
+        if not isinstance(func, lua_ast.Index):
+            return False
+        _file, target, _env = self.symbols.resolve(file_path, func.obj)
+        return (isinstance(target, lua_ast.Call) and lua_ast.dotted_name(target.func) == 'require'
+                and bool(target.args) and lua_ast.string_value(target.args[0]) == 'lualine')
+
+    def event_frequency(self, event: str) -> str:
+        if event in CURSORHOLD_EVENTS and self.updatetime is not None and self.updatetime <= HOT_UPDATETIME:
+            return 'tecla'
+        return EVENT_FREQUENCY.get(event, 'raro')
+
+    def _strings(self, file_path: str, node: Optional[lua_ast.Node]) -> List[str]:
+        ref_file, target, env = self.symbols.resolve(file_path, node)
+        if isinstance(target, lua_ast.Table):
+            values = [self.symbols.string(ref_file, v, env) for v in lua_ast.positional_values(target)]
+            return [v for v in values if v]
+        value = self.symbols.string(ref_file, target, env)
+        return [value] if value else []
+
+    def _autocmd(self, file_path: str, call: lua_ast.Call):
+        if not call.args:
+            return
+        events = self._strings(file_path, call.args[0])
+        opts_file, opts, opts_env = self.symbols.table(file_path, call.args[1] if len(call.args) > 1 else None)
+        patterns = self._strings(opts_file, lua_ast.table_field(opts, 'pattern'))
+        frequency = max((self.event_frequency(e) for e in events), key=FREQUENCY_CLASSES.get, default='raro')
+        # Un patrón concreto (no '*') restringe los disparos: baja un nivel
+        if patterns and '*' not in patterns and frequency != 'raro':
+            frequency = list(FREQUENCY_CLASSES)[FREQUENCY_CLASSES[frequency] - 2]
+        group = self._group_name(opts_file, lua_ast.table_field(opts, 'group'), opts_env)
+        callback = HotCallback(
+            kind='autocmd', label=f"{','.join(events) or '?'}" + (f" [{group}]" if group else ""),
+            file_path=file_path, line=call.line, frequency=frequency, events=events, patterns=patterns,
+        )
+        func_file, func, _env = self.symbols.resolve(opts_file, lua_ast.table_field(opts, 'callback'), opts_env)
+        if isinstance(func, lua_ast.Function):
+            callback.func, callback.func_file = func, func_file
+        callback.command = self.symbols.string(opts_file, lua_ast.table_field(opts, 'command'), opts_env)
+        self.callbacks.append(callback)
+
+    def _group_name(self, file_path: str, node: Optional[lua_ast.Node], env) -> Optional[str]:
+        """Nombre del grupo: string o primer argumento string de la llamada que lo crea (`augroup('x')`)."""
+        if isinstance(node, lua_ast.Call) and node.args:
+            return self.symbols.string(file_path, node.args[0], env)
+        return self.symbols.string(file_path, node, env)
+
+    def _lualine(self, file_path: str, call: lua_ast.Call):
+        _file, config, _env = self.symbols.table(file_path, call.args[0] if call.args else None)
+        for bar in LUALINE_BARS:
+            bar_file, sections, _env = self.symbols.table(file_path, lua_ast.table_field(config, bar))
+            if sections is None:
+                continue
+            for section in sections.fields:
+                if not section.name.startswith('lualine_') or not isinstance(section.value, lua_ast.Table):
+                    continue
+                for component in lua_ast.positional_values(section.value):
+                    hint = lua_ast.dotted_name(component.func if isinstance(component, lua_ast.Call) else component)
+                    for comp_file, comp in self._components(bar_file, component):
+                        self._component(comp_file, comp, f"{bar}.{section.name}", hint)
+
+    def _components(self, file_path: str, node: lua_ast.Node) -> List[Tuple[str, lua_ast.Node]]:
+        """Componente (tabla, función o nombre); una llamada `mode()` se sustituye por lo que devuelve."""
+        ref_file, target, _env = self.symbols.resolve(file_path, node)
+        if isinstance(target, lua_ast.Call):
+            func_file, func, _env = self.symbols.resolve(ref_file, target.func)
+            if isinstance(func, lua_ast.Function):
+                return [(func_file, value) for stmt in _walk(func) if isinstance(stmt, lua_ast.Return)
+                        for value in stmt.values]
+            return []
+        return [(ref_file, target)] if target is not None else []
+
+    def _component(self, file_path: str, component: lua_ast.Node, section: str, hint: Optional[str]):
+        """Funciones de un componente; `hint` es el nombre de la variable que lo contiene (tdo, filesize...)."""
+        if isinstance(component, lua_ast.Function):
+            self._add_component(file_path, component, f"{section} {hint or 'función'}")
+            return
+        if not isinstance(component, lua_ast.Table):
+            return
+        values = lua_ast.positional_values(component)
+        name = hint or (lua_ast.string_value(values[0]) if values else None) or 'función'
+        if values and isinstance(values[0], lua_ast.Function):
+            self._add_component(file_path, values[0], f"{section} {name}")
+        for field_name in LUALINE_FUNCTION_FIELDS:
+            for func_file, func in self._functions(file_path, lua_ast.table_field(component, field_name)):
+                self._add_component(func_file, func, f"{section} {name}.{field_name}")
+
+    def _functions(self, file_path: str, node: Optional[lua_ast.Node]) -> List[Tuple[str, lua_ast.Function]]:
+        """Función a la que evalúa una expresión; `a and b` vale b y `a or b` vale a (las funciones son verdaderas)."""
+        if isinstance(node, lua_ast.Paren):
+            return self._functions(file_path, node.expr)
+        if isinstance(node, lua_ast.BinOp) and node.op in ('and', 'or'):
+            return self._functions(file_path, node.right if node.op == 'and' else node.left)
+        ref_file, target, _env = self.symbols.resolve(file_path, node)
+        return [(ref_file, target)] if isinstance(target, lua_ast.Function) else []
+
+    def _add_component(self, file_path: str, func: lua_ast.Function, label: str):
+        self.callbacks.append(HotCallback(
+            kind='lualine', label=label, file_path=file_path, line=func.line,
+            frequency='redibujado', func=func, func_file=file_path,
+        ))
+
+    # ----- auditoría -----
+    def audit(self) -> List[Finding]:
+        """Llamadas bloqueantes en todos los callbacks, de mayor a menor severidad."""
+        if not self.callbacks:
+            self.index()
+        findings: List[Finding] = []
+        seen: Set[Tuple[int, str, int]] = set()
+        for callback in self.callbacks:
+            if callback.command and callback.command.lstrip().startswith(('!', 'silent !', 'silent!!')):
+                findings.append(Finding(callback, ':!', BLOCKING_CALLS[':!'][0],
+                                        callback.file_path, callback.line))
+            if callback.func is None:
+                continue
+            for finding in self._scan(callback, callback.func_file, callback.func, [], set(), False):
+                key = (id(callback), finding.file_path, finding.line)
+                if key not in seen:
+                    seen.add(key)
+                    findings.append(finding)
+        findings.sort(key=lambda f: (-f.score, self.rel(f.file_path), f.line))
+        return findings
+
+    def _scan(self, callback: HotCallback, file_path: str, func: lua_ast.Function, via: List[str],
+              visited: Set[int], throttled: bool) -> Iterator[Finding]:
+        if id(func) in visited or len(via) > MAX_CALL_DEPTH:
+            return
+        visited.add(id(func))
+        for statement in func.body:
+            yield from self._visit(callback, file_path, statement, via, visited, throttled)
+
+    def _visit(self, callback: HotCallback, file_path: str, node: lua_ast.Node, via: List[str],
+               visited: Set[int], throttled: bool) -> Iterator[Finding]:
+        if isinstance(node, lua_ast.Function):
+            return
+        if isinstance(node, lua_ast.If):
+            for test, body in node.tests:
+                yield from self._visit(callback, file_path, test, via, visited, throttled)
+                guarded = throttled or self._reads_clock(test)
+                for statement in body:
+                    yield from self._visit(callback, file_path, statement, via, visited, guarded)
+            for statement in node.orelse:
+                yield from self._visit(callback, file_path, statement, via, visited, throttled)
+            return
+        call = self._blocking(file_path, node)
+        if call is not None:
+            yield Finding(callback, call, BLOCKING_CALLS[call][0], file_path, node.line, throttled, list(via))
+        elif isinstance(node, lua_ast.Call) and not isinstance(node.func, lua_ast.Function):
+            func_file, func, _env = self.symbols.resolve(file_path, node.func)
+            if isinstance(func, lua_ast.Function):
+                step = f"{lua_ast.dotted_name(node.func) or 'función'} ({self.rel(func_file)}:{func.line})"
+                yield from self._scan(callback, func_file, func, via + [step], visited, throttled)
+        for child in lua_ast.iter_children(node):
+            yield from self._visit(callback, file_path, child, via, visited, throttled)
+
+    def _blocking(self, file_path: str, node: lua_ast.Node) -> Optional[str]:
+        if isinstance(node, lua_ast.MethodCall) and node.method == 'wait' and isinstance(node.obj, lua_ast.Call) \
+                and lua_ast.dotted_name(node.obj.func) == 'vim.system':
+            return 'vim.system():wait'
+        if not isinstance(node, lua_ast.Call):
+            return None
+        name = self._call_name(file_path, node)
+        if name not in BLOCKING_CALLS:
+            return None
+        if name == 'vim.lsp.buf.format':
+            _file, opts, _env = self.symbols.table(file_path, node.args[0] if node.args else None)
+            asynchronous = lua_ast.table_field(opts, 'async')
+            if isinstance(asynchronous, lua_ast.Boolean) and asynchronous.value:
+                return None
+        return name
+
+    @staticmethod
+    def _reads_clock(test: lua_ast.Node) -> bool:
+        return any(isinstance(n, lua_ast.Call) and lua_ast.dotted_name(n.func) in CLOCK_CALLS
+                   for n in [test, *_iter_all(test)])
+
+
+def format_report(auditor: HotCallbackAuditor, findings: List[Finding]) -> str:
+    """Informe markdown: hallazgos por severidad y resumen de callbacks por frecuencia."""
+    out = [f"### Callbacks calientes ({len(auditor.callbacks)} indexados"]
+    if auditor.updatetime is not None:
+        out.append(f", updatetime = {auditor.updatetime} ms")
+    out.append(")\n\n")
+    for frequency in sorted(FREQUENCY_CLASSES, key=FREQUENCY_CLASSES.get, reverse=True):
+        count = sum(1 for cb in auditor.callbacks if cb.frequency == frequency)
+        if count:
+            out.append(f"- **{frequency}**: {count} — {FREQUENCY_LABELS[frequency]}\n")
+    out.append("\n")
+    if not findings:
+        out.append("✅ Ninguna llamada bloqueante en callbacks calientes\n")
+        return ''.join(out)
+    out.append("| Severidad | Ubicación | Llamada | Coste | Callback | Frecuencia |\n")
+    out.append("|-----------|-----------|---------|-------|----------|------------|\n")
+    for finding in findings:
+        callback = finding.callback
+        location = f"{auditor.rel(finding.file_path)}:{finding.line}"
+        source = f"{callback.label} ({auditor.rel(callback.file_path)}:{callback.line})"
+        if finding.via:
+            source += " vía " + " → ".join(finding.via)
+        cost = finding.cost + (" (limitada por reloj)" if finding.throttled else "")
+        out.append(f"| {finding.severity} | {location} | `{finding.call}` | {cost} | {source} | "
+                   f"{callback.frequency} |\n")
+    return ''.join(out)
+
+
+def report_json(auditor: HotCallbackAuditor, findings: List[Finding]) -> Dict:
+    return {
+        'updatetime': auditor.updatetime,
+        'callbacks': [
+            {'kind': cb.kind, 'label': cb.label, 'file': auditor.rel(cb.file_path), 'line': cb.line,
+             'frequency': cb.frequency, 'events': cb.events, 'patterns': cb.patterns}
+            for cb in auditor.callbacks
+        ],
+        'findings': [
+            {'severity': f.severity, 'score': f.score, 'call': f.call, 'cost': f.cost,
+             'file': auditor.rel(f.file_path), 'line': f.line, 'throttled': f.throttled, 'via': f.via,
+             'callback': {'kind': f.callback.kind, 'label': f.callback.label,
+                          'file': auditor.rel(f.callback.file_path), 'line': f.callback.line,
+                          'frequency': f.callback.frequency}}
+            for f in findings
+        ],
+    }
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Forma canónica de secuencias de teclas de Neovim.
+
+La misma pulsación se escribe de muchas maneras en la configuración: <C-d>,
+<c-d> o <Ctrl-d>; <CR>, <cr> o <Enter>; <leader>, <localleader> o el valor real
+de vim.g.mapleader. KeyCanonicalizer tokeniza la secuencia y normaliza cada token:
+
+- modificadores con alias (C/Ctrl/Control, M/A/Alt/Meta, S/Shift, D/Cmd) en orden fijo;
+- <C-x> no distingue mayúsculas (como en la terminal) y <S-x> equivale a X;
+- nombres especiales con su grafía canónica (<CR>, <Esc>, <Space>, <BS>, <F1>...);
+- <leader>/<localleader> se sustituyen por sus valores leídos de lua/core/keys.lua.
+
+Dos keybindings con la misma clave canónica son la misma pulsación.
+"""
+
+import os
+import re
+from typing import Dict, List, Tuple
+
+
+# Valor por defecto de mapleader/maplocalleader en Neovim
+DEFAULT_LEADER = '\\'
+
+_TOKEN_RE = re.compile(r"<[^<>\s]+>|.", re.DOTALL)
+_LEADER_RE = re.compile(r"vim\.g\.(mapleader|maplocalleader)\s*=\s*(['\"])(.*?)\2")
+
+_MODIFIERS = {
+    'c': 'C', 'ctrl': 'C', 'control': 'C',
+    'm': 'M', 'a': 'M', 'alt': 'M', 'meta': 'M',
+    's': 'S', 'shift': 'S',
+    'd': 'D', 'cmd': 'D', 'super': 'D',
+}
+_MODIFIER_ORDER = 'CMSD'
+
+_SPECIAL_NAMES = {
+    'cr': '<CR>', 'enter': '<CR>', 'return': '<CR>',
+    'esc': '<Esc>', 'escape': '<Esc>',
+    'space': '<Space>', 'tab': '<Tab>',
+    'bs': '<BS>', 'backspace': '<BS>',
+    'del': '<Del>', 'delete': '<Del>', 'insert': '<Insert>',
+    'up': '<Up>', 'down': '<Down>', 'left': '<Left>', 'right': '<Right>',
+    'home': '<Home>', 'end': '<End>', 'pageup': '<PageUp>', 'pagedown': '<PageDown>',
+    'nop': '<Nop>', 'plug': '<Plug>', 'nl': '<NL>',
+    'bar': '|', 'bslash': '\\', 'lt': '<',
+}
+# Teclas sin <...> que equivalen a un nombre especial
+_CHAR_NAMES = {' ': '<Space>', '\t': '<Tab>', '\r': '<CR>', '\n': '<NL>'}
+
+
+class KeyCanonicalizer:
+    """Normaliza secuencias de teclas resolviendo <leader>/<localleader>."""
+
+    def __init__(self, leader: str = DEFAULT_LEADER, localleader: str = DEFAULT_LEADER):
+        self.leader = leader
+        self.localleader = localleader
+        self._leader_tokens = self._literal_tokens(leader)
+        self._localleader_tokens = self._literal_tokens(localleader)
+        self._cache: Dict[str, str] = {}
+
+    @classmethod
+    def from_config(cls, repo_root: str, config_file: str = os.path.join('lua', 'core', 'keys.lua')) -> 'KeyCanonicalizer':
+        """Lee vim.g.mapleader / vim.g.maplocalleader del archivo de configuración."""
+        values = {'mapleader': DEFAULT_LEADER, 'maplocalleader': DEFAULT_LEADER}
+        try:
+            with open(os.path.join(repo_root, config_file), 'r', encoding='utf-8') as f:
+                content = f.read()
+        except OSError:
+            content = ""
+        for match in _LEADER_RE.finditer(content):
+            values[match.group(1)] = match.group(3)
+        return cls(values['mapleader'], values['maplocalleader'])
+
+    def _literal_tokens(self, value: str) -> List[str]:
+        # El valor de mapleader puede ser un carácter (' ') o una notación (<Space>)
+        return [self.normalize_token(tok) for tok in _TOKEN_RE.findall(value)] or ['\\']
+
+    @staticmethod
+    def normalize_token(token: str) -> str:
+        """Forma canónica de un único token (sin resolver <leader>)."""
+        if len(token) == 1:
+            return _CHAR_NAMES.get(token, token)
+        inner = token[1:-1]
+        if inner.endswith('-') and len(inner) > 1:
+            mods_part, key = inner[:-2], '-'
+        else:
+            mods_part, _, key = inner.rpartition('-')
+        mods = []
+        for mod in (mods_part.split('-') if mods_part else []):
+            canonical = _MODIFIERS.get(mod.lower())
+            if canonical is None:
+                # No es un modificador conocido (p.ej. <Plug>(foo-bar)): conservar tal cual
+                return token
+            if canonical not in mods:
+                mods.append(canonical)
+        name = _SPECIAL_NAMES.get(key.lower())
+        if name is None:
+            if re.fullmatch(r"[fF]\d{1,2}", key):
+                name = f"<{key.upper()}>"
+            elif len(key) == 1:
+                name = key
+            elif key.lower() in ('leader', 'localleader'):
+                name = f"<{key.lower()}>"
+            else:
+                name = f"<{key}>"
+        if not mods:
+            return name
+        if len(name) == 1:
+            if 'C' in mods:
+                name = name.lower()
+            if mods == ['S'] and name.isalpha():
+                return name.upper()
+        mods.sort(key=_MODIFIER_ORDER.index)
+        bare = name[1:-1] if len(name) > 2 and name.startswith('<') else name
+        return f"<{'-'.join(mods)}-{bare}>"
+
+    def tokens(self, key: str) -> Tuple[str, ...]:
+        """Tokens canónicos de una secuencia, con <leader>/<localleader> resueltos."""
+        out: List[str] = []
+        for raw in _TOKEN_RE.findall(key):
+            token = self.normalize_token(raw)
+            if token == '<leader>':
+                out.extend(self._leader_tokens)
+            elif token == '<localleader>':
+                out.extend(self._localleader_tokens)
+            else:
+                out.append(token)
+        return tuple(out)
+
+    def canonical(self, key: str) -> str:
+        """Clave canónica (cadena) de una secuencia; memoizada."""
+        cached = self._cache.get(key)
+        if cached is None:
+            cached = ''.join(self.tokens(key))
+            self._cache[key] = cached
+        return cached
+
+    def display(self, tokens: Tuple[str, ...]) -> str:
+        """Secuencia legible: el valor del líder al inicio se muestra como <leader>."""
+        n = len(self._leader_tokens)
+        if tuple(tokens[:n]) == tuple(self._leader_tokens):
+            return '<leader>' + ''.join(tokens[n:])
+        return ''.join(tokens)
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Tabla columnar de keybindings compartida por todos los renderizadores.
+
+Cada salida (markdown, HTML, JSON, Lua, páginas) agrupa los mismos atajos por
+archivo, categoría, modo o clave canónica y los ordena por `key.lower()`. Con
+KeybindingTable la extracción se convierte una sola vez en columnas (una lista
+por campo, indexadas por número de fila):
+
+- teclas y rutas internadas (sys.intern), modos como tuplas compartidas;
+- clave canónica, acción mostrada ("⚠️ Sin descripción" si falta) y `rank`, la
+  posición de la fila en el orden estable por tecla en minúsculas: ordenar
+  cualquier subconjunto por tecla es ordenar enteros, con el mismo desempate
+  (orden de aparición) que sorted(..., key=lambda k: k.lower());
+- columnas perezosas: categoría, tecla formateada con <kbd> y chips de modos.
+
+Una tabla es una secuencia de Keybinding (el código que itera listas sigue
+funcionando) y una vista (`view`) es la misma tabla restringida a unas filas, en
+su orden original. Los índices por archivo, categoría, modo y clave canónica de
+cada vista se construyen al pedirlos y se guardan: todos los renderizadores comparten los de la
+tabla completa. Las columnas e índices se calculan completos y luego se asignan,
+así que varios hilos renderizando a la vez (write_outputs) no ven estados a medias.
+
+Para enviar una vista a otro proceso (--render-workers) se serializan sólo sus
+filas, con las columnas perezosas ya calculadas.
+"""
+
+import os
+import sys
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+# Acción mostrada cuando un atajo no tiene descripción ni acción distinta de la tecla
+MISSING_DESCRIPTION = "⚠️ Sin descripción"
+
+
+def action_display(kb) -> str:
+    """Descripción o, si falta, la acción; MISSING_DESCRIPTION si no hay ninguna útil."""
+    display = kb.description if kb.description else kb.action
+    if not display or display == kb.key:
+        return MISSING_DESCRIPTION
+    return display
+
+
+class KeybindingColumns:
+    """Columnas de una extracción completa; cada lista tiene una entrada por fila."""
+
+    # Columnas que se calculan al pedirlas: nombre -> método del extractor que da el valor de una fila
+    LAZY_COLUMNS = ('category', 'formatted_key')
+
+    def __init__(self, keybindings: Sequence, extractor):
+        self.extractor = extractor
+        intern = sys.intern
+        self.records = list(keybindings)
+        rel_paths: Dict[str, str] = {}
+        modes: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+        self.key = [intern(kb.key) for kb in self.records]
+        self.key_lower = [key.lower() for key in self.key]
+        self.canonical = [intern(extractor.canonical_key_of(kb)) for kb in self.records]
+        self.display = [action_display(kb) for kb in self.records]
+        self.context = [kb.context for kb in self.records]
+        self.line = [kb.line_number for kb in self.records]
+        self.modes = [modes.setdefault(tuple(kb.modes), tuple(kb.modes)) for kb in self.records]
+        self.rel_path = [
+            rel_paths.get(kb.file_path) or rel_paths.setdefault(
+                kb.file_path, intern(os.path.relpath(kb.file_path, extractor.repo_root)))
+            for kb in self.records
+        ]
+        order = sorted(range(len(self.records)), key=self.key_lower.__getitem__)
+        self.rank = [0] * len(order)
+        for position, row in enumerate(order):
+            self.rank[row] = position
+        self.category: Optional[List[str]] = None
+        self.formatted_key: Optional[List[str]] = None
+        self._chips: Dict[Tuple[str, ...], str] = {}
+
+    def lazy(self, name: str) -> List[str]:
+        column = getattr(self, name)
+        if column is None:
+            if name == 'category':
+                column = [self.extractor.categorize_keybinding(kb) for kb in self.records]
+            else:
+                column = [self.extractor.format_key_combination(key) for key in self.key]
+            setattr(self, name, column)
+        return column
+
+    def chips(self, modes: Sequence[str]) -> str:
+        """modes_to_chips memoizado por tupla de modos."""
+        modes = tuple(modes)
+        chips = self._chips.get(modes)
+        if chips is None:
+            chips = self._chips[modes] = self.extractor.modes_to_chips(list(modes))
+        return chips
+
+    def subset(self, rows: List[int]) -> 'KeybindingColumns':
+        """Columnas sólo de `rows` (renumeradas 0..n-1), con las perezosas ya calculadas y sin extractor."""
+        for name in self.LAZY_COLUMNS:
+            self.lazy(name)
+        other = KeybindingColumns.__new__(KeybindingColumns)
+        for name, value in self.__dict__.items():
+            other.__dict__[name] = [value[r] for r in rows] if isinstance(value, list) else value
+        other.extractor = None
+        other._chips = dict(self._chips)
+        return other
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state['extractor'] = None
+        return state
+
+
+class KeybindingTable(Sequence):
+    """Secuencia de Keybinding sobre columnas compartidas, con índices cacheados por vista."""
+
+    def __init__(self, columns: KeybindingColumns, rows: Optional[List[int]] = None):
+        self.columns = columns
+        self.rows: List[int] = list(range(len(columns.records))) if rows is None else rows
+        self._cache: Dict[Tuple, object] = {}
+
+    @classmethod
+    def build(cls, keybindings: Sequence, extractor) -> 'KeybindingTable':
+        return cls(KeybindingColumns(keybindings, extractor))
+
+    # ----- secuencia -----
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __iter__(self) -> Iterator:
+        records = self.columns.records
+        return (records[r] for r in self.rows)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.view(self.rows[index])
+        return self.columns.records[self.rows[index]]
+
+    def __reduce__(self):
+        return (KeybindingTable, (self.columns.subset(self.rows),))
+
+    def view(self, rows: List[int]) -> 'KeybindingTable':
+        """Vista sobre las mismas columnas con sólo `rows` (números de fila de las columnas)."""
+        return KeybindingTable(self.columns, rows)
+
+    # ----- columnas perezosas -----
+    def category(self, row: int) -> str:
+        return self.columns.lazy('category')[row]
+
+    def formatted_key(self, row: int) -> str:
+        return self.columns.lazy('formatted_key')[row]
+
+    def chips(self, modes: Sequence[str]) -> str:
+        return self.columns.chips(modes)
+
+    # ----- índices -----
+    def _cached(self, cache_key: Tuple, build: Callable[[], object]):
+        value = self._cache.get(cache_key)
+        if value is None:
+            value = self._cache[cache_key] = build()
+        return value
+
+    def _group(self, keys: List) -> Dict[str, 'KeybindingTable']:
+        groups: Dict[str, List[int]] = {}
+        for row in self.rows:
+            groups.setdefault(keys[row], []).append(row)
+        return {name: self.view(rows) for name, rows in groups.items()}
+
+    def by_file(self) -> Dict[str, 'KeybindingTable']:
+        """Ruta relativa -> vista, en orden de primera aparición."""
+        return self._cached(('file',), lambda: self._group(self.columns.rel_path))
+
+    def by_category(self) -> Dict[str, 'KeybindingTable']:
+        return self._cached(('category',), lambda: self._group(self.columns.lazy('category')))
+
+    def by_mode(self, default: str) -> Dict[str, 'KeybindingTable']:
+        """Modo -> vista (una fila aparece en cada uno de sus modos; `default` si no tiene)."""
+        def build():
+            groups: Dict[str, List[int]] = {}
+            fallback = (default,)
+            for row in self.rows:
+                for mode in self.columns.modes[row] or fallback:
+                    groups.setdefault(mode, []).append(row)
+            return {mode: self.view(rows) for mode, rows in groups.items()}
+        return self._cached(('mode', default), build)
+
+    def by_canonical(self) -> Dict[str, 'KeybindingTable']:
+        """Clave canónica -> vista (<leader>x y <Space>x juntas), en orden de primera aparición."""
+        return self._cached(('canonical',), lambda: self._group(self.columns.canonical))
+
+    def sorted_rows(self) -> List[int]:
+        """Filas ordenadas por tecla en minúsculas (estable: empates en orden de aparición)."""
+        return self._cached(('sorted',), lambda: sorted(self.rows, key=self.columns.rank.__getitem__))
+
+    def sorted_records(self) -> List:
+        records = self.columns.records
+        return [records[r] for r in self.sorted_rows()]
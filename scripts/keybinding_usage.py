@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+"""
+Uso real de los atajos a partir de logs de pulsaciones.
+
+La configuración puede registrar cada atajo que se dispara en un archivo local, un
+evento por línea, en texto separado por tabuladores o en JSON:
+
+    1718031200.41	n	<leader>ff
+    {"ts": 1718031201.02, "mode": "x", "lhs": " y"}
+
+El modo puede ser el corto de Neovim (n, x, v, i...) o el nombre largo (Normal,
+Visual...); el lhs se canonicaliza con KeyCanonicalizer, así que '<leader>ff' y
+' ff' cuentan como la misma tecla. Las líneas que no se entienden se cuentan como
+inválidas y se ignoran.
+
+UsageAggregator lee uno o muchos logs (también .gz, directorios, logs de varios
+usuarios) línea a línea con memoria constante: cada (modo, tecla canónica) se
+cuenta en un count-min sketch (CountMinSketch) de tamaño fijo, con actualización
+conservadora; mientras haya pocas teclas distintas (EXACT_LIMIT) se llevan además
+contadores exactos, que son los que se usan. El sketch nunca subestima: una
+estimación 0 significa que el atajo no se usó. Los sketches se pueden guardar
+(--sketch) y volver a pasar como entrada en lugar de logs; se suman, así que cada
+usuario puede agregar los suyos y combinarlos después.
+
+`rank` cruza los conteos con la tabla de atajos extraídos por (modo, tecla
+canónica) y clasifica: los más usados (esenciales), los que nunca se usaron y los
+muy usados que no tienen descripción. El informe JSON (report_json) guarda además
+el conteo de cada atajo; si existe docs/keybinding-usage.json, update_keybindings.py
+lo usa para la sección "Uso real" de la documentación.
+
+Se usa con `update_keybindings.py usage LOG... [--json RUTA] [--sketch RUTA]`. Este
+módulo no importa update_keybindings.
+"""
+
+import os
+import sys
+import json
+import math
+import base64
+import hashlib
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from keybinding_table import MISSING_DESCRIPTION
+from startuptime import expand_log_paths, open_log
+
+
+# Informe de uso que alimenta la documentación, relativo a la raíz
+DEFAULT_USAGE_REPORT = os.path.join('docs', 'keybinding-usage.json')
+# Sufijo de los sketches guardados (se aceptan como entrada junto a los logs)
+SKETCH_SUFFIX = '.cms.json'
+# Error del sketch: sobreestimación <= EPSILON * eventos con probabilidad 1 - DELTA
+EPSILON = 0.0005
+DELTA = 0.001
+# Teclas distintas con contador exacto; por encima sólo queda el sketch
+EXACT_LIMIT = 4096
+# Tamaño de la caché lhs -> clave del sketch (memoria acotada aunque los lhs sean muchos)
+KEY_CACHE_SIZE = 4096
+# Un atajo es "muy usado" si acumula al menos esta fracción de los eventos
+HOT_SHARE = 0.01
+# Esenciales en el informe y en la documentación
+ESSENTIALS_LIMIT = 20
+
+
+class CountMinSketch:
+    """Count-min sketch con actualización conservadora y hashing doble (blake2b).
+
+    width = ceil(e / epsilon) columnas y depth = ceil(ln(1 / delta)) filas: la
+    estimación de una clave nunca es menor que su conteo real y lo supera en más de
+    epsilon * total con probabilidad <= delta. Dos sketches del mismo tamaño se
+    combinan sumando sus tablas.
+    """
+
+    def __init__(self, epsilon: float = EPSILON, delta: float = DELTA,
+                 width: Optional[int] = None, depth: Optional[int] = None):
+        self.width = width or math.ceil(math.e / epsilon)
+        self.depth = depth or math.ceil(math.log(1 / delta))
+        self.table = array('Q', bytes(8 * self.width * self.depth))
+        self.total = 0
+
+    def _cells(self, key: str) -> Tuple[int, ...]:
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        width = self.width
+        return tuple(row * width + (h1 + row * h2) % width for row in range(self.depth))
+
+    def add_cells(self, cells: Tuple[int, ...], count: int = 1):
+        """Suma `count` sólo a las celdas que quedarían por debajo del nuevo mínimo."""
+        table = self.table
+        target = min(table[cell] for cell in cells) + count
+        for cell in cells:
+            if table[cell] < target:
+                table[cell] = target
+        self.total += count
+
+    def add(self, key: str, count: int = 1):
+        self.add_cells(self._cells(key), count)
+
+    def estimate_cells(self, cells: Tuple[int, ...]) -> int:
+        table = self.table
+        return min(table[cell] for cell in cells)
+
+    def estimate(self, key: str) -> int:
+        return self.estimate_cells(self._cells(key))
+
+    @property
+    def error_bound(self) -> int:
+        """Sobreestimación máxima (con probabilidad 1 - delta)."""
+        return math.ceil(math.e / self.width * self.total)
+
+    def merge(self, other: 'CountMinSketch'):
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError(f"sketch de {other.width}x{other.depth}, se esperaba {self.width}x{self.depth}")
+        table = self.table
+        for index, value in enumerate(other.table):
+            if value:
+                table[index] += value
+        self.total += other.total
+
+    def to_json(self) -> Dict:
+        table = array('Q', self.table)
+        if sys.byteorder != 'little':
+            table.byteswap()
+        return {'width': self.width, 'depth': self.depth, 'total': self.total,
+                'table': base64.b64encode(table.tobytes()).decode('ascii')}
+
+    @classmethod
+    def from_json(cls, data: Dict) -> 'CountMinSketch':
+        sketch = cls(width=int(data['width']), depth=int(data['depth']))
+        table = array('Q', base64.b64decode(data['table']))
+        if sys.byteorder != 'little':
+            table.byteswap()
+        if len(table) != sketch.width * sketch.depth:
+            raise ValueError("tabla del sketch con tamaño incorrecto")
+        sketch.table = table
+        sketch.total = int(data['total'])
+        return sketch
+
+
+def parse_event(line: str) -> Optional[Tuple[str, str]]:
+    """(modo, lhs) de una línea del log (TSV `ts<TAB>modo<TAB>lhs` o JSON); None si no se entiende."""
+    line = line.rstrip('\r\n')
+    if not line.strip():
+        return None
+    if line.lstrip().startswith('{'):
+        try:
+            data = json.loads(line)
+        except ValueError:
+            return None
+        if not isinstance(data, dict):
+            return None
+        mode, lhs = data.get('mode'), data.get('lhs')
+        if isinstance(mode, str) and isinstance(lhs, str) and mode and lhs:
+            return mode, lhs
+        return None
+    parts = line.split('\t', 2)
+    if len(parts) != 3 or not parts[1] or not parts[2]:
+        return None
+    return parts[1], parts[2]
+
+
+class UsageAggregator:
+    """Conteos por (modo largo, tecla canónica) con memoria constante."""
+
+    def __init__(self, canonical: Callable[[str], str], mode_names: Dict[str, str],
+                 epsilon: float = EPSILON, delta: float = DELTA):
+        self.canonical = canonical
+        # Modo corto o largo -> modo largo ('x' y 'v' son Visual)
+        self.mode_names = dict(mode_names)
+        self.mode_names.update({name: name for name in mode_names.values()})
+        self.sketch = CountMinSketch(epsilon, delta)
+        self.exact: Optional[Dict[str, int]] = {}
+        self._keys: 'OrderedDict[Tuple[str, str], Tuple[str, Tuple[int, ...]]]' = OrderedDict()
+        self.events = 0
+        self.invalid = 0
+        self.files_read = 0
+        self.sketches_read = 0
+
+    @staticmethod
+    def key(mode: str, canonical: str) -> str:
+        return f"{mode}\t{canonical}"
+
+    def _lookup(self, mode: str, lhs: str) -> Optional[Tuple[str, Tuple[int, ...]]]:
+        """Clave del sketch y sus celdas, con caché LRU acotada."""
+        cached = self._keys.get((mode, lhs))
+        if cached is not None:
+            self._keys.move_to_end((mode, lhs))
+            return cached
+        name = self.mode_names.get(mode)
+        if name is None:
+            return None
+        key = self.key(name, self.canonical(lhs))
+        cached = (key, self.sketch._cells(key))
+        self._keys[(mode, lhs)] = cached
+        if len(self._keys) > KEY_CACHE_SIZE:
+            self._keys.popitem(last=False)
+        return cached
+
+    def feed(self, lines: Iterable[str]):
+        for line in lines:
+            event = parse_event(line)
+            found = self._lookup(*event) if event is not None else None
+            if found is None:
+                self.invalid += 1
+                continue
+            key, cells = found
+            self.events += 1
+            self.sketch.add_cells(cells)
+            if self.exact is not None:
+                self.exact[key] = self.exact.get(key, 0) + 1
+                if len(self.exact) > EXACT_LIMIT:
+                    self.exact = None
+
+    def merge_sketch(self, data: Dict):
+        """Suma un sketch guardado (con sus contadores exactos, si los tiene)."""
+        self.sketch.merge(CountMinSketch.from_json(data))
+        self.events += int(data['total'])
+        self.sketches_read += 1
+        exact = data.get('exact')
+        if exact is None or self.exact is None:
+            self.exact = None
+            return
+        for key, count in exact.items():
+            self.exact[key] = self.exact.get(key, 0) + int(count)
+        if len(self.exact) > EXACT_LIMIT:
+            self.exact = None
+
+    def feed_files(self, paths: Iterable[str]):
+        for path in expand_log_paths(paths):
+            try:
+                if path.endswith(SKETCH_SUFFIX):
+                    with open(path, 'r', encoding='utf-8') as f:
+                        self.merge_sketch(json.load(f))
+                else:
+                    self.feed(open_log(path))
+                    self.files_read += 1
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Aviso: no se pudo leer {path}: {e}")
+
+    def count(self, mode: str, canonical: str) -> int:
+        key = self.key(mode, canonical)
+        if self.exact is not None:
+            return self.exact.get(key, 0)
+        return self.sketch.estimate(key)
+
+    @property
+    def error_bound(self) -> int:
+        """Error de los conteos: 0 con contadores exactos."""
+        return 0 if self.exact is not None else self.sketch.error_bound
+
+    def save_sketch(self, path: str):
+        data = self.sketch.to_json()
+        data['exact'] = self.exact
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+
+
+@dataclass
+class BindingUsage:
+    """Un atajo extraído con sus conteos por modo."""
+    row: int
+    key: str
+    canonical: str
+    action: str
+    rel_path: str
+    line: int
+    counts: Dict[str, int] = field(default_factory=dict)
+    # Otro atajo comparte (modo, tecla canónica): el conteo no distingue cuál se disparó
+    shared: bool = False
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    @property
+    def documented(self) -> bool:
+        return self.action != MISSING_DESCRIPTION
+
+
+@dataclass
+class UsageRanking:
+    events: int
+    error_bound: int
+    bindings: List[BindingUsage]
+
+    def essentials(self, limit: int = ESSENTIALS_LIMIT) -> List[BindingUsage]:
+        used = [usage for usage in self.bindings if usage.total > 0]
+        used.sort(key=lambda usage: -usage.total)
+        return used[:limit]
+
+    def never_used(self) -> List[BindingUsage]:
+        return [usage for usage in self.bindings if usage.counts and usage.total == 0]
+
+    def hot_undocumented(self) -> List[BindingUsage]:
+        threshold = max(1, HOT_SHARE * self.events, self.error_bound + 1)
+        hot = [usage for usage in self.bindings if not usage.documented and usage.total >= threshold]
+        hot.sort(key=lambda usage: -usage.total)
+        return hot
+
+
+def rank(table, count: Callable[[str, str], Optional[int]], events: int, error_bound: int = 0,
+         modes: Optional[Iterable[str]] = None) -> UsageRanking:
+    """Cruza los conteos con la tabla de atajos por (modo, tecla canónica).
+
+    `count(modo, canónica)` devuelve None si no hay datos para esa tecla (p.ej. un
+    atajo añadido después del informe): ese modo no se cuenta ni como usado ni como
+    sin uso. Sólo se consideran los modos de `modes` (por defecto, todos).
+    """
+    columns = table.columns
+    allowed = set(modes) if modes is not None else None
+    bindings: List[BindingUsage] = []
+    owners: Dict[Tuple[str, str], List[BindingUsage]] = {}
+    for row in table.rows:
+        canonical = columns.canonical[row]
+        usage = BindingUsage(row, columns.key[row], canonical, columns.display[row],
+                             columns.rel_path[row], columns.line[row])
+        for mode in columns.modes[row]:
+            if allowed is not None and mode not in allowed:
+                continue
+            value = count(mode, canonical)
+            if value is not None:
+                usage.counts[mode] = value
+            owners.setdefault((mode, canonical), []).append(usage)
+        bindings.append(usage)
+    for sharing in owners.values():
+        if len(sharing) > 1:
+            for usage in sharing:
+                usage.shared = True
+    return UsageRanking(events, error_bound, bindings)
+
+
+def _binding_json(usage: BindingUsage) -> Dict:
+    return {'key': usage.key, 'canonical': usage.canonical, 'action': usage.action,
+            'location': f"{usage.rel_path}:{usage.line}", 'counts': usage.counts,
+            'total': usage.total, 'shared': usage.shared}
+
+
+def report_json(aggregator: UsageAggregator, ranking: UsageRanking, limit: int = ESSENTIALS_LIMIT) -> Dict:
+    """Informe completo; `counts` (modo, tecla canónica, conteo) es lo que lee la documentación."""
+    counts: Dict[Tuple[str, str], int] = {}
+    for usage in ranking.bindings:
+        for mode, value in usage.counts.items():
+            counts[(mode, usage.canonical)] = value
+    return {
+        'events': aggregator.events,
+        'invalid_lines': aggregator.invalid,
+        'files': aggregator.files_read,
+        'sketches': aggregator.sketches_read,
+        'exact': aggregator.exact is not None,
+        'error_bound': ranking.error_bound,
+        'counts': [{'mode': mode, 'canonical': canonical, 'count': value}
+                   for (mode, canonical), value in sorted(counts.items())],
+        'essentials': [_binding_json(usage) for usage in ranking.essentials(limit)],
+        'hot_undocumented': [_binding_json(usage) for usage in ranking.hot_undocumented()],
+        'never_used': [_binding_json(usage) for usage in ranking.never_used()],
+    }
+
+
+@dataclass
+class UsageReport:
+    """Conteos de un informe JSON guardado, para la documentación."""
+    events: int
+    error_bound: int
+    counts: Dict[Tuple[str, str], int]
+
+    def count(self, mode: str, canonical: str) -> Optional[int]:
+        return self.counts.get((mode, canonical))
+
+
+def load_usage_report(path: str) -> Optional[UsageReport]:
+    """Informe de `usage --json`; None si no existe o no se puede leer."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        counts = {(entry['mode'], entry['canonical']): int(entry['count']) for entry in data['counts']}
+        return UsageReport(int(data['events']), int(data.get('error_bound', 0)), counts)
+    except OSError:
+        return None
+    except (ValueError, KeyError, TypeError) as e:
+        print(f"Aviso: informe de uso {path} inválido, se ignora: {e}")
+        return None
+
+
+def format_report(aggregator: UsageAggregator, ranking: UsageRanking, limit: int = ESSENTIALS_LIMIT) -> str:
+    """Informe markdown: esenciales por uso, muy usados sin descripción y nunca usados."""
+    sources = f"{aggregator.files_read} logs" + (f", {aggregator.sketches_read} sketches" if aggregator.sketches_read else "")
+    out = [f"### Uso de atajos ({aggregator.events} eventos, {sources}"]
+    if aggregator.invalid:
+        out.append(f", {aggregator.invalid} líneas inválidas")
+    out.append(")\n\n")
+    if ranking.error_bound:
+        out.append(f"Conteos estimados (count-min sketch): sobreestiman como mucho {ranking.error_bound}.\n\n")
+
+    def table(title: str, rows: List[BindingUsage]):
+        out.append(f"### {title}\n\n")
+        if not rows:
+            out.append("(ninguno)\n\n")
+            return
+        out.append("| Tecla | Acción | Usos | Ubicación |\n")
+        out.append("|-------|--------|-----:|-----------|\n")
+        for usage in rows:
+            modes = ', '.join(f"{mode}: {value}" for mode, value in usage.counts.items())
+            shared = " (compartida)" if usage.shared else ""
+            out.append(f"| `{usage.key}`{shared} | {usage.action} | {usage.total} ({modes}) | "
+                       f"{usage.rel_path}:{usage.line} |\n")
+        out.append("\n")
+
+    table("Esenciales (más usados)", ranking.essentials(limit))
+    table("Muy usados sin descripción", ranking.hot_undocumented())
+    never = ranking.never_used()
+    table(f"Nunca usados ({len(never)})", never[:limit])
+    return ''.join(out).rstrip('\n') + '\n'
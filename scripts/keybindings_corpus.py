@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Corpus de entradas patológicas para los motores de extracción de keybindings.
+
+Cada generador produce contenido Lua (válido o no) pensado para disparar el peor
+caso de algún escaneo: llaves y paréntesis sin cerrar, líneas muy largas, miles de
+líneas en blanco antes de un comentario, bloques custom_keys sin 'end', tablas
+anidadas en profundidad, etc.
+
+Uso:
+    python3 scripts/keybindings_corpus.py [--size N] [--engine regex|ast|all]
+
+Para cada caso y motor se mide el tiempo con tamaño N y 2N. El script falla (código
+de salida 1) si algún caso supera el presupuesto por archivo o si al duplicar la
+entrada el tiempo crece de forma claramente superlineal.
+
+Los mismos casos, con límites más holgados, corren en tests/test_keybindings_corpus.py.
+"""
+
+import io
+import os
+import sys
+import time
+import argparse
+import contextlib
+from typing import Callable, Dict, List, Tuple
+
+# Tiempo máximo por caso (segundos) y crecimiento máximo admitido al duplicar N
+CASE_TIME_LIMIT = 2.0
+MAX_GROWTH = 3.0
+# Por debajo de este tiempo la medición es ruido y no se evalúa el crecimiento
+MIN_MEASURABLE = 0.02
+# Repeticiones por medición (se toma la mejor)
+REPEATS = 3
+
+
+def unclosed_calls(n: int) -> str:
+    """Llamadas map( sin cerrar encadenadas en una sola línea."""
+    return "map('n', 'x" * n
+
+
+def unclosed_strings(n: int) -> str:
+    """Cabeceras de llamadas cuya cadena nunca se cierra, una por línea."""
+    return "vim.keymap.set('n\n" * n
+
+
+def unbalanced_braces(n: int) -> str:
+    """Aperturas de tabla estilo Snacks/which-key que nunca se cierran."""
+    return "local t = { ['<leader>a'] = {\n" * n
+
+
+def unclosed_heads_per_line(n: int) -> str:
+    """Líneas largas llenas de cabeceras map( sin cerrar (el peor caso de las búsquedas por línea)."""
+    line = ("map('n','k',x," * 300)[:4000]
+    return "\n".join([line] * max(1, n // 10)) + "\nmap('n', 'jj', '<Esc>', { desc = 'fin' })\n"
+
+
+def nested_tables(n: int) -> str:
+    """Tablas con índice entre corchetes anidadas en profundidad (y cerradas)."""
+    depth = min(n, 150)
+    repeat = max(1, n // depth)
+    block = "['<leader>x'] = { " * depth + "desc = 'x' " + "} " * depth
+    return "local keys = {\n" + ",\n".join([block] * repeat) + "\n}\n"
+
+
+def long_line(n: int) -> str:
+    """Una única línea enorme con una llamada válida al final."""
+    return "local s = '" + "a" * (n * 40) + "' map('n', 'jj', '<Esc>', { desc = 'fin' })\n"
+
+
+def blank_lines_before_comment(n: int) -> str:
+    """Muchas líneas en blanco (el caso cuadrático de ^\\s*-- en modo multilínea)."""
+    return ("add_default_keybindings = true\n" + "\n" * (n * 20) +
+            "-- add_keymap('<leader>z', ':PickMe files<cr>', 'Files')\n")
+
+
+def custom_keys_without_end(n: int) -> str:
+    """Cabeceras custom_keys con función pero sin 'end' posterior."""
+    return "['<leader>l'] = function(plugin)\n" * n
+
+
+def many_keymaps(n: int) -> str:
+    """Caso realista grande: n llamadas válidas con descripción."""
+    return "".join(
+        f"vim.keymap.set('n', '<leader>k{i}', ':cmd{i}<CR>', {{ desc = 'Comando {i}' }})\n"
+        for i in range(n)
+    )
+
+
+CASES: Dict[str, Callable[[int], str]] = {
+    'unclosed_calls': unclosed_calls,
+    'unclosed_strings': unclosed_strings,
+    'unbalanced_braces': unbalanced_braces,
+    'unclosed_heads_per_line': unclosed_heads_per_line,
+    'nested_tables': nested_tables,
+    'long_line': long_line,
+    'blank_lines_before_comment': blank_lines_before_comment,
+    'custom_keys_without_end': custom_keys_without_end,
+    'many_keymaps': many_keymaps,
+}
+
+
+def time_extraction(extractor, file_path: str, content: str) -> Tuple[float, int]:
+    """Devuelve (mejor tiempo en segundos, keybindings extraídos) para un contenido.
+
+    Los avisos del extractor (errores de sintaxis, presupuesto) se descartan.
+    """
+    best = float('inf')
+    count = 0
+    for _ in range(REPEATS):
+        extractor.reset_caches()
+        with contextlib.redirect_stdout(io.StringIO()):
+            started = time.perf_counter()
+            kbs = extractor.extract_keybindings_from_content(file_path, content)
+            best = min(best, time.perf_counter() - started)
+        count = len(kbs)
+    return best, count
+
+
+def run(size: int, engines: List[str]) -> bool:
+    """Ejecuta el corpus con cada motor e imprime la tabla de tiempos; True si todo está acotado."""
+    from update_keybindings import ENGINES
+
+    ok = True
+    print(f"{'caso':<28} {'motor':<6} {'N':>8} {'t(N)':>9} {'t(2N)':>9} {'ratio':>6}  kbs")
+    for engine in engines:
+        extractor = ENGINES[engine]()
+        file_path = os.path.join(extractor.repo_root, 'lua', 'plugins', 'tools', 'pickme.lua')
+        for name, generate in CASES.items():
+            t1, _ = time_extraction(extractor, file_path, generate(size))
+            t2, count = time_extraction(extractor, file_path, generate(size * 2))
+            ratio = t2 / t1 if t1 > 0 else 0.0
+            failures = []
+            if t2 > CASE_TIME_LIMIT:
+                failures.append(f"{t2:.2f}s > {CASE_TIME_LIMIT:.2f}s")
+            if t2 >= MIN_MEASURABLE and ratio > MAX_GROWTH:
+                failures.append(f"crecimiento x{ratio:.1f} al duplicar N")
+            status = "  ❌ " + "; ".join(failures) if failures else ""
+            print(f"{name:<28} {engine:<6} {size:>8} {t1:>9.4f} {t2:>9.4f} {ratio:>6.2f}  {count}{status}")
+            ok = ok and not failures
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mide los extractores con entradas patológicas.")
+    parser.add_argument('--size', type=int, default=2000, help="Tamaño base N de cada caso")
+    parser.add_argument('--engine', choices=['regex', 'ast', 'all'], default='all')
+    args = parser.parse_args(argv)
+
+    engines = ['regex', 'ast'] if args.engine == 'all' else [args.engine]
+    if run(args.size, engines):
+        print("✅ Tiempo de extracción acotado en todos los casos")
+        return 0
+    print("❌ Algún caso supera el límite de tiempo o crece de forma superlineal")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,428 @@
+#!/usr/bin/env python3
+"""
+Daemon de consultas de keybindings sobre un socket Unix, y su cliente.
+
+Las integraciones del editor y los scripts de shell preguntan a menudo cosas como
+"¿qué hace <leader>qd?" o "¿está libre <leader>zz?". Lanzar update_keybindings.py
+para cada pregunta reimporta el script y vuelve a extraerlo todo. El daemon
+(update_keybindings.py serve) extrae una vez, mantiene en memoria un
+KeybindingIndex y responde consultas JSON (una por línea) en un socket Unix:
+
+- lookup:    atajos de una secuencia exacta ({"op": "lookup", "key": "<leader>qd"})
+- prefix:    atajos bajo un prefijo ({"op": "prefix", "prefix": "<leader>q"})
+- search:    texto en tecla, descripción, acción o archivo ({"op": "search", "text": "git"})
+- conflicts: teclas con varias acciones en el mismo modo (el análisis de la documentación)
+- free:      secuencias libres (free_keys.FreeKeyFinder)
+- status, reload, stop
+
+Las secuencias se comparan por sus tokens canónicos (KeyCanonicalizer), así que
+<leader>, <Space> y ' ' son la misma tecla. Un hilo vigila los archivos Lua
+(mtime y tamaño de cada uno, cada `poll_interval` segundos); si algo cambia se
+reextrae en segundo plano y el índice nuevo sustituye al anterior de golpe: las
+consultas nunca esperan a una extracción. Si la reextracción falla (p.ej. un error
+de sintaxis a medio editar), el índice anterior sigue respondiendo, `status` muestra
+el error y no se reintenta hasta el siguiente cambio. Toda respuesta lleva "ok".
+
+El cliente (este archivo ejecutado directamente) sólo importa socket, json y
+argparse; no carga el extractor:
+    python3 scripts/keybindings_daemon.py lookup '<leader>qd'
+    python3 scripts/keybindings_daemon.py free --prefix '<leader>z'
+
+Este módulo no importa update_keybindings: el servidor recibe el extractor ya
+construido.
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import bisect
+import threading
+import socketserver
+from typing import Dict, List, Optional, Tuple
+
+
+# Intervalo por defecto entre comprobaciones de los archivos vigilados (segundos)
+DEFAULT_POLL_INTERVAL = 1.0
+# Resultados máximos por defecto de prefix y search
+DEFAULT_LIMIT = 50
+
+
+def default_socket_path() -> str:
+    """$XDG_RUNTIME_DIR/nvim-keybindings.sock o, si no existe, uno por usuario en /tmp."""
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return os.path.join(runtime_dir, 'nvim-keybindings.sock')
+    return os.path.join('/tmp', f"nvim-keybindings-{os.getuid()}.sock")
+
+
+class KeybindingIndex:
+    """Estado inmutable de una extracción, preparado para consultas rápidas.
+
+    Por modo, una lista ordenada de (tokens canónicos, posición del registro): la
+    búsqueda exacta y por prefijo son un bisect más el recorrido de los resultados.
+    """
+
+    def __init__(self, extractor, keybindings: List):
+        from free_keys import FreeKeyFinder
+        from renderers import JsonRenderer
+
+        self.canonicalizer = extractor.canonicalizer
+        self.normalize_modes = extractor.normalize_modes
+        self.built_at = time.time()
+        json_renderer = JsonRenderer(extractor)
+        self.records: List[Dict] = [json_renderer.record(kb) for kb in keybindings]
+        self.by_mode: Dict[str, List[Tuple[Tuple[str, ...], int]]] = {}
+        for i, kb in enumerate(keybindings):
+            tokens = self.canonicalizer.tokens(kb.key)
+            if not tokens:
+                continue
+            for mode in kb.modes or ['Normal']:
+                self.by_mode.setdefault(mode, []).append((tokens, i))
+        for entries in self.by_mode.values():
+            entries.sort()
+        self.search_text = [
+            ' '.join([r['key'], r['description'], r['action'], r['context'], r['file'], r['category']]).lower()
+            for r in self.records
+        ]
+        self.free_finder = FreeKeyFinder(keybindings, self.canonicalizer)
+        # El índice no cambia: cada consulta de teclas libres se enumera una sola vez
+        self._free_cache: Dict[Tuple, List[Dict]] = {}
+        self.conflict_list = self._conflicts(extractor, keybindings)
+
+    def modes(self, value: Optional[str]) -> List[str]:
+        """Modos pedidos ('n', 'n,v', 'Normal'...); todos si no se indica ninguno."""
+        if not value:
+            return list(self.by_mode)
+        return self.normalize_modes(value)
+
+    def _range(self, mode: str, tokens: Tuple[str, ...], exact: bool) -> List[int]:
+        entries = self.by_mode.get(mode, [])
+        out: List[int] = []
+        for i in range(bisect.bisect_left(entries, (tokens,)), len(entries)):
+            entry_tokens, record = entries[i]
+            if entry_tokens[:len(tokens)] != tokens or (exact and entry_tokens != tokens):
+                break
+            out.append(record)
+        return out
+
+    def _matches(self, key: str, modes: Optional[str], exact: bool, limit: int) -> List[Dict]:
+        tokens = self.canonicalizer.tokens(key)
+        if not tokens:
+            return []
+        found: List[int] = []
+        for mode in self.modes(modes):
+            found.extend(self._range(mode, tokens, exact))
+        return [self.records[i] for i in sorted(set(found))][:limit]
+
+    def lookup(self, key: str, modes: Optional[str] = None) -> List[Dict]:
+        return self._matches(key, modes, exact=True, limit=len(self.records))
+
+    def prefix(self, prefix: str, modes: Optional[str] = None, limit: int = DEFAULT_LIMIT) -> List[Dict]:
+        return self._matches(prefix, modes, exact=False, limit=limit)
+
+    def search(self, text: str, modes: Optional[str] = None, limit: int = DEFAULT_LIMIT) -> List[Dict]:
+        """Registros que contienen todos los términos de `text` (sin distinguir mayúsculas)."""
+        terms = text.lower().split()
+        wanted = set(self.modes(modes)) if modes else None
+        out: List[Dict] = []
+        for record, haystack in zip(self.records, self.search_text):
+            if wanted is not None and not wanted.intersection(record['modes'] or ['Normal']):
+                continue
+            if all(term in haystack for term in terms):
+                out.append(record)
+                if len(out) >= limit:
+                    break
+        return out
+
+    def _conflicts(self, extractor, keybindings: List) -> List[Dict]:
+        """Conflictos del mismo análisis que la documentación y --fail-on-conflicts (find_conflicts)."""
+        table_view, found = extractor.find_conflicts(keybindings)
+        key = table_view.columns.key
+        return [
+            {
+                'key': key[row],
+                'mode': mode,
+                'actions': [
+                    {'action': action, 'locations': [{'file': path, 'line': line} for path, line in locations]}
+                    for action, locations in actions.items()
+                ],
+            }
+            for row, modes in found for mode, actions in modes.items()
+        ]
+
+    def conflicts(self, modes: Optional[str] = None) -> List[Dict]:
+        if not modes:
+            return list(self.conflict_list)
+        wanted = set(self.modes(modes))
+        return [c for c in self.conflict_list if c['mode'] in wanted]
+
+    def free(self, modes: Optional[str] = None, prefix: str = '<leader>', depth: int = 2,
+             alphabet: Optional[str] = None, related: str = "", limit: int = 20) -> Dict[str, List[Dict]]:
+        from free_keys import DEFAULT_ALPHABET
+
+        results: Dict[str, List[Dict]] = {}
+        for mode in self.normalize_modes(modes or 'n'):
+            cache_key = (mode, prefix, depth, alphabet, related)
+            free = self._free_cache.get(cache_key)
+            if free is None:
+                free = [
+                    {'key': fk.key, 'score': fk.score, 'group': fk.group, 'reasons': fk.reasons}
+                    for fk in self.free_finder.find(mode, prefix=prefix, alphabet=alphabet or DEFAULT_ALPHABET,
+                                                    depth=depth, related=related)
+                ]
+                self._free_cache[cache_key] = free
+            results[mode] = free[:limit]
+        return results
+
+
+class KeybindingDaemon:
+    """Mantiene el índice al día (vigilando los archivos) y responde peticiones."""
+
+    def __init__(self, extractor, poll_interval: float = DEFAULT_POLL_INTERVAL):
+        self.extractor = extractor
+        self.poll_interval = poll_interval
+        self.generation = 0
+        self.index: Optional[KeybindingIndex] = None
+        self.snapshot: Dict[str, Tuple[int, int]] = {}
+        self.stopped = threading.Event()
+        self._rebuild_lock = threading.Lock()
+        # Último fallo de reextracción (el índice anterior sigue respondiendo); None tras un éxito
+        self.last_error: Optional[str] = None
+
+    def watched_files(self) -> Dict[str, Tuple[int, int]]:
+        """(mtime_ns, tamaño) de cada archivo Lua; un archivo nuevo o borrado también cuenta."""
+        snapshot: Dict[str, Tuple[int, int]] = {}
+        # Todos los archivos, no sólo los alcanzables: un require nuevo puede incorporar cualquiera
+        for file_path in self.extractor.all_lua_files():
+            try:
+                st = os.stat(file_path)
+            except OSError:
+                continue
+            snapshot[file_path] = (st.st_mtime_ns, st.st_size)
+        return snapshot
+
+    def rebuild(self):
+        """Extrae de nuevo y sustituye el índice (las consultas siguen usando el anterior mientras)."""
+        from key_canonical import KeyCanonicalizer
+
+        with self._rebuild_lock:
+            snapshot = self.watched_files()
+            started = time.perf_counter()
+            self.extractor.reset_caches()
+            # El líder puede haber cambiado en lua/core/keys.lua
+            self.extractor.canonicalizer = KeyCanonicalizer.from_config(self.extractor.repo_root)
+            keybindings = self.extractor.extract_all_keybindings()
+            index = KeybindingIndex(self.extractor, keybindings)
+            self.index, self.snapshot = index, snapshot
+            self.generation += 1
+            self.last_error = None
+            print(f"🔄 Índice #{self.generation}: {len(keybindings)} keybindings "
+                  f"en {(time.perf_counter() - started) * 1000:.0f} ms")
+
+    def watch(self):
+        """Hilo vigilante: reextrae cuando cambia algún archivo Lua.
+
+        Si la reextracción falla, se guarda igualmente la instantánea: no se vuelve a
+        intentar hasta el siguiente cambio (el mismo error se repetiría en cada intervalo).
+        """
+        while not self.stopped.wait(self.poll_interval):
+            self.poll()
+
+    def poll(self):
+        """Una comprobación del vigilante: reextrae si los archivos difieren de la última instantánea."""
+        snapshot = self.watched_files()
+        if snapshot == self.snapshot:
+            return
+        try:
+            self.rebuild()
+        except Exception as e:
+            self.snapshot = snapshot
+            self.last_error = f"{type(e).__name__}: {e}"
+            print(f"Aviso: no se pudo reextraer tras un cambio ({self.last_error}); "
+                  f"se reintenta cuando vuelva a cambiar algún archivo")
+
+    def handle(self, request: Dict) -> Dict:
+        """Responde una petición ya decodificada; los errores se devuelven como {'ok': false, 'error': ...}."""
+        op = request.get('op')
+        index = self.index
+        if op == 'lookup':
+            return {'results': index.lookup(str(request.get('key', '')), request.get('mode'))}
+        if op == 'prefix':
+            return {'results': index.prefix(str(request.get('prefix', '')), request.get('mode'),
+                                             int(request.get('limit', DEFAULT_LIMIT)))}
+        if op == 'search':
+            return {'results': index.search(str(request.get('text', '')), request.get('mode'),
+                                             int(request.get('limit', DEFAULT_LIMIT)))}
+        if op == 'conflicts':
+            return {'results': index.conflicts(request.get('mode'))}
+        if op == 'free':
+            return {'results': index.free(request.get('mode'), str(request.get('prefix', '<leader>')),
+                                          int(request.get('depth', 2)), request.get('alphabet'),
+                                          str(request.get('related', '')), int(request.get('limit', 20)))}
+        if op == 'status':
+            return {'generation': self.generation, 'keybindings': len(index.records),
+                    'files': len(self.snapshot), 'built_at': index.built_at,
+                    'engine': type(self.extractor).__name__, 'last_error': self.last_error}
+        if op == 'reload':
+            try:
+                self.rebuild()
+            except Exception as e:
+                # Errores de sintaxis, archivos ilegibles...: el índice anterior sigue respondiendo
+                self.last_error = f"{type(e).__name__}: {e}"
+                return {'error': f"no se pudo reextraer: {self.last_error}", 'generation': self.generation}
+            return {'generation': self.generation, 'keybindings': len(self.index.records)}
+        if op == 'stop':
+            self.stopped.set()
+            return {'stopping': True}
+        return {'error': f"operación desconocida: {op!r}"}
+
+    def respond(self, line: bytes) -> bytes:
+        started = time.perf_counter()
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("la petición debe ser un objeto JSON")
+            response = self.handle(request)
+        except (ValueError, TypeError, OSError) as e:
+            response = {'error': str(e)}
+        response['ok'] = 'error' not in response
+        response['took_us'] = round((time.perf_counter() - started) * 1e6, 1)
+        return json.dumps(response, ensure_ascii=False).encode('utf-8') + b"\n"
+
+    def serve(self, socket_path: str) -> int:
+        """Extrae, escucha en `socket_path` y atiende hasta recibir 'stop' o Ctrl-C."""
+        if os.path.exists(socket_path):
+            if ping(socket_path):
+                print(f"❌ Ya hay un daemon escuchando en {socket_path}")
+                return 1
+            os.remove(socket_path)
+        self.rebuild()
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                # Conexión persistente: una petición JSON por línea, una respuesta por línea
+                for line in self.rfile:
+                    if line.strip():
+                        self.wfile.write(daemon.respond(line))
+                        self.wfile.flush()
+                    if daemon.stopped.is_set():
+                        break
+
+        server = socketserver.ThreadingUnixStreamServer(socket_path, Handler)
+        server.daemon_threads = True
+        os.chmod(socket_path, 0o600)
+        threading.Thread(target=self.watch, daemon=True).start()
+        threading.Thread(target=lambda: (self.stopped.wait(), server.shutdown()), daemon=True).start()
+        print(f"🚀 Escuchando en {socket_path}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stopped.set()
+            server.server_close()
+            if os.path.exists(socket_path):
+                os.remove(socket_path)
+        return 0
+
+
+# =========
+#  Cliente
+# =========
+def query(socket_path: str, request: Dict, timeout: float = 5.0) -> Dict:
+    """Envía una petición al daemon y devuelve la respuesta decodificada."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(socket_path)
+        sock.sendall(json.dumps(request).encode('utf-8') + b"\n")
+        with sock.makefile('rb') as f:
+            return json.loads(f.readline())
+
+
+def ping(socket_path: str) -> bool:
+    """True si hay un daemon respondiendo en `socket_path`."""
+    try:
+        return 'error' not in query(socket_path, {'op': 'status'}, timeout=1.0)
+    except (OSError, ValueError):
+        return False
+
+
+def format_response(op: str, response: Dict) -> str:
+    """Salida legible de una respuesta para la terminal."""
+    if 'error' in response:
+        return f"❌ {response['error']}\n"
+    results = response.get('results')
+    out: List[str] = []
+    if op in ('lookup', 'prefix', 'search'):
+        for r in results:
+            modes = ','.join(r['modes']) or 'Normal'
+            out.append(f"{r['key']:<20} {modes:<16} {r['description'] or r['action']}  ({r['file']}:{r['line']})\n")
+        if not results:
+            out.append("(sin resultados)\n")
+    elif op == 'conflicts':
+        for c in results:
+            out.append(f"{c['key']} [{c['mode']}]\n")
+            for a in c['actions']:
+                locations = ', '.join(f"{loc['file']}:{loc['line']}" for loc in a['locations'])
+                out.append(f"    {a['action']} — {locations}\n")
+        if not results:
+            out.append("No se detectaron conflictos.\n")
+    elif op == 'free':
+        for mode, free in results.items():
+            out.append(f"{mode}:\n")
+            for fk in free:
+                out.append(f"    {fk['key']:<16} {fk['score']:>5.2f}  {', '.join(fk['reasons'])}\n")
+    else:
+        out.append(json.dumps({k: v for k, v in response.items() if k not in ('took_us', 'ok')},
+                              ensure_ascii=False) + "\n")
+    return ''.join(out)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Cliente del daemon de keybindings (update_keybindings.py serve).")
+    parser.add_argument('--socket', default=default_socket_path(), help="Ruta del socket del daemon")
+    parser.add_argument('--json', action='store_true', help="Imprime la respuesta JSON tal cual")
+    ops = parser.add_subparsers(dest='op', metavar='OPERACIÓN', required=True)
+    lookup = ops.add_parser('lookup', help="Atajos de una secuencia exacta")
+    lookup.add_argument('key')
+    prefix = ops.add_parser('prefix', help="Atajos bajo un prefijo")
+    prefix.add_argument('prefix')
+    search = ops.add_parser('search', help="Busca texto en tecla, descripción, acción o archivo")
+    search.add_argument('text', nargs='+')
+    ops.add_parser('conflicts', help="Teclas con varias acciones en el mismo modo")
+    free = ops.add_parser('free', help="Secuencias libres")
+    free.add_argument('--prefix', default='<leader>')
+    free.add_argument('--depth', type=int, default=2)
+    free.add_argument('--alphabet', default=None)
+    free.add_argument('--related', default='')
+    for sub in (lookup, prefix, search, ops.choices['conflicts'], free):
+        sub.add_argument('--mode', default=None, help="Modos separados por comas (n, v, i, ...)")
+    for sub in (prefix, search, free):
+        sub.add_argument('--limit', type=int, default=None)
+    for name, help_text in (('status', "Estado del índice"), ('reload', "Fuerza una reextracción"),
+                            ('stop', "Detiene el daemon")):
+        ops.add_parser(name, help=help_text)
+    args = parser.parse_args(argv)
+
+    request = {key: value for key, value in vars(args).items()
+               if key not in ('socket', 'json') and value is not None}
+    if args.op == 'search':
+        request['text'] = ' '.join(args.text)
+    try:
+        response = query(args.socket, request)
+    except OSError as e:
+        print(f"❌ No hay daemon en {args.socket} ({e}). Arráncalo con: python3 scripts/update_keybindings.py serve")
+        return 2
+    if args.json:
+        print(json.dumps(response, ensure_ascii=False))
+    else:
+        sys.stdout.write(format_response(args.op, response))
+    return 1 if 'error' in response else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
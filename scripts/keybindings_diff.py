@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+Arnés diferencial: compara un motor de extracción candidato con el de referencia.
+
+El motor de referencia es KeybindingExtractor (regex); cualquier motor más rápido
+debe producir exactamente lo mismo o la documentación cambia. Para cada entrada se
+ejecutan ambos motores y se comparan:
+- los Keybinding extraídos, campo a campo (modos, acción, descripción, contexto),
+  emparejados por línea y tecla;
+- el markdown renderizado a partir de cada lista (diff unificado).
+
+Entradas:
+- repo: cada archivo .lua del repositorio y la documentación completa;
+- sintético: los generadores de keybindings_corpus.py con tamaño N;
+- fuzz: mutaciones aleatorias (semilla fija) de los archivos del repositorio:
+  llaves sin cerrar, strings largas, llamadas comentadas, truncados...
+
+Junto a las diferencias se muestra el tiempo de cada motor y el speedup
+(referencia / candidato). Cada entrada se clasifica en una categoría:
+- registros perdidos: el candidato no produce algún registro que la referencia sí
+  encuentra, también con entrada inválida (error);
+- diferencias: los motores no coinciden (error);
+- excepción: algún motor lanzó una excepción; se informa y se sigue (error);
+- aceptadas: sólo difieren registros de ACCEPTED_DIVERGENCES, documentados abajo;
+- entrada inválida: el contenido no es Lua válido para lua_ast (fuzz, casos
+  patológicos) y no se pierde ningún registro; cada motor se recupera a su manera
+  y el resto de diferencias se informan sin contar como error.
+Sale con código 1 si hay alguna entrada con registros perdidos, diferencias o
+excepciones.
+
+El motor ast paga el tokenizado y el parseo completos de cada archivo, así que por
+archivo suelto es varias veces más lento que los regex; en la extracción completa
+el parseo se comparte con el grafo de módulos y la fila "documento completo" es la
+que mide el coste real.
+
+Uso:
+    python3 scripts/keybindings_diff.py [--candidate ast] [--size N] [--mutants N] [--seed S]
+"""
+
+import os
+import sys
+import time
+import random
+import difflib
+import argparse
+import contextlib
+import io
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import lua_ast
+from keybindings_corpus import CASES, time_extraction
+
+# Campos que se comparan en cada par de registros emparejados
+COMPARED_FIELDS = ('modes', 'action', 'description', 'context')
+
+# Divergencias conocidas entre regex y ast, (archivo, tecla) -> motivo. Sólo cubren
+# diferencias de campos (acción, descripción...), nunca registros que falten en un lado.
+ACCEPTED_DIVERGENCES: Dict[Tuple[str, str], str] = {
+    ('lua/plugins/ui/gitsigns.lua', ']e'):
+        "ast toma desc de las opciones tras el callback multilínea; regex usa el comentario previo",
+    ('lua/plugins/ui/gitsigns.lua', '[e'):
+        "ast toma desc de las opciones tras el callback multilínea; regex usa el comentario previo",
+}
+
+# Categorías de una entrada; las de ERROR_CATEGORIES hacen fallar el arnés
+CATEGORY_OK = ""
+CATEGORY_LOST = "registros perdidos"
+CATEGORY_DIFFERENT = "diferencias"
+CATEGORY_EXCEPTION = "excepción"
+CATEGORY_ACCEPTED = "aceptadas"
+CATEGORY_INVALID = "entrada inválida"
+ERROR_CATEGORIES = (CATEGORY_LOST, CATEGORY_DIFFERENT, CATEGORY_EXCEPTION)
+
+
+class Difference(NamedTuple):
+    """Diferencia entre registros emparejados; `field` es None si falta en un lado."""
+    file_path: str
+    line: int
+    key: str
+    field: Optional[str]
+    text: str
+    # El registro sólo está en la referencia: el candidato lo perdió
+    lost: bool = False
+
+
+def record_key(kb) -> Tuple[int, str]:
+    return kb.line_number, kb.key
+
+
+def diff_records(reference: List, candidate: List) -> List[Difference]:
+    """Diferencias campo a campo entre dos listas de Keybinding (emparejadas por línea y tecla)."""
+    pending: Dict[Tuple[int, str], List] = {}
+    for kb in candidate:
+        pending.setdefault(record_key(kb), []).append(kb)
+    out: List[Difference] = []
+    for kb in reference:
+        matches = pending.get(record_key(kb))
+        if not matches:
+            out.append(Difference(kb.file_path, kb.line_number, kb.key, None,
+                                  f"L{kb.line_number} {kb.key}: sólo en referencia", lost=True))
+            continue
+        other = matches.pop(0)
+        for name in COMPARED_FIELDS:
+            ref_value, cand_value = getattr(kb, name), getattr(other, name)
+            if ref_value != cand_value:
+                out.append(Difference(kb.file_path, kb.line_number, kb.key, name,
+                                      f"L{kb.line_number} {kb.key}: {name} {ref_value!r} != {cand_value!r}"))
+    for matches in pending.values():
+        for kb in matches:
+            out.append(Difference(kb.file_path, kb.line_number, kb.key, None,
+                                  f"L{kb.line_number} {kb.key}: sólo en candidato"))
+    return out
+
+
+def is_valid_lua(content: str) -> bool:
+    """True si lua_ast parsea el contenido sin errores de sintaxis."""
+    try:
+        return not lua_ast.parse_tolerant(content)[1]
+    except Exception:
+        return False
+
+
+def diff_markdown(reference: str, candidate: str, label: str) -> List[str]:
+    """Líneas cambiadas (+/-) del diff unificado entre dos documentos."""
+    diff = difflib.unified_diff(
+        reference.splitlines(), candidate.splitlines(),
+        fromfile=f"{label} (referencia)", tofile=f"{label} (candidato)", lineterm="",
+    )
+    return [line for line in diff if line[:1] in '+-' and not line.startswith(('+++', '---'))]
+
+
+# ===========
+#  Mutaciones
+# ===========
+def unclosed_brace(rng: random.Random, content: str) -> str:
+    pos = rng.randrange(len(content) + 1)
+    return content[:pos] + "{" + content[pos:]
+
+
+def long_string(rng: random.Random, content: str) -> str:
+    lines = content.split('\n')
+    at = rng.randrange(len(lines) + 1)
+    closed = rng.random() < 0.5
+    literal = "local s = [[" + "x" * rng.randrange(1000, 20000) + ("]]" if closed else "")
+    return '\n'.join(lines[:at] + [literal] + lines[at:])
+
+
+def commented_call(rng: random.Random, content: str) -> str:
+    lines = content.split('\n')
+    calls = [i for i, line in enumerate(lines) if 'map(' in line or 'keymap.set(' in line or 'desc' in line]
+    if not calls:
+        calls = list(range(len(lines)))
+    at = rng.choice(calls)
+    lines[at] = "-- " + lines[at]
+    return '\n'.join(lines)
+
+
+def truncated(rng: random.Random, content: str) -> str:
+    return content[:rng.randrange(len(content) + 1)]
+
+
+def stray_paren(rng: random.Random, content: str) -> str:
+    pos = rng.randrange(len(content) + 1)
+    return content[:pos] + rng.choice("()") + content[pos:]
+
+
+def unclosed_quote(rng: random.Random, content: str) -> str:
+    pos = rng.randrange(len(content) + 1)
+    return content[:pos] + rng.choice("'\"") + content[pos:]
+
+
+MUTATIONS: Dict[str, Callable[[random.Random, str], str]] = {
+    'unclosed_brace': unclosed_brace,
+    'long_string': long_string,
+    'commented_call': commented_call,
+    'truncated': truncated,
+    'stray_paren': stray_paren,
+    'unclosed_quote': unclosed_quote,
+}
+
+
+def fuzz_inputs(files: List[Tuple[str, str]], mutants: int, seed: int) -> List[Tuple[str, str, str]]:
+    """(etiqueta, archivo, contenido) de `mutants` mutaciones deterministas de los archivos dados."""
+    rng = random.Random(seed)
+    names = sorted(MUTATIONS)
+    out = []
+    for i in range(mutants):
+        rel_path, content = rng.choice(files)
+        mutation = rng.choice(names)
+        out.append((f"{mutation}#{i}:{rel_path}", rel_path, MUTATIONS[mutation](rng, content)))
+    return out
+
+
+# =======
+#  Arnés
+# =======
+class DifferentialHarness:
+    """Ejecuta referencia y candidato sobre cada entrada y acumula diferencias y tiempos."""
+
+    def __init__(self, reference, candidate, show: int = 5):
+        self.reference = reference
+        self.candidate = candidate
+        self.show = show
+        self.rows: List[Tuple[str, str, int, int, int, float, float, str]] = []
+
+    def render(self, extractor, keybindings: List) -> str:
+        return extractor.generate_documentation(extractor.dedupe_keybindings(list(keybindings)))
+
+    def run_engine(self, extractor, file_path: str, content: str) -> Tuple[float, List, str]:
+        """(tiempo, keybindings, markdown) de un motor sobre un contenido."""
+        elapsed, _ = time_extraction(extractor, file_path, content)
+        with contextlib.redirect_stdout(io.StringIO()):
+            kbs = extractor.extract_keybindings_from_content(file_path, content)
+            return elapsed, kbs, self.render(extractor, kbs)
+
+    def run_repository(self, extractor) -> Tuple[float, List, str]:
+        """(tiempo, keybindings, markdown) de la extracción completa del repositorio, en frío."""
+        extractor.reset_caches()
+        with contextlib.redirect_stdout(io.StringIO()):
+            started = time.perf_counter()
+            kbs = extractor.extract_all_keybindings()
+            elapsed = time.perf_counter() - started
+            return elapsed, kbs, extractor.generate_documentation(kbs)
+
+    def compare(self, source: str, label: str, file_path: str, content: str):
+        self.compare_runs(source, label, lambda extractor: self.run_engine(extractor, file_path, content),
+                          valid=is_valid_lua(content))
+
+    def compare_repository(self):
+        """Extracción completa del repositorio y documento markdown final."""
+        self.compare_runs("repo", "(documento completo)", self.run_repository, valid=True,
+                          doc_label="docs/keybindings.md")
+
+    def compare_runs(self, source: str, label: str, run: Callable, valid: bool, doc_label: Optional[str] = None):
+        """Ejecuta ambos motores (una excepción de cualquiera es una categoría más) y clasifica."""
+        results = []
+        errors: List[str] = []
+        for role, extractor in (("referencia", self.reference), ("candidato", self.candidate)):
+            try:
+                results.append(run(extractor))
+            except Exception as e:
+                errors.append(f"excepción en {role}: {type(e).__name__}: {e}")
+                results.append((0.0, [], ""))
+        (t_ref, ref_kbs, ref_doc), (t_cand, cand_kbs, cand_doc) = results
+        if errors:
+            self.report(source, label, len(ref_kbs), len(cand_kbs), errors, t_ref, t_cand, CATEGORY_EXCEPTION)
+            return
+        records = diff_records(ref_kbs, cand_kbs)
+        differences = [d.text for d in records] + diff_markdown(ref_doc, cand_doc, doc_label or label)
+        if not differences:
+            category = CATEGORY_OK
+        elif any(d.lost for d in records):
+            category = CATEGORY_LOST
+        elif not valid:
+            category = CATEGORY_INVALID
+        elif records and all(self.accepted(d) for d in records):
+            # El markdown sólo puede diferir por esos mismos registros
+            category = CATEGORY_ACCEPTED
+        else:
+            category = CATEGORY_DIFFERENT
+        self.report(source, label, len(ref_kbs), len(cand_kbs), differences, t_ref, t_cand, category)
+
+    def accepted(self, difference: Difference) -> bool:
+        """True si es una diferencia de campo documentada en ACCEPTED_DIVERGENCES."""
+        rel_path = os.path.relpath(difference.file_path, self.reference.repo_root).replace(os.sep, '/')
+        return difference.field is not None and (rel_path, difference.key) in ACCEPTED_DIVERGENCES
+
+    def report(self, source: str, label: str, ref_count: int, cand_count: int, differences: List[str],
+               t_ref: float, t_cand: float, category: str = CATEGORY_DIFFERENT):
+        speedup = t_ref / t_cand if t_cand > 0 else 0.0
+        mark = "❌" if category in ERROR_CATEGORIES else "ℹ️ "
+        status = f"  {mark} {len(differences)} {category}" if differences else ""
+        print(f"{source:<10} {label[:48]:<48} {ref_count:>5} {cand_count:>5} "
+              f"{t_ref:>8.4f} {t_cand:>8.4f} {speedup:>7.2f}x{status}")
+        for line in differences[:self.show]:
+            print(f"{'':<11}{line}")
+        if len(differences) > self.show:
+            print(f"{'':<11}... y {len(differences) - self.show} más")
+        self.rows.append((source, label, ref_count, cand_count, len(differences), t_ref, t_cand,
+                          category if differences else CATEGORY_OK))
+
+    def summary(self) -> bool:
+        """Imprime el resumen por fuente; True si ninguna entrada tuvo registros perdidos, diferencias ni excepciones."""
+        print()
+        for source in dict.fromkeys(row[0] for row in self.rows):
+            rows = [row for row in self.rows if row[0] == source]
+            t_ref = sum(row[5] for row in rows)
+            t_cand = sum(row[6] for row in rows)
+            speedup = t_ref / t_cand if t_cand > 0 else 0.0
+            counts = ", ".join(f"{sum(1 for row in rows if row[7] == category)} con {category}"
+                               for category in (CATEGORY_LOST, CATEGORY_DIFFERENT, CATEGORY_EXCEPTION,
+                                                CATEGORY_ACCEPTED, CATEGORY_INVALID))
+            print(f"{source}: {len(rows)} entradas ({counts}), "
+                  f"referencia {t_ref:.3f}s, candidato {t_cand:.3f}s, speedup {speedup:.2f}x")
+        return not any(row[7] in ERROR_CATEGORIES for row in self.rows)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from update_keybindings import ENGINES, KeybindingExtractor
+
+    parser = argparse.ArgumentParser(description="Compara un motor de extracción con el de referencia (regex).")
+    parser.add_argument('--candidate', choices=sorted(ENGINES), default='ast', help="Motor candidato")
+    parser.add_argument('--sources', default='repo,synthetic,fuzz',
+                        help="Entradas separadas por comas: repo, synthetic, fuzz")
+    parser.add_argument('--size', type=int, default=200, help="Tamaño N de los casos sintéticos")
+    parser.add_argument('--mutants', type=int, default=50, help="Número de mutaciones del corpus fuzz")
+    parser.add_argument('--seed', type=int, default=0, help="Semilla de las mutaciones")
+    parser.add_argument('--show', type=int, default=5, help="Diferencias a mostrar por entrada")
+    args = parser.parse_args(argv)
+    sources = [name.strip() for name in args.sources.split(',') if name.strip()]
+
+    reference = KeybindingExtractor()
+    harness = DifferentialHarness(reference, ENGINES[args.candidate](), show=args.show)
+    files = []
+    for file_path in reference.find_lua_files():
+        with open(file_path, 'r', encoding='utf-8') as f:
+            files.append((os.path.relpath(file_path, reference.repo_root), f.read()))
+
+    print(f"{'fuente':<10} {'entrada':<48} {'ref':>5} {'cand':>5} {'t_ref':>8} {'t_cand':>8} {'speedup':>8}")
+    if 'repo' in sources:
+        for rel_path, content in files:
+            harness.compare('repo', rel_path, os.path.join(reference.repo_root, rel_path), content)
+        harness.compare_repository()
+    if 'synthetic' in sources:
+        # Los casos se evalúan como si fueran pickme.lua, igual que en keybindings_corpus.py
+        file_path = os.path.join(reference.repo_root, 'lua', 'plugins', 'tools', 'pickme.lua')
+        for name, generate in CASES.items():
+            harness.compare('synthetic', f"{name} (N={args.size})", file_path, generate(args.size))
+    if 'fuzz' in sources and files:
+        for label, rel_path, content in fuzz_inputs(files, args.mutants, args.seed):
+            harness.compare('fuzz', label, os.path.join(reference.repo_root, rel_path), content)
+
+    if harness.summary():
+        print(f"✅ El motor '{args.candidate}' produce la salida de referencia (salvo divergencias aceptadas)")
+        return 0
+    print(f"❌ El motor '{args.candidate}' difiere de la referencia")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Analizador de oportunidades de carga diferida (lazy-loading) de plugins.
+
+Cruza las specs de lazy.nvim (lazy_specs.PluginSpecIndex) con los keybindings
+extraídos. Cada atajo se enlaza con el plugin que invoca:
+
+- comando: ':Spectre<cr>', '<cmd>PickMe files<cr>' -> el plugin que declara ese
+  cmd o, si ninguno lo declara, aquel cuyo nombre es prefijo del comando
+  (LualineBuffersJump1 -> lualine.nvim);
+- módulo: require('gitlinker'), :lua Snacks.explorer() -> el plugin de ese nombre;
+- configuración: atajos definidos en el módulo de config del plugin
+  (config = load_config('tools.tdo') -> lua/plugins/tools/tdo.lua). Sólo existen
+  después de cargarlo, así que se informan pero no proponen disparadores.
+
+Con esos enlaces el informe:
+- propone `keys = {...}` / `cmd = {...}` para los plugins que hoy se cargan al
+  arrancar (lazy = false) o por evento (VeryLazy, BufReadPost...) y que se usan a
+  través de atajos, con la lista exacta de teclas;
+- comprueba cada entrada `keys = { ... }` existente contra los atajos definidos,
+  y los atajos que invocan por comando un plugin diferido sin que ninguna de sus
+  teclas o comandos lo cargue (un require del módulo ya lo carga).
+
+Se usa con `update_keybindings.py lazy-report [--json RUTA]`. Este módulo no
+importa update_keybindings.
+"""
+
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from lazy_specs import PluginSpec, PluginSpecIndex
+
+
+# Los plugins con esta prioridad o más (temas, UI temprana) no se proponen como diferidos
+EAGER_PRIORITY = 1000
+# Los comandos de usuario (los de los plugins) empiezan por mayúscula; los internos no
+_COMMAND_RE = re.compile(r"^\s*(?::|<[cC][mM][dD]>)\s*(?:silent!?\s+)?([A-Z][A-Za-z0-9_]*)")
+_REQUIRE_RE = re.compile(r"require\s*\(?\s*['\"]([\w.-]+)['\"]")
+_LUA_GLOBAL_RE = re.compile(r"(?::|<cmd>)\s*lua\s+([A-Z][A-Za-z0-9_]*)\s*[.:]")
+# Modos de Neovim a partir de los nombres de la documentación
+VIM_MODES = {
+    'Normal': 'n', 'Visual': 'v', 'Select': 's', 'Insert': 'i',
+    'Terminal': 't', 'Command': 'c', 'Operator': 'o',
+}
+
+
+@dataclass
+class PluginLink:
+    """Atajo enlazado con un plugin: cómo (command/module/config) y con qué comando."""
+    key: str
+    modes: List[str]
+    file: str
+    line: int
+    via: str
+    command: Optional[str] = None
+
+
+@dataclass
+class LazyPluginReport:
+    """Resultado del análisis de un plugin."""
+    name: str
+    line: int
+    loading: str
+    links: List[PluginLink] = field(default_factory=list)
+    suggested_keys: List[str] = field(default_factory=list)
+    suggested_cmds: List[str] = field(default_factory=list)
+    caveats: List[str] = field(default_factory=list)
+    keys_check: List[Tuple[str, str]] = field(default_factory=list)
+    uncovered: List[PluginLink] = field(default_factory=list)
+
+
+def default_lazy(repo_root: str) -> bool:
+    """Valor de `defaults = { lazy = ... }` en lua/plugins/lazy.lua (false si no se indica, como lazy.nvim)."""
+    try:
+        with open(os.path.join(repo_root, 'lua', 'plugins', 'lazy.lua'), 'r', encoding='utf-8') as f:
+            match = re.search(r"defaults\s*=\s*\{[^}]*\blazy\s*=\s*(true|false)", f.read())
+    except OSError:
+        return False
+    return bool(match) and match.group(1) == 'true'
+
+
+def lazy_key_spec(key: str, modes: List[str]) -> str:
+    """Entrada de keys en sintaxis Lua: '<leader>x' o { '<leader>x', mode = { 'n', 'v' } }."""
+    vim_modes = [VIM_MODES.get(m, m) for m in modes] or ['n']
+    if vim_modes == ['n']:
+        return f"'{key}'"
+    return f"{{ '{key}', mode = {{ {', '.join(repr(m) for m in vim_modes)} }} }}"
+
+
+class LazyLoadAnalyzer:
+    """Enlaza keybindings con specs de plugins y calcula propuestas y comprobaciones."""
+
+    def __init__(self, index: PluginSpecIndex, keybindings: List, canonicalizer, repo_root: str,
+                 lazy_by_default: bool = False):
+        self.index = index
+        self.keybindings = keybindings
+        self.canonicalizer = canonicalizer
+        self.repo_root = repo_root
+        self.lazy_by_default = lazy_by_default
+        self.dependents = index.dependents()
+        self._by_command: Dict[str, PluginSpec] = {}
+        for spec in index.specs:
+            for cmd in spec.cmds:
+                self._by_command.setdefault(cmd, spec)
+        self._by_config_file = {
+            os.path.normpath(spec.config_file(repo_root)): spec for spec in index.specs if spec.config_module
+        }
+
+    def rel_path(self, file_path: str) -> str:
+        return os.path.relpath(file_path, self.repo_root).replace(os.sep, '/')
+
+    def loading(self, spec: PluginSpec) -> str:
+        """Cómo se carga hoy: eager, event, cmd/keys/ft, dependency o require."""
+        triggers = spec.triggers
+        if spec.lazy is False or (spec.lazy is None and not self.lazy_by_default and not triggers):
+            return 'eager'
+        if triggers:
+            return '+'.join(triggers)
+        if spec.name in self.dependents:
+            return 'dependency'
+        return 'require'
+
+    def plugin_for_name(self, name: str, prefix: bool = False) -> Optional[PluginSpec]:
+        """Spec cuyo nombre coincide con `name` (o es prefijo suyo, para comandos)."""
+        return self.index.find(name, prefix=prefix)
+
+    def link(self, kb) -> Optional[Tuple[PluginSpec, PluginLink]]:
+        """Plugin invocado por un keybinding (o en cuya config se define); None si ninguno."""
+        make = lambda via, command=None: PluginLink(kb.key, list(kb.modes), self.rel_path(kb.file_path),
+                                                   kb.line_number, via, command)
+        action = kb.action or ""
+        global_match = _LUA_GLOBAL_RE.search(action)
+        if global_match:
+            spec = self.plugin_for_name(global_match.group(1))
+            if spec is not None:
+                return spec, make('module')
+        command_match = _COMMAND_RE.match(action)
+        if command_match:
+            command = command_match.group(1)
+            spec = self._by_command.get(command) or self.plugin_for_name(command, prefix=True)
+            if spec is not None:
+                return spec, make('command', command)
+        require_match = _REQUIRE_RE.search(action)
+        if require_match:
+            spec = self.plugin_for_name(require_match.group(1).split('.')[0])
+            if spec is not None:
+                return spec, make('module')
+        spec = self._by_config_file.get(os.path.normpath(kb.file_path))
+        if spec is not None:
+            return spec, make('config')
+        return None
+
+    def analyze(self) -> List[LazyPluginReport]:
+        reports = {
+            spec.name: LazyPluginReport(spec.name, spec.line, self.loading(spec)) for spec in self.index.specs
+        }
+        specs = self.index.by_name()
+        defined: Dict[str, List[str]] = {}
+        spec_file = os.path.normpath(self.index.file_path)
+        for kb in self.keybindings:
+            if os.path.normpath(kb.file_path) == spec_file:
+                # Las propias entradas `keys =` de la lista: no definen el atajo ni enlazan plugins
+                continue
+            location = f"{self.rel_path(kb.file_path)}:{kb.line_number}"
+            defined.setdefault(self.canonicalizer.canonical(kb.key), []).append(location)
+            linked = self.link(kb)
+            if linked is not None:
+                spec, link = linked
+                reports[spec.name].links.append(link)
+
+        for name, report in reports.items():
+            spec = specs[name]
+            triggers = [link for link in report.links if link.via != 'config']
+            self._suggest(spec, report, triggers)
+            self._check_keys(spec, report, triggers, defined)
+        return list(reports.values())
+
+    def _suggest(self, spec: PluginSpec, report: LazyPluginReport, triggers: List[PluginLink]):
+        loaded_early = report.loading == 'eager' or 'event' in spec.triggers
+        if not triggers or not loaded_early:
+            return
+        if spec.priority is not None and spec.priority >= EAGER_PRIORITY:
+            report.caveats.append(f"priority = {spec.priority}: se carga pronto a propósito, no se propone")
+            return
+        seen = set()
+        for link in triggers:
+            entry = lazy_key_spec(link.key, link.modes)
+            if entry not in seen:
+                seen.add(entry)
+                report.suggested_keys.append(entry)
+        commands = list(spec.cmds) + [l.command for l in triggers if l.command and l.command not in spec.cmds]
+        report.suggested_cmds = list(dict.fromkeys(commands))
+        if spec.events:
+            report.caveats.append(
+                f"hoy se carga con event = {spec.events}: comprueba que no se use por sus efectos "
+                "al abrir buffers (UI, signos, autocmds)"
+            )
+        for dependent in self.dependents.get(spec.name, []):
+            report.caveats.append(f"es dependencia de {dependent}: se cargará también con ese plugin")
+        if spec.config_module:
+            config_keys = [l for l in report.links if l.via == 'config']
+            if config_keys:
+                report.caveats.append(
+                    f"{len(config_keys)} atajos se definen en {spec.config_module}: sólo existen tras cargarlo"
+                )
+
+    def _check_keys(self, spec: PluginSpec, report: LazyPluginReport, triggers: List[PluginLink],
+                    defined: Dict[str, List[str]]):
+        spec_keys = {self.canonicalizer.canonical(key.lhs) for key in spec.keys}
+        for key in spec.keys:
+            locations = defined.get(self.canonicalizer.canonical(key.lhs), [])
+            if key.rhs is not None:
+                status = "mapeo definido en la propia spec"
+            elif locations:
+                status = f"definido en {', '.join(locations[:3])}"
+            else:
+                status = "sin atajo definido: la tecla carga el plugin pero no hace nada conocido"
+            report.keys_check.append((key.lhs, status))
+        if report.loading in ('eager',) or 'event' in spec.triggers:
+            return
+        # Plugin diferido: ¿cada atajo que lo invoca lo carga (por su tecla o por su comando)?
+        for link in triggers:
+            if self.canonicalizer.canonical(link.key) in spec_keys:
+                continue
+            if link.command and link.command in spec.cmds:
+                continue
+            if link.via == 'module':
+                # lazy.nvim carga el plugin al hacer require de su módulo
+                continue
+            report.uncovered.append(link)
+
+
+def format_report(reports: List[LazyPluginReport]) -> str:
+    """Informe markdown: tabla de plugins, propuestas y comprobaciones de keys."""
+    out: List[str] = ["### Plugins y atajos enlazados\n\n",
+                      "| Plugin | Carga | Atajos (comando/módulo) | Atajos en su config |\n",
+                      "|--------|-------|------------------------:|--------------------:|\n"]
+    for report in reports:
+        triggers = sum(1 for link in report.links if link.via != 'config')
+        config = len(report.links) - triggers
+        out.append(f"| {report.name} | {report.loading} | {triggers} | {config} |\n")
+
+    out.append("\n### Propuestas de carga diferida\n\n")
+    suggestions = [r for r in reports if r.suggested_keys]
+    if not suggestions:
+        out.append("(sin propuestas)\n")
+    for report in suggestions:
+        out.append(f"- **{report.name}** (hoy: {report.loading})\n")
+        out.append(f"  - `keys = {{ {', '.join(report.suggested_keys)} }},`\n")
+        if report.suggested_cmds:
+            out.append(f"  - `cmd = {{ {', '.join(repr(c) for c in report.suggested_cmds)} }},`\n")
+        for caveat in report.caveats:
+            out.append(f"  - ⚠️ {caveat}\n")
+    skipped = [r for r in reports if r.caveats and not r.suggested_keys]
+    for report in skipped:
+        out.append(f"- {report.name}: {'; '.join(report.caveats)}\n")
+
+    out.append("\n### Comprobación de `keys =` existentes\n\n")
+    checked = [r for r in reports if r.keys_check or r.uncovered]
+    if not checked:
+        out.append("(ninguna spec declara keys)\n")
+    for report in checked:
+        out.append(f"- **{report.name}**\n")
+        for lhs, status in report.keys_check:
+            mark = "❌" if status.startswith("sin atajo") else "✅"
+            out.append(f"  - {mark} `{lhs}`: {status}\n")
+        for link in report.uncovered:
+            out.append(f"  - ⚠️ `{link.key}` ({link.file}:{link.line}) invoca el plugin pero no está en keys "
+                       f"ni su comando en cmd: no lo carga\n")
+    return ''.join(out)
+
+
+def report_json(reports: List[LazyPluginReport]) -> Dict:
+    """Versión serializable del informe."""
+    return {
+        'plugins': [
+            {
+                'name': r.name,
+                'line': r.line,
+                'loading': r.loading,
+                'links': [vars(link) for link in r.links],
+                'suggested_keys': r.suggested_keys,
+                'suggested_cmds': r.suggested_cmds,
+                'caveats': r.caveats,
+                'keys_check': [{'lhs': lhs, 'status': status} for lhs, status in r.keys_check],
+                'uncovered': [vars(link) for link in r.uncovered],
+            }
+            for r in reports
+        ]
+    }
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Índice de las especificaciones de plugins de lazy.nvim (lua/plugins/list.lua).
+
+list.lua declara una lista de specs de lazy.nvim:
+
+    {
+        '2kabhishek/nerdy.nvim',
+        cmd = { 'Nerdy' },
+        keys = { '<leader>in', '<leader>iN' },
+        config = load_config('tools.nerdy'),
+    },
+
+PluginSpecIndex recorre el AST una sola vez desde las tablas de nivel superior
+(`local plugins = { ... }` o el `return { ... }`) y reconoce cada spec por su
+primer valor posicional ('usuario/repo'). Las listas anidadas de specs se
+recorren; los campos (dependencies, opts...) no, así que una dependencia no se
+confunde con una spec. De cada spec se guardan lazy, priority, event, cmd, ft,
+keys (en sus tres formas: string, lista de strings y { lhs, rhs, desc = , mode = })
+y el módulo de configuración (config = load_config('tools.nerdy') -> plugins.tools.nerdy).
+
+Este módulo no importa update_keybindings.
+"""
+
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import lua_ast
+
+
+# Ruta por defecto de la lista de plugins, relativa a la raíz del repositorio
+DEFAULT_SPEC_FILE = os.path.join('lua', 'plugins', 'list.lua')
+# Funciones auxiliares de list.lua que devuelven un config: nombre -> prefijo del módulo cargado
+CONFIG_LOADERS = {'load_config': 'plugins.'}
+# Longitud mínima del nombre base para emparejar por prefijo (comandos)
+MIN_PREFIX_MATCH = 3
+# 'usuario/repo' (o 'usuario/repo.nvim')
+_REPO_RE = re.compile(r"^[\w.-]+/[\w.-]+$")
+
+
+@dataclass
+class LazyKey:
+    """Entrada de `keys =` de una spec: sólo el lhs o el mapeo completo."""
+    lhs: str
+    rhs: Optional[str] = None
+    desc: str = ""
+    modes: List[str] = field(default_factory=lambda: ['n'])
+    line: int = 0
+
+
+@dataclass
+class PluginSpec:
+    """Spec de un plugin de lazy.nvim con sus disparadores de carga."""
+    name: str
+    line: int
+    lazy: Optional[bool] = None
+    priority: Optional[int] = None
+    events: List[str] = field(default_factory=list)
+    cmds: List[str] = field(default_factory=list)
+    fts: List[str] = field(default_factory=list)
+    keys: List[LazyKey] = field(default_factory=list)
+    dependencies: List[str] = field(default_factory=list)
+    config_module: Optional[str] = None
+    main: Optional[str] = None
+
+    @property
+    def short_name(self) -> str:
+        return self.name.rsplit('/', 1)[-1]
+
+    @property
+    def base_name(self) -> str:
+        """Nombre normalizado para emparejar módulos y comandos: nvim-spectre -> spectre, co-author.nvim -> coauthor."""
+        name = self.short_name.lower()
+        name = re.sub(r"[.-]n?vim$", '', name)
+        name = re.sub(r"^n?vim-", '', name)
+        return re.sub(r"[^a-z0-9]", '', name)
+
+    @property
+    def triggers(self) -> List[str]:
+        """Disparadores de carga presentes: 'eager', 'event', 'cmd', 'keys', 'ft'."""
+        out = []
+        if self.lazy is False:
+            out.append('eager')
+        if self.events:
+            out.append('event')
+        if self.cmds:
+            out.append('cmd')
+        if self.keys:
+            out.append('keys')
+        if self.fts:
+            out.append('ft')
+        return out
+
+    def config_file(self, repo_root: str) -> Optional[str]:
+        """Archivo Lua del módulo de configuración (plugins.tools.nerdy -> lua/plugins/tools/nerdy.lua)."""
+        if not self.config_module:
+            return None
+        return os.path.join(repo_root, 'lua', *self.config_module.split('.')) + '.lua'
+
+
+def _strings(node: Optional[lua_ast.Node]) -> List[str]:
+    """'x' o { 'x', 'y' } -> lista de strings."""
+    if isinstance(node, lua_ast.Table):
+        values = [lua_ast.string_value(v) for v in lua_ast.positional_values(node)]
+        return [v for v in values if v]
+    value = lua_ast.string_value(node)
+    return [value] if value else []
+
+
+def _lazy_key(node: lua_ast.Node) -> Optional[LazyKey]:
+    """Una entrada de keys: '<leader>x' o { '<leader>x', rhs, desc = '...', mode = { 'n', 'v' } }."""
+    lhs = lua_ast.string_value(node)
+    if lhs is not None:
+        return LazyKey(lhs=lhs, line=node.line)
+    if not isinstance(node, lua_ast.Table):
+        return None
+    values = lua_ast.positional_values(node)
+    lhs = lua_ast.string_value(values[0]) if values else None
+    if not lhs:
+        return None
+    rhs = None
+    if len(values) > 1:
+        rhs = lua_ast.string_value(values[1])
+        if rhs is None and isinstance(values[1], lua_ast.Function):
+            rhs = "<función Lua>"
+    desc = lua_ast.string_value(lua_ast.table_field(node, 'desc')) or ""
+    modes = _strings(lua_ast.table_field(node, 'mode')) or ['n']
+    return LazyKey(lhs=lhs, rhs=rhs, desc=desc, modes=modes, line=node.line)
+
+
+def _config_module(node: Optional[lua_ast.Node]) -> Optional[str]:
+    """Módulo cargado por config: load_config('x') o function() require('x') end."""
+    if isinstance(node, lua_ast.Call):
+        name = lua_ast.dotted_name(node.func)
+        if name in CONFIG_LOADERS and len(node.args) == 1:
+            arg = lua_ast.string_value(node.args[0])
+            if arg:
+                return CONFIG_LOADERS[name] + arg
+    if isinstance(node, lua_ast.Function):
+        for child in _iter(node):
+            if isinstance(child, lua_ast.Call) and lua_ast.dotted_name(child.func) == 'require' and child.args:
+                return lua_ast.string_value(child.args[0])
+    return None
+
+
+def _iter(node: lua_ast.Node):
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        yield current
+        stack.extend(reversed(list(lua_ast.iter_children(current))))
+
+
+class PluginSpecIndex:
+    """Specs de plugins de un archivo de lista de lazy.nvim, en orden de declaración."""
+
+    def __init__(self, file_path: str, tree: lua_ast.Chunk):
+        self.file_path = file_path
+        self.specs: List[PluginSpec] = []
+        for statement in tree.body:
+            if isinstance(statement, (lua_ast.Local, lua_ast.Assign, lua_ast.Return)):
+                for value in statement.values:
+                    if isinstance(value, lua_ast.Table):
+                        self._collect(value, top_level=True)
+
+    @classmethod
+    def from_file(cls, file_path: str) -> 'PluginSpecIndex':
+        """Índice de un archivo; vacío si no existe o no se puede leer."""
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+        except OSError:
+            content = ""
+        tree, _errors = lua_ast.parse_tolerant(content)
+        return cls(file_path, tree)
+
+    @classmethod
+    def from_repo(cls, repo_root: str, spec_file: str = DEFAULT_SPEC_FILE) -> 'PluginSpecIndex':
+        return cls.from_file(os.path.join(repo_root, spec_file))
+
+    def _collect(self, table: lua_ast.Table, top_level: bool = False):
+        """Recorre una lista de specs: specs directas, strings 'usuario/repo' y listas anidadas."""
+        spec = self._spec(table)
+        if spec is not None:
+            self.specs.append(spec)
+            return
+        for value in lua_ast.positional_values(table):
+            name = lua_ast.string_value(value)
+            if name and _REPO_RE.match(name):
+                self.specs.append(PluginSpec(name=name, line=value.line))
+            elif isinstance(value, lua_ast.Table):
+                self._collect(value)
+        if top_level:
+            # { plugins = plugins } o { plugins = { ... } }: el valor puede ser la propia lista
+            for fld in table.fields:
+                if fld.kind != 'positional' and isinstance(fld.value, lua_ast.Table):
+                    self._collect(fld.value, top_level=True)
+
+    def _spec(self, table: lua_ast.Table) -> Optional[PluginSpec]:
+        values = lua_ast.positional_values(table)
+        name = lua_ast.string_value(values[0]) if values else None
+        if not name or not _REPO_RE.match(name):
+            return None
+        spec = PluginSpec(name=name, line=table.line)
+        lazy = lua_ast.table_field(table, 'lazy')
+        if isinstance(lazy, lua_ast.Boolean):
+            spec.lazy = lazy.value
+        priority = lua_ast.table_field(table, 'priority')
+        if isinstance(priority, lua_ast.Number):
+            try:
+                spec.priority = int(priority.raw, 0)
+            except ValueError:
+                pass
+        spec.events = _strings(lua_ast.table_field(table, 'event'))
+        spec.cmds = _strings(lua_ast.table_field(table, 'cmd'))
+        spec.fts = _strings(lua_ast.table_field(table, 'ft'))
+        keys = lua_ast.table_field(table, 'keys')
+        entries = [keys] if lua_ast.string_value(keys) is not None else lua_ast.positional_values(keys)
+        spec.keys = [key for key in (_lazy_key(entry) for entry in entries) if key is not None]
+        dependencies = lua_ast.table_field(table, 'dependencies')
+        spec.dependencies = [d for d in _strings(dependencies) if _REPO_RE.match(d)]
+        for dep in lua_ast.positional_values(dependencies):
+            if isinstance(dep, lua_ast.Table):
+                dep_values = lua_ast.positional_values(dep)
+                dep_name = lua_ast.string_value(dep_values[0]) if dep_values else None
+                if dep_name and _REPO_RE.match(dep_name):
+                    spec.dependencies.append(dep_name)
+        spec.config_module = _config_module(lua_ast.table_field(table, 'config'))
+        spec.main = lua_ast.string_value(lua_ast.table_field(table, 'main'))
+        return spec
+
+    def find(self, name: str, prefix: bool = False) -> Optional[PluginSpec]:
+        """Spec de un módulo o comando por nombre: 'spectre', 'nvim-web-devicons', 'Snacks'...
+
+        Se compara con el nombre base (nvim-spectre -> spectre), el nombre corto
+        normalizado y `main`; con prefix=True también vale un nombre base que sea
+        prefijo de `name` (LualineBuffersJump1 -> lualine), eligiendo el más largo.
+        """
+        normalized = re.sub(r"[^a-z0-9]", '', name.lower())
+        best = None
+        for spec in self.specs:
+            base = spec.base_name
+            if not base:
+                continue
+            if normalized in (base, re.sub(r"[^a-z0-9]", '', spec.short_name.lower())) \
+                    or (spec.main and name.split('.')[0] == spec.main):
+                return spec
+            if prefix and len(base) >= MIN_PREFIX_MATCH and normalized.startswith(base):
+                if best is None or len(base) > len(best.base_name):
+                    best = spec
+        return best
+
+    def by_name(self) -> Dict[str, PluginSpec]:
+        return {spec.name: spec for spec in self.specs}
+
+    def dependents(self) -> Dict[str, List[str]]:
+        """Plugin -> plugins que lo declaran como dependencia."""
+        out: Dict[str, List[str]] = {}
+        for spec in self.specs:
+            for dep in spec.dependencies:
+                out.setdefault(dep, []).append(spec.name)
+        return out
@@ -0,0 +1,1121 @@
+#!/usr/bin/env python3
+"""
+Parser de Lua (5.1/LuaJIT, con los operadores de 5.3) que produce un AST.
+
+El AST cubre la gramática completa de sentencias y expresiones, pero está
+pensado para extracción: las reglas de extracción se registran por tipo de nodo
+en un LuaWalker y un único recorrido del árbol alimenta a todas las reglas.
+
+Uso básico:
+
+    tree = parse(source)                     # lanza LuaSyntaxError
+    tree, errors = parse_tolerant(source)    # se recupera por sentencia y por campo de tabla
+    walker = LuaWalker()
+    walker.register(Call, on_call)
+    walker.walk(tree)
+"""
+
+import re
+import sys
+import time
+import bisect
+from dataclasses import dataclass, field
+from typing import Any, Callable, ClassVar, Dict, Iterator, List, NamedTuple, Optional, Tuple, Type
+
+
+class LuaSyntaxError(Exception):
+    """Error de sintaxis con posición (offset y línea) dentro del código fuente."""
+
+    def __init__(self, message: str, pos: int = 0, line: int = 0):
+        super().__init__(f"{message} (línea {line})" if line else message)
+        self.message = message
+        self.pos = pos
+        self.line = line
+        # False: la recuperación por campo de tabla no puede resincronizar (el error sube a la sentencia)
+        self.recoverable = True
+
+
+class ParseDeadlineExceeded(Exception):
+    """parse_tolerant superó su plazo (p.ej. un archivo enorme con un error por línea)."""
+
+
+# =========
+#  Tokens
+# =========
+KEYWORDS = frozenset({
+    'and', 'break', 'do', 'else', 'elseif', 'end', 'false', 'for', 'function',
+    'goto', 'if', 'in', 'local', 'nil', 'not', 'or', 'repeat', 'return', 'then',
+    'true', 'until', 'while',
+})
+
+# Operadores ordenados de mayor a menor longitud para el escaneo
+_OPERATORS = (
+    '...', '..', '==', '~=', '<=', '>=', '::', '//', '<<', '>>',
+    '+', '-', '*', '/', '%', '^', '#', '&', '~', '|', '<', '>', '=',
+    '(', ')', '{', '}', '[', ']', ';', ':', ',', '.',
+)
+
+# Alternativas en el mismo orden: la primera que coincide es la más larga posible
+_OPERATOR_RE = re.compile('|'.join(re.escape(op) for op in _OPERATORS))
+_SPACE_RE = re.compile(r"[ \t\r\n\f\v]+")
+_NAME_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+_NUMBER_RE = re.compile(
+    r"0[xX](?:[0-9a-fA-F]*\.?[0-9a-fA-F]*)(?:[pP][+-]?[0-9]+)?(?:ULL|LL|i)?"
+    r"|(?:[0-9]+\.?[0-9]*|\.[0-9]+)(?:[eE][+-]?[0-9]+)?(?:ULL|LL|i)?"
+)
+_LONG_OPEN_RE = re.compile(r"\[(=*)\[")
+_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'a': '\a', 'b': '\b', 'f': '\f', 'v': '\v',
+            '\\': '\\', '"': '"', "'": "'", '\n': '\n'}
+# Tokens entre dos comprobaciones del plazo en tokenize
+_DEADLINE_STRIDE = 4096
+
+
+class Token(NamedTuple):
+    """Token léxico. `value` es el texto decodificado para strings.
+
+    Es una tupla de valores atómicos: el recolector de basura deja de seguirla, así
+    que millones de tokens no encarecen cada recolección.
+    """
+    kind: str  # 'name' | 'keyword' | 'string' | 'number' | 'op' | 'eof'
+    value: str
+    start: int
+    end: int
+
+
+def _decode_escapes(raw: str) -> str:
+    """Decodifica las secuencias de escape de un string Lua entre comillas."""
+    if '\\' not in raw:
+        return raw
+    out: List[str] = []
+    i = 0
+    n = len(raw)
+    while i < n:
+        ch = raw[i]
+        if ch != '\\' or i + 1 >= n:
+            out.append(ch)
+            i += 1
+            continue
+        nxt = raw[i + 1]
+        if nxt in _ESCAPES:
+            out.append(_ESCAPES[nxt])
+            i += 2
+        elif nxt == 'x' and i + 3 < n + 1:
+            try:
+                out.append(chr(int(raw[i + 2:i + 4], 16)))
+            except ValueError:
+                out.append(raw[i + 2:i + 4])
+            i += 4
+        elif nxt == 'z':
+            i += 2
+            while i < n and raw[i].isspace():
+                i += 1
+        elif nxt == 'u' and i + 2 < n and raw[i + 2] == '{':
+            close = raw.find('}', i + 3)
+            if close == -1:
+                out.append(raw[i:])
+                break
+            try:
+                out.append(chr(int(raw[i + 3:close], 16)))
+            except ValueError:
+                out.append(raw[i:close + 1])
+            i = close + 1
+        elif nxt.isdigit():
+            j = i + 1
+            while j < n and j < i + 4 and raw[j].isdigit():
+                j += 1
+            out.append(chr(int(raw[i + 1:j]) % 256))
+            i = j
+        else:
+            out.append(nxt)
+            i += 2
+    return ''.join(out)
+
+
+def tokenize(source: str, deadline: Optional[float] = None) -> List[Token]:
+    """Convierte el código fuente en tokens, descartando comentarios.
+
+    Cada posición se consume una sola vez, por lo que el coste es lineal en el
+    tamaño del archivo (los cierres de strings largos y comentarios se buscan con
+    str.find desde la posición actual). Con `deadline` se comprueba el plazo cada
+    _DEADLINE_STRIDE tokens.
+    """
+    tokens: List[Token] = []
+    i = 0
+    n = len(source)
+    check_at = _DEADLINE_STRIDE if deadline is not None else -1
+    while i < n:
+        if len(tokens) == check_at:
+            check_at += _DEADLINE_STRIDE
+            if time.monotonic() > deadline:
+                raise ParseDeadlineExceeded(f"plazo de parseo agotado al tokenizar (offset {i})")
+        ch = source[i]
+        if ch in ' \t\r\n\f\v':
+            i = _SPACE_RE.match(source, i).end()
+            continue
+        # Comentarios: -- línea o --[[ bloque ]] / --[==[ bloque ]==]
+        if ch == '-' and source.startswith('--', i):
+            m_long = _LONG_OPEN_RE.match(source, i + 2)
+            if m_long:
+                close = source.find(']' + m_long.group(1) + ']', m_long.end())
+                i = n if close == -1 else close + len(m_long.group(1)) + 2
+            else:
+                nl = source.find('\n', i)
+                i = n if nl == -1 else nl + 1
+            continue
+        # Sólo identificadores ASCII (como Lua): una letra no ASCII es un carácter inesperado
+        m = _NAME_RE.match(source, i)
+        if m:
+            word = m.group(0)
+            tokens.append(Token('keyword' if word in KEYWORDS else 'name', word, i, m.end()))
+            i = m.end()
+            continue
+        if ch.isdigit() or (ch == '.' and i + 1 < n and source[i + 1].isdigit()):
+            m = _NUMBER_RE.match(source, i)
+            end = m.end() if m and m.end() > i else i + 1
+            tokens.append(Token('number', source[i:end], i, end))
+            i = end
+            continue
+        if ch in ('"', "'"):
+            j = i + 1
+            while j < n:
+                c = source[j]
+                if c == '\\':
+                    j += 2
+                    continue
+                if c == ch or c == '\n':
+                    break
+                j += 1
+            if j >= n or source[j] != ch:
+                raise LuaSyntaxError("string sin cerrar", i)
+            tokens.append(Token('string', _decode_escapes(source[i + 1:j]), i, j + 1))
+            i = j + 1
+            continue
+        if ch == '[':
+            m_long = _LONG_OPEN_RE.match(source, i)
+            if m_long:
+                closing = ']' + m_long.group(1) + ']'
+                close = source.find(closing, m_long.end())
+                if close == -1:
+                    raise LuaSyntaxError("string largo sin cerrar", i)
+                body = source[m_long.end():close]
+                # Lua descarta el primer salto de línea inmediato
+                if body.startswith('\r\n'):
+                    body = body[2:]
+                elif body.startswith('\n'):
+                    body = body[1:]
+                tokens.append(Token('string', body, i, close + len(closing)))
+                i = close + len(closing)
+                continue
+        m = _OPERATOR_RE.match(source, i)
+        if not m:
+            raise LuaSyntaxError(f"carácter inesperado {ch!r}", i)
+        tokens.append(Token('op', m.group(0), i, m.end()))
+        i = m.end()
+    tokens.append(Token('eof', '', n, n))
+    return tokens
+
+
+# ======
+#  AST
+# ======
+@dataclass
+class Node:
+    """Nodo base: offsets [start, end) en el código fuente y línea (1-based)."""
+    start: int = field(default=0, repr=False, compare=False)
+    end: int = field(default=0, repr=False, compare=False)
+    line: int = field(default=0, compare=False)
+
+    # Campos que contienen nodos hijos (nodo, lista de nodos o lista de tuplas)
+    _children: ClassVar[Tuple[str, ...]] = ()
+
+
+@dataclass
+class Chunk(Node):
+    body: List[Node] = field(default_factory=list)
+    _children = ('body',)
+
+
+# ----- Expresiones -----
+@dataclass
+class Nil(Node):
+    pass
+
+
+@dataclass
+class Boolean(Node):
+    value: bool = False
+
+
+@dataclass
+class Number(Node):
+    raw: str = ''
+
+
+@dataclass
+class String(Node):
+    value: str = ''
+
+
+@dataclass
+class Vararg(Node):
+    pass
+
+
+@dataclass
+class Name(Node):
+    id: str = ''
+
+
+@dataclass
+class Index(Node):
+    """obj[key] u obj.key (dotted=True)."""
+    obj: Optional[Node] = None
+    key: Optional[Node] = None
+    dotted: bool = False
+    _children = ('obj', 'key')
+
+
+@dataclass
+class Call(Node):
+    func: Optional[Node] = None
+    args: List[Node] = field(default_factory=list)
+    _children = ('func', 'args')
+
+
+@dataclass
+class MethodCall(Node):
+    obj: Optional[Node] = None
+    method: str = ''
+    args: List[Node] = field(default_factory=list)
+    _children = ('obj', 'args')
+
+
+@dataclass
+class Function(Node):
+    params: List[str] = field(default_factory=list)
+    is_vararg: bool = False
+    body: List[Node] = field(default_factory=list)
+    _children = ('body',)
+
+
+@dataclass
+class Field(Node):
+    """Campo de un constructor de tabla.
+
+    kind: 'positional' ({ v }), 'named' ({ name = v }) o 'keyed' ({ [k] = v }).
+    """
+    kind: str = 'positional'
+    name: str = ''
+    key: Optional[Node] = None
+    value: Optional[Node] = None
+    _children = ('key', 'value')
+
+
+@dataclass
+class Table(Node):
+    fields: List[Field] = field(default_factory=list)
+    _children = ('fields',)
+
+
+@dataclass
+class BinOp(Node):
+    op: str = ''
+    left: Optional[Node] = None
+    right: Optional[Node] = None
+    _children = ('left', 'right')
+
+
+@dataclass
+class UnOp(Node):
+    op: str = ''
+    operand: Optional[Node] = None
+    _children = ('operand',)
+
+
+@dataclass
+class Paren(Node):
+    expr: Optional[Node] = None
+    _children = ('expr',)
+
+
+# ----- Sentencias -----
+@dataclass
+class Local(Node):
+    names: List[str] = field(default_factory=list)
+    values: List[Node] = field(default_factory=list)
+    _children = ('values',)
+
+
+@dataclass
+class Assign(Node):
+    targets: List[Node] = field(default_factory=list)
+    values: List[Node] = field(default_factory=list)
+    _children = ('targets', 'values')
+
+
+@dataclass
+class CallStatement(Node):
+    call: Optional[Node] = None
+    _children = ('call',)
+
+
+@dataclass
+class Do(Node):
+    body: List[Node] = field(default_factory=list)
+    _children = ('body',)
+
+
+@dataclass
+class While(Node):
+    cond: Optional[Node] = None
+    body: List[Node] = field(default_factory=list)
+    _children = ('cond', 'body')
+
+
+@dataclass
+class Repeat(Node):
+    body: List[Node] = field(default_factory=list)
+    cond: Optional[Node] = None
+    _children = ('body', 'cond')
+
+
+@dataclass
+class If(Node):
+    """tests: [(condición, cuerpo)] para if/elseif; orelse: cuerpo del else."""
+    tests: List[Tuple[Node, List[Node]]] = field(default_factory=list)
+    orelse: List[Node] = field(default_factory=list)
+    _children = ('tests', 'orelse')
+
+
+@dataclass
+class NumericFor(Node):
+    var: str = ''
+    start_expr: Optional[Node] = None
+    stop_expr: Optional[Node] = None
+    step_expr: Optional[Node] = None
+    body: List[Node] = field(default_factory=list)
+    _children = ('start_expr', 'stop_expr', 'step_expr', 'body')
+
+
+@dataclass
+class GenericFor(Node):
+    names: List[str] = field(default_factory=list)
+    iters: List[Node] = field(default_factory=list)
+    body: List[Node] = field(default_factory=list)
+    _children = ('iters', 'body')
+
+
+@dataclass
+class FunctionDecl(Node):
+    """function a.b.c() / function a:b() (target) o local function f() (is_local)."""
+    target: Optional[Node] = None
+    func: Optional[Function] = None
+    is_local: bool = False
+    is_method: bool = False
+    _children = ('target', 'func')
+
+
+@dataclass
+class Return(Node):
+    values: List[Node] = field(default_factory=list)
+    _children = ('values',)
+
+
+@dataclass
+class Break(Node):
+    pass
+
+
+@dataclass
+class Goto(Node):
+    label: str = ''
+
+
+@dataclass
+class Label(Node):
+    name: str = ''
+
+
+# Prioridades binarias (izquierda, derecha) como en lparser.c
+_BINARY_PRIORITY: Dict[str, Tuple[int, int]] = {
+    'or': (1, 1), 'and': (2, 2),
+    '<': (3, 3), '>': (3, 3), '<=': (3, 3), '>=': (3, 3), '~=': (3, 3), '==': (3, 3),
+    '|': (4, 4), '~': (5, 5), '&': (6, 6), '<<': (7, 7), '>>': (7, 7),
+    '..': (9, 8), '+': (10, 10), '-': (10, 10),
+    '*': (11, 11), '/': (11, 11), '//': (11, 11), '%': (11, 11),
+    '^': (14, 13),
+}
+_UNARY_PRIORITY = 12
+
+# Profundidad máxima de anidamiento (protege la pila de Python con entradas patológicas)
+MAX_NESTING = 200
+
+_BLOCK_END = frozenset({'end', 'else', 'elseif', 'until', 'eof'})
+_STATEMENT_START = frozenset({'local', 'function', 'if', 'for', 'while', 'do', 'return', 'repeat', 'goto', 'break'})
+# Fuera de un cuerpo de función no pueden aparecer dentro de una tabla: la tabla no se cerró
+_NOT_IN_TABLE = frozenset({'local', 'if', 'for', 'while', 'do', 'return', 'repeat', 'goto', 'break',
+                           'end', 'else', 'elseif', 'until', 'eof'})
+# Abren un bloque que se cierra con 'end' o 'until' (el 'do' de for/while cuenta por ellos)
+_BLOCK_OPEN = frozenset({'function', 'if', 'do', 'repeat'})
+_CLOSING_BRACKET = {'(': ')', '[': ']', '{': '}'}
+
+
+class Parser:
+    """Parser descendente recursivo sobre la lista de tokens."""
+
+    def __init__(self, source: str, tolerant: bool = False, deadline: Optional[float] = None):
+        self.source = source
+        self.tolerant = tolerant
+        # Instante (time.monotonic) a partir del cual el parseo se abandona
+        self.deadline = deadline
+        self.errors: List[LuaSyntaxError] = []
+        self._line_starts = [0] + [m.end() for m in re.finditer('\n', source)]
+        self.tokens = tokenize(source, deadline)
+        self.pos = 0
+        self.depth = 0
+
+    # ----- utilidades -----
+    def line_of(self, offset: int) -> int:
+        return bisect.bisect_right(self._line_starts, offset)
+
+    @property
+    def tok(self) -> Token:
+        return self.tokens[self.pos]
+
+    def _tok_key(self, tok: Token) -> str:
+        if tok.kind in ('keyword', 'op'):
+            return tok.value
+        return tok.kind
+
+    def peek_key(self, offset: int = 0) -> str:
+        idx = min(self.pos + offset, len(self.tokens) - 1)
+        return self._tok_key(self.tokens[idx])
+
+    def error(self, message: str) -> LuaSyntaxError:
+        tok = self.tok
+        return LuaSyntaxError(f"{message}, encontrado {tok.value or tok.kind!r}", tok.start, self.line_of(tok.start))
+
+    def advance(self) -> Token:
+        tok = self.tokens[self.pos]
+        if tok.kind != 'eof':
+            self.pos += 1
+        return tok
+
+    def check(self, value: str) -> bool:
+        return self.peek_key() == value
+
+    def accept(self, value: str) -> Optional[Token]:
+        if self.check(value):
+            return self.advance()
+        return None
+
+    def expect(self, value: str) -> Token:
+        if not self.check(value):
+            raise self.error(f"se esperaba {value!r}")
+        return self.advance()
+
+    def expect_name(self) -> Token:
+        if self.tok.kind != 'name':
+            raise self.error("se esperaba un nombre")
+        return self.advance()
+
+    def _finish(self, node: Node, start_tok: Token) -> Node:
+        node.start = start_tok.start
+        prev = self.tokens[self.pos - 1] if self.pos > 0 else start_tok
+        node.end = max(prev.end, start_tok.end)
+        node.line = self.line_of(start_tok.start)
+        return node
+
+    def _enter(self):
+        self.depth += 1
+        if self.depth > MAX_NESTING:
+            exc = self.error("anidamiento demasiado profundo")
+            exc.recoverable = False
+            raise exc
+
+    def _check_deadline(self):
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            raise ParseDeadlineExceeded(f"plazo de parseo agotado (línea {self.line_of(self.tok.start)})")
+
+    def _record(self, exc: LuaSyntaxError):
+        # Sin traceback: guardarlo mantendría vivos los marcos del parser de cada error
+        self.errors.append(exc.with_traceback(None))
+        # La recuperación es lo caro: un archivo con miles de errores se corta aquí
+        self._check_deadline()
+
+    def _leave(self):
+        self.depth -= 1
+
+    # ----- bloques y sentencias -----
+    def parse_chunk(self) -> Chunk:
+        start_tok = self.tok
+        body = self.block()
+        if self.tok.kind != 'eof':
+            if not self.tolerant:
+                raise self.error("se esperaba fin de archivo")
+            # Tokens de cierre sobrantes ('end' de más, etc.): registrar y continuar
+            while self.tok.kind != 'eof':
+                self._record(self.error("token de cierre inesperado"))
+                self.advance()
+                body.extend(self.block())
+        return self._finish(Chunk(body=body), start_tok)
+
+    def block(self) -> List[Node]:
+        body: List[Node] = []
+        while self.peek_key() not in _BLOCK_END:
+            self._check_deadline()
+            is_return = self.check('return')
+            before = self.pos
+            depth = self.depth
+            try:
+                stmt = self.retstat() if is_return else self.statement()
+            except LuaSyntaxError as exc:
+                if not self.tolerant:
+                    raise
+                self._record(exc)
+                self.depth = depth
+                self._synchronize(before)
+                continue
+            if stmt is not None:
+                body.append(stmt)
+            if is_return:
+                break
+        return body
+
+    def _synchronize(self, failed_at: int):
+        """Avanza hasta un token que pueda iniciar una sentencia en una nueva línea."""
+        if self.pos <= failed_at:
+            self.pos = failed_at + 1 if self.tokens[failed_at].kind != 'eof' else failed_at
+        while self.tok.kind != 'eof':
+            key = self.peek_key()
+            if key in _STATEMENT_START or key in _BLOCK_END:
+                return
+            prev = self.tokens[self.pos - 1]
+            if self.tok.kind == 'name' and '\n' in self.source[prev.end:self.tok.start]:
+                return
+            self.advance()
+
+    def statement(self) -> Optional[Node]:
+        start_tok = self.tok
+        key = self.peek_key()
+        if key == ';':
+            self.advance()
+            return None
+        if key == 'if':
+            return self.ifstat()
+        if key == 'while':
+            self.advance()
+            cond = self.expr()
+            self.expect('do')
+            body = self._nested_block()
+            self.expect('end')
+            return self._finish(While(cond=cond, body=body), start_tok)
+        if key == 'do':
+            self.advance()
+            body = self._nested_block()
+            self.expect('end')
+            return self._finish(Do(body=body), start_tok)
+        if key == 'for':
+            return self.forstat()
+        if key == 'repeat':
+            self.advance()
+            body = self._nested_block()
+            self.expect('until')
+            cond = self.expr()
+            return self._finish(Repeat(body=body, cond=cond), start_tok)
+        if key == 'function':
+            return self.funcstat()
+        if key == 'local':
+            self.advance()
+            if self.accept('function'):
+                name_tok = self.expect_name()
+                func = self.funcbody(start_tok)
+                target = self._finish(Name(id=name_tok.value), name_tok)
+                return self._finish(FunctionDecl(target=target, func=func, is_local=True), start_tok)
+            names = [self.expect_name().value]
+            self._attrib()
+            while self.accept(','):
+                names.append(self.expect_name().value)
+                self._attrib()
+            values = self.exprlist() if self.accept('=') else []
+            return self._finish(Local(names=names, values=values), start_tok)
+        if key == '::':
+            self.advance()
+            name = self.expect_name().value
+            self.expect('::')
+            return self._finish(Label(name=name), start_tok)
+        if key == 'break':
+            self.advance()
+            return self._finish(Break(), start_tok)
+        if key == 'goto':
+            self.advance()
+            return self._finish(Goto(label=self.expect_name().value), start_tok)
+        return self.exprstat()
+
+    def _attrib(self):
+        # Lua 5.4: local x <const> / <close>
+        if self.check('<') and self.tokens[self.pos + 1].kind == 'name' and self.peek_key(2) == '>':
+            self.pos += 3
+
+    def _nested_block(self) -> List[Node]:
+        self._enter()
+        try:
+            return self.block()
+        finally:
+            self._leave()
+
+    def ifstat(self) -> Node:
+        start_tok = self.advance()
+        tests: List[Tuple[Node, List[Node]]] = []
+        cond = self.expr()
+        self.expect('then')
+        tests.append((cond, self._nested_block()))
+        orelse: List[Node] = []
+        while True:
+            if self.accept('elseif'):
+                cond = self.expr()
+                self.expect('then')
+                tests.append((cond, self._nested_block()))
+            elif self.accept('else'):
+                orelse = self._nested_block()
+                self.expect('end')
+                break
+            else:
+                self.expect('end')
+                break
+        return self._finish(If(tests=tests, orelse=orelse), start_tok)
+
+    def forstat(self) -> Node:
+        start_tok = self.advance()
+        first = self.expect_name().value
+        if self.accept('='):
+            start_expr = self.expr()
+            self.expect(',')
+            stop_expr = self.expr()
+            step_expr = self.expr() if self.accept(',') else None
+            self.expect('do')
+            body = self._nested_block()
+            self.expect('end')
+            return self._finish(NumericFor(var=first, start_expr=start_expr, stop_expr=stop_expr,
+                                           step_expr=step_expr, body=body), start_tok)
+        names = [first]
+        while self.accept(','):
+            names.append(self.expect_name().value)
+        self.expect('in')
+        iters = self.exprlist()
+        self.expect('do')
+        body = self._nested_block()
+        self.expect('end')
+        return self._finish(GenericFor(names=names, iters=iters, body=body), start_tok)
+
+    def funcstat(self) -> Node:
+        start_tok = self.advance()
+        name_tok = self.expect_name()
+        target: Node = self._finish(Name(id=name_tok.value), name_tok)
+        is_method = False
+        while self.check('.') or self.check(':'):
+            sep = self.advance().value
+            key_tok = self.expect_name()
+            key = self._finish(String(value=key_tok.value), key_tok)
+            target = self._finish(Index(obj=target, key=key, dotted=True), start_tok)
+            if sep == ':':
+                is_method = True
+                break
+        func = self.funcbody(start_tok, is_method)
+        return self._finish(FunctionDecl(target=target, func=func, is_method=is_method), start_tok)
+
+    def retstat(self) -> Node:
+        start_tok = self.advance()
+        values: List[Node] = []
+        if self.peek_key() not in _BLOCK_END and not self.check(';'):
+            values = self.exprlist()
+        self.accept(';')
+        return self._finish(Return(values=values), start_tok)
+
+    def exprstat(self) -> Node:
+        start_tok = self.tok
+        first = self.suffixedexp()
+        if self.check('=') or self.check(','):
+            targets = [first]
+            while self.accept(','):
+                targets.append(self.suffixedexp())
+            self.expect('=')
+            values = self.exprlist()
+            for target in targets:
+                if not isinstance(target, (Name, Index)):
+                    raise LuaSyntaxError("destino de asignación inválido", target.start, target.line)
+            return self._finish(Assign(targets=targets, values=values), start_tok)
+        if not isinstance(first, (Call, MethodCall)):
+            raise self.error("se esperaba una llamada o asignación")
+        return self._finish(CallStatement(call=first), start_tok)
+
+    # ----- expresiones -----
+    def exprlist(self) -> List[Node]:
+        values = [self.expr()]
+        while self.accept(','):
+            values.append(self.expr())
+        return values
+
+    def expr(self, limit: int = 0) -> Node:
+        self._enter()
+        try:
+            start_tok = self.tok
+            key = self.peek_key()
+            if key in ('not', '-', '#', '~'):
+                self.advance()
+                operand = self.expr(_UNARY_PRIORITY)
+                left: Node = self._finish(UnOp(op=key, operand=operand), start_tok)
+            else:
+                left = self.simpleexp()
+            while True:
+                op = self.peek_key()
+                prio = _BINARY_PRIORITY.get(op)
+                if prio is None or prio[0] <= limit:
+                    break
+                self.advance()
+                right = self.expr(prio[1])
+                left = self._finish(BinOp(op=op, left=left, right=right), start_tok)
+            return left
+        finally:
+            self._leave()
+
+    def simpleexp(self) -> Node:
+        tok = self.tok
+        if tok.kind == 'number':
+            self.advance()
+            return self._finish(Number(raw=tok.value), tok)
+        if tok.kind == 'string':
+            self.advance()
+            return self._finish(String(value=tok.value), tok)
+        key = self.peek_key()
+        if key == 'nil':
+            self.advance()
+            return self._finish(Nil(), tok)
+        if key in ('true', 'false'):
+            self.advance()
+            return self._finish(Boolean(value=key == 'true'), tok)
+        if key == '...':
+            self.advance()
+            return self._finish(Vararg(), tok)
+        if key == '{':
+            return self.table()
+        if key == 'function':
+            self.advance()
+            return self.funcbody(tok)
+        return self.suffixedexp()
+
+    def primaryexp(self) -> Node:
+        tok = self.tok
+        if tok.kind == 'name':
+            self.advance()
+            return self._finish(Name(id=tok.value), tok)
+        if self.accept('('):
+            inner = self.expr()
+            self.expect(')')
+            return self._finish(Paren(expr=inner), tok)
+        raise self.error("expresión inesperada")
+
+    def suffixedexp(self) -> Node:
+        start_tok = self.tok
+        node = self.primaryexp()
+        while True:
+            key = self.peek_key()
+            if key == '.':
+                self.advance()
+                key_tok = self.expect_name()
+                name = self._finish(String(value=key_tok.value), key_tok)
+                node = self._finish(Index(obj=node, key=name, dotted=True), start_tok)
+            elif key == '[':
+                self.advance()
+                index = self.expr()
+                self.expect(']')
+                node = self._finish(Index(obj=node, key=index), start_tok)
+            elif key == ':':
+                self.advance()
+                method = self.expect_name().value
+                args = self.callargs()
+                node = self._finish(MethodCall(obj=node, method=method, args=args), start_tok)
+            elif key in ('(', '{', 'string'):
+                # Lua: una llamada con '(' en otra línea es ambigua; se acepta igual
+                args = self.callargs()
+                node = self._finish(Call(func=node, args=args), start_tok)
+            else:
+                return node
+
+    def callargs(self) -> List[Node]:
+        tok = self.tok
+        if tok.kind == 'string':
+            self.advance()
+            return [self._finish(String(value=tok.value), tok)]
+        if self.check('{'):
+            return [self.table()]
+        self.expect('(')
+        args: List[Node] = []
+        if not self.check(')'):
+            args = self.exprlist()
+        self.expect(')')
+        return args
+
+    def table(self) -> Node:
+        start_tok = self.expect('{')
+        self._enter()
+        try:
+            fields: List[Field] = []
+            depth = self.depth
+            while not self.check('}'):
+                before = self.pos
+                try:
+                    fields.append(self.tablefield())
+                except LuaSyntaxError as exc:
+                    # Modo tolerante: se descarta sólo el campo y se sigue con el siguiente
+                    if not self.tolerant or not exc.recoverable:
+                        raise
+                    self.depth = depth
+                    if not self._skip_field(before):
+                        exc.recoverable = False
+                        raise
+                    self._record(exc)
+                    continue
+                if self.accept(',') or self.accept(';') or self.check('}'):
+                    continue
+                # Falta el separador: si lo que sigue puede ser otro campo, se registra y se continúa
+                exc = self.error("se esperaba '}'")
+                if not self.tolerant or self.peek_key() in _NOT_IN_TABLE or self.peek_key() in (')', ']'):
+                    exc.recoverable = False
+                    raise exc
+                self._record(exc)
+            self.expect('}')
+        finally:
+            self._leave()
+        return self._finish(Table(fields=fields), start_tok)
+
+    def _skip_field(self, start: int) -> bool:
+        """Salta un campo de tabla inválido desde `start` hasta ',' / ';' (consumido) o el '}' de la tabla.
+
+        Los paréntesis, corchetes, llaves y bloques function/if/do/repeat del campo se
+        saltan equilibrados. Devuelve False (posición indeterminada) si aparece algo
+        que no puede estar dentro de una tabla, como 'local' fuera de una función o un
+        cierre sin apertura: la tabla no se cerró y el error se recupera por sentencia.
+        """
+        self.pos = start
+        brackets: List[str] = []
+        blocks = 0
+        while True:
+            key = self.peek_key()
+            if key in _CLOSING_BRACKET:
+                brackets.append(_CLOSING_BRACKET[key])
+            elif key in (')', ']', '}'):
+                if key in brackets:
+                    while brackets.pop() != key:
+                        pass
+                elif key == '}' and not blocks:
+                    return True
+                else:
+                    return False
+            elif key == 'eof':
+                return False
+            elif blocks:
+                if key in _BLOCK_OPEN:
+                    blocks += 1
+                elif key in ('end', 'until'):
+                    blocks -= 1
+            elif key == 'function':
+                blocks = 1
+            elif key in _NOT_IN_TABLE:
+                return False
+            elif not brackets and key in (',', ';'):
+                self.advance()
+                return True
+            self.advance()
+
+    def tablefield(self) -> Field:
+        start_tok = self.tok
+        if self.check('['):
+            self.advance()
+            key = self.expr()
+            self.expect(']')
+            self.expect('=')
+            value = self.expr()
+            return self._finish(Field(kind='keyed', key=key, value=value), start_tok)
+        if start_tok.kind == 'name' and self.peek_key(1) == '=':
+            self.advance()
+            self.advance()
+            key = self._finish(String(value=start_tok.value), start_tok)
+            value = self.expr()
+            return self._finish(Field(kind='named', name=start_tok.value, key=key, value=value), start_tok)
+        value = self.expr()
+        return self._finish(Field(kind='positional', value=value), start_tok)
+
+    def funcbody(self, start_tok: Token, is_method: bool = False) -> Function:
+        self.expect('(')
+        params: List[str] = ['self'] if is_method else []
+        is_vararg = False
+        if not self.check(')'):
+            while True:
+                if self.accept('...'):
+                    is_vararg = True
+                    break
+                params.append(self.expect_name().value)
+                if not self.accept(','):
+                    break
+        self.expect(')')
+        body = self._nested_block()
+        self.expect('end')
+        return self._finish(Function(params=params, is_vararg=is_vararg, body=body), start_tok)
+
+
+def _raise_recursion_limit():
+    # Cada nivel de anidamiento usa varios marcos de Python
+    needed = MAX_NESTING * 12 + 200
+    if sys.getrecursionlimit() < needed:
+        sys.setrecursionlimit(needed)
+
+
+def parse(source: str) -> Chunk:
+    """Parsea un chunk Lua completo. Lanza LuaSyntaxError ante el primer error."""
+    _raise_recursion_limit()
+    parser = Parser(source)
+    return parser.parse_chunk()
+
+
+def parse_tolerant(source: str, deadline: Optional[float] = None) -> Tuple[Chunk, List[LuaSyntaxError]]:
+    """Parsea recuperándose de errores a nivel de sentencia y de campo de tabla.
+
+    Un campo de tabla inválido se descarta hasta el siguiente ',' / ';' / '}' y la
+    tabla se conserva; si la tabla no se puede resincronizar (p.ej. no se cerró), se
+    descarta la sentencia entera. Todo lo descartado se registra en la lista de
+    errores; el resto del archivo sigue produciendo AST. Un error léxico (string sin
+    cerrar) se trata truncando el código en ese punto.
+
+    Con `deadline` (un instante de time.monotonic) se lanza ParseDeadlineExceeded si
+    el parseo sigue en marcha pasado ese instante.
+    """
+    _raise_recursion_limit()
+    try:
+        parser = Parser(source, tolerant=True, deadline=deadline)
+    except LuaSyntaxError as exc:
+        exc = exc.with_traceback(None)
+        try:
+            parser = Parser(source[:exc.pos], tolerant=True, deadline=deadline)
+        except LuaSyntaxError:
+            return Chunk(), [exc]
+        parser.errors.append(exc)
+    chunk = parser.parse_chunk()
+    return chunk, parser.errors
+
+
+# ====================
+#  Recorrido y helpers
+# ====================
+def iter_children(node: Node) -> Iterator[Node]:
+    """Itera los hijos directos de un nodo, en orden de código fuente."""
+    for name in node._children:
+        value = getattr(node, name)
+        if value is None:
+            continue
+        if isinstance(value, Node):
+            yield value
+            continue
+        for item in value:
+            if isinstance(item, Node):
+                yield item
+            elif isinstance(item, tuple):
+                cond, body = item
+                yield cond
+                for stmt in body:
+                    yield stmt
+
+
+VisitorCallback = Callable[[Node, List[Node]], None]
+
+
+class LuaWalker:
+    """Recorre el AST una sola vez despachando cada nodo a las reglas registradas.
+
+    Las reglas se registran por tipo de nodo; el callback recibe el nodo y la
+    lista de ancestros (del más externo al padre inmediato). El recorrido es
+    iterativo para no depender de la profundidad de la pila de Python.
+    """
+
+    def __init__(self):
+        self._handlers: Dict[Type[Node], List[VisitorCallback]] = {}
+
+    def register(self, node_type: Type[Node], callback: VisitorCallback):
+        self._handlers.setdefault(node_type, []).append(callback)
+
+    def register_rule(self, rule: Any):
+        """Registra un objeto regla con atributo `node_types` y método `visit(node, ancestors)`."""
+        for node_type in rule.node_types:
+            self.register(node_type, rule.visit)
+
+    def walk(self, root: Node):
+        handlers = self._handlers
+        ancestors: List[Node] = []
+        # Pila de (nodo, iterador de hijos); None marca el retorno a un ancestro
+        stack: List[Tuple[Node, Optional[Iterator[Node]]]] = [(root, None)]
+        while stack:
+            node, children = stack[-1]
+            if children is None:
+                for callback in handlers.get(type(node), ()):
+                    callback(node, ancestors)
+                children = iter_children(node)
+                stack[-1] = (node, children)
+                ancestors.append(node)
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                ancestors.pop()
+            else:
+                stack.append((child, None))
+
+
+def dotted_name(node: Optional[Node]) -> Optional[str]:
+    """Devuelve 'vim.keymap.set' para Index/Name encadenados; None si no es un nombre simple."""
+    parts: List[str] = []
+    while isinstance(node, Index):
+        if not node.dotted or not isinstance(node.key, String):
+            return None
+        parts.append(node.key.value)
+        node = node.obj
+    if not isinstance(node, Name):
+        return None
+    parts.append(node.id)
+    return '.'.join(reversed(parts))
+
+
+def string_value(node: Optional[Node]) -> Optional[str]:
+    """Valor de un literal string (o concatenación de literales); None en otro caso."""
+    if isinstance(node, String):
+        return node.value
+    if isinstance(node, Paren):
+        return string_value(node.expr)
+    if isinstance(node, BinOp) and node.op == '..':
+        left = string_value(node.left)
+        right = string_value(node.right)
+        if left is not None and right is not None:
+            return left + right
+    return None
+
+
+def table_field(table: Optional[Node], name: str) -> Optional[Node]:
+    """Valor del campo `name = ...` de un constructor de tabla."""
+    if not isinstance(table, Table):
+        return None
+    for fld in table.fields:
+        if fld.kind == 'named' and fld.name == name:
+            return fld.value
+        if fld.kind == 'keyed' and isinstance(fld.key, String) and fld.key.value == name:
+            return fld.value
+    return None
+
+
+def positional_values(table: Optional[Node]) -> List[Node]:
+    """Valores posicionales de un constructor de tabla, en orden."""
+    if not isinstance(table, Table):
+        return []
+    return [fld.value for fld in table.fields if fld.kind == 'positional' and fld.value is not None]
+
+
+def node_source(source: str, node: Node) -> str:
+    """Texto fuente de un nodo."""
+    return source[node.start:node.end]
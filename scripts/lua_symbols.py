@@ -0,0 +1,428 @@
+#!/usr/bin/env python3
+"""
+Tabla de símbolos de todo el repositorio para el motor AST.
+
+Un único recorrido por archivo (sobre el AST de lua_ast) registra:
+- a qué declaración se refiere cada nombre, con el ámbito léxico de Lua: cada
+  bloque (chunk, función, do, while, repeat, cuerpo de for, rama de if) tiene su
+  ámbito; parámetros, variables de bucle y `local` pertenecen al suyo y un `local`
+  sólo es visible después de su declaración;
+- el valor de esas declaraciones si se asignan una sola vez (constantes string,
+  tablas de opciones compartidas como `local opts = { ... }`, funciones), y el de
+  los globales asignados una sola vez en el archivo;
+- miembros `M.x = ...` / `function M.x() ... end` y el valor devuelto por el
+  módulo (`return M` o `return { ... }`), indexados por su nombre de require
+  ('lib.util' para lua/lib/util.lua);
+- `require('...')` como referencia al módulo, sin volver a leer ese archivo.
+
+Con eso las reglas resuelven nombres en tiempo constante (diccionarios, cadenas
+de resolución cortas y memoizadas): alias de vim.keymap.set como
+`local function map(mode, lhs, rhs, opts)`, teclas concatenadas como
+`'<leader>' .. prefix .. 'x'` y descripciones guardadas en variables.
+
+La resolución es conservadora: una declaración reasignada (o un parámetro, o una
+variable de bucle) no se resuelve, y una función sólo es alias si su cuerpo hace
+exactamente una llamada de keymap. Que un mismo nombre se declare en otro ámbito
+(p.ej. `local opts = {...}` y el parámetro `opts` de `local function map(...)`) no
+impide resolver ninguno de los dos.
+"""
+
+import os
+from dataclasses import dataclass, field
+from typing import Dict, Hashable, Iterator, List, Optional, Tuple
+
+import lua_ast
+
+
+# Funciones de Neovim que definen keymaps (todas con firma mode, lhs, rhs, opts)
+KEYMAP_FUNCTIONS = frozenset({'vim.keymap.set', 'vim.api.nvim_set_keymap'})
+
+# Saltos máximos al seguir una cadena de nombres (evita ciclos como `a = b; b = a`)
+MAX_RESOLVE_DEPTH = 32
+
+# Referencia a un nodo en su archivo y, si lo hay, el entorno de parámetros de un alias
+Env = Dict[str, Tuple[str, lua_ast.Node]]
+Ref = Tuple[str, Optional[lua_ast.Node], Optional[Env]]
+
+
+@dataclass
+class FileSymbols:
+    """Símbolos de un archivo: AST, valores de los nombres, miembros y retorno del módulo."""
+    content: str
+    tree: lua_ast.Chunk
+    errors: List[lua_ast.LuaSyntaxError] = field(default_factory=list)
+    # Globales asignados una sola vez en el archivo
+    bindings: Dict[str, lua_ast.Node] = field(default_factory=dict)
+    # id de cada Name que se refiere a una declaración local -> su valor (None si no se resuelve)
+    locals: Dict[int, Optional[lua_ast.Node]] = field(default_factory=dict)
+    members: Dict[Tuple[str, str], lua_ast.Node] = field(default_factory=dict)
+    returned: Optional[lua_ast.Node] = None
+
+    def value(self, name: lua_ast.Name) -> Optional[lua_ast.Node]:
+        """Valor al que se refiere `name` en su posición (local de su ámbito o global)."""
+        if id(name) in self.locals:
+            return self.locals[id(name)]
+        return self.bindings.get(name.id)
+
+
+@dataclass
+class KeymapAlias:
+    """Función que envuelve una única llamada a vim.keymap.set/nvim_set_keymap."""
+    file_path: str
+    params: List[str]
+    call: lua_ast.Call
+
+
+def module_name(repo_root: str, file_path: str) -> Optional[str]:
+    """Nombre de require de un archivo bajo lua/ ('lib.util'); None fuera de lua/."""
+    rel_path = os.path.relpath(file_path, os.path.join(repo_root, 'lua'))
+    if rel_path.startswith('..') or not rel_path.endswith('.lua'):
+        return None
+    parts = rel_path[:-len('.lua')].split(os.sep)
+    if parts[-1] == 'init' and len(parts) > 1:
+        parts.pop()
+    return '.'.join(parts)
+
+
+class _Binding:
+    """Una declaración (o un global): su valor y cuántas veces se asigna."""
+
+    __slots__ = ('value', 'assignments', 'decl', 'shadowed')
+
+    def __init__(self, value: Optional[lua_ast.Node], decl: Optional[lua_ast.Node] = None,
+                 shadowed: Optional['_Binding'] = None):
+        self.value = value
+        self.assignments = 1
+        # Sentencia `local` que la declara: sus expresiones aún no la ven (`local x = x`)
+        self.decl = decl
+        # Declaración anterior del mismo nombre en el mismo ámbito
+        self.shadowed = shadowed
+
+
+class _BindingCollector:
+    """Resuelve cada nombre a su declaración por ámbitos y registra miembros en un recorrido del AST."""
+
+    node_types = (lua_ast.Local, lua_ast.Assign, lua_ast.FunctionDecl, lua_ast.Function,
+                  lua_ast.NumericFor, lua_ast.GenericFor, lua_ast.Name)
+
+    def __init__(self, symbols: FileSymbols):
+        self.symbols = symbols
+        # Ámbito (ver _scope_key) -> nombre -> declaración visible
+        self.scopes: Dict[Hashable, Dict[str, _Binding]] = {}
+        self.globals: Dict[str, _Binding] = {}
+        self.refs: Dict[int, _Binding] = {}
+        self.member_counts: Dict[Tuple[str, str], int] = {}
+        # If -> id de cada sentencia -> rama
+        self._branches: Dict[int, Dict[int, int]] = {}
+
+    # ----- Ámbitos -----
+    def _scope_key(self, owner: lua_ast.Node, child: lua_ast.Node) -> Optional[Hashable]:
+        """Ámbito que `owner` abre para su hijo `child` (None si el hijo se evalúa en el ámbito exterior)."""
+        if isinstance(owner, (lua_ast.Chunk, lua_ast.Function, lua_ast.Do, lua_ast.Repeat)):
+            return id(owner)
+        if isinstance(owner, lua_ast.While):
+            return None if child is owner.cond else id(owner)
+        if isinstance(owner, lua_ast.NumericFor):
+            return None if child in (owner.start_expr, owner.stop_expr, owner.step_expr) else id(owner)
+        if isinstance(owner, lua_ast.GenericFor):
+            return None if any(child is it for it in owner.iters) else id(owner)
+        if isinstance(owner, lua_ast.If):
+            branches = self._branches.get(id(owner))
+            if branches is None:
+                branches = {id(stmt): i for i, (_cond, body) in enumerate(owner.tests) for stmt in body}
+                branches.update((id(stmt), len(owner.tests)) for stmt in owner.orelse)
+                self._branches[id(owner)] = branches
+            branch = branches.get(id(child))
+            return None if branch is None else (id(owner), branch)
+        return None
+
+    def _scope_chain(self, ancestors: List[lua_ast.Node], node: lua_ast.Node) -> Iterator[Hashable]:
+        """Ámbitos que ve `node`, del más interno al chunk."""
+        child = node
+        for owner in reversed(ancestors):
+            key = self._scope_key(owner, child)
+            if key is not None:
+                yield key
+            child = owner
+
+    def declare(self, key: Hashable, name: str, value: Optional[lua_ast.Node], decl: Optional[lua_ast.Node] = None):
+        scope = self.scopes.setdefault(key, {})
+        scope[name] = _Binding(value, decl, scope.get(name))
+
+    def lookup(self, name: str, ancestors: List[lua_ast.Node], node: lua_ast.Node) -> Optional[_Binding]:
+        for key in self._scope_chain(ancestors, node):
+            binding = self.scopes.get(key, {}).get(name)
+            while binding is not None and binding.decl is not None \
+                    and any(ancestor is binding.decl for ancestor in ancestors):
+                binding = binding.shadowed
+            if binding is not None:
+                return binding
+        return None
+
+    def assign(self, name: str, value: Optional[lua_ast.Node], ancestors: List[lua_ast.Node], node: lua_ast.Node):
+        binding = self.lookup(name, ancestors, node)
+        if binding is None:
+            binding = self.globals.get(name)
+            if binding is None:
+                self.globals[name] = _Binding(value)
+                return
+        binding.assignments += 1
+        if value is not None:
+            binding.value = value
+
+    def bind_member(self, target: lua_ast.Node, value: Optional[lua_ast.Node]):
+        if not (isinstance(target, lua_ast.Index) and isinstance(target.obj, lua_ast.Name)
+                and isinstance(target.key, lua_ast.String)):
+            return
+        key = (target.obj.id, target.key.value)
+        self.member_counts[key] = self.member_counts.get(key, 0) + 1
+        if value is not None:
+            self.symbols.members[key] = value
+
+    def visit(self, node: lua_ast.Node, ancestors: List[lua_ast.Node]):
+        if isinstance(node, lua_ast.Name):
+            binding = self.lookup(node.id, ancestors, node)
+            if binding is not None:
+                self.refs[id(node)] = binding
+        elif isinstance(node, lua_ast.Local):
+            key = next(self._scope_chain(ancestors, node), None)
+            for i, name in enumerate(node.names):
+                self.declare(key, name, node.values[i] if i < len(node.values) else None, node)
+        elif isinstance(node, lua_ast.Assign):
+            for i, target in enumerate(node.targets):
+                value = node.values[i] if i < len(node.values) else None
+                if isinstance(target, lua_ast.Name):
+                    self.assign(target.id, value, ancestors, node)
+                else:
+                    self.bind_member(target, value)
+        elif isinstance(node, lua_ast.FunctionDecl):
+            if isinstance(node.target, lua_ast.Name):
+                if node.is_local:
+                    # `local function f` ya es visible en su propio cuerpo (recursión)
+                    self.declare(next(self._scope_chain(ancestors, node), None), node.target.id, node.func)
+                else:
+                    self.assign(node.target.id, node.func, ancestors, node)
+            elif not node.is_method:
+                self.bind_member(node.target, node.func)
+        elif isinstance(node, lua_ast.Function):
+            for param in node.params:
+                self.declare(id(node), param, None)
+        elif isinstance(node, lua_ast.NumericFor):
+            self.declare(id(node), node.var, None)
+        elif isinstance(node, lua_ast.GenericFor):
+            for name in node.names:
+                self.declare(id(node), name, None)
+
+    def finish(self):
+        symbols = self.symbols
+        resolvable = lambda binding: binding.value if binding.assignments == 1 else None
+        symbols.locals = {ref: resolvable(binding) for ref, binding in self.refs.items()}
+        symbols.bindings = {name: binding.value for name, binding in self.globals.items()
+                            if resolvable(binding) is not None}
+        symbols.members = {key: value for key, value in symbols.members.items() if self.member_counts[key] == 1}
+        body = symbols.tree.body
+        if body and isinstance(body[-1], lua_ast.Return) and len(body[-1].values) == 1:
+            symbols.returned = body[-1].values[0]
+
+
+class SymbolIndex:
+    """Índice de símbolos de varios archivos Lua con resolución de nombres memoizada."""
+
+    def __init__(self, repo_root: str = ""):
+        self.repo_root = repo_root
+        self.files: Dict[str, FileSymbols] = {}
+        self.modules: Dict[str, str] = {}
+        self._aliases: Dict[int, Optional[KeymapAlias]] = {}
+        self._strings: Dict[Tuple[str, int], Optional[str]] = {}
+
+    @classmethod
+    def build(cls, repo_root: str, file_paths: List[str]) -> 'SymbolIndex':
+        """Lee y parsea cada archivo una vez; los archivos ilegibles se omiten con aviso."""
+        index = cls(repo_root)
+        index.add_paths(file_paths)
+        return index
+
+    def add_paths(self, file_paths: List[str]):
+        """Lee, parsea e indexa los archivos dados; los ilegibles se omiten con aviso."""
+        for file_path in file_paths:
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    content = f.read()
+            except Exception as e:
+                print(f"Error leyendo {file_path}: {e}")
+                continue
+            tree, errors = lua_ast.parse_tolerant(content)
+            self.add_file(file_path, content, tree, errors)
+
+    def copy(self) -> 'SymbolIndex':
+        """Copia con los mismos árboles y memorias vacías (los archivos añadidos después no se comparten)."""
+        index = SymbolIndex(self.repo_root)
+        index.files = dict(self.files)
+        index.modules = dict(self.modules)
+        return index
+
+    def add_file(self, file_path: str, content: str, tree: lua_ast.Chunk,
+                 errors: Optional[List[lua_ast.LuaSyntaxError]] = None) -> FileSymbols:
+        collector = self.begin_file(content, tree, errors)
+        walker = lua_ast.LuaWalker()
+        walker.register_rule(collector)
+        walker.walk(tree)
+        return self.end_file(file_path, collector)
+
+    def begin_file(self, content: str, tree: lua_ast.Chunk,
+                   errors: Optional[List[lua_ast.LuaSyntaxError]] = None) -> _BindingCollector:
+        """Colector de símbolos de un archivo, para registrarlo en el recorrido de otro (require_graph)."""
+        return _BindingCollector(FileSymbols(content=content, tree=tree, errors=list(errors or [])))
+
+    def end_file(self, file_path: str, collector: _BindingCollector) -> FileSymbols:
+        """Cierra el colector tras el recorrido y añade el archivo al índice."""
+        if file_path in self.files:
+            # Contenido nuevo para un archivo ya indexado: las memorias apuntan a nodos del AST viejo
+            self._aliases.clear()
+            self._strings.clear()
+        collector.finish()
+        symbols = collector.symbols
+        self.files[file_path] = symbols
+        name = module_name(self.repo_root, file_path) if self.repo_root else None
+        if name:
+            self.modules[name] = file_path
+        return symbols
+
+    def parsed(self, file_path: str, content: str) -> Optional[FileSymbols]:
+        """Símbolos del archivo si se indexó con este mismo contenido (para reutilizar el AST)."""
+        symbols = self.files.get(file_path)
+        if symbols is not None and symbols.content == content:
+            return symbols
+        return None
+
+    # ----- Resolución -----
+    def resolve(self, file_path: str, node: Optional[lua_ast.Node], env: Optional[Env] = None,
+                depth: int = 0) -> Ref:
+        """Sigue nombres, miembros y paréntesis hasta el nodo que define el valor."""
+        while node is not None and depth < MAX_RESOLVE_DEPTH:
+            depth += 1
+            if isinstance(node, lua_ast.Paren):
+                node = node.expr
+            elif isinstance(node, lua_ast.Name):
+                if env and node.id in env:
+                    file_path, node = env[node.id]
+                    env = None
+                    continue
+                symbols = self.files.get(file_path)
+                value = symbols.value(node) if symbols else None
+                if value is None:
+                    break
+                node, env = value, None
+            elif isinstance(node, lua_ast.Index):
+                key = self.string(file_path, node.key, env, depth)
+                target = self.member(file_path, node.obj, key, env, depth) if key is not None else None
+                if target is None:
+                    break
+                (file_path, node), env = target, None
+            else:
+                break
+        return file_path, node, env
+
+    def member(self, file_path: str, obj: Optional[lua_ast.Node], key: str, env: Optional[Env],
+               depth: int) -> Optional[Tuple[str, lua_ast.Node]]:
+        """Valor de obj.key: miembro asignado en el archivo, export de un módulo o campo de tabla."""
+        symbols = self.files.get(file_path)
+        if isinstance(obj, lua_ast.Name) and not (env and obj.id in env) and symbols:
+            value = symbols.members.get((obj.id, key))
+            if value is not None:
+                return file_path, value
+        obj_file, target, _env = self.resolve(file_path, obj, env, depth)
+        module_file = self.required_file(target)
+        if module_file is not None:
+            return self.export(module_file, key)
+        value = lua_ast.table_field(target, key)
+        return (obj_file, value) if value is not None else None
+
+    def required_file(self, node: Optional[lua_ast.Node]) -> Optional[str]:
+        """Archivo indexado de una llamada require('modulo')."""
+        if not isinstance(node, lua_ast.Call) or lua_ast.dotted_name(node.func) != 'require' or len(node.args) != 1:
+            return None
+        name = lua_ast.string_value(node.args[0])
+        return self.modules.get(name) if name else None
+
+    def export(self, file_path: str, key: str) -> Optional[Tuple[str, lua_ast.Node]]:
+        """Campo `key` de lo que devuelve el módulo (return M / return { ... })."""
+        symbols = self.files[file_path]
+        returned = symbols.returned
+        if isinstance(returned, lua_ast.Name):
+            value = symbols.members.get((returned.id, key))
+            if value is not None:
+                return file_path, value
+            returned = symbols.value(returned)
+        value = lua_ast.table_field(returned, key)
+        return (file_path, value) if value is not None else None
+
+    def string(self, file_path: str, node: Optional[lua_ast.Node], env: Optional[Env] = None,
+               depth: int = 0) -> Optional[str]:
+        """Valor string constante de una expresión (literales, constantes y concatenaciones)."""
+        if node is None:
+            return None
+        memo_key = (file_path, id(node))
+        if env is None and memo_key in self._strings:
+            return self._strings[memo_key]
+        value = self._string(file_path, node, env, depth)
+        if env is None:
+            self._strings[memo_key] = value
+        return value
+
+    def _string(self, file_path: str, node: lua_ast.Node, env: Optional[Env], depth: int) -> Optional[str]:
+        if isinstance(node, lua_ast.String):
+            return node.value
+        if depth >= MAX_RESOLVE_DEPTH:
+            return None
+        file_path, node, env = self.resolve(file_path, node, env, depth)
+        if isinstance(node, lua_ast.String):
+            return node.value
+        if isinstance(node, lua_ast.Number):
+            return node.raw
+        if isinstance(node, lua_ast.BinOp) and node.op == '..':
+            left = self.string(file_path, node.left, env, depth + 1)
+            right = self.string(file_path, node.right, env, depth + 1) if left is not None else None
+            if right is not None:
+                return left + right
+        return None
+
+    def table(self, file_path: str, node: Optional[lua_ast.Node], env: Optional[Env] = None) -> Ref:
+        """Constructor de tabla al que se refiere una expresión (p.ej. una tabla opts compartida)."""
+        file_path, node, env = self.resolve(file_path, node, env)
+        return (file_path, node, env) if isinstance(node, lua_ast.Table) else (file_path, None, None)
+
+    # ----- Alias de keymaps -----
+    def keymap_alias(self, file_path: str, func: lua_ast.Function) -> Optional[KeymapAlias]:
+        """Alias si el cuerpo (sin funciones anidadas) hace exactamente una llamada de keymap."""
+        cache_key = id(func)
+        if cache_key in self._aliases:
+            return self._aliases[cache_key]
+        calls: List[lua_ast.Call] = []
+        stack: List[lua_ast.Node] = list(func.body)
+        while stack and len(calls) < 2:
+            node = stack.pop()
+            if isinstance(node, lua_ast.Function):
+                continue
+            if isinstance(node, lua_ast.Call) and lua_ast.dotted_name(node.func) in KEYMAP_FUNCTIONS:
+                calls.append(node)
+            stack.extend(lua_ast.iter_children(node))
+        alias = KeymapAlias(file_path, list(func.params), calls[0]) if len(calls) == 1 else None
+        self._aliases[cache_key] = alias
+        return alias
+
+    def keymap_call(self, file_path: str, call: lua_ast.Call) -> Optional[Tuple[str, List[Ref]]]:
+        """(función de keymap, argumentos resueltos) de una llamada directa o a través de un alias."""
+        args: List[Ref] = [(file_path, arg, None) for arg in call.args]
+        target_file, target, _env = self.resolve(file_path, call.func)
+        name = lua_ast.dotted_name(target)
+        if name in KEYMAP_FUNCTIONS:
+            return name, args
+        if not isinstance(target, lua_ast.Function):
+            return None
+        alias = self.keymap_alias(target_file, target)
+        if alias is None:
+            return None
+        env: Env = {param: (file_path, arg) for param, arg in zip(alias.params, call.args)}
+        inner_name = lua_ast.dotted_name(alias.call.func)
+        return inner_name, [(alias.file_path, arg, env) for arg in alias.call.args]
@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+"""
+Lint de rendimiento de las opciones de Neovim con reglas declaradas como datos.
+
+OptionModel extrae sobre la tabla de símbolos (lua_symbols.SymbolIndex) todas
+las asignaciones de opciones del repositorio, con su tipo, operación, ámbito y
+ubicación:
+
+- estilo tabla: `local options = { updatetime = 50 }` aplicada con
+  `for k, v in pairs(options) do vim.opt[k] = v end`;
+- `vim.opt.x = v`, `vim.o.x = v`, `vim.opt_local.x = v`... y `vim.g.x = v`;
+- `vim.opt.path:append({ '**' })` (append/prepend/remove);
+- `set x=v`, `set x+=v`, `setlocal x` dentro de `vim.cmd([[ ... ]])`.
+
+Los nombres cortos se normalizan (OPTION_ALIASES: si -> smartindent) y el valor
+efectivo de una opción global resulta de aplicar en orden sus operaciones sobre el
+valor por defecto de Neovim (NVIM_DEFAULTS).
+
+OptionRuleEngine evalúa RULES, una lista de diccionarios: condiciones
+(opción, operador, argumento) que deben cumplirse todas, un hecho opcional
+calculado a partir de los keymaps extraídos (FACTS; p.ej. atajos que son prefijo
+de otros, que hacen esperar 'timeoutlen') y el mensaje. Añadir una regla es
+añadir una entrada a RULES.
+
+Este módulo no importa update_keybindings.
+"""
+
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import lua_ast
+from lua_symbols import SymbolIndex
+
+
+# Objetos de Lua que exponen opciones -> ámbito
+OPTION_ACCESSORS = {
+    'vim.opt': 'global', 'vim.o': 'global', 'vim.go': 'global', 'vim.opt_global': 'global',
+    'vim.wo': 'local', 'vim.bo': 'local', 'vim.opt_local': 'local', 'vim.g': 'variable',
+}
+LIST_METHODS = {'append': 'append', 'prepend': 'prepend', 'remove': 'remove'}
+# Nombres cortos de opciones -> nombre completo
+OPTION_ALIASES = {
+    'ai': 'autoindent', 'si': 'smartindent', 'sw': 'shiftwidth', 'ts': 'tabstop', 'et': 'expandtab',
+    'ut': 'updatetime', 'tm': 'timeoutlen', 'ttm': 'ttimeoutlen', 'nu': 'number', 'rnu': 'relativenumber',
+    'cul': 'cursorline', 'cuc': 'cursorcolumn', 'cb': 'clipboard', 'pa': 'path', 'fdm': 'foldmethod',
+    'smc': 'synmaxcol', 'ul': 'undolevels', 'udf': 'undofile', 'icm': 'inccommand', 'isk': 'iskeyword',
+    'ww': 'whichwrap', 'fcs': 'fillchars', 'shm': 'shortmess', 'rtp': 'runtimepath', 'lz': 'lazyredraw',
+    'spl': 'spelllang', 'stl': 'statusline', 'ls': 'laststatus',
+}
+# Valores por defecto de Neovim de las opciones que usan las reglas
+NVIM_DEFAULTS: Dict[str, Any] = {
+    'updatetime': 4000, 'timeoutlen': 1000, 'ttimeoutlen': 50, 'path': '.,,', 'clipboard': '',
+    'cursorline': False, 'cursorcolumn': False, 'relativenumber': False, 'foldmethod': 'manual',
+    'synmaxcol': 3000, 'undofile': False, 'undolevels': 1000, 'inccommand': 'nosplit',
+}
+_SET_COMMAND_RE = re.compile(r"^\s*(?:se|set|setlocal|setl|setglobal|setg)\s+(.*)$")
+_SET_ARG_RE = re.compile(r"^([a-z]+)(?:(!|&)|([-+^]?=)(.*))?$")
+# Opciones cuyo nombre empieza por 'no' sin ser una negación (nonumber = number desactivado)
+_NO_PREFIXED_OPTIONS = frozenset({'number', 'numberwidth'})
+_SET_OPERATORS = {'=': 'set', '+=': 'append', '-=': 'remove', '^=': 'prepend'}
+
+# Contextos de atajos globales (el resto son locales a un panel o valores por defecto de un plugin)
+GLOBAL_CONTEXTS = ('', 'which-key')
+SEVERITY_ORDER = {'alta': 3, 'media': 2, 'baja': 1}
+# Reglas de rendimiento: todas las condiciones `when` (opción, operador, argumento) deben cumplirse
+# sobre el valor efectivo; `requires` nombra un hecho de FACTS que debe ser no vacío.
+# El mensaje admite {value} (valor de la primera opción) y los campos del hecho.
+RULES: List[Dict[str, Any]] = [
+    {
+        'id': 'updatetime-bajo', 'severity': 'media', 'when': [('updatetime', 'lt', 200)],
+        'message': "CursorHold/CursorHoldI saltan tras {value} ms sin teclear (por defecto 4000): "
+                   "sus callbacks se ejecutan casi en cada pausa",
+    },
+    {
+        'id': 'timeoutlen-prefijos', 'severity': 'media', 'when': [('timeoutlen', 'gt', 0)],
+        'requires': 'prefix_shadowed',
+        'message': "{count} atajos son prefijo de otros en su modo: tras pulsarlos Neovim espera "
+                   "{value} ms antes de ejecutarlos ({examples})",
+    },
+    {
+        'id': 'path-recursivo', 'severity': 'media', 'when': [('path', 'has', '**')],
+        'message': "'path' incluye '**': :find, gf y findfile() recorren recursivamente todo el árbol "
+                   "del directorio de trabajo",
+    },
+    {
+        'id': 'clipboard-sistema', 'severity': 'baja', 'when': [('clipboard', 'has', ('unnamed', 'unnamedplus'))],
+        'message': "clipboard={value}: cada yank, borrado y pegado pasa por el proveedor del portapapeles "
+                   "(un proceso externo como xclip o wl-copy)",
+    },
+    {
+        'id': 'cursorline-relativenumber', 'severity': 'baja',
+        'when': [('cursorline', 'is', True), ('relativenumber', 'is', True)],
+        'message': "cursorline con relativenumber: cada movimiento del cursor redibuja la línea actual "
+                   "y toda la columna de números",
+    },
+    {
+        'id': 'foldmethod-costoso', 'severity': 'media', 'when': [('foldmethod', 'in', ('syntax', 'expr'))],
+        'message': "foldmethod={value} recalcula los pliegues al editar; en archivos grandes es lento",
+    },
+    {
+        'id': 'synmaxcol-alto', 'severity': 'baja', 'when': [('synmaxcol', 'not_between', (1, 3000))],
+        'message': "synmaxcol={value}: el resaltado por sintaxis de líneas muy largas no se limita",
+    },
+    {
+        'id': 'undo-persistente-grande', 'severity': 'baja',
+        'when': [('undolevels', 'gt', 1000), ('undofile', 'is', True)],
+        'message': "undolevels={value} con undofile: el historial de deshacer de cada buffer se serializa "
+                   "en disco en cada guardado",
+    },
+    {
+        'id': 'inccommand-split', 'severity': 'baja', 'when': [('inccommand', 'eq', 'split')],
+        'message': "inccommand=split recalcula la vista previa de :s en todo el buffer con cada tecla",
+    },
+]
+
+
+@dataclass
+class OptionAssignment:
+    """Asignación de una opción (o variable vim.g) con su valor tipado y ubicación."""
+    name: str
+    value: Any
+    kind: str
+    op: str
+    scope: str
+    file_path: str
+    line: int
+    source: str
+
+
+@dataclass
+class LintFinding:
+    """Regla cumplida: valor, mensaje y asignaciones que la provocan."""
+    rule: str
+    severity: str
+    option: str
+    value: Any
+    message: str
+    locations: List[Tuple[str, int]] = field(default_factory=list)
+    details: List[Dict] = field(default_factory=list)
+
+
+def option_name(name: str) -> str:
+    return OPTION_ALIASES.get(name, name)
+
+
+def _typed(node: Optional[lua_ast.Node], symbols: SymbolIndex, file_path: str) -> Tuple[Any, str]:
+    """(valor Python, tipo) de una expresión Lua: boolean, number, string, list, map o expr."""
+    ref_file, target, env = symbols.resolve(file_path, node)
+    if isinstance(target, lua_ast.Boolean):
+        return target.value, 'boolean'
+    if isinstance(target, lua_ast.Number):
+        try:
+            return (float(target.raw) if '.' in target.raw else int(target.raw, 0)), 'number'
+        except ValueError:
+            return target.raw, 'expr'
+    text = symbols.string(ref_file, target, env)
+    if text is not None:
+        return text, 'string'
+    if isinstance(target, lua_ast.Table):
+        if all(fld.kind == 'positional' for fld in target.fields):
+            return [_typed(v, symbols, ref_file)[0] for v in lua_ast.positional_values(target)], 'list'
+        return {fld.name: _typed(fld.value, symbols, ref_file)[0] for fld in target.fields if fld.name}, 'map'
+    content = symbols.files[ref_file].content if ref_file in symbols.files else ""
+    return (lua_ast.node_source(content, target) if target is not None else None), 'expr'
+
+
+def _items(value: Any) -> List[str]:
+    """Elementos de una opción de lista ('a,b' o ['a', 'b'])."""
+    if isinstance(value, list):
+        return [str(v) for v in value]
+    if isinstance(value, dict):
+        return [k for k, v in value.items() if v]
+    if isinstance(value, str):
+        return [v for v in value.split(',') if v]
+    return []
+
+
+def _iter_all(node: lua_ast.Node) -> Iterator[lua_ast.Node]:
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        yield current
+        stack.extend(reversed(list(lua_ast.iter_children(current))))
+
+
+class OptionModel:
+    """Todas las asignaciones de opciones del repositorio, en orden de archivo y línea."""
+
+    def __init__(self, symbols: SymbolIndex):
+        self.symbols = symbols
+        self.assignments: List[OptionAssignment] = []
+        for file_path in sorted(symbols.files):
+            self._collect(file_path, symbols.files[file_path].tree)
+
+    @classmethod
+    def from_files(cls, repo_root: str, file_paths: List[str]) -> 'OptionModel':
+        return cls(SymbolIndex.build(repo_root, file_paths))
+
+    def rel(self, file_path: str) -> str:
+        return os.path.relpath(file_path, self.symbols.repo_root) if self.symbols.repo_root else file_path
+
+    def _add(self, name: str, node: Optional[lua_ast.Node], op: str, scope: str, file_path: str, line: int,
+             source: str):
+        value, kind = _typed(node, self.symbols, file_path)
+        if scope == 'variable':
+            name = f"g:{name}"
+        self.assignments.append(OptionAssignment(option_name(name), value, kind, op, scope, file_path, line, source))
+
+    def _collect(self, file_path: str, tree: lua_ast.Chunk):
+        for node in _iter_all(tree):
+            if isinstance(node, lua_ast.Assign):
+                for target, value in zip(node.targets, node.values):
+                    if isinstance(target, lua_ast.Index) and target.dotted:
+                        scope = OPTION_ACCESSORS.get(lua_ast.dotted_name(target.obj) or '')
+                        name = lua_ast.string_value(target.key) if scope else None
+                        if name:
+                            self._add(name, value, 'set', scope, file_path, node.line,
+                                      lua_ast.dotted_name(target.obj))
+            elif isinstance(node, lua_ast.GenericFor):
+                self._table_loop(file_path, node)
+            elif isinstance(node, lua_ast.MethodCall) and node.method in LIST_METHODS \
+                    and isinstance(node.obj, lua_ast.Index) and node.obj.dotted:
+                scope = OPTION_ACCESSORS.get(lua_ast.dotted_name(node.obj.obj) or '')
+                name = lua_ast.string_value(node.obj.key) if scope else None
+                if name and node.args:
+                    self._add(name, node.args[0], LIST_METHODS[node.method], scope, file_path, node.line,
+                              lua_ast.dotted_name(node.obj.obj))
+            elif isinstance(node, lua_ast.Call) and lua_ast.dotted_name(node.func) in ('vim.cmd', 'vim.api.nvim_command') \
+                    and node.args:
+                command = self.symbols.string(file_path, node.args[0])
+                if command:
+                    self._set_commands(file_path, node.line, command)
+
+    def _table_loop(self, file_path: str, loop: lua_ast.GenericFor):
+        """`for k, v in pairs(tabla) do vim.opt[k] = v end`: cada campo de la tabla es una opción."""
+        if len(loop.names) != 2 or len(loop.iters) != 1 or not isinstance(loop.iters[0], lua_ast.Call):
+            return
+        call = loop.iters[0]
+        if lua_ast.dotted_name(call.func) != 'pairs' or len(call.args) != 1:
+            return
+        scope = None
+        for statement in loop.body:
+            if isinstance(statement, lua_ast.Assign) and len(statement.targets) == 1:
+                target = statement.targets[0]
+                if isinstance(target, lua_ast.Index) and not target.dotted \
+                        and isinstance(target.key, lua_ast.Name) and target.key.id == loop.names[0]:
+                    scope = OPTION_ACCESSORS.get(lua_ast.dotted_name(target.obj) or '')
+        if scope is None:
+            return
+        table_file, table, _env = self.symbols.table(file_path, call.args[0])
+        for fld in table.fields if table is not None else []:
+            if fld.kind == 'named':
+                self._add(fld.name, fld.value, 'set', scope, table_file, fld.line, 'tabla')
+
+    def _set_commands(self, file_path: str, line: int, command: str):
+        """Comandos :set/:setlocal de un bloque vim.cmd (una línea de Vimscript por comando)."""
+        for offset, text in enumerate(command.split('\n')):
+            text = re.sub(r'\s+"[^"]*$', '', text)
+            match = _SET_COMMAND_RE.match(text)
+            if not match:
+                continue
+            scope = 'local' if text.split()[0].startswith('setl') else 'global'
+            for arg in re.split(r'(?<!\\)\s+', match.group(1).strip()):
+                arg_match = _SET_ARG_RE.match(arg)
+                if not arg_match:
+                    continue
+                name, toggle, operator, raw = arg_match.groups()
+                negated = not operator and name.startswith('no') and name not in _NO_PREFIXED_OPTIONS
+                if operator:
+                    raw = raw[:-1] + ' ' if raw.endswith('\\') else raw.replace('\\ ', ' ')
+                    value: Any = int(raw) if raw.isdigit() else raw
+                    op, kind = _SET_OPERATORS[operator], 'number' if raw.isdigit() else 'string'
+                elif toggle:
+                    value, op, kind = None, 'toggle', 'expr'
+                else:
+                    value, op, kind = not negated, 'set', 'boolean'
+                self.assignments.append(OptionAssignment(
+                    option_name(name[2:] if negated else name), value, kind, op, scope, file_path, line + offset,
+                    'vim.cmd',
+                ))
+
+    # ----- consultas -----
+    def assignments_of(self, name: str) -> List[OptionAssignment]:
+        name = option_name(name)
+        return [a for a in self.assignments if a.name == name and a.scope == 'global']
+
+    def value(self, name: str) -> Any:
+        """Valor global efectivo: operaciones en orden sobre el valor por defecto de Neovim."""
+        name = option_name(name)
+        current = NVIM_DEFAULTS.get(name)
+        for assignment in self.assignments_of(name):
+            if assignment.op == 'set':
+                current = assignment.value
+            elif assignment.op == 'toggle':
+                current = not current if isinstance(current, bool) else current
+            elif assignment.op == 'append':
+                current = _items(current) + _items(assignment.value)
+            elif assignment.op == 'prepend':
+                current = _items(assignment.value) + _items(current)
+            elif assignment.op == 'remove':
+                removed = set(_items(assignment.value))
+                current = [item for item in _items(current) if item not in removed]
+        return current
+
+
+def prefix_shadowed(keybindings: List, canonicalizer) -> List[Dict]:
+    """Atajos cuyo lhs es prefijo estricto de otro del mismo modo y ámbito (esperan 'timeoutlen').
+
+    Los atajos globales (GLOBAL_CONTEXTS) se comparan entre sí; los de un panel o
+    unos valores por defecto de plugin, sólo con los de su mismo archivo y contexto.
+    """
+    groups: Dict[Tuple[str, ...], List[Tuple[Tuple[str, ...], Any]]] = {}
+    for kb in keybindings:
+        if kb.context == 'which-key-group':
+            continue
+        scope = ('global',) if kb.context in GLOBAL_CONTEXTS else (kb.context, kb.file_path)
+        tokens = canonicalizer.tokens(kb.key)
+        if tokens:
+            for mode in kb.modes or ['Normal']:
+                groups.setdefault((mode,) + scope, []).append((tokens, kb))
+    found = []
+    for group, entries in sorted(groups.items()):
+        entries.sort(key=lambda entry: entry[0])
+        for i, (tokens, kb) in enumerate(entries):
+            # En orden lexicográfico las extensiones de `tokens` van justo después
+            for longer, _other in entries[i + 1:]:
+                if longer[:len(tokens)] != tokens:
+                    break
+                if len(longer) > len(tokens):
+                    found.append({'mode': group[0], 'key': canonicalizer.display(tokens),
+                                  'shadowed_by': canonicalizer.display(longer),
+                                  'file': kb.file_path, 'line': kb.line_number})
+                    break
+    return found
+
+
+# Hechos derivados de los keymaps: nombre -> función (keybindings, canonicalizer) -> lista
+FACTS: Dict[str, Callable[[List, Any], List[Dict]]] = {
+    'prefix_shadowed': prefix_shadowed,
+}
+# Ejemplos citados en el mensaje de una regla con hecho
+MAX_EXAMPLES = 3
+
+
+class OptionRuleEngine:
+    """Evalúa RULES sobre un OptionModel; los hechos de keymaps se calculan sólo si una regla los pide."""
+
+    OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+        'lt': lambda v, a: isinstance(v, (int, float)) and not isinstance(v, bool) and v < a,
+        'gt': lambda v, a: isinstance(v, (int, float)) and not isinstance(v, bool) and v > a,
+        'eq': lambda v, a: v == a,
+        'is': lambda v, a: v is a,
+        'in': lambda v, a: v in a,
+        'not_between': lambda v, a: isinstance(v, int) and not a[0] <= v <= a[1],
+        'has': lambda v, a: any(item in (a if isinstance(a, tuple) else (a,)) for item in _items(v)),
+    }
+
+    def __init__(self, model: OptionModel, rules: Optional[List[Dict]] = None,
+                 keybindings_provider: Optional[Callable[[], Tuple[List, Any]]] = None):
+        self.model = model
+        self.rules = RULES if rules is None else rules
+        self.keybindings_provider = keybindings_provider
+        self._facts: Dict[str, List[Dict]] = {}
+
+    def fact(self, name: str) -> List[Dict]:
+        if name not in self._facts:
+            if self.keybindings_provider is None:
+                self._facts[name] = []
+            else:
+                keybindings, canonicalizer = self.keybindings_provider()
+                self._facts[name] = FACTS[name](keybindings, canonicalizer)
+        return self._facts[name]
+
+    def evaluate(self) -> List[LintFinding]:
+        findings = []
+        for rule in self.rules:
+            conditions = rule['when']
+            if not all(self.OPERATORS[op](self.model.value(option), arg) for option, op, arg in conditions):
+                continue
+            details: List[Dict] = []
+            fields: Dict[str, Any] = {}
+            if rule.get('requires'):
+                details = self.fact(rule['requires'])
+                if not details:
+                    continue
+                fields = {'count': len(details), 'examples': ', '.join(
+                    f"{d['key']} → {d['shadowed_by']}" for d in details[:MAX_EXAMPLES])}
+            option = conditions[0][0]
+            value = self.model.value(option)
+            shown = ','.join(_items(value)) if isinstance(value, list) else value
+            locations = sorted((a.file_path, a.line) for option_name_, _op, _arg in conditions
+                               for a in self.model.assignments_of(option_name_))
+            findings.append(LintFinding(
+                rule=rule['id'], severity=rule['severity'], option=option, value=value,
+                message=rule['message'].format(value=shown, **fields), locations=locations, details=details,
+            ))
+        findings.sort(key=lambda f: -SEVERITY_ORDER[f.severity])
+        return findings
+
+
+def format_report(model: OptionModel, findings: List[LintFinding]) -> str:
+    """Sección markdown con los hallazgos y su ubicación."""
+    out = [f"### Opciones: rendimiento ({len(model.assignments)} asignaciones, {len(findings)} avisos)\n\n"]
+    if not findings:
+        out.append("✅ Ninguna regla de rendimiento se cumple\n")
+        return ''.join(out)
+    out.append("| Severidad | Regla | Ubicación | Detalle |\n")
+    out.append("|-----------|-------|-----------|---------|\n")
+    for finding in findings:
+        locations = ', '.join(f"{model.rel(path)}:{line}" for path, line in finding.locations) or "(por defecto)"
+        out.append(f"| {finding.severity} | `{finding.rule}` | {locations} | {finding.message} |\n")
+    return ''.join(out)
+
+
+def report_json(model: OptionModel, findings: List[LintFinding]) -> Dict:
+    return {
+        'options': [
+            {'name': a.name, 'value': a.value, 'type': a.kind, 'op': a.op, 'scope': a.scope,
+             'file': model.rel(a.file_path), 'line': a.line, 'source': a.source}
+            for a in model.assignments
+        ],
+        'findings': [
+            {'rule': f.rule, 'severity': f.severity, 'option': f.option, 'value': f.value, 'message': f.message,
+             'locations': [{'file': model.rel(path), 'line': line} for path, line in f.locations],
+             'details': [{**d, 'file': model.rel(d['file'])} for d in f.details]}
+            for f in findings
+        ],
+    }
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Escaneo de keymaps por defecto en los plugins instalados por lazy.nvim.
+
+Los atajos "por defecto" de plugins como Nerdy, Exercism, PickMe o Markit viven
+en el código fuente del plugin, no en esta configuración. Este módulo recorre el
+directorio raíz de lazy.nvim (configurado en lua/plugins/lazy.lua), busca
+definiciones del tipo vim.keymap.set()/nvim_set_keymap() y tablas de mapeos
+{ '<tecla>', ':Comando<CR>', 'Descripción' }, y guarda el resultado en caché por
+plugin usando el commit fijado en lua/plugins/lock.json: un plugin sólo se vuelve
+a escanear cuando su commit cambia.
+
+El escaneo se reparte entre procesos con un número acotado de tareas en vuelo,
+de modo que la memoria no crece con el número de archivos escaneados.
+"""
+
+import os
+import re
+import json
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass, asdict
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+# Se incrementa cuando cambia el formato de la caché o la lógica de escaneo
+SCAN_VERSION = 1
+
+# Máximo de keymaps aceptados por archivo (protege contra archivos generados)
+MAX_KEYMAPS_PER_FILE = 500
+
+# Subdirectorios de un plugin que Neovim carga como código Lua
+PLUGIN_SOURCE_DIRS = ('lua', 'plugin', 'after', 'ftplugin')
+
+_STR = r"(['\"])((?:(?!\1).)+)\1"
+
+_KEYMAP_PATTERNS = [
+    # vim.keymap.set('n', '<leader>x', rhs, { desc = '...' })
+    re.compile(
+        r"vim\.keymap\.set\s*\(\s*" + _STR + r"\s*,\s*['\"]([^'\"]+)['\"]\s*,\s*(['\"][^'\"\n]*['\"]|[^,\n)]+)([^\n]*)"
+    ),
+    # vim.keymap.set({ 'n', 'v' }, '<leader>x', rhs, { desc = '...' })
+    re.compile(
+        r"vim\.keymap\.set\s*\(\s*\{([^}\n]+)\}\s*,\s*['\"]([^'\"]+)['\"]\s*,\s*(['\"][^'\"\n]*['\"]|[^,\n)]+)([^\n]*)"
+    ),
+    # vim.api.nvim_set_keymap('n', '<leader>x', rhs, opts)
+    re.compile(
+        r"vim\.api\.nvim_set_keymap\s*\(\s*" + _STR + r"\s*,\s*['\"]([^'\"]+)['\"]\s*,\s*(['\"][^'\"\n]*['\"])([^\n]*)"
+    ),
+]
+
+# Entradas de tablas de mapeos: { '<leader>x', ':Cmd<CR>', 'Descripción' }
+_TRIPLE_RE = re.compile(
+    r"\{\s*['\"]([^'\"\n]+)['\"]\s*,\s*['\"]([^'\"\n]+)['\"]\s*,\s*['\"]([^'\"\n]+)['\"]\s*\}"
+)
+_DESC_RE = re.compile(r"desc\s*=\s*['\"]([^'\"]+)['\"]")
+
+
+@dataclass
+class PluginKeymap:
+    """Keymap encontrado en el código fuente de un plugin."""
+    plugin: str
+    file: str
+    line_number: int
+    modes: List[str]
+    key: str
+    action: str
+    description: str
+
+
+def _looks_like_key(value: str) -> bool:
+    """Heurística mínima para distinguir teclas de otros literales."""
+    value = value.strip()
+    return value.startswith('<') or value.startswith('[') or value.startswith(']') or len(value) <= 3
+
+
+def scan_lua_file(plugin: str, rel_file: str, abs_file: str) -> List[Tuple]:
+    """Escanea un archivo Lua de un plugin y devuelve tuplas serializables.
+
+    Se ejecuta en procesos worker, por eso devuelve tuplas simples y no
+    instancias de PluginKeymap.
+    """
+    try:
+        with open(abs_file, 'r', encoding='utf-8', errors='replace') as f:
+            content = f.read()
+    except OSError:
+        return []
+
+    found: List[Tuple] = []
+
+    def line_of(index: int) -> int:
+        return content.count('\n', 0, index) + 1
+
+    for idx, pattern in enumerate(_KEYMAP_PATTERNS):
+        for m in pattern.finditer(content):
+            if len(found) >= MAX_KEYMAPS_PER_FILE:
+                return found
+            line_start = content.rfind('\n', 0, m.start()) + 1
+            if '--' in content[line_start:m.start()]:
+                continue
+            if idx == 1:
+                modes_raw, key, action, rest = m.groups()
+            else:
+                _quote, modes_raw, key, action, rest = m.groups()
+            modes = [mode.strip(" '\"") for mode in modes_raw.split(',') if mode.strip(" '\"")]
+            desc_match = _DESC_RE.search(rest or '')
+            found.append((
+                plugin, rel_file, line_of(m.start()), modes, key.strip(),
+                action.strip().strip('\'"'), desc_match.group(1).strip() if desc_match else '',
+            ))
+
+    # Las tablas de triples sólo tienen sentido en archivos que definen keymaps
+    if 'keymap' in content:
+        for m in _TRIPLE_RE.finditer(content):
+            if len(found) >= MAX_KEYMAPS_PER_FILE:
+                break
+            key, action, desc = (g.strip() for g in m.groups())
+            if not _looks_like_key(key):
+                continue
+            line_start = content.rfind('\n', 0, m.start()) + 1
+            if content[line_start:m.start()].lstrip().startswith('--'):
+                continue
+            found.append((plugin, rel_file, line_of(m.start()), ['n'], key, action, desc))
+
+    return found
+
+
+def resolve_lazy_paths(repo_root: str) -> Tuple[str, str]:
+    """Resuelve (root, lockfile) de lazy.nvim a partir de lua/plugins/lazy.lua.
+
+    Sólo entiende expresiones del tipo vim.fn.stdpath('<tipo>') .. '<sufijo>',
+    que son las que usa la configuración; si no se reconocen se usan los valores
+    por defecto de lazy.nvim.
+    """
+    xdg_data = os.environ.get('XDG_DATA_HOME') or os.path.expanduser('~/.local/share')
+    stdpaths = {
+        'data': os.path.join(xdg_data, 'nvim'),
+        'config': repo_root,
+    }
+    root = os.path.join(stdpaths['data'], 'lazy')
+    lockfile = os.path.join(repo_root, 'lua', 'plugins', 'lock.json')
+
+    lazy_lua = os.path.join(repo_root, 'lua', 'plugins', 'lazy.lua')
+    try:
+        with open(lazy_lua, 'r', encoding='utf-8') as f:
+            content = f.read()
+    except OSError:
+        return root, lockfile
+
+    expr_re = r"vim\.fn\.stdpath\(\s*['\"](\w+)['\"]\s*\)\s*\.\.\s*['\"]([^'\"]+)['\"]"
+    m_root = re.search(r"^\s*root\s*=\s*" + expr_re, content, re.MULTILINE)
+    if m_root and m_root.group(1) in stdpaths:
+        root = stdpaths[m_root.group(1)] + m_root.group(2)
+    m_lock = re.search(r"^\s*lockfile\s*=\s*" + expr_re, content, re.MULTILINE)
+    if m_lock and m_lock.group(1) in stdpaths:
+        lockfile = stdpaths[m_lock.group(1)] + m_lock.group(2)
+    return os.path.normpath(root), os.path.normpath(lockfile)
+
+
+def read_lockfile(lockfile: str) -> Dict[str, str]:
+    """Devuelve {nombre_plugin: commit} desde lock.json (vacío si no existe)."""
+    try:
+        with open(lockfile, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return {name: info.get('commit', '') for name, info in data.items() if isinstance(info, dict)}
+
+
+def default_cache_dir() -> str:
+    """Directorio de caché del generador de documentación (XDG)."""
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+    return os.path.join(base, 'nvim-keybindings')
+
+
+class PluginKeymapScanner:
+    """Escanea el directorio de plugins de lazy.nvim con caché por commit."""
+
+    def __init__(self, plugin_root: str, lockfile: str, cache_dir: Optional[str] = None,
+                 jobs: Optional[int] = None):
+        self.plugin_root = plugin_root
+        self.lockfile = lockfile
+        self.cache_path = os.path.join(cache_dir or default_cache_dir(), 'plugin-keymaps.json')
+        self.jobs = jobs or os.cpu_count() or 1
+        # Tareas en vuelo como máximo: acota la memoria de resultados pendientes
+        self.max_in_flight = self.jobs * 4
+        self.rescanned: List[str] = []
+
+    def _load_cache(self) -> Dict[str, dict]:
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get('version') != SCAN_VERSION:
+            return {}
+        return data.get('plugins', {})
+
+    def _save_cache(self, plugins: Dict[str, dict]):
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        tmp_path = self.cache_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': SCAN_VERSION, 'plugins': plugins}, f)
+        os.replace(tmp_path, self.cache_path)
+
+    def _iter_plugin_files(self, plugin: str) -> Iterator[Tuple[str, str, str]]:
+        """Genera (plugin, ruta_relativa, ruta_absoluta) sin materializar listas."""
+        plugin_dir = os.path.join(self.plugin_root, plugin)
+        for sub in PLUGIN_SOURCE_DIRS:
+            base = os.path.join(plugin_dir, sub)
+            for root, dirs, files in os.walk(base):
+                dirs[:] = sorted(d for d in dirs if not d.startswith('.') and d not in ('test', 'tests', 'spec'))
+                for name in sorted(files):
+                    if name.endswith('.lua'):
+                        abs_file = os.path.join(root, name)
+                        yield plugin, os.path.relpath(abs_file, plugin_dir), abs_file
+
+    def _scan_plugins(self, plugins: List[str]) -> Dict[str, List[PluginKeymap]]:
+        """Escanea en paralelo los archivos de los plugins indicados."""
+        results: Dict[str, List[PluginKeymap]] = {p: [] for p in plugins}
+        if not plugins:
+            return results
+
+        def collect(future):
+            for item in future.result():
+                results[item[0]].append(PluginKeymap(*item))
+
+        tasks = (task for plugin in plugins for task in self._iter_plugin_files(plugin))
+        with ProcessPoolExecutor(max_workers=self.jobs) as pool:
+            pending = set()
+            for task in tasks:
+                if len(pending) >= self.max_in_flight:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        collect(future)
+                pending.add(pool.submit(scan_lua_file, *task))
+            for future in pending:
+                collect(future)
+
+        for keymaps in results.values():
+            keymaps.sort(key=lambda km: (km.file, km.line_number))
+        return results
+
+    def scan(self) -> Dict[str, List[PluginKeymap]]:
+        """Devuelve {plugin: [PluginKeymap]} reutilizando la caché cuando el commit coincide."""
+        locked = read_lockfile(self.lockfile)
+        if not os.path.isdir(self.plugin_root):
+            print(f"Aviso: no existe el directorio de plugins {self.plugin_root}")
+            return {}
+
+        installed = sorted(
+            name for name in os.listdir(self.plugin_root)
+            if os.path.isdir(os.path.join(self.plugin_root, name))
+        )
+        cache = self._load_cache()
+        out: Dict[str, List[PluginKeymap]] = {}
+        stale: List[str] = []
+        for plugin in installed:
+            commit = locked.get(plugin, '')
+            entry = cache.get(plugin)
+            # Sin commit fijado no hay forma fiable de validar la caché: re-escanear
+            if commit and entry and entry.get('commit') == commit:
+                out[plugin] = [PluginKeymap(**km) for km in entry.get('keymaps', [])]
+            else:
+                stale.append(plugin)
+
+        scanned = self._scan_plugins(stale)
+        for plugin, keymaps in scanned.items():
+            out[plugin] = keymaps
+            cache[plugin] = {
+                'commit': locked.get(plugin, ''),
+                'keymaps': [asdict(km) for km in keymaps],
+            }
+        self.rescanned = stale
+
+        # Olvidar plugins desinstalados
+        for plugin in list(cache.keys()):
+            if plugin not in out:
+                del cache[plugin]
+        if stale or len(cache) != len(out):
+            try:
+                self._save_cache(cache)
+            except OSError as e:
+                print(f"Aviso: no se pudo guardar la caché de plugins: {e}")
+        return out
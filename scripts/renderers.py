@@ -0,0 +1,551 @@
+#!/usr/bin/env python3
+"""
+Renderizadores de la documentación de keybindings.
+
+Una única extracción (lista de Keybinding) alimenta a todos los formatos:
+- markdown: docs/keybindings.md (el documento histórico del repositorio)
+- html: hoja de trucos autocontenida con filtrado en el navegador
+- json: volcado estructurado para otras herramientas
+- lua: lua/generated/keymap_index.lua, un módulo Lua con los atajos ya
+  ordenados, los grupos y las descripciones, para hacer require desde la config
+- pages: directorio docs/keybindings/ con una página por archivo, por modo y de
+  conflictos más un índice; sólo se reescriben las páginas cuyo hash cambió
+
+Cada renderizador produce su salida por trozos (render) y la escribe en
+streaming a un archivo temporal que se renombra al terminar, de modo que un
+lector nunca ve un archivo a medio escribir. write_outputs genera todos los
+formatos pedidos en paralelo.
+
+Los renderizadores reciben el extractor (para reutilizar categorías, chips de
+modos y formato de teclas) pero no importan update_keybindings.
+"""
+
+import os
+import re
+import json
+import html
+import difflib
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+# Comentario con la huella de las entradas (markdown y HTML)
+FINGERPRINT_PREFIX = "<!-- keybindings-fingerprint: "
+FINGERPRINT_RE = re.compile(r"^<!-- keybindings-fingerprint: ([0-9a-f]{64}) -->$", re.MULTILINE)
+
+
+def write_atomic(path: str, chunks: Iterable[str]):
+    """Escribe los trozos en un archivo temporal y lo renombra a `path` al terminar."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for chunk in chunks:
+                f.write(chunk)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+class Renderer:
+    """Formato de salida de la documentación."""
+
+    name = ""
+    default_path = ""
+    fingerprint_re = FINGERPRINT_RE
+
+    def __init__(self, extractor, output_path: Optional[str] = None):
+        self.extractor = extractor
+        self.output_path = os.path.join(extractor.repo_root, output_path or self.default_path)
+
+    def render(self, keybindings: List, fingerprint: str) -> Iterator[str]:
+        """Produce la salida por trozos, incluyendo la huella de las entradas."""
+        raise NotImplementedError
+
+    def render_to_string(self, keybindings: List, fingerprint: str) -> str:
+        return ''.join(self.render(keybindings, fingerprint))
+
+    def read_fingerprint(self) -> Optional[str]:
+        """Huella incrustada en la salida existente (None si no hay o no se puede leer)."""
+        try:
+            with open(self.output_path, 'r', encoding='utf-8') as f:
+                match = self.fingerprint_re.search(f.read())
+        except OSError:
+            return None
+        return match.group(1) if match else None
+
+    def strip_fingerprint(self, text: str) -> str:
+        """Texto sin la huella, para comparar salidas ignorándola."""
+        return self.fingerprint_re.sub('', text).rstrip('\n') + '\n'
+
+    def write(self, keybindings: List, fingerprint: str) -> str:
+        """Escribe la salida en streaming (archivo temporal + rename) y devuelve la ruta."""
+        write_atomic(self.output_path, self.render(keybindings, fingerprint))
+        return self.output_path
+
+    def diff(self, keybindings: List, fingerprint: str) -> List[str]:
+        """Diff unificado entre la salida existente y la regenerada, ignorando la huella."""
+        rel_path = self.rel_path(self.output_path)
+        try:
+            with open(self.output_path, 'r', encoding='utf-8') as f:
+                current = f.read()
+        except OSError:
+            current = ""
+        regenerated = self.render_to_string(keybindings, fingerprint)
+        return list(difflib.unified_diff(
+            self.strip_fingerprint(current).splitlines(keepends=True),
+            self.strip_fingerprint(regenerated).splitlines(keepends=True),
+            fromfile=f"{rel_path} (actual)", tofile=f"{rel_path} (regenerado)",
+        ))
+
+    def write_summary(self) -> str:
+        """Detalle de la última escritura para el mensaje final (vacío si no aplica)."""
+        return ""
+
+    def rel_path(self, file_path: str) -> str:
+        return os.path.relpath(file_path, self.extractor.repo_root).replace(os.sep, '/')
+
+    def row_path(self, table, row: int) -> str:
+        """rel_path de una fila de la tabla columnar (la ruta relativa ya está calculada)."""
+        return table.columns.rel_path[row].replace(os.sep, '/')
+
+
+class MarkdownRenderer(Renderer):
+    """docs/keybindings.md, generado por secciones con KeybindingExtractor.iter_documentation."""
+
+    name = "markdown"
+    default_path = "docs/keybindings.md"
+
+    def render(self, keybindings: List, fingerprint: str) -> Iterator[str]:
+        yield from self.extractor.iter_documentation(keybindings)
+        yield f"\n{FINGERPRINT_PREFIX}{fingerprint} -->\n"
+
+
+class JsonRenderer(Renderer):
+    """Volcado JSON: un objeto por keybinding, en el orden de la documentación."""
+
+    name = "json"
+    default_path = "docs/keybindings.json"
+    fingerprint_re = re.compile(r'^  "fingerprint": "([0-9a-f]{64})",$', re.MULTILINE)
+
+    def strip_fingerprint(self, text: str) -> str:
+        return self.fingerprint_re.sub('', text)
+
+    def record(self, kb, table=None, row: Optional[int] = None) -> Dict:
+        """Objeto JSON de un atajo; con la fila de la tabla, ruta y categoría salen de sus columnas."""
+        if table is None:
+            file_path, category = self.rel_path(kb.file_path), self.extractor.categorize_keybinding(kb)
+        else:
+            file_path, category = self.row_path(table, row), table.category(row)
+        return {
+            'file': file_path,
+            'line': kb.line_number,
+            'modes': kb.modes,
+            'key': kb.key,
+            'action': kb.action,
+            'description': kb.description,
+            'context': kb.context,
+            'category': category,
+            'canonical_key': kb.canonical_key,
+            'sources': [{'file': path, 'line': line} for path, line in kb.sources],
+        }
+
+    def render(self, keybindings: List, fingerprint: str) -> Iterator[str]:
+        table = self.extractor.as_table(keybindings)
+        ordered = [row for _path, kbs, _priority in self.extractor.ordered_file_groups(table) for row in kbs.rows]
+        records = table.columns.records
+        yield "{\n"
+        yield f'  "fingerprint": "{fingerprint}",\n'
+        yield f'  "count": {len(ordered)},\n'
+        yield '  "keybindings": ['
+        for i, row in enumerate(ordered):
+            separator = "," if i else ""
+            yield f"{separator}\n    {json.dumps(self.record(records[row], table, row), ensure_ascii=False)}"
+        yield "\n  ]\n}\n"
+
+
+_HTML_HEAD = """<!DOCTYPE html>
+<html lang="es">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>Atajos de teclado — Roberto nvim</title>
+<style>
+body { font-family: system-ui, sans-serif; margin: 0 auto; max-width: 72rem; padding: 1rem; color: #222; }
+header { position: sticky; top: 0; background: #fff; padding: .5rem 0; border-bottom: 1px solid #ddd; }
+#filter { width: 100%; font-size: 1rem; padding: .4rem; box-sizing: border-box; }
+.modes label { margin-right: .8rem; font-size: .9rem; }
+section h2 { font-size: 1.05rem; margin: 1.5rem 0 .4rem; }
+table { border-collapse: collapse; width: 100%; }
+th, td { text-align: left; padding: .25rem .5rem; border-bottom: 1px solid #eee; vertical-align: top; }
+kbd { font-family: ui-monospace, monospace; background: #f4f4f4; border: 1px solid #ccc; border-radius: 3px; padding: 0 .3rem; }
+.ctx, .cat { color: #666; font-size: .85rem; }
+.hidden { display: none; }
+</style>
+</head>
+<body>
+<header>
+<h1>Atajos de teclado</h1>
+<input id="filter" type="search" placeholder="Filtrar por tecla, acción, archivo o categoría…" autofocus>
+<div class="modes">
+"""
+
+_HTML_SCRIPT = """<script>
+(function () {
+  var filter = document.getElementById('filter');
+  var modeBoxes = Array.prototype.slice.call(document.querySelectorAll('.modes input'));
+  var rows = Array.prototype.slice.call(document.querySelectorAll('tbody tr'));
+  var sections = Array.prototype.slice.call(document.querySelectorAll('section'));
+  function apply() {
+    var terms = filter.value.toLowerCase().split(/\\s+/).filter(Boolean);
+    var modes = modeBoxes.filter(function (b) { return b.checked; }).map(function (b) { return b.value; });
+    rows.forEach(function (row) {
+      var text = row.getAttribute('data-search');
+      var rowModes = row.getAttribute('data-modes').split(' ');
+      var visible = terms.every(function (t) { return text.indexOf(t) !== -1; }) &&
+        rowModes.some(function (m) { return modes.indexOf(m) !== -1; });
+      row.classList.toggle('hidden', !visible);
+    });
+    sections.forEach(function (section) {
+      section.classList.toggle('hidden', !section.querySelector('tbody tr:not(.hidden)'));
+    });
+  }
+  filter.addEventListener('input', apply);
+  modeBoxes.forEach(function (b) { b.addEventListener('change', apply); });
+})();
+</script>
+"""
+
+
+class HtmlRenderer(Renderer):
+    """Hoja de trucos HTML autocontenida (CSS y JS en línea, sin dependencias)."""
+
+    name = "html"
+    default_path = "docs/keybindings.html"
+
+    def row(self, kb, table=None, row: Optional[int] = None) -> str:
+        """Fila <tr> de un atajo; con la fila de la tabla, ruta, categoría y chips salen de sus columnas."""
+        if table is None:
+            rel_path, category = self.rel_path(kb.file_path), self.extractor.categorize_keybinding(kb)
+            chips = self.extractor.modes_to_chips(kb.modes)
+        else:
+            rel_path, category, chips = self.row_path(table, row), table.category(row), table.chips(kb.modes)
+        action = kb.description or kb.action
+        search = ' '.join([kb.key, action, kb.action, kb.context, rel_path, category]).lower()
+        modes = ' '.join(kb.modes) if kb.modes else 'Normal'
+        context = f'<div class="ctx">{html.escape(kb.context)}</div>' if kb.context else ""
+        return (
+            f'<tr data-search="{html.escape(search)}" data-modes="{html.escape(modes)}">'
+            f'<td><kbd>{html.escape(kb.key)}</kbd></td>'
+            f'<td>{html.escape(action)}{context}</td>'
+            f'<td>{html.escape(chips)}</td>'
+            f'<td class="cat">{html.escape(category)}</td>'
+            f'<td class="ctx">{html.escape(rel_path)}:{kb.line_number}</td>'
+            '</tr>\n'
+        )
+
+    def render(self, keybindings: List, fingerprint: str) -> Iterator[str]:
+        table = self.extractor.as_table(keybindings)
+        groups = self.extractor.ordered_file_groups(table)
+        all_modes: List[str] = []
+        for _path, kbs, _priority in groups:
+            for mode in kbs.by_mode('Normal'):
+                if mode not in all_modes:
+                    all_modes.append(mode)
+
+        yield _HTML_HEAD
+        for mode in all_modes:
+            yield f'<label><input type="checkbox" value="{html.escape(mode)}" checked> {html.escape(mode)}</label>\n'
+        yield f"</div>\n</header>\n<p>{sum(len(kbs) for _p, kbs, _pr in groups)} atajos.</p>\n"
+        for file_path, kbs, _priority in groups:
+            yield f"<section>\n<h2>{html.escape(file_path)}</h2>\n"
+            yield ("<table>\n<thead><tr><th>Tecla</th><th>Acción</th><th>Modos</th>"
+                   "<th>Categoría</th><th>Origen</th></tr></thead>\n<tbody>\n")
+            for row, kb in zip(kbs.rows, kbs):
+                yield self.row(kb, table, row)
+            yield "</tbody>\n</table>\n</section>\n"
+        yield _HTML_SCRIPT
+        yield f"</body>\n</html>\n{FINGERPRINT_PREFIX}{fingerprint} -->\n"
+
+
+def lua_string(value: str) -> str:
+    """Literal de string Lua entre comillas dobles (escapa \\, comillas y controles)."""
+    out = ['"']
+    for ch in value:
+        if ch in '\\"':
+            out.append('\\' + ch)
+        elif ch == '\n':
+            out.append('\\n')
+        elif ord(ch) < 32 or ord(ch) == 127:
+            out.append(f"\\{ord(ch):03d}")
+        else:
+            out.append(ch)
+    out.append('"')
+    return ''.join(out)
+
+
+class LuaIndexRenderer(Renderer):
+    """Módulo Lua precalculado con los atajos, para cargarlo con require sin cómputo.
+
+    El archivo es un único `return { ... }` de constantes (sin llamadas ni bucles),
+    así que cargarlo es sólo leer la tabla y vim.loader puede cachear su bytecode.
+    Contiene:
+    - bindings: { lhs, mode, desc, file, line } ordenados por modo y secuencia canónica;
+    - groups: prefijo -> etiqueta de los grupos de which-key;
+    - descriptions: modo -> lhs -> descripción (la primera en ese orden).
+    Los modos van en notación de Neovim ('n', 'v'...); los atajos de modos que no son
+    de Neovim (Custom: teclas de la interfaz de Lazy) no se incluyen. lua/generated
+    está en GENERATED_DIRS, así que el módulo no es entrada de su propia huella.
+    """
+
+    name = "lua"
+    default_path = "lua/generated/keymap_index.lua"
+    fingerprint_re = re.compile(r"^-- keybindings-fingerprint: ([0-9a-f]{64})$", re.MULTILINE)
+    vim_modes = {
+        'Normal': 'n', 'Visual': 'v', 'Select': 's', 'Insert': 'i',
+        'Terminal': 't', 'Command': 'c', 'Operator': 'o',
+    }
+
+    def rows(self, keybindings: List) -> List[Tuple[str, str, str, str, str, int]]:
+        """(modo, clave canónica, lhs, descripción, archivo, línea) de cada atajo y modo, ordenados."""
+        table = self.extractor.as_table(keybindings)
+        columns = table.columns
+        rows = []
+        for row, kb in zip(table.rows, table):
+            if kb.context == 'which-key-group':
+                continue
+            desc = kb.description if kb.description and kb.description != kb.key else ""
+            for mode in columns.modes[row] or ('Normal',):
+                vim_mode = self.vim_modes.get(mode)
+                if vim_mode:
+                    rows.append((vim_mode, columns.canonical[row], kb.key, desc, self.row_path(table, row),
+                                 kb.line_number))
+        return sorted(set(rows))
+
+    def groups(self, keybindings: List) -> Dict[str, str]:
+        groups: Dict[str, str] = {}
+        for kb in keybindings:
+            if kb.context == 'which-key-group' and kb.description:
+                groups.setdefault(kb.key, kb.description)
+        return dict(sorted(groups.items(), key=lambda item: item[0].lower()))
+
+    def render(self, keybindings: List, fingerprint: str) -> Iterator[str]:
+        rows = self.rows(keybindings)
+        yield "-- Índice de atajos generado por scripts/update_keybindings.py --formats lua. No editar a mano.\n"
+        yield f"-- keybindings-fingerprint: {fingerprint}\n"
+        yield "return {\n"
+        yield "  -- { lhs, mode, desc, file, line }, ordenados por modo y secuencia canónica\n"
+        yield "  bindings = {\n"
+        for mode, _canonical, lhs, desc, file_path, line in rows:
+            yield (f"    {{ lhs = {lua_string(lhs)}, mode = {lua_string(mode)}, desc = {lua_string(desc)}, "
+                   f"file = {lua_string(file_path)}, line = {line} }},\n")
+        yield "  },\n"
+        yield "  -- prefijo -> etiqueta del grupo de which-key\n"
+        yield "  groups = {\n"
+        for prefix, label in self.groups(keybindings).items():
+            yield f"    [{lua_string(prefix)}] = {lua_string(label)},\n"
+        yield "  },\n"
+        yield "  -- modo -> lhs -> descripción\n"
+        yield "  descriptions = {\n"
+        descriptions: Dict[str, Dict[str, str]] = {}
+        for mode, _canonical, lhs, desc, _file, _line in rows:
+            if desc:
+                descriptions.setdefault(mode, {}).setdefault(lhs, desc)
+        for mode, entries in descriptions.items():
+            yield f"    {mode} = {{\n"
+            for lhs, desc in entries.items():
+                yield f"      [{lua_string(lhs)}] = {lua_string(desc)},\n"
+            yield "    },\n"
+        yield "  },\n"
+        yield "}\n"
+
+
+class PagedMarkdownRenderer(Renderer):
+    """docs/keybindings/: índice más páginas pequeñas (por archivo, por modo y de conflictos).
+
+    Cada página se guarda con su sha256 en manifest.json y sólo se reescribe si su
+    contenido cambió; las páginas que ya no se generan se borran. La huella de las
+    entradas va sólo en index.md (escrito el último), así que un cambio en un archivo
+    Lua reescribe su página, las de sus modos y el índice, y nada más.
+    """
+
+    name = "pages"
+    default_path = "docs/keybindings"
+    index_page = "index.md"
+    manifest_name = "manifest.json"
+
+    def __init__(self, extractor, output_path: Optional[str] = None):
+        super().__init__(extractor, output_path)
+        self.rewritten: List[str] = []
+        self.removed: List[str] = []
+        self.unchanged = 0
+
+    @property
+    def index_path(self) -> str:
+        return self.page_path(self.index_page)
+
+    def page_path(self, name: str) -> str:
+        return os.path.join(self.output_path, *name.split('/'))
+
+    def link_prefix(self, name: str) -> str:
+        """Prefijo relativo desde la página `name` hasta la raíz del repositorio."""
+        page_dir = os.path.dirname(self.page_path(name))
+        return os.path.relpath(self.extractor.repo_root, page_dir).replace(os.sep, '/') + '/'
+
+    @staticmethod
+    def slug(text: str) -> str:
+        return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-') or 'pagina'
+
+    def file_pages(self, groups: List[Tuple[str, List, bool]]) -> Dict[str, str]:
+        """Archivo fuente -> nombre de su página (files/<slug>.md, sin colisiones)."""
+        names: Dict[str, str] = {}
+        used = set()
+        for file_path, _kbs, _priority in groups:
+            base = self.slug(re.sub(r'\.lua$', '', file_path))
+            name, n = f"files/{base}.md", 2
+            while name in used:
+                name, n = f"files/{base}-{n}.md", n + 1
+            used.add(name)
+            names[file_path] = name
+        return names
+
+    def mode_groups(self, keybindings: List) -> List[Tuple[str, List]]:
+        """(modo, keybindings) en el orden habitual de modos y luego por aparición."""
+        order = ['Normal', 'Visual', 'Select', 'Insert', 'Terminal', 'Command', 'Operator']
+        per_mode = self.extractor.as_table(keybindings).by_mode('N/A')
+        modes = sorted(per_mode, key=lambda m: order.index(m) if m in order else len(order))
+        return [(mode, per_mode[mode]) for mode in modes]
+
+    def pages(self, keybindings: List, fingerprint: str) -> Dict[str, str]:
+        """Nombre relativo -> contenido de cada página, con el índice al final."""
+        extractor = self.extractor
+        groups = extractor.ordered_file_groups(keybindings)
+        file_pages = self.file_pages(groups)
+        pages: Dict[str, str] = {}
+
+        for file_path, kbs, priority in groups:
+            name = file_pages[file_path]
+            pages[name] = "[Índice](../index.md)\n\n" + extractor.generate_file_section(
+                file_path, kbs, priority, link_prefix=self.link_prefix(name)
+            )
+
+        mode_pages: List[Tuple[str, str, int]] = []
+        for mode, kbs in self.mode_groups(keybindings):
+            name = f"modes/{self.slug(mode)}.md"
+            prefix = self.link_prefix(name)
+            doc = f"[Índice](../index.md)\n\n# Modo {mode}\n\n{len(kbs)} atajos.\n\n"
+            for file_path, file_kbs, _priority in extractor.ordered_file_groups(kbs):
+                doc += f"### [{file_path}]({prefix}{file_path})\n\n"
+                doc += extractor.generate_markdown_table(file_kbs) + "\n"
+            pages[name] = doc
+            mode_pages.append((mode, name, len(kbs)))
+
+        pages["conflicts.md"] = (
+            "[Índice](index.md)\n\n# Conflictos y solapamientos\n\n"
+            + extractor.generate_conflicts_section(keybindings, link_prefix=self.link_prefix("conflicts.md"))
+            + "\n"
+        )
+
+        index = "# [Roberto nvim](https://github.com/25ASAB015/nvim) — Atajos de teclado\n\n"
+        index += f"{len(keybindings)} atajos en {len(groups)} archivos.\n\n"
+        index += "> Leader == <kbd>Espacio</kbd>\n\n"
+        index += "## Por archivo\n\n"
+        for file_path, kbs, _priority in groups:
+            index += f"- [{file_path}]({file_pages[file_path]}) — {len(kbs)}\n"
+        index += "\n## Por modo\n\n"
+        for mode, name, count in mode_pages:
+            index += f"- [{mode}]({name}) — {count}\n"
+        index += "\n## [Conflictos y solapamientos](conflicts.md)\n"
+        index += f"\n{FINGERPRINT_PREFIX}{fingerprint} -->\n"
+        pages[self.index_page] = index
+        return pages
+
+    def render(self, keybindings: List, fingerprint: str) -> Iterator[str]:
+        """Todas las páginas concatenadas (sólo para comparar o depurar)."""
+        for name, content in self.pages(keybindings, fingerprint).items():
+            yield f"<!-- {name} -->\n{content}"
+
+    def read_manifest(self) -> Dict[str, str]:
+        try:
+            with open(self.page_path(self.manifest_name), 'r', encoding='utf-8') as f:
+                return json.load(f).get('pages', {})
+        except (OSError, ValueError, AttributeError):
+            return {}
+
+    def read_fingerprint(self) -> Optional[str]:
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                match = self.fingerprint_re.search(f.read())
+        except OSError:
+            return None
+        return match.group(1) if match else None
+
+    def write(self, keybindings: List, fingerprint: str) -> str:
+        """Escribe sólo las páginas cuyo hash difiere del manifiesto y borra las obsoletas."""
+        pages = self.pages(keybindings, fingerprint)
+        previous = self.read_manifest()
+        hashes: Dict[str, str] = {}
+        self.rewritten, self.removed, self.unchanged = [], [], 0
+        for name, content in pages.items():
+            digest = hashlib.sha256(content.encode('utf-8')).hexdigest()
+            hashes[name] = digest
+            path = self.page_path(name)
+            if previous.get(name) == digest and os.path.exists(path):
+                self.unchanged += 1
+                continue
+            write_atomic(path, [content])
+            self.rewritten.append(name)
+        for name in previous:
+            if name not in pages:
+                try:
+                    os.remove(self.page_path(name))
+                except OSError:
+                    pass
+                self.removed.append(name)
+        if hashes != previous:
+            manifest = json.dumps({'pages': hashes}, ensure_ascii=False, indent=2, sort_keys=True)
+            write_atomic(self.page_path(self.manifest_name), [manifest + "\n"])
+        return self.output_path
+
+    def diff(self, keybindings: List, fingerprint: str) -> List[str]:
+        """Diff de cada página contra la existente (las obsoletas aparecen como borradas)."""
+        pages = self.pages(keybindings, fingerprint)
+        stale = [name for name in self.read_manifest() if name not in pages]
+        out: List[str] = []
+        for name in list(pages) + stale:
+            rel_path = self.rel_path(self.page_path(name))
+            try:
+                with open(self.page_path(name), 'r', encoding='utf-8') as f:
+                    current = f.read()
+            except OSError:
+                current = ""
+            regenerated = pages.get(name, "")
+            if name == self.index_page:
+                current, regenerated = self.strip_fingerprint(current), self.strip_fingerprint(regenerated)
+            out.extend(difflib.unified_diff(
+                current.splitlines(keepends=True), regenerated.splitlines(keepends=True),
+                fromfile=f"{rel_path} (actual)", tofile=f"{rel_path} (regenerado)",
+            ))
+        return out
+
+    def write_summary(self) -> str:
+        summary = f"{len(self.rewritten)} páginas reescritas, {self.unchanged} sin cambios"
+        if self.removed:
+            summary += f", {len(self.removed)} borradas"
+        return summary
+
+
+RENDERERS: Dict[str, type] = {
+    renderer.name: renderer for renderer in (
+        MarkdownRenderer, HtmlRenderer, JsonRenderer, LuaIndexRenderer, PagedMarkdownRenderer,
+    )
+}
+
+
+def write_outputs(renderers: List[Renderer], keybindings: List, fingerprint: str) -> List[Tuple[str, str]]:
+    """Escribe todos los formatos en paralelo; devuelve (formato, ruta) en el orden pedido."""
+    with ThreadPoolExecutor(max_workers=max(1, len(renderers))) as pool:
+        futures = [pool.submit(renderer.write, keybindings, fingerprint) for renderer in renderers]
+        return [(renderer.name, future.result()) for renderer, future in zip(renderers, futures)]
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Grafo de módulos de la configuración: qué archivos Lua llegan a ejecutarse.
+
+Neovim ejecuta init.lua y los archivos de los directorios de runtime que carga por
+sí mismo (plugin/, after/, ftplugin/...). El resto de lua/ sólo corre si alguien lo
+carga:
+- require('core.keys') y pcall(require, 'user');
+- los cargadores de configuración de list.lua: load_config('ui.onedark') hace
+  require('plugins.' .. package);
+- `import = 'plugins.extra'` de lazy.nvim (el módulo o los módulos de ese directorio).
+
+ModuleGraph recorre esas referencias desde las raíces y sólo parsea los archivos que
+alcanza; los demás (módulos archivados, experimentos) se informan como no
+alcanzables. Los nombres se resuelven contra la estructura de lua/ ('lib.util' ->
+lua/lib/util.lua o lua/lib/util/init.lua, como lua_symbols.module_name). Los
+cargadores se detectan en cada archivo (una función cuyo cuerpo hace
+require('prefijo' .. parámetro)), además de los conocidos de lazy_specs.CONFIG_LOADERS.
+Un require cuyo argumento no es un literal ni pasa por un cargador no se puede
+seguir: se anota como referencia dinámica para el informe.
+
+Cada archivo se parsea con un plazo (file_budget, el --file-budget del extractor).
+Si el parseo falla o agota el plazo, las referencias salen de un escaneo por regex
+(require, pcall(require, ...), cargadores conocidos e `import =`); si sólo tuvo
+errores de sintaxis, el escaneo completa lo que estaba en las sentencias
+descartadas. En ambos casos se avisa de que la alcanzabilidad puede ser parcial.
+
+El contenido se lee del disco o de la función `read` (p.ej. los blobs de una
+revisión de git con --rev), de modo que el mismo grafo decide qué se documenta en
+ambos casos.
+
+Sin init.lua no hay raíces y se consideran alcanzables todos los archivos.
+
+Con una tabla de símbolos (lua_symbols.SymbolIndex) el mismo recorrido del AST
+indexa también los símbolos de cada archivo alcanzado, y el motor ast reutiliza
+ese árbol en lugar de volver a parsear.
+
+Este módulo no importa update_keybindings.
+"""
+
+import os
+import re
+import time
+import bisect
+from collections import deque
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+import lua_ast
+from lazy_specs import CONFIG_LOADERS
+from lua_symbols import SymbolIndex, module_name
+
+
+# Punto de entrada de la configuración, relativo a la raíz
+ROOT_FILE = 'init.lua'
+# Directorios de runtime cuyos .lua carga Neovim sin require (relativos a la raíz)
+RUNTIME_DIRS = ('plugin', 'after', 'ftplugin', 'indent', 'syntax', 'colors', 'lsp')
+
+# Escaneo por regex cuando el AST no está disponible o está incompleto
+_COMMENT_LINE_RE = re.compile(r"(?m)^[ \t]*--.*$")
+_CALL_RE = re.compile(r"\b([A-Za-z_][\w.]*)\s*\(?\s*(['\"])([\w.-]+)\2")
+_PCALL_REQUIRE_RE = re.compile(r"\bpcall\s*\(\s*require\s*,\s*(['\"])([\w.-]+)\1")
+_IMPORT_RE = re.compile(r"\bimport\s*=\s*(['\"])([\w.-]+)\1")
+
+
+class _ReferenceCollector:
+    """Referencias a módulos de un archivo en un recorrido del AST (en orden de código)."""
+
+    node_types = (lua_ast.FunctionDecl, lua_ast.Local, lua_ast.Call, lua_ast.Field)
+
+    def __init__(self):
+        self.loaders: Dict[str, str] = dict(CONFIG_LOADERS)
+        self.modules: List[Tuple[str, int]] = []
+        self.imports: List[Tuple[str, int]] = []
+        self.dynamic: List[int] = []
+        self._loader_requires: Set[int] = set()
+
+    def visit(self, node: lua_ast.Node, ancestors: List[lua_ast.Node]):
+        if isinstance(node, lua_ast.FunctionDecl):
+            self._loader(lua_ast.dotted_name(node.target), node.func)
+        elif isinstance(node, lua_ast.Local):
+            for name, value in zip(node.names, node.values):
+                self._loader(name, value)
+        elif isinstance(node, lua_ast.Field):
+            name = lua_ast.string_value(node.value)
+            if node.kind == 'named' and node.name == 'import' and name:
+                self.imports.append((name, node.line))
+        else:
+            self._call(node)
+
+    def _loader(self, name: Optional[str], func: Optional[lua_ast.Node]):
+        """Registra `name` como cargador si su cuerpo hace require('prefijo' .. parámetro)."""
+        if not name or not isinstance(func, lua_ast.Function):
+            return
+        stack: List[lua_ast.Node] = list(func.body)
+        while stack:
+            node = stack.pop()
+            if isinstance(node, lua_ast.Call) and lua_ast.dotted_name(node.func) == 'require' and len(node.args) == 1:
+                arg = node.args[0]
+                if isinstance(arg, lua_ast.BinOp) and arg.op == '..' and isinstance(arg.right, lua_ast.Name) \
+                        and arg.right.id in func.params and lua_ast.string_value(arg.left) is not None:
+                    self.loaders[name] = lua_ast.string_value(arg.left)
+                    self._loader_requires.add(id(node))
+                    return
+            stack.extend(lua_ast.iter_children(node))
+
+    def _call(self, node: lua_ast.Call):
+        func = lua_ast.dotted_name(node.func)
+        if func == 'require' and node.args:
+            name = lua_ast.string_value(node.args[0])
+            if name:
+                self.modules.append((name, node.line))
+            elif id(node) not in self._loader_requires:
+                self.dynamic.append(node.line)
+        elif func == 'pcall' and len(node.args) >= 2 and lua_ast.dotted_name(node.args[0]) == 'require':
+            name = lua_ast.string_value(node.args[1])
+            if name:
+                self.modules.append((name, node.line))
+            else:
+                self.dynamic.append(node.line)
+        elif func in self.loaders and node.args:
+            name = lua_ast.string_value(node.args[0])
+            if name:
+                self.modules.append((self.loaders[func] + name, node.line))
+
+    def add_missing(self, other: '_ReferenceCollector'):
+        """Añade las referencias de `other` que este recorrido no encontró."""
+        modules = {name for name, _line in self.modules}
+        imports = {name for name, _line in self.imports}
+        self.modules.extend(ref for ref in other.modules if ref[0] not in modules)
+        self.imports.extend(ref for ref in other.imports if ref[0] not in imports)
+
+
+def scan_references(content: str) -> _ReferenceCollector:
+    """Referencias a módulos por regex, sin AST (sólo cargadores conocidos; sin require dinámicos)."""
+    content = _COMMENT_LINE_RE.sub("", content)
+    line_starts = [0] + [m.end() for m in re.finditer('\n', content)]
+    line_of = lambda offset: bisect.bisect_right(line_starts, offset)
+    collector = _ReferenceCollector()
+    for match in _CALL_RE.finditer(content):
+        func, name = match.group(1), match.group(3)
+        if func == 'require':
+            collector.modules.append((name, line_of(match.start())))
+        elif func in collector.loaders:
+            collector.modules.append((collector.loaders[func] + name, line_of(match.start())))
+    for match in _PCALL_REQUIRE_RE.finditer(content):
+        collector.modules.append((match.group(2), line_of(match.start())))
+    for match in _IMPORT_RE.finditer(content):
+        collector.imports.append((match.group(2), line_of(match.start())))
+    collector.modules.sort(key=lambda ref: ref[1])
+    return collector
+
+
+class ModuleGraph:
+    """Alcanzabilidad de los archivos Lua del repositorio desde init.lua y el runtime."""
+
+    def __init__(self, repo_root: str, lua_files: List[str], symbols: Optional[SymbolIndex] = None,
+                 file_budget: float = 0.0, read: Optional[Callable[[str], str]] = None):
+        self.repo_root = repo_root
+        self.files = lua_files
+        # Si se da, cada archivo parseado se indexa en el mismo recorrido que sus referencias
+        self.symbols = symbols
+        # Plazo de parseo por archivo en segundos (<= 0: sin plazo)
+        self.file_budget = file_budget
+        # Contenido de una ruta absoluta (por defecto se lee del disco)
+        self.read = read or _read_file
+        self.modules: Dict[str, str] = {}
+        for file_path in lua_files:
+            name = module_name(repo_root, file_path)
+            if name:
+                self.modules[name] = file_path
+        self.roots = [path for path in lua_files if self._is_root(path)]
+        # Archivo -> archivos que carga; archivo -> líneas con require dinámicos
+        self.edges: Dict[str, List[str]] = {}
+        self.dynamic: Dict[str, List[int]] = {}
+        # Archivo -> motivo por el que sus referencias salen (en parte) del escaneo por regex
+        self.partial: Dict[str, str] = {}
+        self.reachable: Set[str] = set()
+        self._walk()
+
+    def _is_root(self, file_path: str) -> bool:
+        rel_path = os.path.relpath(file_path, self.repo_root).replace(os.sep, '/')
+        return rel_path == ROOT_FILE or rel_path.split('/', 1)[0] in RUNTIME_DIRS
+
+    @property
+    def has_roots(self) -> bool:
+        return any(os.path.relpath(p, self.repo_root).replace(os.sep, '/') == ROOT_FILE for p in self.roots)
+
+    def resolve(self, name: str) -> Optional[str]:
+        """Archivo del módulo 'a.b' (lua/a/b.lua o lua/a/b/init.lua); None si no es del repositorio."""
+        return self.modules.get(name)
+
+    def resolve_import(self, name: str) -> List[str]:
+        """`import = 'a.b'` de lazy.nvim: el propio módulo y los módulos directos de lua/a/b/."""
+        prefix = name + '.'
+        files = [path for module, path in self.modules.items()
+                 if module == name or (module.startswith(prefix) and '.' not in module[len(prefix):])]
+        return sorted(set(files))
+
+    def references(self, file_path: str) -> _ReferenceCollector:
+        """Referencias del archivo; las de un archivo que no se pudo parsear salen de scan_references."""
+        try:
+            content = self.read(file_path)
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"Aviso: no se pudo leer {file_path} para el grafo de módulos: {e}")
+            content = ""
+        deadline = time.monotonic() + self.file_budget if self.file_budget > 0 else None
+        try:
+            tree, errors = lua_ast.parse_tolerant(content, deadline)
+            collector = _ReferenceCollector()
+            walker = lua_ast.LuaWalker()
+            walker.register_rule(collector)
+            symbol_collector = self.symbols.begin_file(content, tree, errors) if self.symbols is not None else None
+            if symbol_collector is not None:
+                walker.register_rule(symbol_collector)
+            walker.walk(tree)
+        except Exception as e:
+            # Sin símbolos: el motor ast indexará el archivo por su cuenta
+            self._partial(file_path, f"no se pudo parsear: {type(e).__name__}: {e}")
+            return scan_references(content)
+        if symbol_collector is not None:
+            self.symbols.end_file(file_path, symbol_collector)
+        if errors:
+            # Las sentencias descartadas pueden contener require
+            self._partial(file_path, f"{len(errors)} errores de sintaxis; primero: {errors[0]}")
+            collector.add_missing(scan_references(content))
+        return collector
+
+    def _partial(self, file_path: str, reason: str):
+        self.partial[file_path] = reason
+        rel_path = os.path.relpath(file_path, self.repo_root).replace(os.sep, '/')
+        print(f"Aviso: grafo de módulos incompleto en {rel_path} ({reason}); sus require se buscan "
+              f"por regex y la alcanzabilidad puede ser parcial")
+
+    def _walk(self):
+        """Recorrido en anchura desde las raíces; sólo se parsean los archivos alcanzados."""
+        if not self.has_roots:
+            self.reachable = set(self.files)
+            return
+        queue = deque(self.roots)
+        self.reachable = set(self.roots)
+        while queue:
+            file_path = queue.popleft()
+            refs = self.references(file_path)
+            targets: List[str] = []
+            for name, _line in refs.modules:
+                target = self.resolve(name)
+                if target is not None:
+                    targets.append(target)
+            for name, _line in refs.imports:
+                targets.extend(self.resolve_import(name))
+            self.edges[file_path] = targets
+            if refs.dynamic:
+                self.dynamic[file_path] = refs.dynamic
+            for target in targets:
+                if target not in self.reachable:
+                    self.reachable.add(target)
+                    queue.append(target)
+
+    def reachable_files(self) -> List[str]:
+        """Archivos alcanzables, en el orden de `lua_files`."""
+        return [path for path in self.files if path in self.reachable]
+
+    def unreachable_files(self) -> List[str]:
+        return [path for path in self.files if path not in self.reachable]
+
+
+def _read_file(file_path: str) -> str:
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def format_unreachable(graph: ModuleGraph) -> str:
+    """Informe breve de módulos no alcanzables y de require dinámicos sin resolver."""
+    rel = lambda path: os.path.relpath(path, graph.repo_root).replace(os.sep, '/')
+    out: List[str] = []
+    unreachable = graph.unreachable_files()
+    if unreachable:
+        out.append(f"ℹ️  {len(unreachable)} módulo(s) no alcanzable(s) desde {ROOT_FILE} (no se documentan; "
+                   f"--all-files los incluye): {', '.join(rel(p) for p in unreachable)}\n")
+    for file_path, lines in graph.dynamic.items():
+        out.append(f"Aviso: require dinámico sin resolver en {rel(file_path)} (líneas "
+                   f"{', '.join(str(line) for line in lines)}): lo que cargue no se sigue\n")
+    return ''.join(out)
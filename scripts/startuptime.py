@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+Ingesta de logs de `nvim --startuptime` con atribución de costes.
+
+Cada ejecución de `nvim --startuptime LOG` añade al archivo un bloque:
+
+    000.008  000.008: --- NVIM STARTING ---
+    003.100  000.420  000.420: sourcing /home/u/.config/nvim/init.lua
+    004.050  000.900  000.300: require('core.options')
+    ...
+    061.000  000.010: --- NVIM STARTED ---
+
+StartupTimeAggregator lee uno o muchos logs (también .gz) línea a línea y suma,
+por ejecución, el tiempo propio ("self") y el total ("self+sourced") de cada
+require, cada archivo sourced y cada evento. Al cerrar cada ejecución los totales
+se vuelcan en histogramas logarítmicos (LogHistogram): la memoria depende del
+número de módulos distintos, no del número de ejecuciones ni del tamaño de los
+logs, y los percentiles tienen un error relativo acotado (RELATIVE_ERROR).
+
+Cada módulo o archivo se atribuye a:
+- un archivo del repositorio (require('core.keys') -> lua/core/keys.lua,
+  sourcing .../nvim/init.lua -> init.lua);
+- un plugin de lua/plugins/list.lua (require('spectre'), sourcing
+  .../lazy/nvim-spectre/plugin/spectre.lua), con la línea de su spec;
+- el runtime de Neovim (require('vim.*'), $VIMRUNTIME) u "otro".
+
+Se usa con `update_keybindings.py startuptime LOG... [--json RUTA]`. Este módulo
+no importa update_keybindings.
+"""
+
+import os
+import re
+import gzip
+import math
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from lazy_specs import PluginSpecIndex
+
+
+# Error relativo máximo de los percentiles estimados
+RELATIVE_ERROR = 0.02
+# Percentiles del informe
+PERCENTILES = (50, 90, 99)
+
+_TIMED_RE = re.compile(r"^\s*(\d+\.\d+)\s+(\d+\.\d+)\s+(\d+\.\d+):\s+(sourcing|require)\s*(.*?)\s*$")
+_EVENT_RE = re.compile(r"^\s*(\d+\.\d+)\s+(\d+\.\d+):\s+(.*?)\s*$")
+_REQUIRE_ARG_RE = re.compile(r"^\(\s*['\"](.+?)['\"]\s*\)$")
+_STARTING = '--- NVIM STARTING ---'
+_STARTED = '--- NVIM STARTED ---'
+
+
+class LogHistogram:
+    """Histograma de cubos logarítmicos (estilo DDSketch) con memoria acotada.
+
+    Un valor v > 0 cae en el cubo ceil(log_gamma(v)), con gamma = (1+e)/(1-e); el
+    percentil estimado tiene error relativo <= e. El número de cubos crece con el
+    logaritmo del rango de valores, no con el número de muestras.
+    """
+
+    def __init__(self, relative_error: float = RELATIVE_ERROR):
+        self.gamma = (1 + relative_error) / (1 - relative_error)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets: Dict[int, int] = {}
+        self.zeros = 0
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value: float):
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+        if value <= 0:
+            self.zeros += 1
+            return
+        index = math.ceil(math.log(value) / self._log_gamma)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def percentile(self, p: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(p / 100 * self.count))
+        if rank <= self.zeros:
+            return 0.0
+        seen = self.zeros
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(self.max, 2 * self.gamma ** index / (self.gamma + 1))
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+@dataclass
+class Target:
+    """Destino de la atribución: archivo del repo, plugin, runtime u otro."""
+    kind: str
+    name: str
+    line: int = 0
+
+
+@dataclass
+class TimedItem:
+    """Estadísticas de un require, archivo sourced o evento a lo largo de las ejecuciones."""
+    kind: str
+    name: str
+    target: Target
+    self_ms: LogHistogram = field(default_factory=LogHistogram)
+    total_ms: LogHistogram = field(default_factory=LogHistogram)
+
+
+def open_log(path: str) -> Iterator[str]:
+    """Líneas de un log (texto o .gz) sin cargarlo entero."""
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8', errors='replace') as f:
+        yield from f
+
+
+def expand_log_paths(paths: Iterable[str]) -> List[str]:
+    """Archivos a leer: los dados y, para directorios, sus *.log / *.log.gz / *.txt."""
+    out: List[str] = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _dirs, files in os.walk(path):
+                out.extend(os.path.join(root, name) for name in sorted(files)
+                           if name.endswith(('.log', '.log.gz', '.txt')))
+        else:
+            out.append(path)
+    return out
+
+
+class StartupTimeAggregator:
+    """Acumula logs de --startuptime por ejecución y los atribuye a archivos y plugins."""
+
+    def __init__(self, repo_root: str, index: Optional[PluginSpecIndex] = None, repo_files: Iterable[str] = ()):
+        self.repo_root = repo_root
+        self.index = index
+        self.repo_files = {
+            os.path.relpath(path, repo_root).replace(os.sep, '/') for path in repo_files
+        }
+        self.items: Dict[Tuple[str, str], TimedItem] = {}
+        self.startup = LogHistogram()
+        self.runs = 0
+        self.incomplete = 0
+        self.files_read = 0
+        self._targets: Dict[Tuple[str, str], Target] = {}
+        self._plugin_dirs = {spec.short_name: spec for spec in index.specs} if index else {}
+
+    # ----- atribución -----
+    def module_file(self, module: str) -> Optional[str]:
+        base = 'lua/' + module.replace('.', '/')
+        for candidate in (base + '.lua', base + '/init.lua'):
+            if candidate in self.repo_files:
+                return candidate
+        return None
+
+    def path_file(self, path: str) -> Optional[str]:
+        """Archivo del repo cuyo path relativo es el sufijo más largo de `path`."""
+        parts = path.replace('\\', '/').split('/')
+        for i in range(len(parts)):
+            candidate = '/'.join(parts[i:])
+            if candidate in self.repo_files:
+                return candidate
+        return None
+
+    def target(self, kind: str, name: str) -> Target:
+        key = (kind, name)
+        cached = self._targets.get(key)
+        if cached is None:
+            cached = self._targets[key] = self._resolve(kind, name)
+        return cached
+
+    def _resolve(self, kind: str, name: str) -> Target:
+        if kind == 'event':
+            return Target('event', name)
+        if kind == 'require':
+            if name == 'vim' or name.startswith('vim.'):
+                return Target('runtime', 'vim')
+            rel_path = self.module_file(name)
+            if rel_path:
+                return Target('repo', rel_path)
+            spec = self.index.find(name.split('.')[0]) if self.index else None
+            if spec is not None:
+                return Target('plugin', spec.name, spec.line)
+            return Target('other', name.split('.')[0])
+        rel_path = self.path_file(name)
+        if rel_path:
+            return Target('repo', rel_path)
+        for part in name.replace('\\', '/').split('/'):
+            spec = self._plugin_dirs.get(part)
+            if spec is not None:
+                return Target('plugin', spec.name, spec.line)
+        if '/runtime/' in name or name.startswith('$VIMRUNTIME'):
+            return Target('runtime', 'runtime')
+        return Target('other', os.path.basename(name))
+
+    # ----- lectura -----
+    def feed(self, lines: Iterable[str]):
+        """Procesa las líneas de un log; cada STARTING..STARTED es una ejecución."""
+        run: Optional[Dict[Tuple[str, str], List[float]]] = None
+        for line in lines:
+            match = _TIMED_RE.match(line)
+            if match:
+                if run is None:
+                    continue
+                _clock, total, own, kind, arg = match.groups()
+                if kind == 'require':
+                    arg_match = _REQUIRE_ARG_RE.match(arg)
+                    arg = arg_match.group(1) if arg_match else arg.strip("()'\"")
+                    key = ('require', arg)
+                else:
+                    key = ('source', arg)
+                sums = run.setdefault(key, [0.0, 0.0])
+                sums[0] += float(own)
+                sums[1] += float(total)
+                continue
+            match = _EVENT_RE.match(line)
+            if not match:
+                continue
+            clock, elapsed, event = match.groups()
+            if event == _STARTING:
+                if run is not None:
+                    self.incomplete += 1
+                run = {}
+            elif event == _STARTED and run is not None:
+                self._close_run(run, float(clock))
+                run = None
+            elif run is not None:
+                sums = run.setdefault(('event', event), [0.0, 0.0])
+                sums[0] += float(elapsed)
+                sums[1] += float(elapsed)
+        if run is not None:
+            self.incomplete += 1
+
+    def _close_run(self, run: Dict[Tuple[str, str], List[float]], clock: float):
+        self.runs += 1
+        self.startup.add(clock)
+        for (kind, name), (own, total) in run.items():
+            item = self.items.get((kind, name))
+            if item is None:
+                item = self.items[(kind, name)] = TimedItem(kind, name, self.target(kind, name))
+            item.self_ms.add(own)
+            item.total_ms.add(total)
+
+    def feed_files(self, paths: Iterable[str]):
+        for path in expand_log_paths(paths):
+            try:
+                self.feed(open_log(path))
+            except OSError as e:
+                print(f"Aviso: no se pudo leer {path}: {e}")
+                continue
+            self.files_read += 1
+
+    # ----- resultados -----
+    def ranked_items(self) -> List[TimedItem]:
+        """Requires y archivos sourced, de mayor a menor tiempo propio medio por ejecución."""
+        items = [item for item in self.items.values() if item.kind != 'event']
+        return sorted(items, key=lambda item: -item.self_ms.total / max(1, self.runs))
+
+    def by_target(self) -> List[Tuple[Target, float, int]]:
+        """(destino, ms propios medios por ejecución, nº de elementos), de mayor a menor."""
+        totals: Dict[Tuple[str, str], List] = {}
+        for item in self.items.values():
+            if item.kind == 'event':
+                continue
+            entry = totals.setdefault((item.target.kind, item.target.name), [item.target, 0.0, 0])
+            entry[1] += item.self_ms.total / max(1, self.runs)
+            entry[2] += 1
+        return sorted((tuple(entry) for entry in totals.values()), key=lambda entry: -entry[1])
+
+    def events(self) -> List[TimedItem]:
+        return sorted((item for item in self.items.values() if item.kind == 'event'),
+                      key=lambda item: -item.self_ms.total)
+
+
+def _stats(histogram: LogHistogram, runs: int) -> Dict[str, float]:
+    stats = {'runs': histogram.count, 'mean_per_run': round(histogram.total / max(1, runs), 3),
+             'max': round(histogram.max, 3)}
+    for p in PERCENTILES:
+        stats[f"p{p}"] = round(histogram.percentile(p), 3)
+    return stats
+
+
+def format_report(aggregator: StartupTimeAggregator, limit: int = 25) -> str:
+    """Informe markdown: arranque total, destinos (repo/plugins) y módulos más caros."""
+    runs = aggregator.runs
+    out = [f"### Arranque ({runs} ejecuciones, {aggregator.files_read} logs"]
+    if aggregator.incomplete:
+        out.append(f", {aggregator.incomplete} incompletas descartadas")
+    out.append(")\n\n")
+    startup = aggregator.startup
+    out.append(" · ".join(f"p{p}: {startup.percentile(p):.1f} ms" for p in PERCENTILES)
+               + f" · media: {startup.mean:.1f} ms\n\n")
+
+    out.append("### Coste por archivo del repositorio y por plugin\n\n")
+    out.append("| Destino | Tipo | ms propios / ejecución | Elementos |\n")
+    out.append("|---------|------|-----------------------:|----------:|\n")
+    for target, mean_ms, count in aggregator.by_target()[:limit]:
+        name = f"{target.name} (list.lua:{target.line})" if target.kind == 'plugin' and target.line else target.name
+        out.append(f"| {name} | {target.kind} | {mean_ms:.3f} | {count} |\n")
+
+    out.append("\n### Requires y archivos más caros (tiempo propio)\n\n")
+    percentiles = ' | '.join(f"p{p}" for p in PERCENTILES)
+    out.append(f"| Elemento | Destino | media/ejec. | {percentiles} | total p50 |\n")
+    out.append("|----------|---------|------------:|" + "----:|" * len(PERCENTILES) + "----------:|\n")
+    for item in aggregator.ranked_items()[:limit]:
+        label = f"require('{item.name}')" if item.kind == 'require' else item.name
+        cells = ' | '.join(f"{item.self_ms.percentile(p):.3f}" for p in PERCENTILES)
+        out.append(f"| {label} | {item.target.name} | {item.self_ms.total / max(1, runs):.3f} | {cells} | "
+                   f"{item.total_ms.percentile(50):.3f} |\n")
+    return ''.join(out)
+
+
+def report_json(aggregator: StartupTimeAggregator) -> Dict:
+    runs = aggregator.runs
+    return {
+        'runs': runs,
+        'incomplete_runs': aggregator.incomplete,
+        'files': aggregator.files_read,
+        'startup_ms': _stats(aggregator.startup, runs),
+        'targets': [
+            {'kind': target.kind, 'name': target.name, 'spec_line': target.line or None,
+             'self_ms_per_run': round(mean_ms, 3), 'items': count}
+            for target, mean_ms, count in aggregator.by_target()
+        ],
+        'items': [
+            {'kind': item.kind, 'name': item.name, 'target': {'kind': item.target.kind, 'name': item.target.name},
+             'self_ms': _stats(item.self_ms, runs), 'total_ms': _stats(item.total_ms, runs)}
+            for item in aggregator.ranked_items() + aggregator.events()
+        ],
+    }
@@ -2,21 +2,129 @@
 """
 Script para extraer keybindings de archivos Lua y generar documentación automática.
 
-Este script escanea todos los archivos .lua en el repositorio (excepto .git),
-extrae los keybindings según los patrones utilizados en el repositorio y
-genera/actualiza el archivo docs/keybindings.md siguiendo el formato existente.
+Este script escanea los archivos .lua del repositorio alcanzables desde init.lua
+(require, pcall(require, ...), load_config('...') e `import =` de lazy.nvim, más los
+directorios de runtime como plugin/; ver require_graph.py), extrae los keybindings
+según los patrones utilizados en el repositorio y genera/actualiza el archivo
+docs/keybindings.md siguiendo el formato existente. Los módulos no alcanzables se
+informan y no se documentan; --all-files los incluye (con --rev, el grafo se recorre
+sobre los blobs de esa revisión).
 
 Patrones de keybindings detectados:
 - map() function calls
 - vim.keymap.set() calls  
 - custom_keys configurations (en lazy.lua)
+
+Con --engine ast se usa un parser de Lua (lua_ast.py) en lugar de los regex: un
+único recorrido del AST por archivo alimenta todas las reglas de extracción. Antes,
+el recorrido del grafo de módulos construye, sobre los mismos árboles que parsea
+para seguir los require, la tabla de símbolos (lua_symbols.py) con la que se
+resuelven alias de vim.keymap.set, constantes, tablas de opciones compartidas y
+funciones exportadas por módulos (require('lib.util')). El arnés
+keybindings_diff.py compara cualquier motor con el de referencia (regex).
+
+Opcionalmente (--scan-plugins) escanea los plugins instalados por lazy.nvim para
+documentar sus atajos por defecto reales en lugar de los valores conocidos.
+
+Los escaneos son lineales (cabeceras acotadas, índice de líneas y de pares de
+llaves precalculado) y cada archivo corre bajo un presupuesto (--file-budget):
+si se agota, se avisa y se extrae en un modo parcial por líneas. El corpus de
+entradas patológicas está en keybindings_corpus.py. Los archivos muy grandes
+(--mmap-threshold, 4 MiB por defecto) se mapean en memoria y se escanean como bytes,
+salvo que les corresponda algún extractor especializado (Snacks, which-key,
+defaults de plugins): entonces se avisa y se leen como texto.
+
+El documento generado termina con una huella de sus entradas (hashes de los
+archivos Lua + SCRIPT_VERSION). Si coincide, el script termina sin extraer nada;
+--check sale con código 1 cuando la documentación está desactualizada.
+
+Con --formats markdown,html,json una sola extracción alimenta los tres formatos
+(renderers.py), que se generan en paralelo y se escriben en streaming. El formato
+pages escribe docs/keybindings/ como páginas pequeñas (por archivo, por modo y de
+conflictos) con un índice, y sólo reescribe las páginas cuyo contenido cambió.
+El formato lua escribe lua/generated/keymap_index.lua: atajos ordenados, grupos y
+descripciones como constantes que la configuración carga con
+require('generated.keymap_index') sin calcular nada al arrancar. Como los demás
+formatos, sólo se regenera si cambia la huella; lua/generated no se escanea.
+
+Con --rev REVISIÓN (o --async para el árbol de trabajo) las lecturas de archivos y
+de blobs de git se solapan con el parseo en un pipeline asyncio con concurrencia y
+cola acotadas (async_pipeline.py).
+
+El subcomando free-keys (free_keys.py) lista secuencias libres por modo:
+    python3 scripts/update_keybindings.py free-keys --prefix '<leader>' --depth 2
+
+El subcomando lazy-report (lazy_specs.py, lazy_report.py) cruza los atajos con las
+specs de lua/plugins/list.lua y propone disparadores keys/cmd para los plugins que
+se cargan al arrancar o por evento.
+
+El subcomando serve (keybindings_daemon.py) extrae una vez y responde consultas
+JSON en un socket Unix, reextrayendo cuando cambian los archivos Lua:
+    python3 scripts/update_keybindings.py serve &
+    python3 scripts/keybindings_daemon.py lookup '<leader>qd'
+
+El subcomando startuptime (startuptime.py) agrega logs de `nvim --startuptime` de
+muchas ejecuciones con memoria constante y atribuye el tiempo a archivos del repo y
+a specs de list.lua:
+    python3 scripts/update_keybindings.py startuptime logs/ --json startup.json
+
+El subcomando hot-callbacks (hot_callbacks.py) indexa autocmds y componentes de
+lualine y señala llamadas bloqueantes (vim.fn.system, io.popen, finddir, expand...)
+en callbacks que se disparan a menudo, con archivo:línea y clase de frecuencia.
+
+El subcomando options-lint (options_lint.py) modela todas las asignaciones de
+opciones y evalúa reglas de rendimiento declaradas como datos (updatetime, path
+recursivo, timeoutlen con atajos que son prefijo de otros...).
+
+--fail-on-conflicts (conflict_gate.py) es la puerta de CI: sólo extrae, reutilizando
+la caché por archivo (extraction_cache.py), y compara los conflictos con la línea
+base docs/keybinding-conflicts.txt; imprime JSON Lines y sale con 1 si hay nuevos.
+
+El subcomando usage (keybinding_usage.py) agrega logs de pulsaciones de atajos (un
+evento por línea, de uno o muchos usuarios) con memoria constante y clasifica los
+atajos por uso real: esenciales, nunca usados y muy usados sin descripción:
+    python3 scripts/update_keybindings.py usage logs/ --json docs/keybinding-usage.json
+Si existe docs/keybinding-usage.json (o el informe de --usage), la documentación
+añade la sección "Uso real" con esos conteos.
 """
 
 import os
 import re
+import sys
 import glob
-from typing import List, Dict, Tuple, Optional
-from dataclasses import dataclass
+import argparse
+import asyncio
+import bisect
+import hashlib
+import json
+import mmap
+import time
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Dict, Iterator, Tuple, Optional
+from dataclasses import asdict, dataclass, field
+
+import lua_ast
+from plugin_keymaps import PluginKeymap, PluginKeymapScanner, resolve_lazy_paths
+from renderers import RENDERERS, Renderer, write_outputs
+from async_pipeline import DEFAULT_IO_CONCURRENCY, DEFAULT_QUEUE_SIZE, ExtractionPipeline, GitSourceError
+from which_key_graph import WhichKeyTableGraph
+from keybinding_table import KeybindingTable
+from extraction_cache import ExtractionCache
+from require_graph import ModuleGraph, format_unreachable
+from conflict_gate import DEFAULT_BASELINE, Conflict, evaluate as evaluate_conflicts, format_jsonl, load_baseline, save_baseline
+from free_keys import DEFAULT_ALPHABET, FreeKeyFinder, format_report
+from keybindings_daemon import DEFAULT_POLL_INTERVAL, KeybindingDaemon, default_socket_path
+from lazy_specs import DEFAULT_SPEC_FILE, PluginSpecIndex
+from lazy_report import LazyLoadAnalyzer, default_lazy, report_json, format_report as format_lazy_report
+from startuptime import StartupTimeAggregator, format_report as format_startup_report, report_json as startup_json
+from hot_callbacks import SEVERITY_LEVELS, HotCallbackAuditor, format_report as format_hot_report, report_json as hot_json
+from options_lint import OptionModel, OptionRuleEngine, format_report as format_options_report, report_json as options_json
+from keybinding_usage import (DEFAULT_USAGE_REPORT, ESSENTIALS_LIMIT, UsageAggregator, UsageRanking, UsageReport,
+                              load_usage_report, rank as rank_usage, format_report as format_usage_report, report_json as usage_json)
+from key_canonical import KeyCanonicalizer
+from lua_symbols import Ref, SymbolIndex
 
 
 @dataclass
@@ -29,6 +137,259 @@ class Keybinding:
     description: str
     context: str = ""
     line_number: int = 0
+    # Clave canónica (KeyCanonicalizer) y todas las ubicaciones (archivo, línea) fusionadas en este registro
+    canonical_key: str = ""
+    sources: List[Tuple[str, int]] = field(default_factory=list)
+
+
+# Contextos con significado estructural: no se combinan al fusionar duplicados
+STRUCTURAL_CONTEXTS = ('which-key', 'which-key-group')
+# Contexto de las entradas `keys =` de lazy.nvim (en list.lua le sigue ": <plugin>")
+LAZY_KEYS_CONTEXT = "lazy.nvim keys"
+# Acción de una entrada de `keys =` sin rhs: la tecla sólo carga el plugin, que luego
+# define el mapeo real (no cuenta como conflicto con ese mapeo)
+LAZY_TRIGGER_ACTION = "Carga el plugin (lazy.nvim)"
+# Heurística de esenciales sin datos de uso: teclas comunes (en minúsculas) y palabras clave
+ESSENTIAL_COMMON_KEYS = ('jj', 'escape', 'j', 'k', 'n', 'p', 'x', '<c-d>', '<c-u>', 'gl', 'gh')
+ESSENTIAL_KEYWORDS = ('buscar', 'siguiente', 'anterior', 'unir', 'pegar', 'eliminar', 'indent', 'escape')
+
+# desc = '...' o desc = "...": cada string termina en su propia comilla ('Fin de "línea"' es válido)
+DESC_RE = re.compile(r"desc\s*=\s*(?:'([^'\n]+)'|\"([^\"\n]+)\")")
+
+# Versión del formato generado: subirla cuando cambie la salida para invalidar la huella
+SCRIPT_VERSION = "7"
+
+# Presupuesto por defecto de extracción por archivo (segundos); 0 lo desactiva
+DEFAULT_FILE_BUDGET = 5.0
+# Pasos mínimos del presupuesto; se suma un paso por cada 4 bytes del archivo
+MIN_BUDGET_STEPS = 20000
+# Longitud máxima que se examina tras la cabecera de una llamada map(...)/vim.keymap.set(...)
+MAX_CALL_SPAN = 4096
+# Caracteres examinados por paso del presupuesto al evaluar una llamada desde su cabecera
+SPAN_STEP = 256
+# Tamaño a partir del cual un archivo se escanea mapeado en memoria como bytes (4 MiB)
+DEFAULT_MMAP_THRESHOLD = 4 * 1024 * 1024
+# Directorios con Lua generado por este script: no se escanean (no son entradas)
+GENERATED_DIRS = ('lua/generated',)
+
+
+class ExtractionBudgetExceeded(Exception):
+    """La extracción de un archivo agotó su presupuesto de tiempo o de pasos."""
+
+
+class ExtractionBudget:
+    """Presupuesto de extracción de un archivo: plazo en segundos y máximo de pasos.
+
+    Cada coincidencia candidata evaluada cuenta como un paso. Con seconds <= 0 sólo
+    se aplica el límite de pasos.
+    """
+
+    def __init__(self, seconds: float, max_steps: int):
+        self.seconds = seconds
+        self.max_steps = max_steps
+        self.steps = 0
+        self.started = time.monotonic()
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    def tick(self, steps: int = 1):
+        self.steps += steps
+        if self.steps > self.max_steps:
+            raise ExtractionBudgetExceeded(f"{self.steps} pasos > {self.max_steps}")
+        if self.seconds > 0 and self.elapsed() > self.seconds:
+            raise ExtractionBudgetExceeded(f"{self.elapsed():.2f}s > {self.seconds:.2f}s")
+
+
+class LuaTextIndex:
+    """Índices lineales sobre el contenido de un archivo Lua.
+
+    - Inicio de cada línea, para pasar de offset a número de línea con bisect.
+    - Pares de paréntesis/llaves, calculados en una sola pasada que ignora cadenas,
+      cadenas largas y comentarios. Sustituye a recorrer el texto desde cada apertura.
+    """
+
+    _SCAN_RE = re.compile(r"--|[\"'(){}]|\[=*\[")
+    _OPENERS = {')': '(', '}': '{'}
+    _STRING_BODY = {
+        "'": re.compile(r"(?:[^'\\\n]|\\.)*", re.DOTALL),
+        '"': re.compile(r'(?:[^"\\\n]|\\.)*', re.DOTALL),
+    }
+
+    def __init__(self, content: str):
+        self.content = content
+        self._lines: Optional[List[str]] = None
+        self._line_starts: Optional[List[int]] = None
+        self._pairs: Optional[Dict[int, int]] = None
+
+    @property
+    def lines(self) -> List[str]:
+        if self._lines is None:
+            self._lines = self.content.split('\n')
+        return self._lines
+
+    def line_of(self, offset: int) -> int:
+        """Número de línea (base 0) del offset dado."""
+        if self._line_starts is None:
+            starts = [0]
+            pos = self.content.find('\n')
+            while pos != -1:
+                starts.append(pos + 1)
+                pos = self.content.find('\n', pos + 1)
+            self._line_starts = starts
+        return bisect.bisect_right(self._line_starts, offset) - 1
+
+    def line_end(self, offset: int) -> int:
+        """Offset del '\\n' que cierra la línea de `offset` (o el final del contenido)."""
+        line = self.line_of(offset)
+        if line + 1 < len(self._line_starts):
+            return self._line_starts[line + 1] - 1
+        return len(self.content)
+
+    def matching(self, open_index: int) -> int:
+        """Índice del cierre del '(' o '{' en open_index; -1 si no tiene pareja."""
+        if self._pairs is None:
+            self._pairs = self._build_pairs()
+        return self._pairs.get(open_index, -1)
+
+    def _skip_long_bracket(self, start: int) -> int:
+        """Salta una cadena/comentario largo [==[ ... ]==] que empieza en start."""
+        text = self.content
+        level = text.index('[', start + 1) - start - 1
+        close = text.find(']' + '=' * level + ']', start)
+        return len(text) if close == -1 else close + level + 2
+
+    def _build_pairs(self) -> Dict[int, int]:
+        text = self.content
+        pairs: Dict[int, int] = {}
+        stack: List[int] = []
+        i = 0
+        while True:
+            m = self._SCAN_RE.search(text, i)
+            if m is None:
+                break
+            token = m.group(0)
+            pos = m.start()
+            if token == '--':
+                if text.startswith('[', pos + 2) and re.match(r"\[=*\[", text[pos + 2:pos + 64]):
+                    i = self._skip_long_bracket(pos + 2)
+                else:
+                    i = self.line_end(pos)
+            elif token in ('"', "'"):
+                i = self._STRING_BODY[token].match(text, pos + 1).end() + 1
+            elif token[0] == '[':
+                i = self._skip_long_bracket(pos)
+            elif token in ('(', '{'):
+                stack.append(pos)
+                i = pos + 1
+            else:
+                opener = self._OPENERS[token]
+                # Un cierre sin apertura del mismo tipo se ignora (código desbalanceado)
+                if stack and text[stack[-1]] == opener:
+                    pairs[stack.pop()] = pos
+                i = pos + 1
+        return pairs
+
+
+class _MappedLines:
+    """Vista perezosa de las líneas de un MappedLuaSource: sólo decodifica las que se piden."""
+
+    def __init__(self, source: 'MappedLuaSource'):
+        self.source = source
+
+    def __len__(self) -> int:
+        return self.source.line_count()
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self.source.line_text(i) for i in range(*item.indices(len(self)))]
+        return self.source.line_text(item)
+
+
+class MappedLuaSource:
+    """Archivo Lua mapeado en memoria (mmap) para escanearlo como bytes.
+
+    Los patrones compilados como bytes se ejecutan directamente sobre el mapeo y
+    sólo se decodifican los grupos que acaban en campos de un Keybinding (y las
+    pocas líneas de contexto que se piden), así que el pico de memoria se queda
+    cerca del tamaño del archivo mapeado: no hay str del contenido, ni split de
+    líneas, ni copias intermedias. Los inicios de línea se guardan en un array
+    compacto de enteros para pasar de offset a línea con bisect.
+    """
+
+    def __init__(self, file_path: str):
+        self._file = open(file_path, 'rb')
+        try:
+            size = os.fstat(self._file.fileno()).st_size
+            # mmap no admite archivos vacíos
+            self.data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        except Exception:
+            self._file.close()
+            raise
+        self._line_starts: Optional[array] = None
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self._file.close()
+
+    def __enter__(self) -> 'MappedLuaSource':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def lines(self) -> _MappedLines:
+        return _MappedLines(self)
+
+    def _starts(self) -> array:
+        if self._line_starts is None:
+            starts = array('Q', [0])
+            pos = self.data.find(b'\n')
+            while pos != -1:
+                starts.append(pos + 1)
+                pos = self.data.find(b'\n', pos + 1)
+            self._line_starts = starts
+        return self._line_starts
+
+    def line_count(self) -> int:
+        return len(self._starts())
+
+    def line_of(self, offset: int) -> int:
+        """Número de línea (base 0) del offset dado."""
+        return bisect.bisect_right(self._starts(), offset) - 1
+
+    def line_text(self, line_num: int) -> str:
+        starts = self._starts()
+        end = starts[line_num + 1] - 1 if line_num + 1 < len(starts) else len(self.data)
+        return self.decode(starts[line_num], end)
+
+    def decode(self, start: int, end: int) -> str:
+        return self.data[start:end].decode('utf-8', errors='replace')
+
+    def in_comment(self, offset: int) -> bool:
+        """True si hay un '--' en la misma línea antes de offset (como is_match_in_commented_line)."""
+        line_start = self.data.rfind(b'\n', 0, offset) + 1
+        return self.data.find(b'--', line_start, offset + 2) != -1
+
+
+# Extractor del proceso de renderizado (se envía una vez por worker, no por sección)
+_RENDER_EXTRACTOR: Optional['KeybindingExtractor'] = None
+
+
+def _init_render_worker(extractor: 'KeybindingExtractor'):
+    global _RENDER_EXTRACTOR
+    _RENDER_EXTRACTOR = extractor
+
+
+def _render_section(task: Tuple[str, tuple]) -> str:
+    method, args = task
+    for arg in args:
+        # Las vistas llegan sin extractor (KeybindingColumns.subset): se les asigna el del worker
+        if isinstance(arg, KeybindingTable):
+            arg.columns.extractor = _RENDER_EXTRACTOR
+    return getattr(_RENDER_EXTRACTOR, method)(*args)
 
 
 class KeybindingExtractor:
@@ -42,39 +403,76 @@ class KeybindingExtractor:
         else:
             self.repo_root = repo_root
         self.keybindings: List[Keybinding] = []
+        # Keymaps escaneados de los plugins instalados: {nombre_plugin: [PluginKeymap]}
+        self.plugin_keymaps: Dict[str, List[PluginKeymap]] = {}
+        # Forma canónica de las teclas, con el líder real de lua/core/keys.lua
+        self.canonicalizer = KeyCanonicalizer.from_config(self.repo_root)
         
         # Patrones regex para detectar keybindings (más flexibles)
         self.patterns = {
             # map('n', 'jj', '<Esc>', opts) - single mode with any quote style
             'map_function': re.compile(
-                r"map\s*\(\s*['\"]([^'\"]+)['\"]\s*,\s*['\"]([^'\"]+)['\"]\s*,\s*(['\"][^'\"]*['\"]|[^,\)]+)\s*(?:,\s*([^)]*))?\)",
+                r"map\s*\(\s*['\"]([^'\"\n]+)['\"]\s*,\s*['\"]([^'\"\n]+)['\"]\s*,\s*(['\"][^'\"\n]*['\"]|[^,\)]+)\s*(?:,\s*([^)]*))?\)",
                 re.MULTILINE
             ),
             # map({ 'v', 'x' }, 'p', '"_dP', opts) - multiple modes
             'map_function_multi': re.compile(
-                r"map\s*\(\s*\{\s*([^}]+)\s*\}\s*,\s*['\"]([^'\"]+)['\"]\s*,\s*(['\"][^'\"]*['\"]|[^,\)]+)\s*(?:,\s*([^)]*))?\)",
+                r"map\s*\(\s*\{\s*([^}]+)\s*\}\s*,\s*['\"]([^'\"\n]+)['\"]\s*,\s*(['\"][^'\"\n]*['\"]|[^,\)]+)\s*(?:,\s*([^)]*))?\)",
                 re.MULTILINE
             ),
             # vim.keymap.set patterns
             'keymap_set': re.compile(
-                r"vim\.keymap\.set\s*\(\s*['\"]([^'\"]+)['\"]\s*,\s*['\"]([^'\"]+)['\"]\s*,\s*(['\"][^'\"]*['\"]|[^,\)]+)\s*(?:,\s*([^)]*))?\)",
+                r"vim\.keymap\.set\s*\(\s*['\"]([^'\"\n]+)['\"]\s*,\s*['\"]([^'\"\n]+)['\"]\s*,\s*(['\"][^'\"\n]*['\"]|[^,\)]+)\s*(?:,\s*([^)]*))?\)",
                 re.MULTILINE
             ),
             'keymap_set_multi': re.compile(
-                r"vim\.keymap\.set\s*\(\s*\{\s*([^}]+)\s*\}\s*,\s*['\"]([^'\"]+)['\"]\s*,\s*(['\"][^'\"]*['\"]|[^,\)]+)\s*(?:,\s*([^)]*))?\)",
+                r"vim\.keymap\.set\s*\(\s*\{\s*([^}]+)\s*\}\s*,\s*['\"]([^'\"\n]+)['\"]\s*,\s*(['\"][^'\"\n]*['\"]|[^,\)]+)\s*(?:,\s*([^)]*))?\)",
                 re.MULTILINE
             ),
             # ['<localleader>l'] = function(plugin) ... end,
             'custom_keys': re.compile(
-                r"\[(['\"][^'\"]+['\"])\]\s*=\s*function\s*\([^)]*\).*?end",
+                r"\[(['\"][^'\"\n]+['\"])\]\s*=\s*function\s*\([^)]*\).*?end",
                 re.MULTILINE | re.DOTALL
             ),
             # field assignments that define a key, e.g., toggle_style_key = '<leader>ot'
             'assignment_key': re.compile(
-                r"(?<![\w])([A-Za-z_][A-Za-z0-9_]*_key|key)\s*=\s*(['\"][^'\"]+['\"])",
+                r"(?<![\w])([A-Za-z_][A-Za-z0-9_]*_key|key)\s*=\s*(['\"][^'\"\n]+['\"])",
                 re.MULTILINE
             ),
         }
+        # Cabeceras lineales de los patrones de llamada: cada coincidencia se evalúa sólo
+        # dentro de la llamada (hasta su ')' o fin de línea, como máximo MAX_CALL_SPAN)
+        self.call_heads = {
+            'map_function': re.compile(r"map\s*\("),
+            'map_function_multi': re.compile(r"map\s*\("),
+            'keymap_set': re.compile(r"vim\.keymap\.set\s*\("),
+            'keymap_set_multi': re.compile(r"vim\.keymap\.set\s*\("),
+        }
+        self.custom_keys_head = re.compile(r"\[(['\"][^'\"\n]+['\"])\]\s*=\s*function\s*\(")
+        # Entradas estilo Snacks ['algo'] = { ... } y la bandera de los defaults de plugins
+        self.snacks_entry_head = re.compile(r"\[\s*(['\"][^'\"\n]+['\"])\s*\]\s*=\s*\{", re.MULTILINE)
+        self.defaults_flag = re.compile(r"add_default_keybindings\s*=\s*true")
+        # Los mismos patrones compilados como bytes para el modo mmap (MappedLuaSource)
+        self.byte_patterns = {name: self.bytes_pattern(pattern) for name, pattern in self.patterns.items()}
+        self.byte_call_heads = {name: self.bytes_pattern(head) for name, head in self.call_heads.items()}
+        self.byte_custom_keys_head = self.bytes_pattern(self.custom_keys_head)
+        self.byte_snacks_entry_head = self.bytes_pattern(self.snacks_entry_head)
+        self.byte_defaults_flag = self.bytes_pattern(self.defaults_flag)
+        # Tamaño (bytes) a partir del cual un archivo se escanea mapeado en memoria (0 = nunca)
+        self.mmap_threshold = DEFAULT_MMAP_THRESHOLD
+        # Presupuesto por archivo (segundos) y estado de la extracción en curso
+        self.file_budget = DEFAULT_FILE_BUDGET
+        self.budget: Optional[ExtractionBudget] = None
+        self._text_index: Optional[LuaTextIndex] = None
+        # Procesos para renderizar secciones (<= 1: en serie)
+        self.render_workers = 0
+        # Lista de plugins de lazy.nvim: sus entradas `keys =` se extraen con PluginSpecIndex
+        self.spec_file = os.path.join(self.repo_root, DEFAULT_SPEC_FILE)
+        # False: sólo los módulos alcanzables desde init.lua (require_graph.ModuleGraph)
+        self.all_files = False
+        self._module_graph: Optional[Tuple[List[Tuple[str, int, int]], ModuleGraph]] = None
+        # Conteos de uso real (informe de `usage --json`); None: sin sección "Uso real"
+        self.usage: Optional[UsageReport] = None
         
         # Mapeo de modos abreviados a nombres completos
         self.mode_mapping = {
@@ -130,12 +528,59 @@ class KeybindingExtractor:
             ],
         }
 
+    @staticmethod
+    def bytes_pattern(pattern: 're.Pattern') -> 're.Pattern':
+        """Versión bytes de un patrón str (todos los patrones del extractor son ASCII)."""
+        return re.compile(pattern.pattern.encode('ascii'), pattern.flags & ~re.UNICODE)
+
+    def __getstate__(self):
+        # Al enviar el extractor a otro proceso no hace falta el estado de la extracción en curso
+        state = self.__dict__.copy()
+        state['_text_index'] = None
+        state['budget'] = None
+        state['_module_graph'] = None
+        return state
+
     def find_lua_files(self) -> List[str]:
-        """Encuentra todos los archivos .lua en el repositorio, excluyendo .git."""
+        """Archivos .lua a documentar: los alcanzables desde init.lua (todos con all_files)."""
+        lua_files = self.all_lua_files()
+        if self.all_files:
+            return lua_files
+        return self.module_graph(lua_files).reachable_files()
+
+    def module_graph(self, lua_files: Optional[List[str]] = None) -> ModuleGraph:
+        """Grafo de require/load_config; se reutiliza mientras no cambie ningún archivo (mtime y tamaño)."""
+        lua_files = self.all_lua_files() if lua_files is None else lua_files
+        signature = []
+        for file_path in lua_files:
+            try:
+                st = os.stat(file_path)
+            except OSError:
+                continue
+            signature.append((file_path, st.st_mtime_ns, st.st_size))
+        if self._module_graph is None or self._module_graph[0] != signature:
+            graph = ModuleGraph(self.repo_root, lua_files, self.graph_symbols(), file_budget=self.file_budget)
+            self._module_graph = (signature, graph)
+        return self._module_graph[1]
+
+    def module_graph_from(self, lua_files: List[str], read: Callable[[str], str]) -> ModuleGraph:
+        """Grafo de módulos sobre contenidos que no están en el disco (p.ej. los blobs de --rev).
+
+        Es la misma regla que find_lua_files; sin tabla de símbolos ni reutilización.
+        """
+        return ModuleGraph(self.repo_root, lua_files, file_budget=self.file_budget, read=read)
+
+    def graph_symbols(self) -> Optional[SymbolIndex]:
+        """Tabla de símbolos que el grafo de módulos llena al parsear (el motor regex no la usa)."""
+        return None
+
+    def all_lua_files(self) -> List[str]:
+        """Encuentra todos los archivos .lua en el repositorio, excluyendo .git y GENERATED_DIRS."""
         lua_files = []
         for root, dirs, files in os.walk(self.repo_root):
-            # Excluir directorio .git
-            dirs[:] = [d for d in dirs if d != '.git']
+            # Excluir directorio .git y los directorios generados (p.ej. lua/generated/keymap_index.lua)
+            rel_root = os.path.relpath(root, self.repo_root).replace(os.sep, '/')
+            dirs[:] = [d for d in dirs if d != '.git' and self.is_scanned(f"{rel_root}/{d}/")]
             
             for file in files:
                 if file.endswith('.lua'):
@@ -143,21 +588,29 @@ class KeybindingExtractor:
         
         return sorted(lua_files)
 
+    def is_scanned(self, rel_path: str) -> bool:
+        """False si la ruta relativa (con '/') está dentro de un directorio generado."""
+        rel_path = rel_path[2:] if rel_path.startswith('./') else rel_path
+        return not any(rel_path.startswith(f"{d}/") for d in GENERATED_DIRS)
+
     def extract_description_from_options(self, options_str: str) -> str:
         """Extrae descripción del parámetro desc en las opciones."""
         if not options_str:
             return ""
         
         # Buscar desc = 'descripción'
-        desc_match = re.search(r"desc\s*=\s*['\"]([^'\"]+)['\"]", options_str)
+        desc_match = DESC_RE.search(options_str)
         if desc_match:
-            return desc_match.group(1).strip()
+            return (desc_match.group(1) or desc_match.group(2)).strip()
         
         return ""
 
     def extract_description_from_comment(self, content: str, line_num: int) -> str:
         """Extrae descripción de comentarios cercanos al keybinding."""
-        lines = content.split('\n')
+        return self.description_from_comment_lines(self.text_index(content).lines, line_num)
+
+    def description_from_comment_lines(self, lines, line_num: int) -> str:
+        """Como extract_description_from_comment, sobre una secuencia de líneas ya separada."""
         description = ""
         
         # Buscar comentario en la misma línea
@@ -205,6 +658,16 @@ class KeybindingExtractor:
         
         return normalized
 
+    def modes_from_node(self, node: Optional['lua_ast.Node']) -> List[str]:
+        """Modos a partir del valor AST de un campo `mode` ('n' o { 'n', 'x' }); Normal por defecto."""
+        if isinstance(node, lua_ast.Table):
+            values = [lua_ast.string_value(v) for v in lua_ast.positional_values(node)]
+            modes = self.normalize_modes(','.join(v for v in values if v))
+        else:
+            value = lua_ast.string_value(node)
+            modes = self.normalize_modes(value) if value else []
+        return modes or ["Normal"]
+
     def format_key_combination(self, key: str) -> str:
         """Formatea las combinaciones de teclas para mostrar."""
         # Reemplazar notaciones especiales
@@ -265,16 +728,293 @@ class KeybindingExtractor:
 
     def extract_keybindings_from_file(self, file_path: str) -> List[Keybinding]:
         """Extrae keybindings de un archivo específico."""
-        keybindings = []
-        
         try:
+            if self.mmap_threshold and os.path.getsize(file_path) >= self.mmap_threshold:
+                return self.extract_keybindings_from_mapped(file_path)
             with open(file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
         except Exception as e:
             print(f"Error leyendo {file_path}: {e}")
-            return keybindings
-        
-        lines = content.split('\n')
+            return []
+
+        return self.extract_keybindings_from_content(file_path, content)
+
+    def extract_keybindings_from_content(self, file_path: str, content: str) -> List[Keybinding]:
+        """Extrae keybindings del contenido ya leído de un archivo.
+
+        La extracción completa corre bajo un presupuesto por archivo; si se agota, se
+        avisa y se degrada a extract_partial_keybindings.
+        """
+        self.budget = ExtractionBudget(self.file_budget, MIN_BUDGET_STEPS + len(content) // 4)
+        try:
+            keybindings = self.extract_pattern_keybindings(file_path, content)
+            keybindings.extend(self.extract_extension_keybindings(file_path, content))
+        except ExtractionBudgetExceeded as e:
+            rel_path = os.path.relpath(file_path, self.repo_root)
+            print(f"⚠️  Aviso: {rel_path} excedió el presupuesto de extracción ({e}); "
+                  f"se usa el modo parcial (sólo llamadas de una línea)")
+            keybindings = self.extract_partial_keybindings(file_path, content)
+        finally:
+            self.budget = None
+        return keybindings
+
+    def extract_keybindings_from_mapped(self, file_path: str) -> List[Keybinding]:
+        """Modo mmap para archivos muy grandes (p.ej. keymaps generados).
+
+        Aplica los patrones genéricos de self.patterns sobre los bytes del archivo
+        mapeado, decodificando sólo los grupos de cada coincidencia. Cada llamada se
+        evalúa como mucho hasta MAX_CALL_SPAN bytes desde su cabecera. Los extractores
+        especializados (which-key, Snacks, defaults de plugins, keys de lazy.nvim)
+        trabajan sobre texto: si alguno se aplicaría al archivo, se avisa y el archivo
+        se extrae en modo texto.
+        """
+        with MappedLuaSource(file_path) as source:
+            labels = self.mapped_extension_labels(file_path, source.data)
+            if not labels:
+                return self.extract_mapped_patterns(file_path, source)
+        rel_path = os.path.relpath(file_path, self.repo_root)
+        print(f"Aviso: {rel_path} supera --mmap-threshold pero contiene {', '.join(labels)}; "
+              f"se extrae en modo texto")
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        return self.extract_keybindings_from_content(file_path, content)
+
+    def mapped_extension_labels(self, file_path: str, data) -> List[str]:
+        """Extractores especializados que encontrarían algo en un archivo mapeado (comprobación por bytes)."""
+        labels = []
+        if self.byte_snacks_entry_head.search(data):
+            labels.append("Snacks keys")
+        if os.path.basename(file_path).endswith('which-key.lua'):
+            labels.append("which-key keys")
+        if self.byte_defaults_flag.search(data):
+            labels.append("defaults de plugins")
+        if self.is_spec_file(file_path):
+            labels.append("keys de lazy.nvim")
+        return labels
+
+    def extract_mapped_patterns(self, file_path: str, source: MappedLuaSource) -> List[Keybinding]:
+        """Aplica los patrones genéricos sobre los bytes de un archivo mapeado."""
+        keybindings: List[Keybinding] = []
+        for pattern_name, pattern in self.byte_patterns.items():
+            for match in self.iter_mapped_matches(pattern_name, pattern, source):
+                if source.in_comment(match.start()):
+                    continue
+                groups = tuple(
+                    group.decode('utf-8', errors='replace') if group is not None else None
+                    for group in match.groups()
+                )
+                keybinding = self.keybinding_from_groups(
+                    file_path, pattern_name, groups, source.line_of(match.start()), source.lines
+                )
+                if keybinding is not None:
+                    keybindings.append(keybinding)
+        return keybindings
+
+    def iter_mapped_matches(self, pattern_name: str, pattern: 're.Pattern', source: MappedLuaSource):
+        """Como iter_pattern_matches, sobre los bytes de un archivo mapeado."""
+        data = source.data
+        head_re = self.byte_call_heads.get(pattern_name)
+        if head_re is not None:
+            resume = 0
+            for head in head_re.finditer(data):
+                start = head.start()
+                if start < resume:
+                    continue
+                match = pattern.match(data, start, min(len(data), start + MAX_CALL_SPAN))
+                if match:
+                    resume = match.end()
+                    yield match
+        elif pattern_name == 'custom_keys':
+            resume = 0
+            for head in self.byte_custom_keys_head.finditer(data):
+                if head.start() < resume:
+                    continue
+                close = data.find(b')', head.end())
+                body_end = data.find(b'end', close + 1) if close != -1 else -1
+                if body_end == -1:
+                    return
+                match = pattern.match(data, head.start(), body_end + 3)
+                if match:
+                    resume = match.end()
+                    yield match
+        else:
+            yield from pattern.finditer(data)
+
+    def text_index(self, content: str) -> LuaTextIndex:
+        """Índice de líneas y pares de llaves del contenido (se reutiliza mientras no cambie)."""
+        if self._text_index is None or self._text_index.content is not content:
+            self._text_index = LuaTextIndex(content)
+        return self._text_index
+
+    def reset_caches(self):
+        """Descarta los índices reutilizables entre llamadas (para medir una extracción en frío)."""
+        self._text_index = None
+        self._module_graph = None
+
+    def tick(self, steps: int = 1):
+        """Consume pasos del presupuesto del archivo en curso (si lo hay)."""
+        if self.budget is not None:
+            self.budget.tick(steps)
+
+    def iter_pattern_matches(self, pattern_name: str, pattern: 're.Pattern', content: str):
+        """Equivalente a pattern.finditer(content) pero con coste acotado por coincidencia.
+
+        Los patrones de llamada se evalúan desde cada cabecera lineal (map( / vim.keymap.set()
+        sólo hasta el cierre de la llamada o el fin de línea; custom_keys busca su ')' y su
+        'end' una sola vez por coincidencia. Como en finditer, la búsqueda continúa tras el
+        final de la coincidencia anterior. Cada cabecera consume un paso del presupuesto
+        y, si el patrón se evalúa, uno más por cada SPAN_STEP caracteres del tramo.
+        """
+        head_re = self.call_heads.get(pattern_name)
+        if head_re is not None:
+            index = self.text_index(content)
+            resume = 0
+            for head in head_re.finditer(content):
+                self.tick()
+                start = head.start()
+                if start < resume:
+                    continue
+                close = index.matching(head.end() - 1)
+                span_end = min(close + 1 if close != -1 else index.line_end(start), start + MAX_CALL_SPAN)
+                # Los patrones de llamada terminan en ')': sin ninguno en el tramo no hay coincidencia
+                if content.find(')', head.end(), span_end) == -1:
+                    continue
+                self.tick((span_end - start) // SPAN_STEP)
+                match = pattern.match(content, start, span_end)
+                if match:
+                    resume = match.end()
+                    yield match
+        elif pattern_name == 'custom_keys':
+            resume = 0
+            for head in self.custom_keys_head.finditer(content):
+                self.tick()
+                if head.start() < resume:
+                    continue
+                close = content.find(')', head.end())
+                body_end = content.find('end', close + 1) if close != -1 else -1
+                if body_end == -1:
+                    # Sin ')' o 'end' posteriores ninguna cabecera siguiente puede coincidir
+                    return
+                match = pattern.match(content, head.start(), body_end + 3)
+                if match:
+                    resume = match.end()
+                    yield match
+        else:
+            for match in pattern.finditer(content):
+                self.tick()
+                yield match
+
+    def extract_partial_keybindings(self, file_path: str, content: str) -> List[Keybinding]:
+        """Modo degradado: sólo map()/vim.keymap.set() contenidos en una línea.
+
+        Usa las mismas cabeceras ancladas que la extracción completa
+        (iter_pattern_matches: cada llamada se evalúa desde su cabecera hasta su ')' o el
+        fin de línea, como mucho MAX_CALL_SPAN) y corre con un presupuesto propio del
+        mismo tamaño; si también se agota, se devuelve lo extraído hasta ese punto. La
+        descripción sale de desc = '...' o del comentario de la misma línea.
+        """
+        index = self.text_index(content)
+        lines = index.lines
+        found: List[Tuple[int, int, Keybinding]] = []
+        self.budget = ExtractionBudget(self.file_budget, MIN_BUDGET_STEPS + len(content) // 4)
+        try:
+            for pattern_name in self.call_heads:
+                for match in self.iter_pattern_matches(pattern_name, self.patterns[pattern_name], content):
+                    line_num = index.line_of(match.start())
+                    if index.line_of(match.end() - 1) != line_num:
+                        continue
+                    line = lines[line_num]
+                    comment_pos = line.find('--')
+                    line_start = content.rfind('\n', 0, match.start()) + 1
+                    if comment_pos != -1 and line_start + comment_pos <= match.start():
+                        continue
+                    modes_str, key, action, options = match.groups()
+                    description = self.extract_description_from_options(options or "")
+                    if not description and comment_pos != -1:
+                        description = line[comment_pos + 2:].strip()
+                    found.append((line_num, match.start(), Keybinding(
+                        file_path=file_path,
+                        modes=self.normalize_modes(modes_str),
+                        key=key,
+                        action=self.process_action(action.strip('\'"'), description),
+                        description=description,
+                        context="Extracción parcial",
+                        line_number=line_num + 1,
+                    )))
+        except ExtractionBudgetExceeded as e:
+            rel_path = os.path.relpath(file_path, self.repo_root)
+            print(f"⚠️  Aviso: el modo parcial también excedió el presupuesto en {rel_path} ({e}); "
+                  f"resultados truncados")
+        finally:
+            self.budget = None
+        # Una llamada por línea, la primera, como en la extracción línea a línea
+        keybindings: List[Keybinding] = []
+        last_line = -1
+        for line_num, _offset, kb in sorted(found, key=lambda item: (item[0], item[1])):
+            if line_num != last_line:
+                keybindings.append(kb)
+                last_line = line_num
+        return keybindings
+
+    def process_action(self, action: str, description: str) -> str:
+        """Devuelve la acción a mostrar, priorizando la descripción y explicando rhs especiales."""
+        processed_action = action
+        if not action or action in ['<Nop>', '"_dP', '"_x', '"_D', '"_d']:
+            # Usar descripción si hay una disponible
+            if description:
+                processed_action = description
+            else:
+                # Generar descripción básica basada en la acción
+                if action == '<Nop>':
+                    processed_action = "Placeholder (sin acción)"
+                elif action == '"_dP':
+                    processed_action = "Pegar sin perder el clipboard"
+                elif action == '"_x':
+                    processed_action = "Eliminar sin copiar al registro principal"
+                elif action == '"_D':
+                    processed_action = "Eliminar hasta el final, sin copiar"
+                elif action == '"_d':
+                    processed_action = "Eliminar selección, sin copiar"
+                else:
+                    processed_action = action
+
+        # Usar descripción como acción si está disponible y es más descriptiva
+        if description and description != action:
+            processed_action = description
+        return processed_action
+
+    def describe_custom_key(self, lines: List[str], line_num: int) -> str:
+        """Descripción heurística para claves custom_keys de lazy.nvim según su contexto."""
+        context_start = max(0, line_num - 10)
+        context = '\n'.join(lines[context_start:line_num + 5])
+        if 'lazygit' in context:
+            return "Abre lazygit para ver el log del plugin"
+        if 'terminal' in context.lower():
+            return "Abre una terminal en el directorio del plugin"
+        return ""
+
+    def resolve_assignment_key(self, file_path: str, key: str) -> Tuple[str, str]:
+        """Ajusta la tecla de un campo *_key = '...' y devuelve (tecla, nota de contexto).
+
+        Si es un archivo de plugins y el valor no tiene prefijos <...>, se asume que
+        se usa con <leader> y se antepone para una mejor UX en docs.
+        """
+        try:
+            rel_path = os.path.relpath(file_path, self.repo_root)
+        except Exception:
+            rel_path = file_path
+        is_plugin_file = 'plugins' in rel_path or rel_path.startswith('plugin/')
+        lacks_brackets = ('<' not in key and '>' not in key)
+        is_simple_seq = bool(re.fullmatch(r"[A-Za-z0-9]+", key))
+        if is_plugin_file and lacks_brackets and is_simple_seq:
+            # Anotar contexto para transparencia
+            return f"<leader>{key}", "Prefijo asumido: <leader>"
+        return key, ""
+
+    def extract_pattern_keybindings(self, file_path: str, content: str) -> List[Keybinding]:
+        """Extrae keybindings aplicando los patrones regex de self.patterns."""
+        keybindings = []
+        lines = self.text_index(content).lines
         
         # Extraer usando cada patrón
         def is_match_in_commented_line(text: str, start_index: int) -> bool:
@@ -291,244 +1031,115 @@ class KeybindingExtractor:
             rel_index = start_index - line_start
             return comment_pos != -1 and comment_pos <= rel_index
 
+        index = self.text_index(content)
         for pattern_name, pattern in self.patterns.items():
-            for match in pattern.finditer(content):
-                line_num = content[:match.start()].count('\n')
+            for match in self.iter_pattern_matches(pattern_name, pattern, content):
+                line_num = index.line_of(match.start())
                 # Ignorar si está comentado en la misma línea
                 if is_match_in_commented_line(content, match.start()):
                     continue
-                
-                context_note = ""
-                if pattern_name in ['map_function', 'keymap_set']:
-                    modes_str, key, action, options = match.groups()
-                    modes = self.normalize_modes(modes_str)
-                    
-                    # Limpiar acción (remover comillas si las tiene)
-                    action = action.strip('\'"')
-                    
-                    # Extraer descripción de opciones primero
-                    description = self.extract_description_from_options(options or "")
-                    # Si no hay descripción en opciones, buscar en comentarios
-                    if not description:
-                        description = self.extract_description_from_comment(content, line_num)
-                    
-                elif pattern_name in ['map_function_multi', 'keymap_set_multi']:
-                    modes_str, key, action, options = match.groups()
-                    modes = self.normalize_modes(modes_str)
-                    
-                    # Limpiar acción (remover comillas si las tiene)
-                    action = action.strip('\'"')
-                    
-                    # Extraer descripción de opciones primero
-                    description = self.extract_description_from_options(options or "")
-                    # Si no hay descripción en opciones, buscar en comentarios
-                    if not description:
-                        description = self.extract_description_from_comment(content, line_num)
-                    
-                elif pattern_name == 'custom_keys':
-                    key = match.group(1).strip('\'"')
-                    action = "Función personalizada"
-                    modes = ["Custom"]
-                    description = ""
-                    
-                    # Extraer descripción del contexto
-                    context_start = max(0, line_num - 10)
-                    context_lines = lines[context_start:line_num + 5]
-                    context = '\n'.join(context_lines)
-                    
-                    if 'lazygit' in context:
-                        description = "Abre lazygit para ver el log del plugin"
-                    elif 'terminal' in context.lower():
-                        description = "Abre una terminal en el directorio del plugin"
-                    context_note = "Clave personalizada de plugin"
-                elif pattern_name == 'assignment_key':
-                    # Campo *_key = "<...>"
-                    _field, key = match.groups()
-                    key = key.strip('\'"')
-                    action = "Atajo de configuración del plugin"
-                    modes = ["Normal"]
-                    # Descripción por comentario cercano
-                    description = self.extract_description_from_comment(content, line_num)
-
-                    # Si es un archivo de plugins y el valor no tiene prefijos <...>,
-                    # asumir que se usa con <leader> y anteponerlo para una mejor UX en docs.
-                    try:
-                        rel_path = os.path.relpath(file_path, self.repo_root)
-                    except Exception:
-                        rel_path = file_path
-                    is_plugin_file = 'plugins' in rel_path or rel_path.startswith('plugin/')
-                    lacks_brackets = ('<' not in key and '>' not in key)
-                    is_simple_seq = bool(re.fullmatch(r"[A-Za-z0-9]+", key))
-                    if is_plugin_file and lacks_brackets and is_simple_seq:
-                        key = f"<leader>{key}"
-                        # Anotar contexto para transparencia
-                        context_note = "Prefijo asumido: <leader>"
-                    else:
-                        context_note = ""
-                elif pattern_name == 'lazy_keys_entry':
-                    # Entrada tipo { "<leader>x", ..., desc = "...", mode = "n" | {"n","v"} }
-                    key, desc, mode_val = match.groups()
-                    key = key.strip()
-                    # Determinar modos
-                    modes: List[str] = []
-                    if mode_val:
-                        mode_val = mode_val.strip()
-                        if mode_val.startswith('{') and mode_val.endswith('}'):
-                            inner = mode_val[1:-1]
-                            modes = self.normalize_modes(inner)
-                        else:
-                            modes = self.normalize_modes(mode_val)
-                    else:
-                        modes = ["Normal"]
-                    # Acción/descripcion
-                    description = (desc or '').strip()
-                    action = description or "Acción de plugin"
-                else:
-                    continue
-                
-                # Procesar acción para casos especiales
-                processed_action = action
-                if not action or action in ['<Nop>', '"_dP', '"_x', '"_D', '"_d']:
-                    # Usar descripción si hay una disponible
-                    if description:
-                        processed_action = description
-                    else:
-                        # Generar descripción básica basada en la acción
-                        if action == '<Nop>':
-                            processed_action = "Placeholder (sin acción)"
-                        elif action == '"_dP':
-                            processed_action = "Pegar sin perder el clipboard"
-                        elif action == '"_x':
-                            processed_action = "Eliminar sin copiar al registro principal"
-                        elif action == '"_D':
-                            processed_action = "Eliminar hasta el final, sin copiar"
-                        elif action == '"_d':
-                            processed_action = "Eliminar selección, sin copiar"
-                        else:
-                            processed_action = action
-                
-                # Usar descripción como acción si está disponible y es más descriptiva
-                if description and description != action:
-                    processed_action = description
-                
-                keybinding = Keybinding(
-                    file_path=file_path,
-                    modes=modes,
-                    key=key,
-                    action=processed_action,
-                    description=description,
-                    context=context_note,
-                    line_number=line_num + 1
+                keybinding = self.keybinding_from_groups(
+                    file_path, pattern_name, match.groups(), line_num, lines
                 )
-                keybindings.append(keybinding)
-        
-        # Extensión: entradas estilo Snacks (tablas keys y mapeos con índice entre corchetes)
-        try:
-            snacks_kbs = self.extract_snacks_style_keybindings(file_path, content)
-            keybindings.extend(snacks_kbs)
-        except Exception as e:
-            print(f"Aviso: no se pudieron extraer Snacks keys en {file_path}: {e}")
+                if keybinding is not None:
+                    keybindings.append(keybinding)
 
-        # Extensión: which-key tables (which_key.add({...}) / local <name> = { mode=..., { '<key>', ... } })
-        try:
-            wk_kbs = self.extract_which_key_style_keybindings(file_path, content)
-            keybindings.extend(wk_kbs)
-        except Exception as e:
-            print(f"Aviso: no se pudieron extraer which-key keys en {file_path}: {e}")
+        return keybindings
 
-        # Extensión: defaults derivados de ejemplos cuando add_default_keybindings = true
-        try:
-            ex_kbs = self.extract_exercism_default_keybindings(file_path, content)
-            keybindings.extend(ex_kbs)
-        except Exception as e:
-            print(f"Aviso: no se pudieron extraer defaults por ejemplos en {file_path}: {e}")
+    def keybinding_from_groups(self, file_path: str, pattern_name: str, groups: Tuple, line_num: int,
+                               lines) -> Optional[Keybinding]:
+        """Construye el Keybinding de una coincidencia del patrón `pattern_name` (línea base 0)."""
+        context_note = ""
+        if pattern_name in ['map_function', 'keymap_set']:
+            modes_str, key, action, options = groups
+            modes = self.normalize_modes(modes_str)
 
-        # Extensión: defaults para PickMe (detecta add_keymap(...) incluso si está comentado)
-        try:
-            pickme_kbs = self.extract_pickme_default_keybindings(file_path, content)
-            keybindings.extend(pickme_kbs)
-        except Exception as e:
-            print(f"Aviso: no se pudieron extraer defaults de PickMe en {file_path}: {e}")
+            # Limpiar acción (remover comillas si las tiene)
+            action = action.strip('\'"')
 
-        # Extensión: defaults para Nerdy (si add_default_keybindings = true)
-        try:
-            nerdy_kbs = self.extract_nerdy_default_keybindings(file_path, content)
-            keybindings.extend(nerdy_kbs)
-        except Exception as e:
-            print(f"Aviso: no se pudieron extraer defaults de Nerdy en {file_path}: {e}")
+            # Extraer descripción de opciones primero
+            description = self.extract_description_from_options(options or "")
+            # Si no hay descripción en opciones, buscar en comentarios
+            if not description:
+                description = self.description_from_comment_lines(lines, line_num)
 
-        # Extensión: defaults para Markit (si add_default_keybindings = true)
-        try:
-            markit_kbs = self.extract_markit_default_keybindings(file_path, content)
-            keybindings.extend(markit_kbs)
-        except Exception as e:
-            print(f"Aviso: no se pudieron extraer defaults de Markit en {file_path}: {e}")
+        elif pattern_name in ['map_function_multi', 'keymap_set_multi']:
+            modes_str, key, action, options = groups
+            modes = self.normalize_modes(modes_str)
+
+            # Limpiar acción (remover comillas si las tiene)
+            action = action.strip('\'"')
+
+            # Extraer descripción de opciones primero
+            description = self.extract_description_from_options(options or "")
+            # Si no hay descripción en opciones, buscar en comentarios
+            if not description:
+                description = self.description_from_comment_lines(lines, line_num)
+
+        elif pattern_name == 'custom_keys':
+            key = groups[0].strip('\'"')
+            action = "Función personalizada"
+            modes = ["Custom"]
+            # Extraer descripción del contexto
+            description = self.describe_custom_key(lines, line_num)
+            context_note = "Clave personalizada de plugin"
+        elif pattern_name == 'assignment_key':
+            # Campo *_key = "<...>"
+            _field, key = groups
+            key = key.strip('\'"')
+            action = "Atajo de configuración del plugin"
+            modes = ["Normal"]
+            # Descripción por comentario cercano
+            description = self.description_from_comment_lines(lines, line_num)
+            key, context_note = self.resolve_assignment_key(file_path, key)
+        else:
+            return None
+
+        # Procesar acción para casos especiales
+        processed_action = self.process_action(action, description)
+
+        return Keybinding(
+            file_path=file_path,
+            modes=modes,
+            key=key,
+            action=processed_action,
+            description=description,
+            context=context_note,
+            line_number=line_num + 1
+        )
+
+    def extract_extension_keybindings(self, file_path: str, content: str) -> List[Keybinding]:
+        """Aplica los extractores especializados (Snacks, which-key y defaults de plugins)."""
+        keybindings: List[Keybinding] = []
+        extractors = [
+            # Entradas estilo Snacks (tablas keys y mapeos con índice entre corchetes)
+            (self.extract_snacks_style_keybindings, "Snacks keys"),
+            # which-key tables (which_key.add({...}) / local <name> = { mode=..., { '<key>', ... } })
+            (self.extract_which_key_style_keybindings, "which-key keys"),
+            # Defaults derivados de ejemplos cuando add_default_keybindings = true
+            (self.extract_exercism_default_keybindings, "defaults por ejemplos"),
+            # Defaults para PickMe (detecta add_keymap(...) incluso si está comentado)
+            (self.extract_pickme_default_keybindings, "defaults de PickMe"),
+            # Defaults para Nerdy (si add_default_keybindings = true)
+            (self.extract_nerdy_default_keybindings, "defaults de Nerdy"),
+            # Defaults para Markit (si add_default_keybindings = true)
+            (self.extract_markit_default_keybindings, "defaults de Markit"),
+            # Entradas `keys =` de las specs de lazy.nvim (sólo en la lista de plugins)
+            (self.extract_lazy_spec_keybindings, "keys de lazy.nvim"),
+        ]
+        for extractor, label in extractors:
+            try:
+                keybindings.extend(extractor(file_path, content))
+            except ExtractionBudgetExceeded:
+                raise
+            except Exception as e:
+                print(f"Aviso: no se pudieron extraer {label} en {file_path}: {e}")
 
         return keybindings
 
     # =====================
     #  Snacks keys parsing
     # =====================
-    def _find_matching_paren(self, text: str, start_index: int) -> int:
-        """Devuelve el índice de la ')' que cierra el bloque iniciado en start_index (posición del '(').
-        Ignora paréntesis dentro de cadenas simples o dobles. Retorna -1 si no encuentra cierre.
-        """
-        depth = 0
-        in_string: Optional[str] = None
-        i = start_index
-        while i < len(text):
-            ch = text[i]
-            if in_string:
-                if ch == in_string:
-                    if i > 0 and text[i - 1] == '\\':
-                        i += 1
-                        continue
-                    in_string = None
-                i += 1
-                continue
-            if ch in ('"', "'"):
-                in_string = ch
-                i += 1
-                continue
-            if ch == '(':
-                depth += 1
-            elif ch == ')':
-                depth -= 1
-                if depth == 0:
-                    return i
-            i += 1
-        return -1
-    def _find_matching_brace(self, text: str, start_index: int) -> int:
-        """Devuelve el índice de la '}' que cierra el bloque iniciado en start_index (que debe estar en '{').
-        Ignora llaves dentro de cadenas simples o dobles. Retorna -1 si no encuentra cierre.
-        """
-        depth = 0
-        in_string: Optional[str] = None
-        i = start_index
-        while i < len(text):
-            ch = text[i]
-            if in_string:
-                if ch == in_string:
-                    # comprobar escape simple \
-                    if i > 0 and text[i - 1] == '\\':
-                        i += 1
-                        continue
-                    in_string = None
-                i += 1
-                continue
-            if ch in ('"', "'"):
-                in_string = ch
-                i += 1
-                continue
-            if ch == '{':
-                depth += 1
-            elif ch == '}':
-                depth -= 1
-                if depth == 0:
-                    return i
-            i += 1
-        return -1
-
     def _parse_modes_from_inner(self, inner: str) -> List[str]:
         """Extrae modos desde una tabla interna `mode = ...` dentro de una entrada de keys."""
         # Tabla de modos: mode = { 'n', 'x' }
@@ -543,9 +1154,9 @@ class KeybindingExtractor:
         return ["Normal"]
 
     def _parse_desc_from_inner(self, inner: str) -> str:
-        m_desc = re.search(r"desc\s*=\s*['\"]([^'\"]+)['\"]", inner)
+        m_desc = DESC_RE.search(inner)
         if m_desc:
-            return m_desc.group(1).strip()
+            return (m_desc.group(1) or m_desc.group(2)).strip()
         return ""
 
     def extract_snacks_style_keybindings(self, file_path: str, content: str) -> List[Keybinding]:
@@ -556,14 +1167,17 @@ class KeybindingExtractor:
         keybindings: List[Keybinding] = []
 
         # Buscar cualquier entrada del tipo ['algo'] = { ... }
-        entry_start_re = re.compile(r"\[\s*(['\"][^'\"]+['\"])\s*\]\s*=\s*\{", re.MULTILINE)
-        for m in entry_start_re.finditer(content):
+        index = self.text_index(content)
+        for m in self.snacks_entry_head.finditer(content):
             table_key_raw = m.group(1).strip("'\"")
             inner_start = m.end()  # posición justo después de '{'
-            inner_end = self._find_matching_brace(content, inner_start - 1)
+            inner_end = index.matching(inner_start - 1)
             if inner_end == -1:
                 continue
-            inner = content[inner_start:inner_end]
+            # Las líneas comentadas no cuentan (p.ej. un `-- desc = '...'` desactivado)
+            inner = re.sub(r"(?m)^[ \t]*--.*$", "", content[inner_start:inner_end])
+            # Las tablas anidadas se re-examinan: el coste se descuenta del presupuesto
+            self.tick(1 + len(inner) // 256)
 
             # Determinar la tecla efectiva
             # Buscar cadenas candidatas dentro de la tabla y elegir la que parezca una tecla
@@ -586,7 +1200,7 @@ class KeybindingExtractor:
             description = self._parse_desc_from_inner(inner)
 
             # Número de línea aproximado
-            line_number = content[:m.start()].count('\n') + 1
+            line_number = index.line_of(m.start()) + 1
 
             # Si no hay descripción, intentar comentario cercano
             if not description:
@@ -613,229 +1227,136 @@ class KeybindingExtractor:
     # ========================
     #  which-key.lua parsing
     # ========================
-    def _parse_mode_from_table_header(self, table_inner: str) -> List[str]:
-        """Extrae el/los modos definidos en la cabecera de una tabla which-key: mode = 'n' | {'n','v'}.
-        Si no se encuentra, retorna ["Normal"].
-        """
-        # Tabla de modos: mode = { 'n', 'x' }
-        m_tbl = re.search(r"mode\s*=\s*\{([^}]*)\}", table_inner, re.MULTILINE | re.DOTALL)
-        if m_tbl:
-            inner_modes = m_tbl.group(1)
-            modes = self.normalize_modes(inner_modes)
-            return modes if modes else ["Normal"]
-        # Modo simple: mode = 'n'
-        m_str = re.search(r"mode\s*=\s*(['\"][^'\"]+['\"])", table_inner)
-        if m_str:
-            modes = self.normalize_modes(m_str.group(1))
-            return modes if modes else ["Normal"]
-        return ["Normal"]
-
-    def _iter_top_level_entries(self, inner: str) -> List[str]:
-        """Devuelve una lista de strings, cada uno correspondiente a una entrada top-level
-        del tipo { ... } dentro de la tabla principal which-key (ignorando campos tipo mode=...).
-        Usa un pequeño parser por llaves a nivel de la tabla.
-        """
-        entries: List[str] = []
-        i = 0
-        length = len(inner)
-        in_string: Optional[str] = None
-        depth = 0
-        start_idx: Optional[int] = None
-        while i < length:
-            ch = inner[i]
-            if in_string is not None:
-                if ch == in_string:
-                    # comprobar escape
-                    if i > 0 and inner[i - 1] == '\\':
-                        i += 1
-                        continue
-                    in_string = None
-                i += 1
-                continue
-            if ch in ('"', "'"):
-                in_string = ch
-                i += 1
-                continue
-            if ch == '{':
-                if depth == 0:
-                    start_idx = i
-                depth += 1
-            elif ch == '}':
-                depth -= 1
-                if depth == 0 and start_idx is not None:
-                    entry = inner[start_idx:i + 1]
-                    # filtrar objetos que son asignaciones con clave (p.ej., foo = {...});
-                    # nos interesan los literales de entrada que empiezan por '{' y no contienen '=' antes de la primera coma
-                    entries.append(entry)
-                    start_idx = None
-            i += 1
-        return entries
-
-    def _parse_entry_kb(self, file_path: str, modes_default: List[str], entry: str, content_for_comments: str, line_offset: int) -> Optional['Keybinding']:
-        """Intenta extraer un Keybinding desde una entrada { '<key>', ... } de which-key.
-        Retorna None si no es válida.
-        """
-        # Debe comenzar con '{'
-        if not entry.strip().startswith('{'):
-            return None
-        # Buscar primera cadena: la tecla
-        str_literals = re.findall(r"['\"]([^'\"]+)['\"]", entry)
-        if not str_literals:
-            return None
-        key = str_literals[0].strip()
-        # Filtrar claves genéricas o no válidas
-        if key.lower() in ('<leader>', '<auto>'):
-            return None
-
-        # Detectar si es un grupo (group = '...')
-        m_group = re.search(r"group\s*=\s*['\"]([^'\"]+)['\"]", entry)
-        m_desc = re.search(r"desc\s*=\s*['\"]([^'\"]+)['\"]", entry)
-        # Modo por entrada (override)
-        entry_modes: Optional[List[str]] = None
-        m_entry_mode_tbl = re.search(r"mode\s*=\s*\{([^}]*)\}", entry)
-        if m_entry_mode_tbl:
-            entry_modes = self.normalize_modes(m_entry_mode_tbl.group(1))
-        else:
-            m_entry_mode_str = re.search(r"mode\s*=\s*(['\"][^'\"]+['\"])", entry)
-            if m_entry_mode_str:
-                entry_modes = self.normalize_modes(m_entry_mode_str.group(1))
-
-        modes = entry_modes if entry_modes else modes_default
-
-        description = ""
-        if m_desc:
-            description = m_desc.group(1).strip()
-        elif m_group:
-            description = m_group.group(1).strip()
-        else:
-            # Comentario cercano si no hay desc
-            # Calcular número de línea aproximado
-            line_number = content_for_comments[:line_offset].count('\n') + entry[:entry.find('{')].count('\n') + 1
-            description = self.extract_description_from_comment(content_for_comments, max(0, line_number - 1))
-
-        # Intentar detectar acción: segundo literal tipo comando ':...' o '<...>' si no hay desc/grupo
-        action = description or "Acción de which-key"
-        if len(str_literals) >= 2:
-            second = str_literals[1].strip()
-            # Si hay group, el segundo literal suele ser el valor del grupo; ignorar como acción
-            if not m_group:
-                if second.startswith(':') or '<' in second or second.endswith('<cr>') or re.match(r'^:[A-Za-z]', second):
-                    action = second
-
-        # Número de línea aproximado (inicio de la entrada dentro del archivo)
-        # Aproximación del número de línea: inicio del bloque donde vive la entrada
-        abs_line_number = content_for_comments[:line_offset].count('\n') + 1
-
-        # Contexto: marcar explícitamente si es encabezado de grupo
-        context_value = "which-key-group" if m_group else "which-key"
-
-        return Keybinding(
-            file_path=file_path,
-            modes=modes,
-            key=key,
-            action=action if action else (description or "Acción de which-key"),
-            description=description,
-            context=context_value,
-            line_number=abs_line_number,
-        )
-
     def extract_which_key_style_keybindings(self, file_path: str, content: str) -> List['Keybinding']:
         """Extrae keybindings definidos en tablas which-key como:
         local name = { mode = 'n', { '<key>', ':cmd', desc = '...' }, { '<key2>', group = '...' } }
-        y entradas añadidas con table.insert(name, { ... }).
+        y entradas añadidas con table.insert(name, { ... }), también dentro de bucles
+        `for i = 1, 9 do` (una fila real por iteración). Ver which_key_graph.py.
         """
         # Restringir a archivos which-key.lua
-        try:
-            base = os.path.basename(file_path)
-        except Exception:
-            base = file_path
-        if not base.endswith('which-key.lua'):
+        if not os.path.basename(file_path).endswith('which-key.lua'):
             return []
 
+        graph = WhichKeyTableGraph(self.lua_tree(file_path, content))
         results: List[Keybinding] = []
+        for entry in graph.entries():
+            self.tick()
+            # Filtrar claves genéricas o no válidas
+            if entry.key.lower() in ('<leader>', '<auto>'):
+                continue
+            if entry.desc:
+                description = entry.desc.strip()
+            elif entry.group:
+                description = entry.group.strip()
+            else:
+                description = self.extract_description_from_comment(content, entry.line - 1)
 
-        # Determinar cuáles tablas parsear: aquellas pasadas a which_key.add(<name>)
-        allowed_names: set = set()
-        for m in re.finditer(r"which_key\.add\s*\(\s*([A-Za-z_][A-Za-z0-9_]*)\s*\)", content):
-            allowed_names.add(m.group(1))
-
-        # Mapear nombre de tabla -> modos
-        var_modes: Dict[str, List[str]] = {}
+            # Acción: el rhs si parece un comando (':...' o '<...>'); los grupos no tienen acción
+            action = description or "Acción de which-key"
+            rhs = (entry.rhs or "").strip()
+            if not entry.group and rhs and (rhs.startswith(':') or '<' in rhs):
+                action = rhs
 
-        # Capturar definiciones: (local )?<name> = { ... }
-        assign_re = re.compile(r"(?:local\s+)?([A-Za-z_][A-Za-z0-9_]*)\s*=\s*\{", re.MULTILINE)
-        for m in assign_re.finditer(content):
-            var_name = m.group(1)
-            if allowed_names and var_name not in allowed_names:
-                continue
-            start = m.end() - 1  # posición del '{'
-            end = self._find_matching_brace(content, start)
-            if end == -1:
-                continue
-            inner = content[start + 1:end]
-            modes = self._parse_mode_from_table_header(inner)
-            var_modes[var_name] = modes
-
-            # Iterar entradas top-level dentro de la tabla
-            entries = self._iter_top_level_entries(inner)
-            # Calcular offset para líneas
-            line_offset = m.end()
-            for entry in entries:
-                # Saltar si parece una asignación de campo (p.ej., mode = 'n')
-                if re.match(r"^\s*\{\s*['\"]", entry) is None:
-                    continue
-                kb = self._parse_entry_kb(file_path, modes, entry, content, line_offset)
-                if kb:
-                    results.append(kb)
-
-        # Capturar table.insert(name, { ... })
-        insert_re = re.compile(r"table\.insert\s*\(\s*([A-Za-z_][A-Za-z0-9_]*)\s*,\s*\{", re.MULTILINE)
-        for m in insert_re.finditer(content):
-            var_name = m.group(1)
-            if allowed_names and var_name not in allowed_names:
-                continue
-            start = m.end() - 1
-            end = self._find_matching_brace(content, start)
-            if end == -1:
-                continue
-            inner_entry = content[start:end + 1]
-            modes = var_modes.get(var_name, ["Normal"])
-            kb = self._parse_entry_kb(file_path, modes, inner_entry, content, m.start())
-            if kb:
-                results.append(kb)
-
-        # Heurística adicional: detectar mapeos numéricos con string.format('<leader>..%d', i)
-        numeric_insert_re = re.compile(
-            r"table\.insert\s*\(\s*([A-Za-z_][A-Za-z0-9_]*)\s*,\s*\{\s*string\.format\(\s*(['\"][^'\"]+['\"])",
-            re.MULTILINE,
-        )
-        seen_keys = {(kb.key, tuple(kb.modes)) for kb in results}
-        for m in numeric_insert_re.finditer(content):
-            var_name = m.group(1)
-            if allowed_names and var_name not in allowed_names:
-                continue
-            key_lit = m.group(2).strip('"\'')
-            if '%d' not in key_lit:
-                continue
-            modes = var_modes.get(var_name, ["Normal"])
-            sig = (key_lit, tuple(modes))
-            if sig in seen_keys:
-                continue
             results.append(Keybinding(
                 file_path=file_path,
-                modes=modes,
-                key=key_lit,
-                action="Numerical mappings",
-                description="Numerical mappings",
-                context="which-key",
-                line_number=content[:m.start()].count('\n') + 1,
+                modes=self.normalize_modes(','.join(entry.modes)) or ["Normal"],
+                key=entry.key,
+                action=action,
+                description=description,
+                context="which-key-group" if entry.group else "which-key",
+                line_number=entry.line,
             ))
-            seen_keys.add(sig)
-
         return results
 
-        # Helper function used in _parse_entry_kb; placed here to avoid top-level clutter
-    
+    # ==============================
+    #  Specs de lazy.nvim (keys =)
+    # ==============================
+    def is_spec_file(self, file_path: str) -> bool:
+        return os.path.normpath(file_path) == os.path.normpath(self.spec_file)
+
+    def extract_lazy_spec_keybindings(self, file_path: str, content: str) -> List[Keybinding]:
+        """Entradas `keys =` de la lista de plugins, con el plugin dueño como contexto.
+
+        PluginSpecIndex recorre las specs de list.lua en una pasada y reconoce las tres
+        formas de `keys` (string, lista de strings y { lhs, rhs, desc = , mode = }). Una
+        entrada sin rhs sólo dispara la carga: su acción es LAZY_TRIGGER_ACTION. El
+        contexto nombra el plugin y sus otros disparadores (cmd, event).
+        """
+        if not self.is_spec_file(file_path):
+            return []
+        index = PluginSpecIndex(file_path, self.lua_tree(file_path, content))
+        kbs: List[Keybinding] = []
+        for spec in index.specs:
+            if not spec.keys:
+                continue
+            context = f"{LAZY_KEYS_CONTEXT}: {spec.name}"
+            triggers = [f"{label}: {', '.join(values)}" for label, values in (('cmd', spec.cmds), ('event', spec.events))
+                        if values]
+            if triggers:
+                context += f" ({'; '.join(triggers)})"
+            for entry in spec.keys:
+                description = entry.desc.strip()
+                action = self.process_action(entry.rhs, description) if entry.rhs else LAZY_TRIGGER_ACTION
+                kbs.append(Keybinding(
+                    file_path=file_path,
+                    modes=self.normalize_modes(','.join(entry.modes)) or ["Normal"],
+                    key=entry.lhs,
+                    action=action,
+                    description=description,
+                    context=context,
+                    line_number=entry.line,
+                ))
+        return kbs
+
+    def lua_tree(self, file_path: str, content: str) -> lua_ast.Chunk:
+        """AST del contenido para los extractores especializados (lineal; los errores se toleran)."""
+        tree, _errors = lua_ast.parse_tolerant(content)
+        self.tick(1 + len(content) // 256)
+        return tree
+
+    # ==============================
+    #  Defaults escaneados (lazy.nvim)
+    # ==============================
+    def load_plugin_keymaps(self, plugin_root: Optional[str] = None, cache_dir: Optional[str] = None,
+                            jobs: Optional[int] = None):
+        """Escanea (o recupera de caché) los keymaps de los plugins instalados por lazy.nvim."""
+        default_root, lockfile = resolve_lazy_paths(self.repo_root)
+        scanner = PluginKeymapScanner(plugin_root or default_root, lockfile, cache_dir=cache_dir, jobs=jobs)
+        self.plugin_keymaps = scanner.scan()
+        total = sum(len(kms) for kms in self.plugin_keymaps.values())
+        print(f"🔌 Plugins escaneados: {len(self.plugin_keymaps)} "
+              f"({len(scanner.rescanned)} re-escaneados, {total} keymaps)")
+
+    def _scanned_plugin_defaults(self, plugin: str, file_path: str, flag_line: int,
+                                 label: str) -> Optional[List['Keybinding']]:
+        """Convierte los keymaps escaneados de `plugin` en Keybindings del archivo de configuración.
+
+        Retorna None si el plugin no fue escaneado (o no define keymaps), para que el
+        extractor correspondiente use sus valores conocidos como fallback.
+        """
+        keymaps = self.plugin_keymaps.get(plugin)
+        if not keymaps:
+            return None
+        kbs: List[Keybinding] = []
+        seen = set()
+        for line_offset, km in enumerate(keymaps):
+            modes = self.normalize_modes(','.join(km.modes)) or ["Normal"]
+            sig = (km.key, tuple(modes))
+            if sig in seen:
+                continue
+            seen.add(sig)
+            kbs.append(
+                Keybinding(
+                    file_path=file_path,
+                    modes=modes,
+                    key=km.key,
+                    action=km.action or km.description,
+                    description=km.description,
+                    context=f"{label} defaults ({plugin}/{km.file}:L{km.line_number})",
+                    line_number=flag_line + line_offset,
+                )
+            )
+        return kbs
 
     def extract_exercism_default_keybindings(self, file_path: str, content: str) -> List['Keybinding']:
         """Detecta `add_default_keybindings = true` en cualquier archivo Lua.
@@ -848,10 +1369,16 @@ class KeybindingExtractor:
         if not m_flag:
             return []
 
-        flag_line = content[: m_flag.start()].count('\n') + 1
+        flag_line = self.text_index(content).line_of(m_flag.start()) + 1
+
+        base = os.path.basename(file_path)
+        if base.endswith('exercism.lua'):
+            scanned = self._scanned_plugin_defaults('exercism.nvim', file_path, flag_line, "Exercism")
+            if scanned is not None:
+                return scanned
 
         # Ventana acotada tras la bandera para buscar ejemplos
-        lines = content.split('\n')
+        lines = self.text_index(content).lines
         start_line_idx = max(0, flag_line - 1)
         end_line_idx = min(len(lines), start_line_idx + 200)
         window = '\n'.join(lines[start_line_idx:end_line_idx])
@@ -869,7 +1396,6 @@ class KeybindingExtractor:
                 continue
             example_items.append((key, action_cmd, desc))
 
-        base = os.path.basename(file_path)
         looks_like_exercism = base.endswith('exercism.lua') or 'exercism' in content.lower()
         if not example_items and looks_like_exercism:
             example_items = [
@@ -908,11 +1434,20 @@ class KeybindingExtractor:
         add_keymap('<key>', ':PickMe ...<cr>', 'Descripción') aunque estén comentados.
         """
         # Requiere la bandera
-        if re.search(r"add_default_keybindings\s*=\s*true", content) is None:
+        m_flag = re.search(r"add_default_keybindings\s*=\s*true", content)
+        if m_flag is None:
             return []
 
+        if os.path.basename(file_path).endswith('pickme.lua'):
+            flag_line = self.text_index(content).line_of(m_flag.start()) + 1
+            scanned = self._scanned_plugin_defaults('pickme.nvim', file_path, flag_line, "PickMe")
+            if scanned is not None:
+                return scanned
+
         # Remover prefijos de comentario al inicio de líneas para permitir detectar llamadas comentadas
-        search_text = re.sub(r"(?m)^\s*--\s*", "", content)
+        # ([ \t] en lugar de \s: con \s cada inicio de línea volvía a recorrer las líneas en blanco siguientes)
+        search_text = re.sub(r"(?m)^[ \t]*--[ \t]*", "", content)
+        search_index = LuaTextIndex(search_text)
 
         # Buscar posiciones de 'add_keymap(' y extraer con emparejado de paréntesis
         add_pos_re = re.compile(r"add_keymap\s*\(")
@@ -936,12 +1471,13 @@ class KeybindingExtractor:
         kbs: List[Keybinding] = []
         for m in re.finditer(r"add_keymap\s*\(", search_text):
             open_idx = m.end() - 1  # posición del '('
-            close_idx = self._find_matching_paren(search_text, open_idx)
+            close_idx = search_index.matching(open_idx)
             if close_idx == -1:
                 continue
+            self.tick(1 + (close_idx - open_idx) // 256)
             inner_args = search_text[open_idx + 1:close_idx]
             # Quitar prefijos de comentario intra-llamada por si cada argumento está comentado en su línea
-            inner_clean = re.sub(r"(?m)^\s*--\s*", "", inner_args)
+            inner_clean = re.sub(r"(?m)^[ \t]*--[ \t]*", "", inner_args)
             lits = str_lit_re.findall(inner_clean)
             if len(lits) < 3:
                 continue
@@ -952,7 +1488,7 @@ class KeybindingExtractor:
             if not key or not desc:
                 continue
             # Número de línea aproximado
-            line_number = search_text[: m.start()].count('\n') + 1
+            line_number = search_index.line_of(m.start()) + 1
             kbs.append(
                 Keybinding(
                     file_path=file_path,
@@ -986,7 +1522,10 @@ class KeybindingExtractor:
 
         # Construir keybindings por defecto
         kbs: List[Keybinding] = []
-        flag_line = content[: re.search(r"add_default_keybindings\s*=\s*true", content).start()].count('\n') + 1
+        flag_line = self.text_index(content).line_of(re.search(r"add_default_keybindings\s*=\s*true", content).start()) + 1
+        scanned = self._scanned_plugin_defaults('nerdy.nvim', file_path, flag_line, "Nerdy")
+        if scanned is not None:
+            return scanned
         defaults = [
             ("<leader>in", ":Nerdy list<CR>", "Nerdy: List Icons"),
             ("<leader>iN", ":Nerdy recents<CR>", "Nerdy: Recent Icons"),
@@ -1029,14 +1568,17 @@ class KeybindingExtractor:
         flag_match = re.search(r"add_default_keybindings\s*=\s*true", content)
         if not flag_match:
             return []
-        flag_line = content[: flag_match.start()].count('\n') + 1
-        lines = content.split('\n')
+        flag_line = self.text_index(content).line_of(flag_match.start()) + 1
+        scanned = self._scanned_plugin_defaults('markit.nvim', file_path, flag_line, "Markit")
+        if scanned is not None:
+            return scanned
+        lines = self.text_index(content).lines
         start_line_idx = max(0, flag_line - 1)
         end_line_idx = min(len(lines), start_line_idx + 250)
         window = '\n'.join(lines[start_line_idx:end_line_idx])
 
         # Para robustez, permitir líneas comentadas
-        window_clean = re.sub(r"(?m)^\s*--\s*", "", window)
+        window_clean = re.sub(r"(?m)^[ \t]*--[ \t]*", "", window)
 
         triple_re = re.compile(
             r"\{\s*['\"]([^'\"]+)['\"]\s*,\s*['\"]([^'\"]+)['\"]\s*,\s*['\"]([^'\"]+)['\"]\s*\}\s*,?",
@@ -1081,26 +1623,135 @@ class KeybindingExtractor:
             file_keybindings = self.extract_keybindings_from_file(file_path)
             all_keybindings.extend(file_keybindings)
         
-        return all_keybindings
+        return self.dedupe_keybindings(all_keybindings)
+
+    def cache_scope(self, file_hashes: List[Tuple[str, str]], extra_inputs: Optional[Dict[str, str]] = None) -> str:
+        """Ámbito de la caché por archivo: lo que influye en la extracción además del propio archivo.
+
+        Con los regex cada archivo se extrae de forma independiente: basta la versión y
+        las entradas adicionales (motor, plugins escaneados).
+        """
+        return self.fingerprint_from_hashes([], extra_inputs)
 
-    def group_keybindings_by_file(self, keybindings: List[Keybinding]) -> Dict[str, List[Keybinding]]:
-        """Agrupa keybindings por archivo."""
-        grouped = {}
+    def prepare_extraction(self, lua_files: List[str]):
+        """Preparación común antes de extraer archivos sueltos (el motor ast indexa símbolos)."""
+
+    def extract_all_keybindings_cached(self, cache: ExtractionCache,
+                                       extra_inputs: Optional[Dict[str, str]] = None) -> List[Keybinding]:
+        """Como extract_all_keybindings, pero sólo extrae los archivos cuyo hash no está en la caché."""
+        lua_files = self.find_lua_files()
+        file_hashes: List[Tuple[str, str]] = []
+        for file_path in lua_files:
+            rel_path = os.path.relpath(file_path, self.repo_root).replace(os.sep, '/')
+            try:
+                with open(file_path, 'rb') as f:
+                    file_hash = hashlib.sha256(f.read()).hexdigest()
+            except OSError:
+                file_hash = "unreadable"
+            file_hashes.append((rel_path, file_hash))
+        cache.open(self.cache_scope(file_hashes, extra_inputs))
+
+        cached = [cache.get(rel_path, file_hash) for rel_path, file_hash in file_hashes]
+        if any(records is None for records in cached):
+            self.prepare_extraction(lua_files)
+        all_keybindings = []
+        for file_path, (rel_path, file_hash), records in zip(lua_files, file_hashes, cached):
+            if records is None:
+                file_keybindings = self.extract_keybindings_from_file(file_path)
+                # Ruta relativa: la caché es compartible entre checkouts (otro worktree, CI)
+                cache.put(rel_path, file_hash, [dict(asdict(kb), file_path=rel_path) for kb in file_keybindings])
+            else:
+                file_keybindings = [
+                    Keybinding(**dict(record, file_path=file_path, sources=[tuple(s) for s in record['sources']]))
+                    for record in records
+                ]
+            all_keybindings.extend(file_keybindings)
+        cache.save()
+        return self.dedupe_keybindings(all_keybindings)
+
+    def dedupe_keybindings(self, keybindings: List[Keybinding]) -> List[Keybinding]:
+        """Fusiona en una sola pasada los registros duplicados de un mismo archivo.
+
+        Dos registros son duplicados si coinciden archivo, clave canónica, modos y acción
+        mostrada (p.ej. la misma tabla detectada como Snacks keys y como ejemplo de
+        defaults). Se conserva el primero, con todas las ubicaciones en `sources`; los
+        contextos no estructurales se combinan.
+        """
+        merged: Dict[Tuple[str, str, Tuple[str, ...], str], Keybinding] = {}
+        result: List[Keybinding] = []
         for kb in keybindings:
-            rel_path = os.path.relpath(kb.file_path, self.repo_root)
-            if rel_path not in grouped:
-                grouped[rel_path] = []
-            grouped[rel_path].append(kb)
-        
-        return grouped
+            kb.canonical_key = self.canonicalizer.canonical(kb.key)
+            location = (os.path.relpath(kb.file_path, self.repo_root), kb.line_number)
+            action_display = (kb.description or kb.action or "").strip().lower()
+            signature = (location[0], kb.canonical_key, tuple(sorted(kb.modes)), action_display)
+            first = merged.get(signature)
+            if first is None:
+                kb.sources = [location]
+                merged[signature] = kb
+                result.append(kb)
+                continue
+            if location not in first.sources:
+                first.sources.append(location)
+            if kb.context and kb.context != first.context and first.context not in STRUCTURAL_CONTEXTS \
+                    and kb.context not in STRUCTURAL_CONTEXTS:
+                contexts = set(first.context.split('; ')) if first.context else set()
+                contexts.add(kb.context)
+                first.context = '; '.join(sorted(contexts))
+        return result
+
+    def canonical_key_of(self, kb: Keybinding) -> str:
+        return kb.canonical_key or self.canonicalizer.canonical(kb.key)
+
+    def input_fingerprint(self, extra_inputs: Optional[Dict[str, str]] = None) -> str:
+        """Huella de las entradas de la documentación.
+
+        Combina SCRIPT_VERSION, las entradas adicionales (motor, all_files, lockfile de
+        plugins...) y la lista ordenada de (ruta relativa, sha256 del contenido) de todos
+        los archivos Lua, alcanzables o no: el grafo de módulos parsea cada archivo y
+        sólo se construye si la huella no coincide. Sólo lee y hashea archivos: no
+        extrae ni renderiza nada.
+        """
+        file_hashes = []
+        for file_path in self.all_lua_files():
+            rel_path = os.path.relpath(file_path, self.repo_root).replace(os.sep, '/')
+            try:
+                with open(file_path, 'rb') as f:
+                    file_hash = hashlib.sha256(f.read()).hexdigest()
+            except OSError:
+                file_hash = "unreadable"
+            file_hashes.append((rel_path, file_hash))
+        return self.fingerprint_from_hashes(file_hashes, extra_inputs)
+
+    def fingerprint_from_hashes(self, file_hashes: List[Tuple[str, str]],
+                                extra_inputs: Optional[Dict[str, str]] = None) -> str:
+        """Huella a partir de (ruta relativa, sha256) ya calculados (p.ej. blobs de una revisión)."""
+        digest = hashlib.sha256()
+        digest.update(f"version={SCRIPT_VERSION}\n".encode('utf-8'))
+        for name, value in sorted((extra_inputs or {}).items()):
+            digest.update(f"{name}={value}\n".encode('utf-8'))
+        for rel_path, file_hash in file_hashes:
+            digest.update(f"{rel_path} {file_hash}\n".encode('utf-8'))
+        return digest.hexdigest()
+
+    def as_table(self, keybindings: List[Keybinding]) -> KeybindingTable:
+        """La tabla columnar de `keybindings` (la misma si ya lo es)."""
+        if isinstance(keybindings, KeybindingTable):
+            return keybindings
+        return KeybindingTable.build(keybindings, self)
+
+    def group_keybindings_by_file(self, keybindings: List[Keybinding]) -> Dict[str, KeybindingTable]:
+        """Agrupa keybindings por archivo (índice cacheado de la tabla)."""
+        return self.as_table(keybindings).by_file()
 
     def generate_markdown_table(self, keybindings: List[Keybinding]) -> str:
         """Genera tabla markdown para un grupo de keybindings."""
         if not keybindings:
             return ""
+        table_view = self.as_table(keybindings)
+        columns = table_view.columns
         
         # Determinar si usar contexto o notas
-        use_context = any(kb.context for kb in keybindings)
+        use_context = any(columns.context[row] for row in table_view.rows)
         header_col = "Contexto/Notas" if use_context else "Notas/Duplicados"
         
         table = f"""| Combinación de teclas                 | Acción (Español)                                    | Modo(s)         | {header_col}                   |
@@ -1110,12 +1761,15 @@ class KeybindingExtractor:
         # Consolidar por tecla y acción para reducir filas repetidas
         # Estructura: { key: { action: { 'modes': set([...]), 'contexts': set([...]) } } }
         consolidated = {}
-        for kb in keybindings:
-            key = kb.key
+        # Clave canónica -> fila de la primera grafía vista (la que se muestra y por la que se ordena)
+        display_rows: Dict[str, int] = {}
+        key_rows: Dict[str, int] = {}
+        for row in table_view.rows:
+            first = display_rows.setdefault(columns.canonical[row], row)
+            key = columns.key[first]
+            key_rows.setdefault(key, first)
             # Acción mostrada prioriza la descripción si existe
-            action_display = kb.description if kb.description else kb.action
-            if not action_display or action_display == kb.key:
-                action_display = "⚠️ Sin descripción"
+            action_display = columns.display[row]
 
             if key not in consolidated:
                 consolidated[key] = {}
@@ -1124,10 +1778,10 @@ class KeybindingExtractor:
                     'modes': set(),
                     'contexts': set()
                 }
-            for m in kb.modes or ["N/A"]:
+            for m in columns.modes[row] or ("N/A",):
                 consolidated[key][action_display]['modes'].add(m)
-            if use_context and kb.context:
-                consolidated[key][action_display]['contexts'].add(kb.context)
+            if use_context and columns.context[row]:
+                consolidated[key][action_display]['contexts'].add(columns.context[row])
 
         # Orden consistente de modos para visualización
         mode_order = {m: i for i, m in enumerate([
@@ -1137,15 +1791,15 @@ class KeybindingExtractor:
         def sort_modes(modes_set):
             return sorted(list(modes_set), key=lambda m: mode_order.get(m, 999))
 
-        # Escribir filas consolidadas en orden por tecla
-        for key in sorted(consolidated.keys(), key=lambda k: k.lower()):
+        # Escribir filas consolidadas en orden por tecla (rank: tecla en minúsculas, luego aparición)
+        for key in sorted(consolidated.keys(), key=lambda k: columns.rank[key_rows[k]]):
             action_groups = consolidated[key]
             multiple_actions = len(action_groups) > 1
 
             for action_display, info in action_groups.items():
-                key_formatted = self.format_key_combination(key)
+                key_formatted = table_view.formatted_key(key_rows[key])
                 modes_sorted = sort_modes(info['modes'])
-                modes_str = self.modes_to_chips(modes_sorted) if modes_sorted else ""
+                modes_str = table_view.chips(modes_sorted) if modes_sorted else ""
 
                 # Notas: si hay múltiples acciones para la misma tecla, indicarlo
                 notes = "Acción distinta por modo" if multiple_actions else ""
@@ -1165,17 +1819,16 @@ class KeybindingExtractor:
         if not keybindings:
             return ""
 
-        # Mapear: key -> mode -> set(actions)
-        per_key: Dict[str, Dict[str, set]] = {}
-        for kb in keybindings:
-            key = kb.key
-            action_display = kb.description if kb.description else kb.action
-            if not action_display or action_display == kb.key:
-                action_display = "⚠️ Sin descripción"
-            if key not in per_key:
-                per_key[key] = {}
-            for mode in kb.modes or ["N/A"]:
-                per_key[key].setdefault(mode, set()).add(action_display)
+        table_view = self.as_table(keybindings)
+        columns = table_view.columns
+
+        # Mapear: fila de la primera grafía -> mode -> set(actions), agrupado por clave canónica
+        per_key: Dict[int, Dict[str, set]] = {}
+        for group in table_view.by_canonical().values():
+            mode_to_actions = per_key[group.rows[0]] = {}
+            for row in group.rows:
+                for mode in columns.modes[row] or ("N/A",):
+                    mode_to_actions.setdefault(mode, set()).add(columns.display[row])
 
         # Orden de modos
         mode_order = [
@@ -1188,8 +1841,8 @@ class KeybindingExtractor:
 | ------------------------------------- | ------------------------------------------------------------------------------------ | ----- |
 """
 
-        for key in sorted(per_key.keys(), key=lambda k: k.lower()):
-            mode_to_actions = per_key[key]
+        for key_row in sorted(per_key.keys(), key=columns.rank.__getitem__):
+            mode_to_actions = per_key[key_row]
             # Ordenar modos y acciones
             parts: List[str] = []
             notes: List[str] = []
@@ -1203,14 +1856,88 @@ class KeybindingExtractor:
             actions_by_mode_str = " · ".join(parts)
             notes_str = ", ".join(notes)
 
-            table += f"| {self.format_key_combination(key):<37} | {actions_by_mode_str:<84} | {notes_str} |\n"
+            table += f"| {table_view.formatted_key(key_row):<37} | {actions_by_mode_str:<84} | {notes_str} |\n"
 
         return table
 
+    # Archivos que abren la sección "Por archivo", en este orden
+    priority_files = [
+        'lua/core/keys.lua',
+        'lua/core/autocmd.lua', 
+        'lua/plugins/lazy.lua',
+        'lua/plugins/ui/which-key.lua'
+    ]
+
+    def ordered_file_groups(self, keybindings: List[Keybinding]) -> List[Tuple[str, List[Keybinding], bool]]:
+        """Devuelve (archivo, keybindings, es_prioritario) en el orden de la documentación."""
+        grouped = self.group_keybindings_by_file(keybindings)
+        groups: List[Tuple[str, List[Keybinding], bool]] = []
+        for file_path in self.priority_files:
+            if grouped.get(file_path):
+                groups.append((file_path, grouped[file_path], True))
+        for file_path, file_keybindings in grouped.items():
+            if file_path not in self.priority_files and file_keybindings:
+                groups.append((file_path, file_keybindings, False))
+        return groups
+
+    def generate_file_section(self, file_path: str, file_keybindings: List[Keybinding], priority: bool,
+                              link_prefix: str = '') -> str:
+        """Genera la sección markdown de un archivo dentro de "Por archivo".
+
+        link_prefix se antepone a los enlaces al código (p.ej. '../../../' en las páginas de docs/keybindings/).
+        """
+        doc = f"### [{file_path}]({link_prefix}{file_path})\n\n"
+
+        # Agregar notas especiales por archivo
+        if priority and 'lazy.lua' in file_path:
+            doc += "**Estos atajos solo están activos dentro de la interfaz del plugin Lazy.**\n\n"
+
+        # Vista principal
+        if 'which-key.lua' in file_path:
+            # Para which-key, render en formato "pretty" por grupos y modos
+            doc += self.generate_which_key_pretty_sections(file_keybindings)
+        else:
+            # Por categoría (comportamiento estándar)
+            doc += self.generate_by_category_section(file_keybindings, heading_level='####')
+
+        # Agregar notas especiales
+        if priority and 'keys.lua' in file_path:
+            doc += "\n#### Líder global/local: <kbd>Espacio</kbd>\n"
+            doc += "- Asignado como \"líder\" (mapleader y maplocalleader).\n"
+
+        doc += "\n---\n\n"
+        return doc
+
     def generate_documentation(self, keybindings: List[Keybinding]) -> str:
         """Genera la documentación completa en markdown."""
-        grouped = self.group_keybindings_by_file(keybindings)
+        return ''.join(self.iter_documentation(keybindings))
+
+    def documentation_tasks(self, keybindings: List[Keybinding]) -> List[Tuple[str, tuple]]:
+        """Secciones independientes del documento, en orden: (método, argumentos)."""
+        tasks: List[Tuple[str, tuple]] = [('generate_header_section', ())]
+        for group in self.ordered_file_groups(keybindings):
+            tasks.append(('generate_file_section', group))
+        tasks.append(('generate_closing_sections', (keybindings,)))
+        return tasks
+
+    def iter_documentation(self, keybindings: List[Keybinding]) -> Iterator[str]:
+        """Genera la documentación markdown por secciones (para escribirla en streaming).
 
+        Con render_workers > 1 las secciones se renderizan en un pool de procesos y se
+        entregan en el orden original (pool.map), así que la salida es idéntica a la serie.
+        """
+        tasks = self.documentation_tasks(keybindings)
+        if self.render_workers <= 1 or len(tasks) <= 3:
+            for method, args in tasks:
+                yield getattr(self, method)(*args)
+            return
+        chunksize = max(1, len(tasks) // (self.render_workers * 4))
+        with ProcessPoolExecutor(max_workers=self.render_workers,
+                                 initializer=_init_render_worker, initargs=(self,)) as pool:
+            yield from pool.map(_render_section, tasks, chunksize=chunksize)
+
+    def generate_header_section(self) -> str:
+        """Encabezado, índice y título de la sección "Por archivo"."""
         # Encabezado enriquecido
         header = (
             "# [Roberto nvim](https://github.com/25ASAB015/nvim)\n\n"
@@ -1223,64 +1950,25 @@ class KeybindingExtractor:
         # Índice (TOC)
         doc = header + "## Índice\n\n"
         doc += "- [Por archivo](#por-archivo)\n"
+        if self.usage is not None:
+            doc += "- [Uso real](#uso-real)\n"
         doc += "- [Conflictos y solapamientos](#conflictos-y-solapamientos)\n"
         doc += "- [Notas y pendientes](#notas-y-pendientes)\n\n"
 
         # Por archivo
         doc += "## Por archivo\n\n"
-        
-        # Procesar archivos en orden específico
-        file_order = [
-            'lua/core/keys.lua',
-            'lua/core/autocmd.lua', 
-            'lua/plugins/lazy.lua',
-            'lua/plugins/ui/which-key.lua'
-        ]
-        
-        processed_files = set()
-        
-        # Procesar archivos principales en orden
-        for file_path in file_order:
-            if file_path in grouped:
-                file_keybindings = grouped[file_path]
-                if file_keybindings:
-                    doc += f"### [{file_path}]({file_path})\n\n"
-
-                    # Agregar notas especiales por archivo
-                    if 'lazy.lua' in file_path:
-                        doc += "**Estos atajos solo están activos dentro de la interfaz del plugin Lazy.**\n\n"
-
-                    # Vista principal
-                    if 'which-key.lua' in file_path:
-                        # Para which-key, render en formato "pretty" por grupos y modos
-                        doc += self.generate_which_key_pretty_sections(file_keybindings)
-                    else:
-                        # Por categoría (comportamiento estándar)
-                        doc += self.generate_by_category_section(file_keybindings, heading_level='####')
-
-                    # (Vista compacta por tecla removida para simplificar)
-
-                    # Agregar notas especiales
-                    if 'keys.lua' in file_path:
-                        doc += "\n#### Líder global/local: <kbd>Espacio</kbd>\n"
-                        doc += "- Asignado como \"líder\" (mapleader y maplocalleader).\n"
-
-                    doc += "\n---\n\n"
-                
-                processed_files.add(file_path)
-        
-        # Procesar archivos restantes
-        for file_path, file_keybindings in grouped.items():
-            if file_path not in processed_files and file_keybindings:
-                doc += f"### [{file_path}]({file_path})\n\n"
-                if 'which-key.lua' in file_path:
-                    doc += self.generate_which_key_pretty_sections(file_keybindings)
-                else:
-                    doc += self.generate_by_category_section(file_keybindings, heading_level='####')
-                doc += "\n---\n\n"
+        return doc
 
+    def generate_closing_sections(self, keybindings: List[Keybinding]) -> str:
+        """Conflictos y solapamientos, notas y keybindings sin descripción."""
+        doc = ""
         # (Sección Árbol de <leader> removida para simplificar)
 
+        if self.usage is not None:
+            doc += "## Uso real\n\n"
+            doc += self.generate_usage_section(keybindings)
+            doc += "\n---\n\n"
+
         # Conflictos y solapamientos
         doc += "## Conflictos y solapamientos\n\n"
         doc += self.generate_conflicts_section(keybindings)
@@ -1294,9 +1982,13 @@ class KeybindingExtractor:
         doc += "- Los keybindings contextuales se destacan indicando el contexto de activación.\n"
         doc += "- Todo está documentado en español.\n"
 
-        # Contar keybindings sin descripción
+        # Contar keybindings sin descripción (los disparadores de lazy.nvim no la necesitan)
+        table_view = self.as_table(keybindings)
+        columns = table_view.columns
         missing_desc = [
-            kb for kb in keybindings if not kb.description or kb.description == kb.key
+            row for row in table_view.rows
+            if (not columns.records[row].description or columns.records[row].description == columns.key[row])
+            and columns.records[row].action != LAZY_TRIGGER_ACTION
         ]
         no_desc_count = len(missing_desc)
         if no_desc_count > 0:
@@ -1305,13 +1997,13 @@ class KeybindingExtractor:
             # Listado detallado para investigación
             doc += "\n**Keybindings sin descripción:**\n"
             # Ordenar por archivo y línea para facilitar navegación
-            missing_desc.sort(key=lambda kb: (os.path.relpath(kb.file_path, self.repo_root), kb.line_number))
-            for kb in missing_desc:
-                rel_path = os.path.relpath(kb.file_path, self.repo_root)
-                key_fmt = self.format_key_combination(kb.key)
-                modes_str = self.modes_to_chips(kb.modes) if kb.modes else ""
+            missing_desc.sort(key=lambda row: (columns.rel_path[row], columns.line[row]))
+            for row in missing_desc:
+                rel_path, line = columns.rel_path[row], columns.line[row]
+                key_fmt = table_view.formatted_key(row)
+                modes_str = table_view.chips(columns.modes[row]) if columns.modes[row] else ""
                 # Enlace relativo a archivo con ancla de línea (GitHub/Git viewers)
-                doc += f"- [{rel_path}:L{kb.line_number}]({rel_path}#L{kb.line_number}) — Tecla: {key_fmt} — Modos: {modes_str}\n"
+                doc += f"- [{rel_path}:L{line}]({rel_path}#L{line}) — Tecla: {key_fmt} — Modos: {modes_str}\n"
 
         return doc
 
@@ -1327,13 +2019,9 @@ class KeybindingExtractor:
         # Orden de modos fijo
         mode_order = ['Normal', 'Visual', 'Select', 'Insert', 'Terminal', 'Command', 'Operator']
 
-        # Construir mapa modo -> keybindings en ese modo
-        per_mode: Dict[str, List[Keybinding]] = {m: [] for m in mode_order}
-        for kb in keybindings:
-            modes = kb.modes if kb.modes else ['Normal']
-            for m in modes:
-                if m in per_mode:
-                    per_mode[m].append(kb)
+        # Mapa modo -> keybindings en ese modo (índice cacheado de la tabla)
+        table_view = self.as_table(keybindings)
+        per_mode = table_view.by_mode('Normal')
 
         out: List[str] = []
 
@@ -1350,9 +2038,9 @@ class KeybindingExtractor:
                     if group_name:
                         group_prefix_to_name[kb.key] = group_name
 
-            # 2) Asignar a grupos u "otros" (sólo entradas de este modo)
-            grouped: Dict[str, List[Keybinding]] = {name: [] for name in group_prefix_to_name.values()}
-            others: List[Keybinding] = []
+            # 2) Asignar a grupos u "otros" (sólo entradas de este modo), como filas de la tabla
+            grouped: Dict[str, List[int]] = {name: [] for name in group_prefix_to_name.values()}
+            others: List[int] = []
 
             def prefix_order(p: str) -> str:
                 rest = p[len('<leader>'):] if p.lower().startswith('<leader>') else p
@@ -1360,30 +2048,30 @@ class KeybindingExtractor:
 
             ordered_prefixes = sorted(group_prefix_to_name.keys(), key=prefix_order)
 
-            for kb in mode_kbs:
+            for row, kb in zip(mode_kbs.rows, mode_kbs):
                 # Saltar encabezados de grupo
                 if kb.context == 'which-key-group' and kb.key in group_prefix_to_name:
                     continue
                 placed = False
                 for prefix in ordered_prefixes:
-                    if kb.key.lower().startswith(prefix.lower()):
-                        grouped[group_prefix_to_name[prefix]].append(kb)
+                    if table_view.columns.key_lower[row].startswith(prefix.lower()):
+                        grouped[group_prefix_to_name[prefix]].append(row)
                         placed = True
                         break
                 if not placed:
-                    others.append(kb)
+                    others.append(row)
 
             # 3) Render grupos de este modo
             for prefix in ordered_prefixes:
                 group_name = group_prefix_to_name[prefix]
                 items = grouped.get(group_name, [])
                 out.append(f"{heading_level} {group_name}\n\n")
-                out.append(self.generate_markdown_table(items))
+                out.append(self.generate_markdown_table(table_view.view(items)))
                 out.append("\n")
 
             # 4) Otros (Modo)
             out.append(f"{heading_level} Otros ({mode})\n\n")
-            out.append(self.generate_markdown_table(others))
+            out.append(self.generate_markdown_table(table_view.view(others)))
             out.append("\n")
 
         return "".join(out)
@@ -1399,6 +2087,8 @@ class KeybindingExtractor:
         """
         if not keybindings:
             return ""
+        table_view = self.as_table(keybindings)
+        columns = table_view.columns
 
         # Helpers
         def get_group_map(kbs: List[Keybinding]) -> Dict[str, str]:
@@ -1421,19 +2111,21 @@ class KeybindingExtractor:
                 rest_fmt = " ".join(list(rest))
             return f"<kbd>Leader</kbd> <kbd> {rest_fmt} </kbd>"
 
-        def table_rows_for_group(kbs: List[Keybinding], prefix: str) -> str:
+        def table_rows_for_group(kbs: KeybindingTable, prefix: str) -> str:
             rows = []
-            for kb in sorted(kbs, key=lambda x: x.key.lower()):
+            prefix_lower = prefix.lower()
+            for row in kbs.sorted_rows():
+                kb = columns.records[row]
                 if kb.context == 'which-key-group':
                     continue
-                if not kb.key.lower().startswith(prefix.lower()):
+                if not columns.key_lower[row].startswith(prefix_lower):
                     continue
                 key_disp = format_leader_sequence(kb.key)
                 action_disp = kb.description or kb.action or "(sin acción)"
                 rows.append(f"| {key_disp:<34} | {action_disp} |")
             return "\n".join(rows)
 
-        def render_leader_mode(mode_name: str, kbs: List[Keybinding]) -> str:
+        def render_leader_mode(mode_name: str, kbs: KeybindingTable) -> str:
             out: List[str] = []
             if not kbs:
                 return ""
@@ -1456,39 +2148,35 @@ class KeybindingExtractor:
                 out.append(rows + "\n\n" if rows else "\n")
             return "".join(out)
 
-        def render_non_leader(kbs: List[Keybinding]) -> str:
-            non_leader = [kb for kb in kbs if not kb.key.lower().startswith('<leader>')]
+        def render_non_leader(kbs: KeybindingTable) -> str:
+            non_leader = [row for row in kbs.sorted_rows() if not columns.key_lower[row].startswith('<leader>')]
             if not non_leader:
                 return ""
             out: List[str] = []
             out.append("## Non Leader Bindings\n\n")
             out.append("| Keybinding                         | Action                 |\n")
             out.append("| ---------------------------------- | ---------------------- |\n")
-            for kb in sorted(non_leader, key=lambda x: x.key.lower()):
-                key_fmt = self.format_key_combination(kb.key)
+            for row in non_leader:
+                kb = columns.records[row]
+                key_fmt = table_view.formatted_key(row)
                 action_disp = kb.description or kb.action or "(sin acción)"
                 out.append(f"| {key_fmt:<34} | {action_disp:<22} |\n")
             out.append("\n")
             return "".join(out)
 
         # Agrupar por modo
-        mode_to_kbs: Dict[str, List[Keybinding]] = {}
-        for kb in keybindings:
-            modes = kb.modes if kb.modes else ['Normal']
-            for m in modes:
-                mode_to_kbs.setdefault(m, []).append(kb)
+        mode_to_kbs = table_view.by_mode('Normal')
 
         out: List[str] = []
         # Render Normal, Visual en ese orden
         for mode in ['Normal', 'Visual']:
-            out.append(render_leader_mode(mode, mode_to_kbs.get(mode, [])))
+            out.append(render_leader_mode(mode, mode_to_kbs.get(mode, table_view.view([]))))
         # Render otros modos si existiesen
         for mode in sorted([m for m in mode_to_kbs.keys() if m not in ['Normal', 'Visual']]):
-            out.append(render_leader_mode(mode, mode_to_kbs.get(mode, [])))
+            out.append(render_leader_mode(mode, mode_to_kbs[mode]))
 
         # Non leader (de este archivo)
-        all_kbs = keybindings
-        out.append(render_non_leader(all_kbs))
+        out.append(render_non_leader(table_view))
 
         return "".join(out)
 
@@ -1496,11 +2184,8 @@ class KeybindingExtractor:
         """Construye sección agrupada por categorías funcionales.
         heading_level controla el nivel de encabezado para cada categoría (###, ####, ...).
         """
-        # Agrupar por categoría
-        categories: Dict[str, List[Keybinding]] = {}
-        for kb in keybindings:
-            cat = self.categorize_keybinding(kb)
-            categories.setdefault(cat, []).append(kb)
+        # Agrupar por categoría (índice cacheado de la tabla)
+        categories = self.as_table(keybindings).by_category()
 
         # Orden fijo de categorías
         cat_order = [
@@ -1518,98 +2203,135 @@ class KeybindingExtractor:
                 out.append("\n")
         return "".join(out)
 
-    def generate_conflicts_section(self, keybindings: List[Keybinding]) -> str:
-        """Lista teclas con múltiples acciones en el mismo modo u orígenes distintos."""
-        # key -> mode -> list of (action_display, file, line)
-        conflicts: Dict[str, Dict[str, List[Tuple[str, str, int]]]] = {}
-        for kb in keybindings:
-            action_display = kb.description if kb.description else kb.action
-            if not action_display or action_display == kb.key:
-                action_display = "⚠️ Sin descripción"
-            rel_path = os.path.relpath(kb.file_path, self.repo_root)
-            for mode in kb.modes or ["N/A"]:
-                conflicts.setdefault(kb.key, {}).setdefault(mode, []).append(
-                    (action_display, rel_path, kb.line_number)
-                )
+    def find_conflicts(self, keybindings: List[Keybinding]) -> Tuple[KeybindingTable, List[Tuple[int, Dict[str, Dict[str, List[Tuple[str, int]]]]]]]:
+        """Teclas con más de una acción en un mismo modo (el análisis de generate_conflicts_section).
 
-        lines = []
-        for key in sorted(conflicts.keys(), key=lambda k: k.lower()):
-            has_conflict = False
-            entries = conflicts[key]
-            # Detectar conflicto si un modo tiene >1 acción
-            for mode, lst in entries.items():
-                actions = {a for a, _, _ in lst}
-                if len(actions) > 1:
-                    has_conflict = True
-                    break
-            if not has_conflict:
+        Devuelve la tabla y, por cada tecla en conflicto (agrupada por clave canónica y
+        ordenada por tecla), la fila de su primera grafía y modo -> acción mostrada ->
+        ubicaciones, sólo con los modos en conflicto y en orden alfabético.
+        """
+        table_view = self.as_table(keybindings)
+        columns = table_view.columns
+        found: List[Tuple[int, Dict[str, Dict[str, List[Tuple[str, int]]]]]] = []
+        for group in table_view.by_canonical().values():
+            # lazy.nvim sustituye su stub por el mapeo real del plugin: no es un conflicto
+            rows = [row for row in group.rows if columns.records[row].action != LAZY_TRIGGER_ACTION]
+            if len(rows) < 2:
                 continue
-            lines.append(f"- Tecla {self.format_key_combination(key)}:")
-            for mode in sorted(entries.keys()):
-                lst = entries[mode]
-                actions_map: Dict[str, List[Tuple[str, int]]] = {}
-                for action_display, rel_path, line in lst:
-                    actions_map.setdefault(action_display, []).append((rel_path, line))
-                if len(actions_map) <= 1:
-                    continue
+            # mode -> action_display -> ubicaciones; se muestra la primera grafía vista
+            entries: Dict[str, Dict[str, List[Tuple[str, int]]]] = {}
+            for row in rows:
+                locations = columns.records[row].sources or [(columns.rel_path[row], columns.line[row])]
+                for mode in columns.modes[row] or ("N/A",):
+                    entries.setdefault(mode, {}).setdefault(columns.display[row], []).extend(locations)
+            modes = {mode: entries[mode] for mode in sorted(entries) if len(entries[mode]) > 1}
+            if modes:
+                found.append((rows[0], modes))
+        found.sort(key=lambda item: columns.rank[item[0]])
+        return table_view, found
+
+    def generate_conflicts_section(self, keybindings: List[Keybinding], link_prefix: str = '') -> str:
+        """Lista teclas con múltiples acciones en el mismo modo u orígenes distintos."""
+        table_view, conflicts = self.find_conflicts(keybindings)
+        lines = []
+        for row, modes in conflicts:
+            lines.append(f"- Tecla {table_view.formatted_key(row)}:")
+            for mode, actions_map in modes.items():
                 mode_chip = self.modes_to_chips([mode]) if mode != 'N/A' else ''
                 lines.append(f"  - {mode if not mode_chip else mode_chip}: ")
                 for action_display, locs in actions_map.items():
-                    links = ", ".join([f"[{p}:L{ln}]({p}#L{ln})" for p, ln in locs])
+                    links = ", ".join([f"[{p}:L{ln}]({link_prefix}{p}#L{ln})" for p, ln in locs])
                     lines.append(f"    - {action_display} — {links}")
         return "\n".join(lines) if lines else "No se detectaron conflictos relevantes."
 
+    def usage_ranking(self, keybindings: List[Keybinding], count: Callable[[str, str], Optional[int]],
+                      events: int, error_bound: int = 0) -> UsageRanking:
+        """Cruza conteos de uso con los atajos (sin grupos de which-key ni disparadores de lazy.nvim)."""
+        table_view = self.as_table(keybindings)
+        records = table_view.columns.records
+        rows = [row for row in table_view.rows
+                if records[row].context != 'which-key-group' and records[row].action != LAZY_TRIGGER_ACTION]
+        return rank_usage(table_view.view(rows), count, events, error_bound, modes=self.mode_mapping.values())
+
+    def essential_score(self, kb: Keybinding) -> int:
+        """Puntuación heurística de un atajo cuando no hay datos de uso."""
+        text = f"{kb.description} {kb.action}".lower()
+        score = 0
+        # Bonus por teclas comunes
+        key = kb.key.lower()
+        if any(common in key for common in ESSENTIAL_COMMON_KEYS):
+            score += 3
+        # Bonus por navegación/búsqueda/edición básicas
+        score += 2 * sum(1 for keyword in ESSENTIAL_KEYWORDS if keyword in text)
+        # Penalizar acciones de plugin menos generales
+        if 'plugin' in text or 'lazygit' in text:
+            score -= 2
+        # Preferir modos Normal/Visual
+        if 'Normal' in kb.modes:
+            score += 1
+        if 'Visual' in kb.modes:
+            score += 1
+        return score
+
     def generate_essentials_section(self, keybindings: List[Keybinding]) -> str:
-        """Selecciona y muestra un conjunto de atajos esenciales a modo de cheat sheet."""
-        # Puntuación heurística
-        scores: List[Tuple[int, Keybinding]] = []
-        for kb in keybindings:
-            text = f"{kb.description} {kb.action}".lower()
-            score = 0
-            # Bonus por teclas comunes
-            common_keys = ['jj', 'escape', 'j', 'k', 'n', 'N', 'p', 'x', 'X', '<C-d>', '<C-u>', 'gl', 'gh']
-            if any(ck.lower() in kb.key.lower() for ck in common_keys):
-                score += 3
-            # Bonus por navegación/búsqueda/edición básicas
-            for kw in ['buscar', 'siguiente', 'anterior', 'unir', 'pegar', 'eliminar', 'indent', 'escape']:
-                if kw in text:
-                    score += 2
-            # Penalizar acciones de plugin menos generales
-            if 'plugin' in text or 'lazygit' in text:
-                score -= 2
-            # Preferir modos Normal/Visual
-            if 'Normal' in kb.modes:
-                score += 1
-            if 'Visual' in kb.modes:
-                score += 1
-            scores.append((score, kb))
-
-        # Top únicos por tecla+acción
-        scores.sort(key=lambda t: (-t[0], t[1].key.lower()))
+        """Selecciona y muestra un conjunto de atajos esenciales a modo de cheat sheet.
+
+        Con datos de uso (self.usage) son los más usados; sin ellos, los de mayor
+        puntuación heurística (essential_score).
+        """
+        table_view = self.as_table(keybindings)
+        records = table_view.columns.records
+        if self.usage is not None:
+            ranking = self.usage_ranking(table_view, self.usage.count, self.usage.events)
+            candidates = [(records[usage.row], f" ({usage.total} usos)") for usage in ranking.essentials(len(ranking.bindings))]
+        else:
+            # Top por puntuación (rank: tecla en minúsculas, luego aparición)
+            rank = table_view.columns.rank
+            scored = sorted(table_view.rows, key=lambda row: (-self.essential_score(records[row]), rank[row]))
+            candidates = [(records[row], "") for row in scored]
+
+        # Únicos por tecla+acción
         seen = set()
-        selected: List[Keybinding] = []
-        for _, kb in scores:
-            key = kb.key
+        lines = []
+        for kb, suffix in candidates:
             action_display = kb.description if kb.description else kb.action
             if not action_display:
                 continue
-            sig = (key, action_display)
+            sig = (kb.key, action_display)
             if sig in seen:
                 continue
             seen.add(sig)
-            selected.append(kb)
-            if len(selected) >= 20:
-                break
-
-        # Render como lista simple
-        lines = []
-        for kb in selected:
-            rel_path = os.path.relpath(kb.file_path, self.repo_root)
-            action_display = kb.description if kb.description else kb.action
             chips = self.modes_to_chips(kb.modes)
-            lines.append(f"- {self.format_key_combination(kb.key)} {chips} — {action_display}")
+            lines.append(f"- {self.format_key_combination(kb.key)} {chips} — {action_display}{suffix}")
+            if len(lines) >= ESSENTIALS_LIMIT:
+                break
         return "\n".join(lines) if lines else "(Sin elementos esenciales detectados)"
 
+    def generate_usage_section(self, keybindings: List[Keybinding]) -> str:
+        """Esenciales por uso real, muy usados sin descripción y atajos sin uso registrado."""
+        usage = self.usage
+        ranking = self.usage_ranking(keybindings, usage.count, usage.events, usage.error_bound)
+        doc = f"{usage.events} usos de atajos registrados"
+        if usage.error_bound:
+            doc += f" (conteos estimados: sobreestiman como mucho {usage.error_bound})"
+        doc += ".\n\n### Esenciales\n\n"
+        doc += self.generate_essentials_section(keybindings) + "\n\n"
+
+        def listing(usages) -> str:
+            if not usages:
+                return "(Ninguno)\n\n"
+            lines = []
+            for item in usages:
+                key_fmt = self.format_key_combination(item.key)
+                uses = f" ({item.total} usos)" if item.total else ""
+                lines.append(f"- [{item.rel_path}:L{item.line}]({item.rel_path}#L{item.line}) — {key_fmt} "
+                             f"{self.modes_to_chips(list(item.counts))} — {item.action}{uses}")
+            return "\n".join(lines) + "\n\n"
+
+        doc += "### Muy usados sin descripción\n\n" + listing(ranking.hot_undocumented())
+        doc += "### Sin uso registrado\n\n" + listing(ranking.never_used())
+        return doc.rstrip("\n") + "\n"
+
     def generate_leader_tree_section(self, keybindings: List[Keybinding]) -> str:
         """Construye un árbol con prefijo <leader> y <localleader>."""
         # Extraer solo leader keys
@@ -1664,25 +2386,834 @@ class KeybindingExtractor:
             print(f"Error guardando documentación: {e}")
 
 
-def main():
+# =====================================
+#  Motor AST: reglas sobre un único walk
+# =====================================
+class KeymapRule:
+    """Regla de extracción sobre el AST de Lua.
+
+    Cada regla declara los tipos de nodo que le interesan (`node_types`) y emite
+    Keybindings con un rango (`rank`) que reproduce el orden de los patrones del
+    motor regex, de modo que ambos motores generen las filas en el mismo orden.
+    """
+    node_types: Tuple[type, ...] = ()
+    rank = 0
+
+    def __init__(self, extractor: 'KeybindingExtractor', file_path: str, content: str,
+                 emitted: List[Tuple[int, int, Keybinding]]):
+        self.extractor = extractor
+        self.file_path = file_path
+        self.content = content
+        self.emitted = emitted
+
+    @property
+    def lines(self) -> List[str]:
+        return self.extractor.text_index(self.content).lines
+
+    @property
+    def symbols(self) -> SymbolIndex:
+        return self.extractor.symbols
+
+    def emit(self, node: lua_ast.Node, kb: Keybinding, rank: Optional[int] = None):
+        self.extractor.tick()
+        self.emitted.append((self.rank if rank is None else rank, node.start, kb))
+
+    def comment_description(self, line: int) -> str:
+        return self.extractor.extract_description_from_comment(self.content, line - 1)
+
+    def visit(self, node: lua_ast.Node, ancestors: List[lua_ast.Node]):
+        raise NotImplementedError
+
+
+class MapCallRule(KeymapRule):
+    """Llamadas map(...), vim.keymap.set(...) y vim.api.nvim_set_keymap(...)."""
+    node_types = (lua_ast.Call,)
+
+    # nombre de función -> rango base (modo simple; +1 para tabla de modos)
+    functions = {
+        'map': 0,
+        'vim.api.nvim_set_keymap': 0,
+        'vim.keymap.set': 2,
+    }
+
+    def describe_rhs(self, rhs: Ref) -> str:
+        value = self.symbols.string(*rhs)
+        if value is not None:
+            return value
+        rhs_file, node, env = rhs
+        if isinstance(node, lua_ast.Name) and env and node.id in env:
+            # Parámetro de un alias: se muestra el argumento de la llamada original
+            rhs_file, node = env[node.id]
+        if isinstance(node, lua_ast.Function):
+            return "Función Lua"
+        return lua_ast.node_source(self.symbols.files[rhs_file].content, node)
+
+    def visit(self, node: lua_ast.Call, ancestors: List[lua_ast.Node]):
+        name = lua_ast.dotted_name(node.func)
+        if name in self.functions:
+            base_rank = self.functions[name]
+            args: List[Ref] = [(self.file_path, arg, None) for arg in node.args]
+        else:
+            # Alias de vim.keymap.set resueltos con la tabla de símbolos (se ordenan como map)
+            resolved = self.symbols.keymap_call(self.file_path, node)
+            if resolved is None:
+                return
+            base_rank = self.functions['map']
+            args = resolved[1]
+        if len(args) < 3:
+            return
+        mode_file, mode_node, mode_env = self.symbols.resolve(*args[0])
+        if isinstance(mode_node, lua_ast.Table):
+            mode_values = [self.symbols.string(mode_file, v, mode_env) for v in lua_ast.positional_values(mode_node)]
+            if not mode_values or None in mode_values:
+                return
+            modes = self.extractor.normalize_modes(','.join(mode_values))
+            rank = base_rank + 1
+        else:
+            mode_value = self.symbols.string(*args[0])
+            if not mode_value:
+                return
+            modes = self.extractor.normalize_modes(mode_value)
+            rank = base_rank
+        key = self.symbols.string(*args[1])
+        if not key:
+            return
+
+        description = ""
+        if len(args) > 3:
+            opts_file, options, opts_env = self.symbols.table(*args[3])
+            description = self.symbols.string(opts_file, lua_ast.table_field(options, 'desc'), opts_env) or ""
+        description = description.strip()
+        if not description:
+            description = self.comment_description(node.line)
+
+        action = self.extractor.process_action(self.describe_rhs(args[2]), description)
+        self.emit(node, Keybinding(
+            file_path=self.file_path,
+            modes=modes,
+            key=key,
+            action=action,
+            description=description,
+            line_number=node.line,
+        ), rank)
+
+
+class CustomKeysRule(KeymapRule):
+    """Campos ['<tecla>'] = function(...) ... end (custom_keys de lazy.nvim)."""
+    node_types = (lua_ast.Field,)
+    rank = 4
+
+    def visit(self, node: lua_ast.Field, ancestors: List[lua_ast.Node]):
+        if node.kind != 'keyed' or not isinstance(node.key, lua_ast.String):
+            return
+        if not isinstance(node.value, lua_ast.Function):
+            return
+        description = self.extractor.describe_custom_key(self.lines, node.line - 1)
+        self.emit(node, Keybinding(
+            file_path=self.file_path,
+            modes=["Custom"],
+            key=node.key.value,
+            action=self.extractor.process_action("Función personalizada", description),
+            description=description,
+            context="Clave personalizada de plugin",
+            line_number=node.line,
+        ))
+
+
+class AssignmentKeyRule(KeymapRule):
+    """Campos o variables `key`/`*_key` con valor string (p.ej. toggle_style_key = '<leader>ot')."""
+    node_types = (lua_ast.Field, lua_ast.Assign, lua_ast.Local)
+    rank = 5
+
+    @staticmethod
+    def is_key_name(name: str) -> bool:
+        return name == 'key' or name.endswith('_key')
+
+    def visit(self, node: lua_ast.Node, ancestors: List[lua_ast.Node]):
+        pairs: List[Tuple[str, Optional[lua_ast.Node]]] = []
+        if isinstance(node, lua_ast.Field):
+            if node.kind == 'named':
+                pairs.append((node.name, node.value))
+        elif isinstance(node, lua_ast.Local):
+            pairs.extend(zip(node.names, node.values))
+        else:
+            for target, value in zip(node.targets, node.values):
+                if isinstance(target, lua_ast.Name):
+                    pairs.append((target.id, value))
+                elif isinstance(target, lua_ast.Index) and target.dotted:
+                    pairs.append((target.key.value, value))
+        for name, value in pairs:
+            key = lua_ast.string_value(value) if isinstance(value, lua_ast.String) else None
+            if not key or not self.is_key_name(name):
+                continue
+            description = self.comment_description(node.line)
+            key, context_note = self.extractor.resolve_assignment_key(self.file_path, key)
+            self.emit(node, Keybinding(
+                file_path=self.file_path,
+                modes=["Normal"],
+                key=key,
+                action=self.extractor.process_action("Atajo de configuración del plugin", description),
+                description=description,
+                context=context_note,
+                line_number=node.line,
+            ))
+
+
+class BracketTableRule(KeymapRule):
+    """Entradas estilo Snacks: ['nombre'] = { '<tecla>', ..., desc = '...', mode = ... }."""
+    node_types = (lua_ast.Field,)
+    rank = 6
+
+    def visit(self, node: lua_ast.Field, ancestors: List[lua_ast.Node]):
+        if node.kind != 'keyed' or not isinstance(node.key, lua_ast.String):
+            return
+        table = node.value
+        if not isinstance(table, lua_ast.Table):
+            return
+        index_key = node.key.value
+        key_combo = None
+        # Spectre y similares declaran la tecla en un campo `map = 'H'`
+        candidates = [lua_ast.table_field(table, 'map')] + lua_ast.positional_values(table)
+        for value in candidates:
+            literal = lua_ast.string_value(value)
+            if literal is None:
+                continue
+            literal = literal.strip()
+            if (
+                literal.startswith('<') or
+                '<leader>' in literal.lower() or '<localleader>' in literal.lower() or
+                re.fullmatch(r"[A-Za-z0-9]{1,3}", literal) is not None
+            ):
+                key_combo = literal
+                break
+        if not key_combo:
+            key_combo = index_key
+
+        modes = self.extractor.modes_from_node(lua_ast.table_field(table, 'mode'))
+        description = self.first_desc(table)
+        if not description:
+            description = self.comment_description(node.line)
+
+        plausible_key = key_combo.startswith('<') or len(key_combo) <= 5
+        if not description and not plausible_key:
+            return
+        self.emit(node, Keybinding(
+            file_path=self.file_path,
+            modes=modes,
+            key=key_combo,
+            action=description or "Acción de plugin",
+            description=description,
+            context="Snacks keys",
+            line_number=node.line,
+        ))
+
+
+    @staticmethod
+    def first_desc(table: lua_ast.Table) -> str:
+        """Primer `desc = '...'` de la tabla en orden de código, también en tablas anidadas (como los regex)."""
+        stack: List[lua_ast.Node] = [table]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, lua_ast.Field) and node.kind == 'named' and node.name == 'desc':
+                value = lua_ast.string_value(node.value)
+                if value and value.strip():
+                    return value.strip()
+            stack.extend(reversed(list(lua_ast.iter_children(node))))
+        return ""
+
+
+class KeysFieldRule(KeymapRule):
+    """Campos `keys = ...` estilo lazy.nvim: string, lista de strings o { lhs, rhs, desc =, mode = }."""
+    node_types = (lua_ast.Field,)
+    rank = 7
+
+    def visit(self, node: lua_ast.Field, ancestors: List[lua_ast.Node]):
+        if node.kind != 'named' or node.name != 'keys':
+            return
+        if self.extractor.is_spec_file(self.file_path):
+            # La lista de plugins la cubre extract_lazy_spec_keybindings, con el plugin como contexto
+            return
+        entries: List[lua_ast.Node] = []
+        if isinstance(node.value, lua_ast.String):
+            entries = [node.value]
+        elif isinstance(node.value, lua_ast.Table):
+            entries = lua_ast.positional_values(node.value)
+        for entry in entries:
+            modes = ["Normal"]
+            description = ""
+            rhs = ""
+            if isinstance(entry, lua_ast.Table):
+                values = lua_ast.positional_values(entry)
+                key = lua_ast.string_value(values[0]) if values else None
+                if len(values) > 1:
+                    rhs = lua_ast.string_value(values[1]) or ""
+                modes = self.extractor.modes_from_node(lua_ast.table_field(entry, 'mode'))
+                description = (lua_ast.string_value(lua_ast.table_field(entry, 'desc')) or "").strip()
+            else:
+                key = lua_ast.string_value(entry)
+            if not key:
+                continue
+            self.emit(entry, Keybinding(
+                file_path=self.file_path,
+                modes=modes,
+                key=key,
+                action=description or rhs or "Acción de plugin",
+                description=description,
+                context=LAZY_KEYS_CONTEXT,
+                line_number=entry.line,
+            ))
+
+
+class AstKeybindingExtractor(KeybindingExtractor):
+    """Extractor que sustituye los patrones regex por reglas sobre el AST de Lua.
+
+    Un único recorrido del árbol por archivo alimenta todas las reglas; los
+    extractores especializados (which-key, defaults de plugins) se conservan.
+    """
+
+    rule_classes: Tuple[type, ...] = (
+        MapCallRule, CustomKeysRule, AssignmentKeyRule, BracketTableRule, KeysFieldRule,
+    )
+
+    def __init__(self, repo_root: Optional[str] = None):
+        super().__init__(repo_root)
+        # Tabla de símbolos del repositorio (alias de keymaps, constantes, exports de módulos)
+        self.symbols = SymbolIndex(self.repo_root)
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        state['symbols'] = SymbolIndex(self.repo_root)
+        return state
+
+    def reset_caches(self):
+        super().reset_caches()
+        self.symbols = SymbolIndex(self.repo_root)
+
+    def cache_scope(self, file_hashes: List[Tuple[str, str]], extra_inputs: Optional[Dict[str, str]] = None) -> str:
+        # La tabla de símbolos resuelve alias entre archivos: cualquier cambio invalida toda la caché
+        return self.fingerprint_from_hashes(file_hashes, extra_inputs)
+
+    def graph_symbols(self) -> Optional[SymbolIndex]:
+        return SymbolIndex(self.repo_root)
+
+    def prepare_extraction(self, lua_files: List[str]):
+        """Parte de la tabla de símbolos del grafo de módulos e indexa sólo los archivos que no parseó.
+
+        El grafo indexa cada archivo alcanzado en el mismo recorrido que sus require,
+        así que cada archivo se parsea una vez y se recorre dos (símbolos y reglas).
+        Se usa una copia: file_symbols puede añadir contenido que no es el del disco.
+        """
+        if self.all_files:
+            self.symbols = SymbolIndex(self.repo_root)
+        else:
+            self.symbols = self.module_graph().symbols.copy()
+        self.symbols.add_paths([path for path in lua_files if path not in self.symbols.files])
+
+    def extract_all_keybindings(self) -> List[Keybinding]:
+        """Indexa todo el repositorio en una pasada y extrae cada archivo con su AST ya parseado."""
+        lua_files = self.find_lua_files()
+        self.prepare_extraction(lua_files)
+        all_keybindings = []
+        for file_path in lua_files:
+            symbols = self.symbols.files.get(file_path)
+            if symbols is not None:
+                all_keybindings.extend(self.extract_keybindings_from_content(file_path, symbols.content))
+        return self.dedupe_keybindings(all_keybindings)
+
+    def file_symbols(self, file_path: str, content: str):
+        """Símbolos del archivo: los del índice si el contenido coincide; si no, se parsea y se indexa."""
+        symbols = self.symbols.parsed(file_path, content)
+        if symbols is None:
+            tree, errors = lua_ast.parse_tolerant(content)
+            symbols = self.symbols.add_file(file_path, content, tree, errors)
+        return symbols
+
+    def extract_keybindings_from_mapped(self, file_path: str) -> List[Keybinding]:
+        # Las reglas necesitan el AST completo (y la tabla de símbolos guarda el texto): sin modo mmap
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        return self.extract_keybindings_from_content(file_path, content)
+
+    def lua_tree(self, file_path: str, content: str) -> lua_ast.Chunk:
+        # El AST ya está en la tabla de símbolos: no se vuelve a parsear
+        return self.file_symbols(file_path, content).tree
+
+    def extract_pattern_keybindings(self, file_path: str, content: str) -> List[Keybinding]:
+        symbols = self.file_symbols(file_path, content)
+        # El tokenizador y el parser son lineales; sólo se comprueba el plazo tras el parseo
+        self.tick()
+        errors = symbols.errors
+        if errors:
+            print(f"Aviso: {len(errors)} errores de sintaxis en {file_path}; primero: {errors[0]}")
+        emitted: List[Tuple[int, int, Keybinding]] = []
+        walker = lua_ast.LuaWalker()
+        for rule_cls in self.rule_classes:
+            walker.register_rule(rule_cls(self, file_path, content, emitted))
+        walker.walk(symbols.tree)
+        emitted.sort(key=lambda item: (item[0], item[1]))
+        keybindings = [kb for _rank, _offset, kb in emitted]
+        if errors:
+            keybindings.extend(self.recover_dropped_keybindings(file_path, content, keybindings))
+        return keybindings
+
+    def recover_dropped_keybindings(self, file_path: str, content: str,
+                                    keybindings: List[Keybinding]) -> List[Keybinding]:
+        """Registros de los regex que el AST no produjo (sentencias descartadas por errores de sintaxis).
+
+        La recuperación de parse_tolerant descarta sentencias o trunca el archivo (p.ej.
+        una string larga sin cerrar); los regex siguen viendo esas llamadas. Se añaden
+        los registros de los regex cuya (línea, tecla) no está ya, respetando las veces
+        que aparece cada una.
+        """
+        found = Counter((kb.line_number, kb.key) for kb in keybindings)
+        regex_keybindings = KeybindingExtractor.extract_pattern_keybindings(self, file_path, content)
+        regex_keybindings.extend(KeybindingExtractor.extract_snacks_style_keybindings(self, file_path, content))
+        recovered = []
+        for kb in regex_keybindings:
+            location = (kb.line_number, kb.key)
+            if found[location] > 0:
+                found[location] -= 1
+            else:
+                recovered.append(kb)
+        return recovered
+
+    def extract_snacks_style_keybindings(self, file_path: str, content: str) -> List[Keybinding]:
+        # Cubierto por BracketTableRule durante el recorrido del AST (o por
+        # recover_dropped_keybindings si hubo errores de sintaxis)
+        return []
+
+
+ENGINES = {
+    'regex': KeybindingExtractor,
+    'ast': AstKeybindingExtractor,
+}
+
+
+def parse_formats(value: str) -> List[str]:
+    """Valida la lista de formatos de --formats (sin duplicados, en el orden dado)."""
+    formats: List[str] = []
+    for name in (part.strip() for part in value.split(',')):
+        if name not in RENDERERS:
+            raise argparse.ArgumentTypeError(f"formato desconocido: {name!r} (disponibles: {', '.join(RENDERERS)})")
+        if name not in formats:
+            formats.append(name)
+    return formats
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    """Construye el parser de argumentos de línea de comandos."""
+    parser = argparse.ArgumentParser(
+        description="Extrae keybindings de archivos Lua y genera docs/keybindings.md."
+    )
+    parser.add_argument(
+        '--engine', choices=sorted(ENGINES), default='regex',
+        help="Motor de extracción: 'regex' (referencia) o 'ast' (parser de Lua con reglas por nodo). "
+             "Sólo 'ast' resuelve nombres por ámbito (alias de vim.keymap.set, tablas opts compartidas, "
+             "constantes y exports de módulos); 'regex' toma los argumentos literales",
+    )
+    parser.add_argument(
+        '--scan-plugins', action='store_true',
+        help="Escanea los plugins instalados por lazy.nvim para documentar sus atajos por defecto reales",
+    )
+    parser.add_argument(
+        '--plugin-root', default=None,
+        help="Directorio raíz de plugins de lazy.nvim (por defecto, el configurado en lua/plugins/lazy.lua)",
+    )
+    parser.add_argument(
+        '--cache-dir', default=None,
+        help="Directorio de caché (por defecto $XDG_CACHE_HOME/nvim-keybindings)",
+    )
+    parser.add_argument(
+        '--jobs', type=int, default=None,
+        help="Número de procesos para el escaneo en paralelo (por defecto, número de CPUs)",
+    )
+    parser.add_argument(
+        '--file-budget', type=float, default=DEFAULT_FILE_BUDGET, metavar='SEGUNDOS',
+        help="Presupuesto de extracción por archivo; al superarlo se usa un modo parcial (0 = sin plazo). "
+             "También es el plazo de parseo de cada archivo en el grafo de módulos",
+    )
+    parser.add_argument(
+        '--mmap-threshold', type=int, default=DEFAULT_MMAP_THRESHOLD, metavar='BYTES',
+        help="Archivos de este tamaño o más se escanean con mmap como bytes (0 = nunca; por defecto 4 MiB)",
+    )
+    parser.add_argument(
+        '--formats', type=parse_formats, default=['markdown'], metavar='FORMATOS',
+        help=f"Formatos separados por comas: {', '.join(RENDERERS)} (por defecto, markdown)",
+    )
+    parser.add_argument(
+        '--render-workers', type=int, default=0, metavar='N',
+        help="Procesos para renderizar las secciones por archivo (por defecto 0: en serie)",
+    )
+    parser.add_argument(
+        '--rev', default=None, metavar='REVISIÓN',
+        help="Documenta los archivos Lua de una revisión de git (leídos con git cat-file --batch)",
+    )
+    parser.add_argument(
+        '--async', dest='async_io', action='store_true',
+        help="Lee el árbol de trabajo con el pipeline asíncrono (lecturas solapadas con el parseo)",
+    )
+    parser.add_argument(
+        '--io-concurrency', type=int, default=DEFAULT_IO_CONCURRENCY, metavar='N',
+        help=f"Lecturas simultáneas del pipeline asíncrono (por defecto {DEFAULT_IO_CONCURRENCY})",
+    )
+    parser.add_argument(
+        '--queue-size', type=int, default=DEFAULT_QUEUE_SIZE, metavar='N',
+        help=f"Contenidos leídos en espera de parseo como máximo (por defecto {DEFAULT_QUEUE_SIZE})",
+    )
+    parser.add_argument(
+        '--check', action='store_true',
+        help="No escribe nada: sale con código 1 si alguna salida está desactualizada",
+    )
+    parser.add_argument(
+        '--force', action='store_true',
+        help="Regenera aunque la huella de las entradas coincida con la incrustada; con --check, compara "
+             "el contenido completo (detecta salidas editadas a mano)",
+    )
+    parser.add_argument(
+        '--all-files', action='store_true',
+        help="Documenta todos los .lua, también los módulos no alcanzables desde init.lua",
+    )
+    parser.add_argument(
+        '--fail-on-conflicts', action='store_true',
+        help="Para CI: sólo extrae (con caché por archivo) y analiza conflictos, sin renderizar; "
+             "sale con código 1 si hay conflictos que no están en la línea base",
+    )
+    parser.add_argument(
+        '--conflicts-baseline', default=DEFAULT_BASELINE, metavar='RUTA',
+        help=f"Línea base de conflictos conocidos, relativa a la raíz (por defecto {DEFAULT_BASELINE})",
+    )
+    parser.add_argument(
+        '--update-conflicts-baseline', action='store_true',
+        help="Con --fail-on-conflicts: reescribe la línea base con los conflictos actuales",
+    )
+    parser.add_argument(
+        '--usage', default=DEFAULT_USAGE_REPORT, metavar='RUTA',
+        help=f"Informe de `usage --json` para la sección \"Uso real\", relativo a la raíz; se usa si existe "
+             f"(por defecto {DEFAULT_USAGE_REPORT})",
+    )
+
+    subparsers = parser.add_subparsers(dest='command', metavar='COMANDO')
+    free = subparsers.add_parser(
+        'free-keys', help="Lista secuencias de teclas libres por modo, ordenadas por ergonomía",
+    )
+    free.add_argument('--mode', default='n', help="Modos separados por comas (n, v, i, ...; por defecto n)")
+    free.add_argument('--prefix', default='<leader>', help="Prefijo bajo el que buscar (por defecto <leader>)")
+    free.add_argument('--alphabet', default=DEFAULT_ALPHABET, help="Teclas candidatas (admite <C-x> y similares)")
+    free.add_argument('--depth', type=int, default=2, help="Teclas máximas tras el prefijo (por defecto 2)")
+    free.add_argument('--related', default='', help="Texto de atajos relacionados (prioriza su grupo y su inicial)")
+    free.add_argument('--limit', type=int, default=20, help="Candidatos a mostrar por modo")
+    lazy = subparsers.add_parser(
+        'lazy-report', help="Propone disparadores keys/cmd de lazy.nvim a partir de los atajos que usan cada plugin",
+    )
+    lazy.add_argument('--spec-file', default=DEFAULT_SPEC_FILE, help=f"Lista de plugins (por defecto {DEFAULT_SPEC_FILE})")
+    lazy.add_argument('--json', default=None, metavar='RUTA', help="Escribe también el informe en JSON")
+    startup = subparsers.add_parser(
+        'startuptime', help="Agrega logs de nvim --startuptime (percentiles) y los atribuye a archivos y plugins",
+    )
+    startup.add_argument('logs', nargs='+', metavar='LOG', help="Logs (texto o .gz) o directorios que los contienen")
+    startup.add_argument('--spec-file', default=DEFAULT_SPEC_FILE, help=f"Lista de plugins (por defecto {DEFAULT_SPEC_FILE})")
+    startup.add_argument('--json', default=None, metavar='RUTA', help="Escribe también el informe en JSON")
+    startup.add_argument('--limit', type=int, default=25, help="Filas por tabla del informe")
+    hot = subparsers.add_parser(
+        'hot-callbacks', help="Señala llamadas bloqueantes en autocmds y componentes de lualine frecuentes",
+    )
+    hot.add_argument('--min-severity', default='baja', choices=[name for name, _minimum in SEVERITY_LEVELS],
+                     help="Severidad mínima a mostrar (por defecto baja)")
+    hot.add_argument('--json', default=None, metavar='RUTA', help="Escribe también el informe en JSON")
+    options_lint = subparsers.add_parser(
+        'options-lint', help="Evalúa reglas de rendimiento sobre las opciones de Neovim (cruzadas con los atajos)",
+    )
+    options_lint.add_argument('--json', default=None, metavar='RUTA', help="Escribe también el informe en JSON")
+    usage = subparsers.add_parser(
+        'usage', help="Agrega logs de uso de atajos (memoria constante) y clasifica los atajos por uso real",
+    )
+    usage.add_argument('logs', nargs='+', metavar='LOG',
+                       help="Logs (texto o .gz), directorios que los contienen o sketches *.cms.json guardados")
+    usage.add_argument('--json', default=None, metavar='RUTA',
+                       help=f"Escribe también el informe en JSON (en {DEFAULT_USAGE_REPORT} alimenta la documentación)")
+    usage.add_argument('--sketch', default=None, metavar='RUTA',
+                       help="Guarda el sketch agregado (*.cms.json) para combinarlo con otros después")
+    usage.add_argument('--limit', type=int, default=ESSENTIALS_LIMIT, help="Filas por tabla del informe")
+    serve = subparsers.add_parser(
+        'serve', help="Daemon de consultas sobre un socket Unix (cliente: scripts/keybindings_daemon.py)",
+    )
+    serve.add_argument('--socket', default=default_socket_path(), help="Ruta del socket (por defecto en $XDG_RUNTIME_DIR)")
+    serve.add_argument('--poll-interval', type=float, default=DEFAULT_POLL_INTERVAL, metavar='SEGUNDOS',
+                       help=f"Cada cuánto se comprueban los archivos Lua (por defecto {DEFAULT_POLL_INTERVAL})")
+    return parser
+
+
+def run_free_keys(extractor: 'KeybindingExtractor', args: argparse.Namespace) -> int:
+    """Subcomando free-keys: extrae los keybindings y muestra las secuencias libres."""
+    keybindings = extractor.extract_all_keybindings()
+    finder = FreeKeyFinder(keybindings, extractor.canonicalizer)
+    started = time.perf_counter()
+    results = {
+        mode: finder.find(mode, prefix=args.prefix, alphabet=args.alphabet, depth=args.depth, related=args.related)
+        for mode in extractor.normalize_modes(args.mode)
+    }
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    print(format_report(results, args.prefix, args.limit), end='')
+    print(f"({len(keybindings)} keybindings; búsqueda en {elapsed_ms:.1f} ms)")
+    return 0
+
+
+def run_lazy_report(extractor: 'KeybindingExtractor', args: argparse.Namespace) -> int:
+    """Subcomando lazy-report: enlaza atajos con specs de lazy.nvim y propone carga diferida."""
+    keybindings = extractor.extract_all_keybindings()
+    index = PluginSpecIndex.from_repo(extractor.repo_root, args.spec_file)
+    analyzer = LazyLoadAnalyzer(index, keybindings, extractor.canonicalizer, extractor.repo_root,
+                                lazy_by_default=default_lazy(extractor.repo_root))
+    reports = analyzer.analyze()
+    print(format_lazy_report(reports), end='')
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report_json(reports), f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"Informe JSON guardado en: {args.json}")
+    return 0
+
+
+def run_startuptime(extractor: 'KeybindingExtractor', args: argparse.Namespace) -> int:
+    """Subcomando startuptime: agrega los logs y muestra los módulos y plugins más caros."""
+    index = PluginSpecIndex.from_repo(extractor.repo_root, args.spec_file)
+    generated = [path for d in GENERATED_DIRS for path in glob.glob(os.path.join(extractor.repo_root, d, '*.lua'))]
+    aggregator = StartupTimeAggregator(extractor.repo_root, index, extractor.all_lua_files() + generated)
+    aggregator.feed_files(args.logs)
+    if not aggregator.runs:
+        print("Aviso: ningún log contiene una ejecución completa (--- NVIM STARTING --- ... --- NVIM STARTED ---)")
+        return 1
+    print(format_startup_report(aggregator, args.limit), end='')
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(startup_json(aggregator), f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"Informe JSON guardado en: {args.json}")
+    return 0
+
+
+def run_hot_callbacks(extractor: 'KeybindingExtractor', args: argparse.Namespace) -> int:
+    """Subcomando hot-callbacks: audita los callbacks de autocmds y lualine."""
+    auditor = HotCallbackAuditor.from_files(extractor.repo_root, extractor.find_lua_files())
+    auditor.index()
+    minimum = dict(SEVERITY_LEVELS)[args.min_severity]
+    findings = [finding for finding in auditor.audit() if finding.score >= minimum]
+    print(format_hot_report(auditor, findings), end='')
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(hot_json(auditor, findings), f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"Informe JSON guardado en: {args.json}")
+    return 0
+
+
+def run_options_lint(extractor: 'KeybindingExtractor', args: argparse.Namespace) -> int:
+    """Subcomando options-lint: modelo de opciones y reglas de rendimiento."""
+    model = OptionModel.from_files(extractor.repo_root, extractor.find_lua_files())
+    # Los keymaps sólo se extraen si alguna regla que se cumple necesita un hecho derivado de ellos
+    engine = OptionRuleEngine(model, keybindings_provider=lambda: (extractor.extract_all_keybindings(),
+                                                                   extractor.canonicalizer))
+    findings = engine.evaluate()
+    print(format_options_report(model, findings), end='')
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(options_json(model, findings), f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"Informe JSON guardado en: {args.json}")
+    return 0
+
+
+def run_usage(extractor: 'KeybindingExtractor', args: argparse.Namespace) -> int:
+    """Subcomando usage: agrega los logs de uso y los cruza con los atajos extraídos."""
+    aggregator = UsageAggregator(extractor.canonicalizer.canonical, extractor.mode_mapping)
+    aggregator.feed_files(args.logs)
+    if not aggregator.events:
+        print("Aviso: los logs no contienen ningún evento de uso válido (ts<TAB>modo<TAB>lhs o JSON con mode y lhs)")
+        return 1
+    if args.sketch:
+        aggregator.save_sketch(args.sketch)
+        print(f"Sketch guardado en: {args.sketch}")
+    keybindings = extractor.extract_all_keybindings()
+    ranking = extractor.usage_ranking(keybindings, aggregator.count, aggregator.events, aggregator.error_bound)
+    print(format_usage_report(aggregator, ranking, args.limit), end='')
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(usage_json(aggregator, ranking, args.limit), f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"Informe JSON guardado en: {args.json}")
+    return 0
+
+
+def fingerprint_inputs(extractor: 'KeybindingExtractor', args: argparse.Namespace) -> Dict[str, str]:
+    """Entradas de la huella además de los archivos Lua: motor y, si se escanean, los plugins."""
+    inputs = {'engine': args.engine}
+    if args.all_files:
+        inputs['all_files'] = "1"
+    if extractor.usage is not None:
+        with open(os.path.join(extractor.repo_root, args.usage), 'rb') as f:
+            inputs['usage'] = hashlib.sha256(f.read()).hexdigest()
+    if args.scan_plugins or args.plugin_root:
+        default_root, lockfile = resolve_lazy_paths(extractor.repo_root)
+        inputs['plugin_root'] = args.plugin_root or default_root
+        try:
+            with open(lockfile, 'rb') as f:
+                inputs['lockfile'] = hashlib.sha256(f.read()).hexdigest()
+        except OSError:
+            inputs['lockfile'] = "missing"
+    return inputs
+
+
+def run_conflict_gate(extractor: 'KeybindingExtractor', args: argparse.Namespace) -> int:
+    """--fail-on-conflicts: extracción con caché y análisis de conflictos, salida JSON Lines."""
+    started = time.perf_counter()
+    if args.scan_plugins or args.plugin_root:
+        extractor.load_plugin_keymaps(args.plugin_root, cache_dir=args.cache_dir, jobs=args.jobs)
+    cache = ExtractionCache(args.cache_dir, f"extraction-{args.engine}.json")
+    keybindings = extractor.extract_all_keybindings_cached(cache, fingerprint_inputs(extractor, args))
+    table_view, found = extractor.find_conflicts(keybindings)
+    columns = table_view.columns
+    conflicts = [
+        Conflict(mode, columns.key[row], columns.canonical[row], actions)
+        for row, modes in found for mode, actions in modes.items()
+    ]
+
+    baseline_path = os.path.join(extractor.repo_root, args.conflicts_baseline)
+    if args.update_conflicts_baseline:
+        save_baseline(baseline_path, conflicts)
+        print(f"Línea base guardada en: {baseline_path} ({len(conflicts)} conflictos)")
+        return 0
+    baseline = load_baseline(baseline_path)
+    if baseline is None:
+        print(f"Aviso: no existe la línea base {args.conflicts_baseline}; todos los conflictos cuentan como nuevos")
+        baseline = set()
+    result = evaluate_conflicts(conflicts, baseline)
+    summary = {
+        'files': len(cache.seen),
+        'cached': cache.hits,
+        'ms': round((time.perf_counter() - started) * 1000, 1),
+    }
+    sys.stdout.write(format_jsonl(result, summary))
+    return 1 if result.failed else 0
+
+
+def check_outputs(renderers: List[Renderer], keybindings: List[Keybinding], fingerprint: str) -> int:
+    """Compara cada salida regenerada con la existente; 1 si alguna está desactualizada.
+
+    Si el contenido difiere pero la huella incrustada coincide con la actual, las
+    entradas no cambiaron: la salida se editó a mano o cambió el formato sin subir
+    SCRIPT_VERSION, y se informa como deriva del contenido.
+    """
+    stale = []
+    for renderer in renderers:
+        rel_path = os.path.relpath(renderer.output_path, renderer.extractor.repo_root)
+        fingerprint_changed = renderer.read_fingerprint() != fingerprint
+        diff = renderer.diff(keybindings, fingerprint)
+        if diff:
+            sys.stdout.writelines(diff)
+            stale.append(rel_path)
+            if not fingerprint_changed:
+                print(f"❌ {rel_path}: el contenido difiere aunque la huella de entradas no cambió "
+                      f"(¿editado a mano o formato cambiado sin subir SCRIPT_VERSION?)")
+        elif fingerprint_changed:
+            print(f"✅ {rel_path} está al día (sólo cambió la huella; regenera para actualizarla)")
+        else:
+            print(f"✅ {rel_path} está al día")
+    if stale:
+        print(f"❌ Desactualizado: {', '.join(stale)}. Ejecuta scripts/update_keybindings.py")
+        return 1
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
     """Función principal del script."""
-    print("🔍 Extrayendo keybindings de archivos Lua...")
-    
+    args = build_arg_parser().parse_args(argv)
+
     # Inicializar extractor
-    extractor = KeybindingExtractor()
+    extractor = ENGINES[args.engine]()
+    extractor.file_budget = args.file_budget
+    extractor.render_workers = args.render_workers
+    extractor.mmap_threshold = args.mmap_threshold
+    extractor.all_files = args.all_files
+
+    if args.command == 'free-keys':
+        if args.scan_plugins or args.plugin_root:
+            extractor.load_plugin_keymaps(args.plugin_root, cache_dir=args.cache_dir, jobs=args.jobs)
+        return run_free_keys(extractor, args)
+
+    if args.command == 'lazy-report':
+        return run_lazy_report(extractor, args)
+
+    if args.command == 'startuptime':
+        return run_startuptime(extractor, args)
+
+    if args.command == 'hot-callbacks':
+        return run_hot_callbacks(extractor, args)
+
+    if args.command == 'options-lint':
+        return run_options_lint(extractor, args)
+
+    if args.command == 'usage':
+        return run_usage(extractor, args)
+
+    if args.command == 'serve':
+        if args.scan_plugins or args.plugin_root:
+            extractor.load_plugin_keymaps(args.plugin_root, cache_dir=args.cache_dir, jobs=args.jobs)
+        return KeybindingDaemon(extractor, poll_interval=args.poll_interval).serve(args.socket)
+
+    if args.fail_on_conflicts:
+        return run_conflict_gate(extractor, args)
+
+    extractor.usage = load_usage_report(os.path.join(extractor.repo_root, args.usage))
+    renderers = [RENDERERS[name](extractor) for name in args.formats]
+    inputs = fingerprint_inputs(extractor, args)
+
+    # Atajo: si la huella de las entradas coincide con la incrustada en cada salida, no hay nada que hacer
+    # (con --rev la huella depende de los blobs de la revisión y se calcula al leerlos)
+    if args.rev is None:
+        fingerprint = extractor.input_fingerprint(inputs)
+        if not args.force and all(renderer.read_fingerprint() == fingerprint for renderer in renderers):
+            print(f"✅ Documentación al día (huella de entradas sin cambios): {', '.join(args.formats)}")
+            return 0
+
+    print("🔍 Extrayendo keybindings de archivos Lua...")
+    if not args.all_files and args.rev is None:
+        print(format_unreachable(extractor.module_graph()), end='')
+
+    # Atajos por defecto reales de los plugins instalados (opcional)
+    if args.scan_plugins or args.plugin_root:
+        extractor.load_plugin_keymaps(args.plugin_root, cache_dir=args.cache_dir, jobs=args.jobs)
     
     # Extraer keybindings
-    keybindings = extractor.extract_all_keybindings()
+    if args.rev is not None or args.async_io:
+        pipeline = ExtractionPipeline(extractor, jobs=args.jobs, io_concurrency=args.io_concurrency,
+                                      queue_size=args.queue_size)
+        try:
+            keybindings = pipeline.run(args.rev)
+            if pipeline.graph is not None:
+                print(format_unreachable(pipeline.graph), end='')
+            if args.rev is not None:
+                inputs['rev'] = asyncio.run(pipeline.resolve_revision(args.rev))
+                fingerprint = extractor.fingerprint_from_hashes(pipeline.ordered_hashes(), inputs)
+        except GitSourceError as e:
+            print(f"❌ No se pudo leer la revisión {args.rev}: {e}")
+            return 1
+    else:
+        keybindings = extractor.extract_all_keybindings()
     print(f"✅ Encontrados {len(keybindings)} keybindings")
+    # Columnas e índices compartidos por todos los renderizadores
+    keybindings = extractor.as_table(keybindings)
     
-    # Generar documentación
-    documentation = extractor.generate_documentation(keybindings)
+    if args.check:
+        return check_outputs(renderers, keybindings, fingerprint)
     
-    # Guardar documentación
-    extractor.save_documentation(documentation)
+    # Generar y guardar todos los formatos en paralelo a partir de la misma extracción
+    for renderer, (_name, output_path) in zip(renderers, write_outputs(renderers, keybindings, fingerprint)):
+        summary = renderer.write_summary()
+        print(f"Documentación guardada en: {output_path}" + (f" ({summary})" if summary else ""))
     
     print("🎉 Documentación de keybindings actualizada exitosamente!")
+    return 0
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Grafo de tablas which-key construido en un único recorrido del AST.
+
+which-key.lua declara tablas con nombre (`local normal_mappings = { mode = 'n', ... }`),
+las amplía con `table.insert(normal_mappings, { ... })` (a veces dentro de bucles
+`for i = 1, 9 do`) y las registra con `which_key.add(normal_mappings)`.
+WhichKeyTableGraph recorre el árbol una sola vez y registra:
+
+- las tablas con nombre, en orden de definición;
+- las tablas (con nombre o en línea) pasadas a which_key.add;
+- las entradas añadidas con table.insert, junto con los bucles `for` numéricos
+  que las rodean.
+
+Después evalúa cada entrada: las expresiones constantes (literales, `..`,
+string.format con %d/%s/%i, tostring y aritmética simple) se calculan con las
+variables de los bucles, de modo que cada iteración produce un atajo real
+(<leader>f1 ... <leader>f9). El coste es lineal en el tamaño del archivo más el
+número de entradas generadas (acotado por MAX_LOOP_ITERATIONS por inserción).
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+import lua_ast
+
+
+# Iteraciones máximas evaluadas por cada table.insert (producto de los bucles que lo rodean)
+MAX_LOOP_ITERATIONS = 1000
+
+Value = Union[str, int, float]
+_FORMAT_RE = re.compile(r"%([-0-9.]*)([dis%])")
+
+
+@dataclass
+class WhichKeyEntry:
+    """Entrada { '<tecla>', rhs, desc = ..., group = ..., mode = ... } ya evaluada."""
+    table: str
+    key: str
+    rhs: Optional[str]
+    desc: Optional[str]
+    group: Optional[str]
+    modes: List[str]
+    line: int
+    # Variables de los bucles con las que se generó (vacío si es una entrada literal)
+    loop_env: Dict[str, Value] = field(default_factory=dict)
+
+
+def lua_tostring(value: Value) -> str:
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def lua_format(fmt: str, args: List[Value]) -> Optional[str]:
+    """string.format con %d, %i, %s y %%; None si usa otra directiva o faltan argumentos."""
+    out: List[str] = []
+    pos = 0
+    arg_index = 0
+    for match in _FORMAT_RE.finditer(fmt):
+        out.append(fmt[pos:match.start()])
+        pos = match.end()
+        flags, conv = match.groups()
+        if conv == '%':
+            out.append('%')
+            continue
+        if arg_index >= len(args):
+            return None
+        value = args[arg_index]
+        arg_index += 1
+        if conv in 'di':
+            if not isinstance(value, (int, float)):
+                return None
+            out.append(('%' + flags + 'd') % int(value))
+        else:
+            out.append(('%' + flags + 's') % lua_tostring(value))
+    if '%' in fmt[pos:]:
+        return None
+    out.append(fmt[pos:])
+    return ''.join(out)
+
+
+def evaluate(node: Optional[lua_ast.Node], env: Dict[str, Value]) -> Optional[Value]:
+    """Valor constante de una expresión con las variables de bucle de `env`; None si no es constante."""
+    if isinstance(node, lua_ast.String):
+        return node.value
+    if isinstance(node, lua_ast.Number):
+        try:
+            return int(node.raw, 0)
+        except ValueError:
+            try:
+                return float(node.raw)
+            except ValueError:
+                return None
+    if isinstance(node, lua_ast.Name):
+        return env.get(node.id)
+    if isinstance(node, lua_ast.Paren):
+        return evaluate(node.expr, env)
+    if isinstance(node, lua_ast.UnOp) and node.op == '-':
+        operand = evaluate(node.operand, env)
+        return -operand if isinstance(operand, (int, float)) else None
+    if isinstance(node, lua_ast.BinOp):
+        left = evaluate(node.left, env)
+        right = evaluate(node.right, env) if left is not None else None
+        if right is None:
+            return None
+        if node.op == '..':
+            return lua_tostring(left) + lua_tostring(right)
+        if isinstance(left, (int, float)) and isinstance(right, (int, float)):
+            if node.op == '+':
+                return left + right
+            if node.op == '-':
+                return left - right
+            if node.op == '*':
+                return left * right
+        return None
+    if isinstance(node, lua_ast.Call):
+        name = lua_ast.dotted_name(node.func)
+        args = [evaluate(arg, env) for arg in node.args]
+        if None in args:
+            return None
+        if name == 'string.format' and args and isinstance(args[0], str):
+            return lua_format(args[0], args[1:])
+        if name == 'tostring' and len(args) == 1:
+            return lua_tostring(args[0])
+    return None
+
+
+def _mode_strings(node: Optional[lua_ast.Node], env: Dict[str, Value]) -> List[str]:
+    """Modos crudos ('n', 'v'...) de un campo mode = 'n' | { 'n', 'v' }."""
+    if isinstance(node, lua_ast.Table):
+        values = [evaluate(v, env) for v in lua_ast.positional_values(node)]
+        return [v for v in values if isinstance(v, str)]
+    value = evaluate(node, env)
+    return [value] if isinstance(value, str) else []
+
+
+class WhichKeyTableGraph:
+    """Tablas de which-key, sus registros con add y sus inserciones, en un solo recorrido."""
+
+    node_types = (lua_ast.Local, lua_ast.Assign, lua_ast.Call)
+
+    def __init__(self, tree: lua_ast.Chunk):
+        # nombre -> constructor de la tabla (en orden de definición)
+        self.tables: Dict[str, lua_ast.Table] = {}
+        # tablas registradas con which_key.add: nombre o constructor en línea
+        self.added: List[Union[str, lua_ast.Table]] = []
+        # (nombre de la tabla, entrada insertada, bucles numéricos que la rodean) en orden de aparición
+        self.inserts: List[Tuple[str, lua_ast.Node, List[lua_ast.NumericFor]]] = []
+        # nombres locales ligados a require('which-key')
+        self.module_names = {'which_key', 'wk'}
+        walker = lua_ast.LuaWalker()
+        walker.register_rule(self)
+        walker.walk(tree)
+
+    @staticmethod
+    def _is_which_key_require(node: Optional[lua_ast.Node]) -> bool:
+        return (isinstance(node, lua_ast.Call) and lua_ast.dotted_name(node.func) == 'require'
+                and len(node.args) == 1 and lua_ast.string_value(node.args[0]) == 'which-key')
+
+    def visit(self, node: lua_ast.Node, ancestors: List[lua_ast.Node]):
+        if isinstance(node, (lua_ast.Local, lua_ast.Assign)):
+            names = node.names if isinstance(node, lua_ast.Local) else [
+                target.id if isinstance(target, lua_ast.Name) else None for target in node.targets
+            ]
+            for name, value in zip(names, node.values):
+                if name is None:
+                    continue
+                if isinstance(value, lua_ast.Table):
+                    self.tables[name] = value
+                elif self._is_which_key_require(value):
+                    self.module_names.add(name)
+            return
+        func = node.func
+        name = lua_ast.dotted_name(func)
+        if name == 'table.insert' and len(node.args) >= 2 and isinstance(node.args[0], lua_ast.Name):
+            loops = [a for a in ancestors if isinstance(a, lua_ast.NumericFor)]
+            self.inserts.append((node.args[0].id, node.args[-1], loops))
+        elif isinstance(func, lua_ast.Index) and func.dotted and isinstance(func.key, lua_ast.String) \
+                and func.key.value == 'add' and node.args:
+            obj = func.obj
+            if (isinstance(obj, lua_ast.Name) and obj.id in self.module_names) or self._is_which_key_require(obj):
+                target = node.args[0]
+                if isinstance(target, lua_ast.Name):
+                    self.added.append(target.id)
+                elif isinstance(target, lua_ast.Table):
+                    self.added.append(target)
+
+    def registered_names(self) -> List[str]:
+        """Tablas con nombre a documentar: las registradas con add o, si no hay ninguna, todas."""
+        names = [item for item in self.added if isinstance(item, str)]
+        return names if names else list(self.tables)
+
+    def loop_envs(self, loops: List[lua_ast.NumericFor]) -> Iterator[Dict[str, Value]]:
+        """Entornos de variables de los bucles anidados (producto cartesiano, acotado)."""
+        envs: List[Dict[str, Value]] = [{}]
+        for loop in loops:
+            expanded: List[Dict[str, Value]] = []
+            for env in envs:
+                start = evaluate(loop.start_expr, env)
+                stop = evaluate(loop.stop_expr, env)
+                step = evaluate(loop.step_expr, env) if loop.step_expr is not None else 1
+                if not all(isinstance(v, (int, float)) for v in (start, stop, step)) or step == 0:
+                    return
+                value = start
+                while (value <= stop if step > 0 else value >= stop):
+                    if len(expanded) >= MAX_LOOP_ITERATIONS:
+                        break
+                    expanded.append(dict(env, **{loop.var: value}))
+                    value += step
+            envs = expanded
+        yield from envs
+
+    def entry(self, table: str, node: lua_ast.Node, modes: List[str],
+              env: Dict[str, Value]) -> Optional[WhichKeyEntry]:
+        """Evalúa una entrada { '<tecla>', rhs, ... }; None si no lo es o no es constante."""
+        if not isinstance(node, lua_ast.Table):
+            return None
+        values = lua_ast.positional_values(node)
+        key = evaluate(values[0], env) if values else None
+        if not isinstance(key, str) or not key.strip():
+            return None
+        rhs = evaluate(values[1], env) if len(values) > 1 else None
+        desc = evaluate(lua_ast.table_field(node, 'desc'), env)
+        group = evaluate(lua_ast.table_field(node, 'group'), env)
+        entry_modes = _mode_strings(lua_ast.table_field(node, 'mode'), env)
+        return WhichKeyEntry(
+            table=table,
+            key=key.strip(),
+            rhs=rhs if isinstance(rhs, str) else None,
+            desc=desc if isinstance(desc, str) else None,
+            group=group if isinstance(group, str) else None,
+            modes=entry_modes or modes,
+            line=node.line,
+            loop_env=env,
+        )
+
+    def entries(self) -> Iterator[WhichKeyEntry]:
+        """Entradas de las tablas registradas y después las insertadas, en orden de código fuente."""
+        names = self.registered_names()
+        table_modes = {
+            name: _mode_strings(lua_ast.table_field(self.tables[name], 'mode'), {})
+            for name in names if name in self.tables
+        }
+        for name in self.tables:
+            if name not in table_modes:
+                continue
+            for value in lua_ast.positional_values(self.tables[name]):
+                entry = self.entry(name, value, table_modes[name], {})
+                if entry is not None:
+                    yield entry
+        for name, node, loops in self.inserts:
+            if name not in table_modes:
+                continue
+            for env in self.loop_envs(loops):
+                entry = self.entry(name, node, table_modes[name], env)
+                if entry is not None:
+                    yield entry
+        for inline in self.added:
+            if isinstance(inline, lua_ast.Table):
+                modes = _mode_strings(lua_ast.table_field(inline, 'mode'), {})
+                for value in lua_ast.positional_values(inline):
+                    entry = self.entry('', value, modes, {})
+                    if entry is not None:
+                        yield entry
@@ -0,0 +1,56 @@
+"""ExtractionCache: caché compartida entre dos checkouts del mismo repositorio."""
+
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+from extraction_cache import ExtractionCache  # noqa: E402
+from update_keybindings import AstKeybindingExtractor, KeybindingExtractor  # noqa: E402
+
+REPO_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+class TwoCheckoutsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.cache_dir = os.path.join(self.tmp.name, 'cache')
+        self.checkouts = []
+        for name in ('main', 'worktree'):
+            root = os.path.join(self.tmp.name, name)
+            shutil.copytree(os.path.join(REPO_ROOT, 'lua'), os.path.join(root, 'lua'))
+            shutil.copy(os.path.join(REPO_ROOT, 'init.lua'), root)
+            self.checkouts.append(root)
+
+    def extract(self, cls, root, cache=None):
+        extractor = cls(root)
+        with contextlib.redirect_stdout(io.StringIO()):
+            if cache is None:
+                return extractor.extract_all_keybindings()
+            return extractor.extract_all_keybindings_cached(cache, {'engine': cls.__name__})
+
+    def check(self, cls):
+        main, worktree = self.checkouts
+        self.extract(cls, main, ExtractionCache(self.cache_dir))
+        cache = ExtractionCache(self.cache_dir)
+        cached = self.extract(cls, worktree, cache)
+        self.assertEqual(cache.hits, len(cache.seen))
+        self.assertTrue(all(kb.file_path.startswith(worktree + os.sep) for kb in cached))
+        self.assertEqual(cached, self.extract(cls, worktree))
+
+    def test_regex_records_are_rooted_in_the_reading_checkout(self):
+        self.check(KeybindingExtractor)
+
+    def test_ast_records_are_rooted_in_the_reading_checkout(self):
+        self.check(AstKeybindingExtractor)
+
+
+if __name__ == '__main__':
+    unittest.main()
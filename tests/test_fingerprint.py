@@ -0,0 +1,85 @@
+"""Huella de entradas: atajo sin cambios y --check."""
+
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+import update_keybindings  # noqa: E402
+from renderers import MarkdownRenderer  # noqa: E402
+from update_keybindings import KeybindingExtractor  # noqa: E402
+
+REPO_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+class TempRepoTest(unittest.TestCase):
+    """Copia de lua/ e init.lua en un directorio temporal."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.root = self.tmp.name
+        shutil.copytree(os.path.join(REPO_ROOT, 'lua'), os.path.join(self.root, 'lua'))
+        shutil.copy(os.path.join(REPO_ROOT, 'init.lua'), self.root)
+
+
+class FingerprintTest(TempRepoTest):
+
+    def test_fingerprint_does_not_build_the_module_graph(self):
+        extractor = KeybindingExtractor(self.root)
+        with mock.patch.object(update_keybindings, 'ModuleGraph', side_effect=AssertionError("grafo construido")):
+            fingerprint = extractor.input_fingerprint({'engine': 'regex'})
+        self.assertEqual(fingerprint, KeybindingExtractor(self.root).input_fingerprint({'engine': 'regex'}))
+
+    def test_unreachable_files_and_all_files_change_the_fingerprint(self):
+        extractor = KeybindingExtractor(self.root)
+        before = extractor.input_fingerprint({'engine': 'regex'})
+        with open(os.path.join(self.root, 'lua', 'archived.lua'), 'w', encoding='utf-8') as f:
+            f.write("return {}\n")
+        after = extractor.input_fingerprint({'engine': 'regex'})
+        self.assertNotEqual(before, after)
+        self.assertNotEqual(after, extractor.input_fingerprint({'engine': 'regex', 'all_files': "1"}))
+
+
+class CheckModeTest(TempRepoTest):
+
+    def main(self, *argv: str):
+        """Ejecuta main() con la raíz temporal; devuelve (código, salida)."""
+        out = io.StringIO()
+        with mock.patch.dict(update_keybindings.ENGINES, {'regex': lambda: KeybindingExtractor(self.root)}), \
+                contextlib.redirect_stdout(out):
+            code = update_keybindings.main(['--formats', 'markdown', *argv])
+        return code, out.getvalue()
+
+    def test_unchanged_inputs_return_zero_without_extracting(self):
+        self.assertEqual(self.main('--force')[0], 0)
+        with mock.patch.object(KeybindingExtractor, 'extract_all_keybindings',
+                               side_effect=AssertionError("extracción innecesaria")):
+            code, output = self.main('--check')
+        self.assertEqual(code, 0)
+        self.assertIn('huella de entradas sin cambios', output)
+
+    def test_hand_edited_output_is_reported_as_content_drift(self):
+        self.assertEqual(self.main('--force')[0], 0)
+        path = os.path.join(self.root, MarkdownRenderer.default_path)
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content.replace('\n', '\nLínea editada a mano\n', 1))
+        code, output = self.main('--check', '--force')
+        self.assertEqual(code, 1)
+        # El diff va de la salida actual (editada) a la regenerada
+        self.assertIn('-Línea editada a mano', output)
+        self.assertIn('el contenido difiere aunque la huella de entradas no cambió', output)
+        with open(path, 'r', encoding='utf-8') as f:
+            self.assertIn('Línea editada a mano', f.read())
+
+
+if __name__ == '__main__':
+    unittest.main()
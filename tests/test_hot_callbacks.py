@@ -0,0 +1,63 @@
+"""HotCallbackAuditor: llamadas bloqueantes en autocmds y componentes de lualine."""
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+from hot_callbacks import HotCallbackAuditor, format_report  # noqa: E402
+
+AUTOCMDS_LUA = """
+vim.api.nvim_create_autocmd('BufEnter', {
+  callback = function()
+    vim.b.branch = vim.fn.system('git branch --show-current')
+  end,
+})
+"""
+
+LUALINE_LUA = """
+local function root()
+  return vim.fn.finddir('.git', '.;')
+end
+
+require('lualine').setup({
+  sections = { lualine_c = { root } },
+})
+"""
+
+
+class HotCallbackTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.root = self.tmp.name
+
+    def audit(self, **files):
+        paths = []
+        for name, content in files.items():
+            file_path = os.path.join(self.root, 'lua', f'{name}.lua')
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            with open(file_path, 'w', encoding='utf-8') as f:
+                f.write(content)
+            paths.append(file_path)
+        auditor = HotCallbackAuditor.from_files(self.root, paths)
+        findings = auditor.audit()
+        rows = [(f.call, f"{auditor.rel(f.file_path)}:{f.line}", f.callback.frequency) for f in findings]
+        return auditor, findings, rows
+
+    def test_bufenter_autocmd_calling_system_is_flagged(self):
+        auditor, findings, rows = self.audit(autocmds=AUTOCMDS_LUA)
+        self.assertEqual(rows, [('vim.fn.system', os.path.join('lua', 'autocmds.lua') + ':4', 'buffer')])
+        self.assertIn(f"| {findings[0].severity} | {rows[0][1]} | `vim.fn.system` |", format_report(auditor, findings))
+
+    def test_lualine_component_calling_finddir_is_flagged(self):
+        _auditor, findings, rows = self.audit(line=LUALINE_LUA)
+        self.assertEqual(rows, [('vim.fn.finddir', os.path.join('lua', 'line.lua') + ':3', 'redibujado')])
+        self.assertEqual(findings[0].callback.label, 'sections.lualine_c root')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+"""KeybindingTable: índice por clave canónica y sus usuarios (conflictos, tabla por tecla)."""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+from update_keybindings import Keybinding, KeybindingExtractor  # noqa: E402
+
+
+class ByCanonicalTest(unittest.TestCase):
+
+    def setUp(self):
+        self.extractor = KeybindingExtractor()
+        file_path = os.path.join(self.extractor.repo_root, 'lua', 'core', 'keys.lua')
+        self.keybindings = [
+            Keybinding(file_path, ['Normal'], '<CR>', ':A<cr>', 'Ejecutar A', line_number=1),
+            Keybinding(file_path, ['Normal'], 'jj', '<Esc>', 'Salir', line_number=2),
+            Keybinding(file_path, ['Normal'], '<cr>', ':B<cr>', 'Ejecutar B', line_number=3),
+            Keybinding(file_path, ['Normal'], '<Enter>', ':A<cr>', 'Ejecutar A', line_number=4),
+        ]
+        self.table = self.extractor.as_table(self.keybindings)
+
+    def test_spellings_of_one_key_share_a_group(self):
+        groups = self.table.by_canonical()
+        self.assertEqual([group.rows for group in groups.values()], [[0, 2, 3], [1]])
+        self.assertIs(self.table.by_canonical(), groups)
+
+    def test_conflicts_group_by_canonical_key(self):
+        table_view, found = self.extractor.find_conflicts(self.table)
+        self.assertEqual(len(found), 1)
+        row, modes = found[0]
+        self.assertEqual(table_view.columns.key[row], '<CR>')
+        self.assertEqual(sorted(modes['Normal']), ['Ejecutar A', 'Ejecutar B'])
+
+    def test_grouped_by_key_table_has_one_row_per_canonical_key(self):
+        table = self.extractor.generate_markdown_table_grouped_by_key(self.table)
+        rows = table.splitlines()[2:]
+        self.assertEqual(len(rows), 2)
+        self.assertIn('Ejecutar A; Ejecutar B', rows[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+"""Uso real: count-min sketch, agregación de logs y ranking de atajos."""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+from collections import Counter
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+import keybinding_usage  # noqa: E402
+from keybinding_usage import CountMinSketch, UsageAggregator  # noqa: E402
+from update_keybindings import KeybindingExtractor  # noqa: E402
+
+KEYS_LUA = """vim.g.mapleader = ' '
+vim.keymap.set('n', '<leader>ff', ':Files<cr>', { desc = 'Buscar archivos' })
+vim.keymap.set('n', '<leader>gg', ':Git<cr>', { desc = 'Git' })
+vim.keymap.set({ 'n', 'x' }, '<leader>y', '"+y', { desc = 'Copiar al sistema' })
+vim.keymap.set('n', '<leader>z', ':Zen<cr>', { desc = 'Modo zen' })
+"""
+# TSV y JSON, lhs con <leader> o con el espacio literal, modo corto o largo, y una línea inválida
+LOG = [
+    "1718031200.1\tn\t<leader>ff",
+    "1718031200.2\tn\t ff",
+    '{"ts": 1718031200.3, "mode": "x", "lhs": " y"}',
+    "1718031200.4\tn\t<leader>y",
+    "1718031200.5\tNormal\t<leader>gg",
+    "sin tabuladores",
+    "1718031200.6\tn\t<leader>ff",
+]
+
+
+class CountMinSketchTest(unittest.TestCase):
+
+    def test_narrow_sketch_never_underestimates(self):
+        sketch = CountMinSketch(width=8, depth=3)
+        truth = Counter({f"Normal\t<Space>k{i}": i + 1 for i in range(40)})
+        for key, count in truth.items():
+            for _ in range(count):
+                sketch.add(key)
+        self.assertEqual(sketch.total, sum(truth.values()))
+        for key, count in truth.items():
+            self.assertGreaterEqual(sketch.estimate(key), count)
+
+    def test_merged_sketches_count_both_logs(self):
+        first, second = CountMinSketch(width=64, depth=4), CountMinSketch(width=64, depth=4)
+        first.add('a', 3)
+        second.add('a', 2)
+        second.add('b')
+        first.merge(CountMinSketch.from_json(second.to_json()))
+        self.assertEqual((first.total, first.estimate('a'), first.estimate('b')), (6, 5, 1))
+        with self.assertRaises(ValueError):
+            first.merge(CountMinSketch(width=32, depth=4))
+
+
+class UsageRankingTest(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        os.makedirs(os.path.join(tmp.name, 'lua', 'core'))
+        with open(os.path.join(tmp.name, 'init.lua'), 'w', encoding='utf-8') as f:
+            f.write("require('core.keys')\n")
+        with open(os.path.join(tmp.name, 'lua', 'core', 'keys.lua'), 'w', encoding='utf-8') as f:
+            f.write(KEYS_LUA)
+        self.extractor = KeybindingExtractor(tmp.name)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.keybindings = self.extractor.extract_all_keybindings()
+
+    def aggregate(self) -> UsageAggregator:
+        aggregator = UsageAggregator(self.extractor.canonicalizer.canonical, self.extractor.mode_mapping)
+        aggregator.feed(LOG)
+        return aggregator
+
+    def ranking(self, aggregator: UsageAggregator):
+        return self.extractor.usage_ranking(self.keybindings, aggregator.count, aggregator.events,
+                                            aggregator.error_bound)
+
+    def test_events_are_canonicalized_and_counted(self):
+        aggregator = self.aggregate()
+        self.assertEqual((aggregator.events, aggregator.invalid), (6, 1))
+        self.assertEqual(aggregator.count('Normal', '<Space>ff'), 3)
+        self.assertEqual(aggregator.count('Visual', '<Space>y'), 1)
+        self.assertEqual(aggregator.error_bound, 0)
+
+    def test_ranking_orders_essentials_and_finds_unused_bindings(self):
+        ranking = self.ranking(self.aggregate())
+        self.assertEqual([(u.key, u.total) for u in ranking.essentials()],
+                         [('<leader>ff', 3), ('<leader>y', 2), ('<leader>gg', 1)])
+        self.assertEqual([u.key for u in ranking.never_used()], ['<leader>z'])
+
+    def test_sketch_counts_give_the_same_ranking_without_exact_counters(self):
+        with mock.patch.object(keybinding_usage, 'EXACT_LIMIT', 1):
+            aggregator = self.aggregate()
+        self.assertIsNone(aggregator.exact)
+        self.assertEqual([(u.key, u.total) for u in self.ranking(aggregator).essentials()],
+                         [('<leader>ff', 3), ('<leader>y', 2), ('<leader>gg', 1)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+"""Corpus patológico: tiempo por caso acotado y crecimiento lineal en ambos motores."""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+from keybindings_corpus import CASE_TIME_LIMIT, CASES, MAX_GROWTH, MIN_MEASURABLE, time_extraction  # noqa: E402
+from update_keybindings import ENGINES  # noqa: E402
+
+# Tamaños más pequeños que los del script; se cuadruplica N para separar lineal (x4) de cuadrático (x16)
+SIZE = 250
+SCALE = 4
+# Límites holgados para máquinas de CI lentas o cargadas
+TIME_LIMIT = CASE_TIME_LIMIT * 5
+GROWTH_LIMIT = MAX_GROWTH ** 2
+NOISE_FLOOR = MIN_MEASURABLE * SCALE
+
+
+class PathologicalCorpusTest(unittest.TestCase):
+
+    def check_engine(self, engine: str):
+        extractor = ENGINES[engine]()
+        file_path = os.path.join(extractor.repo_root, 'lua', 'plugins', 'tools', 'pickme.lua')
+        for name, generate in CASES.items():
+            with self.subTest(case=name, engine=engine):
+                small, _ = time_extraction(extractor, file_path, generate(SIZE))
+                large, _ = time_extraction(extractor, file_path, generate(SIZE * SCALE))
+                self.assertLess(large, TIME_LIMIT)
+                if large >= NOISE_FLOOR:
+                    self.assertLess(large / small, GROWTH_LIMIT,
+                                    f"x{large / small:.1f} al multiplicar N por {SCALE}")
+
+    def test_regex_engine_is_bounded(self):
+        self.check_engine('regex')
+
+    def test_ast_engine_is_bounded(self):
+        self.check_engine('ast')
+
+
+if __name__ == '__main__':
+    unittest.main()
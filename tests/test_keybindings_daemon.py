@@ -0,0 +1,88 @@
+"""KeybindingDaemon: conflictos, errores de reextracción y vigilante."""
+
+import contextlib
+import io
+import json
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+from keybindings_daemon import KeybindingDaemon, KeybindingIndex  # noqa: E402
+from update_keybindings import LAZY_TRIGGER_ACTION, Keybinding, KeybindingExtractor  # noqa: E402
+
+
+class FlakyExtractor(KeybindingExtractor):
+    """Extractor cuya reextracción falla a partir de la segunda vez."""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def extract_all_keybindings(self):
+        self.calls += 1
+        if self.calls > 1:
+            raise OSError("lua/core/keys.lua: archivo a medio escribir")
+        return super().extract_all_keybindings()
+
+
+class KeybindingDaemonTest(unittest.TestCase):
+
+    def setUp(self):
+        self.extractor = FlakyExtractor()
+        self.daemon = KeybindingDaemon(self.extractor)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.daemon.rebuild()
+
+    def request(self, **request):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return json.loads(self.daemon.respond(json.dumps(request).encode('utf-8')))
+
+    def test_conflicts_are_those_of_find_conflicts(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            keybindings = KeybindingExtractor().extract_all_keybindings()
+        table_view, found = self.extractor.find_conflicts(keybindings)
+        expected = [(table_view.columns.key[row], mode) for row, modes in found for mode in modes]
+        index = KeybindingIndex(self.extractor, keybindings)
+        self.assertEqual([(c['key'], c['mode']) for c in index.conflicts()], expected)
+
+    def test_lazy_trigger_stubs_are_not_conflicts(self):
+        list_lua = os.path.join(self.extractor.repo_root, 'lua', 'plugins', 'list.lua')
+        plugin = os.path.join(self.extractor.repo_root, 'lua', 'plugins', 'tools', 'tdo.lua')
+        keybindings = [
+            Keybinding(list_lua, ['Normal'], '<leader>nt', LAZY_TRIGGER_ACTION, '', 'tdo.nvim', 10),
+            Keybinding(plugin, ['Normal'], '<leader>nt', ':Tdo tomorrow<cr>', 'Notas de mañana', line_number=5),
+        ]
+        self.assertEqual(KeybindingIndex(self.extractor, keybindings).conflicts(), [])
+
+    def test_repository_conflicts_exclude_lazy_triggers(self):
+        stubs = {'<leader>exa', '<leader>exl', '<leader>exr', '<leader>goo', '<leader>iN',
+                 '<leader>in', '<leader>nt', '<leader>nx', '<leader>yg'}
+        keys = {c['key'] for c in self.daemon.index.conflicts()}
+        self.assertFalse(keys & stubs)
+
+    def test_failed_reload_replies_with_error_and_keeps_the_index(self):
+        index = self.daemon.index
+        response = self.request(op='reload')
+        self.assertFalse(response['ok'])
+        self.assertIn('OSError', response['error'])
+        self.assertIs(self.daemon.index, index)
+        status = self.request(op='status')
+        self.assertTrue(status['ok'])
+        self.assertEqual(status['generation'], 1)
+        self.assertIn('a medio escribir', status['last_error'])
+
+    def test_watcher_does_not_retry_a_failed_rebuild_until_files_change(self):
+        self.daemon.snapshot = {}
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.daemon.poll()
+            self.daemon.poll()
+            self.daemon.poll()
+        self.assertEqual(self.extractor.calls, 2)
+        self.assertEqual(self.daemon.snapshot, self.daemon.watched_files())
+        self.assertIsNotNone(self.daemon.last_error)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+"""Arnés diferencial keybindings_diff: categorías de cada entrada y divergencias aceptadas."""
+
+import contextlib
+import io
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+import keybindings_diff  # noqa: E402
+from update_keybindings import AstKeybindingExtractor, KeybindingExtractor  # noqa: E402
+
+
+class FailingExtractor(AstKeybindingExtractor):
+    """Candidato que falla en cualquier extracción."""
+
+    def extract_keybindings_from_content(self, file_path, content):
+        raise RuntimeError("motor roto")
+
+
+class DroppingExtractor(AstKeybindingExtractor):
+    """Candidato que pierde todos los registros de patrones, como un parser que descarta el archivo."""
+
+    def extract_pattern_keybindings(self, file_path, content):
+        return []
+
+
+class DifferentialHarnessTest(unittest.TestCase):
+
+    def setUp(self):
+        self.reference = KeybindingExtractor()
+        self.file_path = os.path.join(self.reference.repo_root, 'lua', 'plugins', 'tools', 'pickme.lua')
+
+    def compare(self, harness, file_path, content):
+        with contextlib.redirect_stdout(io.StringIO()):
+            harness.compare('test', os.path.basename(file_path), file_path, content)
+            ok = harness.summary()
+        return harness.rows[-1][7], ok
+
+    def repo_file(self, rel_path):
+        file_path = os.path.join(self.reference.repo_root, rel_path)
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return file_path, f.read()
+
+    def test_engine_exception_is_a_category_and_the_run_continues(self):
+        harness = keybindings_diff.DifferentialHarness(self.reference, FailingExtractor())
+        category, ok = self.compare(harness, self.file_path, "map('n', 'jj', '<Esc>', { desc = 'fin' })\n")
+        self.assertEqual(category, keybindings_diff.CATEGORY_EXCEPTION)
+        self.assertFalse(ok)
+        category, _ok = self.compare(harness, self.file_path, "local x = 1\n")
+        self.assertEqual(category, keybindings_diff.CATEGORY_EXCEPTION)
+        self.assertEqual(len(harness.rows), 2)
+
+    def test_known_repository_divergences_are_accepted(self):
+        harness = keybindings_diff.DifferentialHarness(self.reference, AstKeybindingExtractor())
+        seen = set()
+        for rel_path in sorted({rel for rel, _key in keybindings_diff.ACCEPTED_DIVERGENCES}):
+            file_path, content = self.repo_file(rel_path)
+            category, ok = self.compare(harness, file_path, content)
+            self.assertEqual(category, keybindings_diff.CATEGORY_ACCEPTED, rel_path)
+            self.assertTrue(ok)
+            with contextlib.redirect_stdout(io.StringIO()):
+                records = keybindings_diff.diff_records(
+                    self.reference.extract_keybindings_from_content(file_path, content),
+                    harness.candidate.extract_keybindings_from_content(file_path, content))
+            seen.update((rel_path, d.key) for d in records)
+        # Una entrada que ya no diverge debe quitarse de la lista
+        self.assertEqual(seen, set(keybindings_diff.ACCEPTED_DIVERGENCES))
+
+    def test_invalid_lua_differences_do_not_fail(self):
+        harness = keybindings_diff.DifferentialHarness(self.reference, AstKeybindingExtractor())
+        # Paréntesis sin cerrar: el emparejado de llaves de regex se pierde, ast recupera la tabla
+        content = "local t = {\n  ['rg'] = {\n    cmd = 'rg', (\n    desc = 'Buscar con rg',\n  },\n}\n"
+        category, ok = self.compare(harness, self.file_path, content)
+        self.assertEqual(category, keybindings_diff.CATEGORY_INVALID)
+        self.assertTrue(ok)
+
+    def test_lost_record_fails_even_on_invalid_input(self):
+        harness = keybindings_diff.DifferentialHarness(self.reference, DroppingExtractor())
+        content = "map('n', 'jj', '<Esc>', { desc = 'fin' })\nlocal x = = 1\n"
+        category, ok = self.compare(harness, self.file_path, content)
+        self.assertEqual(category, keybindings_diff.CATEGORY_LOST)
+        self.assertFalse(ok)
+
+    def test_ast_recovers_calls_dropped_by_syntax_errors(self):
+        harness = keybindings_diff.DifferentialHarness(self.reference, AstKeybindingExtractor())
+        # Una string larga sin cerrar trunca el AST; los regex siguen viendo las llamadas
+        for content in (keybindings_diff.CASES['nested_tables'](200),
+                        "map('n', 'ja', ':A<cr>', { desc = 'A' })\nlocal s = [[sin cerrar\n"
+                        "map('n', 'jb', ':B<cr>', { desc = 'B' })\n"):
+            category, ok = self.compare(harness, self.file_path, content)
+            self.assertNotEqual(category, keybindings_diff.CATEGORY_LOST)
+            self.assertTrue(ok)
+
+    def test_bracket_table_takes_the_first_nested_desc(self):
+        file_path, content = self.repo_file('lua/plugins/tools/spectre.lua')
+        with contextlib.redirect_stdout(io.StringIO()):
+            kbs = AstKeybindingExtractor().extract_keybindings_from_content(file_path, content)
+        self.assertEqual({kb.key: kb.description for kb in kbs if kb.key in ('rg', 'ag')},
+                         {'rg': 'ignore case', 'ag': 'ignore case'})
+
+    def test_commented_desc_in_bracket_table_is_ignored_by_both_engines(self):
+        harness = keybindings_diff.DifferentialHarness(self.reference, AstKeybindingExtractor())
+        content = ("local keys = {\n"
+                   "  ['show'] = {\n"
+                   "    map = 'o',\n"
+                   "--    desc = 'desactivada',\n"
+                   "  },\n"
+                   "}\n")
+        category, ok = self.compare(harness, self.file_path, content)
+        self.assertEqual(category, keybindings_diff.CATEGORY_OK)
+        self.assertTrue(ok)
+
+    def test_other_quote_inside_desc_is_kept_by_both_engines(self):
+        harness = keybindings_diff.DifferentialHarness(self.reference, AstKeybindingExtractor())
+        content = "map('n', 'gl', '$', { desc = 'Fin de \"línea' })\n"
+        category, ok = self.compare(harness, self.file_path, content)
+        self.assertEqual(category, keybindings_diff.CATEGORY_OK)
+        with contextlib.redirect_stdout(io.StringIO()):
+            kbs = self.reference.extract_keybindings_from_content(self.file_path, content)
+        self.assertEqual([kb.description for kb in kbs], ['Fin de "línea'])
+
+
+if __name__ == '__main__':
+    unittest.main()
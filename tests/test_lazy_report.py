@@ -0,0 +1,63 @@
+"""LazyLoadAnalyzer: propuestas de `keys =` y comprobación de las entradas existentes."""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+from lazy_report import LazyLoadAnalyzer, default_lazy, format_report  # noqa: E402
+from lazy_specs import PluginSpecIndex  # noqa: E402
+from update_keybindings import KeybindingExtractor  # noqa: E402
+
+LIST_LUA = """return {
+  { 'nvim-pack/nvim-spectre', event = 'VeryLazy' },
+  { 'folke/trouble.nvim', keys = { '<leader>xx', '<leader>xq' } },
+}
+"""
+KEYS_LUA = """vim.g.mapleader = ' '
+vim.keymap.set('n', '<leader>S', '<cmd>Spectre<cr>')
+vim.keymap.set('n', '<leader>xx', '<cmd>Trouble diagnostics<cr>')
+"""
+
+
+class LazyReportTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.root = self.tmp.name
+        for rel_path, content in (('init.lua', "require('core.keys')\nrequire('plugins.list')\n"),
+                                  ('lua/core/keys.lua', KEYS_LUA), ('lua/plugins/list.lua', LIST_LUA)):
+            file_path = os.path.join(self.root, *rel_path.split('/'))
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            with open(file_path, 'w', encoding='utf-8') as f:
+                f.write(content)
+        extractor = KeybindingExtractor(self.root)
+        with contextlib.redirect_stdout(io.StringIO()):
+            keybindings = extractor.extract_all_keybindings()
+        analyzer = LazyLoadAnalyzer(PluginSpecIndex.from_repo(self.root), keybindings, extractor.canonicalizer,
+                                    self.root, lazy_by_default=default_lazy(self.root))
+        self.reports = {report.name: report for report in analyzer.analyze()}
+
+    def test_plugin_used_only_through_mappings_is_suggested_for_keys(self):
+        report = self.reports['nvim-pack/nvim-spectre']
+        self.assertEqual(report.loading, 'event')
+        self.assertEqual(report.suggested_keys, ["'<leader>S'"])
+        self.assertEqual(report.suggested_cmds, ['Spectre'])
+        self.assertIn("`keys = { '<leader>S' },`", format_report(list(self.reports.values())))
+
+    def test_stale_keys_entry_is_reported(self):
+        report = self.reports['folke/trouble.nvim']
+        self.assertEqual(report.suggested_keys, [])
+        statuses = dict(report.keys_check)
+        self.assertEqual(statuses['<leader>xx'], 'definido en lua/core/keys.lua:3')
+        self.assertTrue(statuses['<leader>xq'].startswith('sin atajo definido'))
+        self.assertIn("❌ `<leader>xq`", format_report(list(self.reports.values())))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+"""Recuperación de errores de lua_ast.parse_tolerant."""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+import lua_ast  # noqa: E402
+
+
+def plugin_list(count: int, broken_at: int) -> str:
+    """Lista de specs estilo lazy.nvim con un campo inválido en la spec `broken_at`."""
+    specs = []
+    for i in range(count):
+        extra = "opts = (x = 1)," if i == broken_at else "opts = {},"
+        specs.append(f"  {{ 'user/plugin{i}', {extra} keys = {{ {{ '<leader>p{i}', desc = 'P{i}' }} }} }},")
+    return "local plugins = {\n" + "\n".join(specs) + "\n}\nreturn plugins\n"
+
+
+class TokenizeTest(unittest.TestCase):
+
+    def test_non_ascii_letter_is_a_syntax_error(self):
+        with self.assertRaises(lua_ast.LuaSyntaxError):
+            lua_ast.tokenize("local año = 1")
+
+    def test_longest_operator_wins(self):
+        ops = [tok.value for tok in lua_ast.tokenize("a ... b .. c == d ~= e // f") if tok.kind == 'op']
+        self.assertEqual(ops, ['...', '..', '==', '~=', '//'])
+
+
+class ParseTolerantTest(unittest.TestCase):
+
+    def test_malformed_return_table_keeps_the_table(self):
+        tree, errors = lua_ast.parse_tolerant("return { a = (x = 1), b = 2 }")
+        self.assertEqual(len(errors), 1)
+        ret = tree.body[0]
+        self.assertIsInstance(ret, lua_ast.Return)
+        table = ret.values[0]
+        self.assertIsInstance(table, lua_ast.Table)
+        self.assertEqual([field.name for field in table.fields], ['b'])
+
+    def test_error_after_return_is_recovered(self):
+        tree, errors = lua_ast.parse_tolerant("return (1 +\n")
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(tree.body, [])
+
+    def test_malformed_field_in_large_table_drops_only_that_field(self):
+        tree, errors = lua_ast.parse_tolerant(plugin_list(300, broken_at=150))
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(errors[0].line, 152)
+        local, ret = tree.body
+        self.assertIsInstance(local, lua_ast.Local)
+        self.assertIsInstance(ret, lua_ast.Return)
+        specs = local.values[0].fields
+        self.assertEqual(len(specs), 300)
+        broken = specs[150].value
+        self.assertIsNone(lua_ast.table_field(broken, 'opts'))
+        self.assertIsNotNone(lua_ast.table_field(broken, 'keys'))
+
+    def test_missing_separator_keeps_both_fields(self):
+        tree, errors = lua_ast.parse_tolerant("local t = { a = 1 b = 2 }")
+        self.assertEqual(len(errors), 1)
+        self.assertEqual([field.name for field in tree.body[0].values[0].fields], ['a', 'b'])
+
+    def test_unclosed_table_falls_back_to_statement_recovery(self):
+        tree, errors = lua_ast.parse_tolerant("local t = {\n  a = 1,\nlocal x = 2\n")
+        self.assertEqual(len(errors), 1)
+        self.assertEqual([node.names for node in tree.body], [['x']])
+
+    def test_function_bodies_inside_fields_are_skipped_balanced(self):
+        tree, errors = lua_ast.parse_tolerant(
+            "local t = { f = function() if x then return end end + , g = 1 }")
+        self.assertEqual(len(errors), 1)
+        self.assertEqual([field.name for field in tree.body[0].values[0].fields], ['g'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+"""SymbolIndex: resolución de nombres por ámbito léxico."""
+
+import contextlib
+import io
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+import lua_ast  # noqa: E402
+from lua_symbols import SymbolIndex  # noqa: E402
+from update_keybindings import AstKeybindingExtractor  # noqa: E402
+
+# Forma de lua/core/keys.lua: el parámetro `opts` del alias y la tabla `opts` del chunk
+KEYS_LUA = """
+local function map(mode, lhs, rhs, opts)
+  opts = opts or {}
+  opts.silent = opts.silent ~= false
+  vim.keymap.set(mode, lhs, rhs, opts)
+end
+
+local opts = { noremap = true, silent = true, desc = 'Compartida' }
+
+map('i', 'jj', '<Esc>', opts)
+vim.keymap.set('n', 'J', 'mzJ`z', opts)
+"""
+
+
+def string_of(content: str, name: str) -> list:
+    """Valores string de cada uso de la variable `name` en llamadas f(name), en orden de código."""
+    index = SymbolIndex()
+    tree, errors = lua_ast.parse_tolerant(content)
+    index.add_file('test.lua', content, tree, errors)
+    values = []
+    walker = lua_ast.LuaWalker()
+    walker.register(lua_ast.Call, lambda node, _anc: values.extend(
+        index.string('test.lua', arg) for arg in node.args
+        if isinstance(arg, lua_ast.Name) and arg.id == name))
+    walker.walk(tree)
+    return values
+
+
+class ScopeTest(unittest.TestCase):
+
+    def test_keys_lua_shape_resolves_the_shared_opts_table(self):
+        extractor = AstKeybindingExtractor()
+        file_path = os.path.join(extractor.repo_root, 'lua', 'core', 'keys.lua')
+        with contextlib.redirect_stdout(io.StringIO()):
+            kbs = extractor.extract_keybindings_from_content(file_path, KEYS_LUA)
+        self.assertEqual([(kb.key, kb.description) for kb in kbs], [('jj', 'Compartida'), ('J', 'Compartida')])
+
+    def test_inner_local_shadows_only_inside_its_block(self):
+        content = ("local k = 'outer'\n"
+                   "do\n  local k = 'inner'\n  f(k)\nend\n"
+                   "f(k)\n")
+        self.assertEqual(string_of(content, 'k'), ['inner', 'outer'])
+
+    def test_local_is_not_visible_in_its_own_initializer(self):
+        content = "local k = 'a'\nlocal k = k .. 'b'\nf(k)\n"
+        self.assertEqual(string_of(content, 'k'), ['ab'])
+
+    def test_if_branches_have_separate_scopes(self):
+        content = ("local k = 'outer'\n"
+                   "if x then\n  local k = 'then'\n  f(k)\nelse\n  f(k)\nend\n")
+        self.assertEqual(string_of(content, 'k'), ['then', 'outer'])
+
+    def test_reassigned_local_is_not_resolved(self):
+        content = "local k = 'a'\nk = 'b'\nf(k)\n"
+        self.assertEqual(string_of(content, 'k'), [None])
+
+    def test_loop_variable_does_not_hide_the_outer_name_in_its_range(self):
+        content = "local k = 'outer'\nfor _, k in ipairs(g(k)) do\n  f(k)\nend\nf(k)\n"
+        self.assertEqual(string_of(content, 'k'), ['outer', None, 'outer'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+"""Modo mmap de extract_keybindings_from_file: patrones sobre bytes y vuelta a modo texto."""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+from update_keybindings import AstKeybindingExtractor, KeybindingExtractor  # noqa: E402
+
+GENERATED = "".join(f"map('n', '<leader>g{i}', ':G{i}<cr>', {{ desc = 'G{i}' }})\n" for i in range(50))
+SNACKS = "local keys = {\n  ['<leader>sb'] = { desc = 'Snacks B' },\n}\n"
+
+
+class MmapModeTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def write(self, name: str, content: str) -> str:
+        file_path = os.path.join(self.tmp.name, 'lua', name)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return file_path
+
+    def extract(self, extractor, file_path: str):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            kbs = extractor.extract_keybindings_from_file(file_path)
+        return [(kb.line_number, kb.key, kb.description) for kb in kbs], out.getvalue()
+
+    def extractors(self, cls=KeybindingExtractor):
+        text, mapped = cls(self.tmp.name), cls(self.tmp.name)
+        text.mmap_threshold = 0
+        mapped.mmap_threshold = 1
+        return text, mapped
+
+    def test_plain_keymaps_are_scanned_as_bytes_without_warning(self):
+        file_path = self.write('generated.lua', GENERATED)
+        text, mapped = self.extractors()
+        expected, _ = self.extract(text, file_path)
+        found, output = self.extract(mapped, file_path)
+        self.assertEqual(len(found), 50)
+        self.assertEqual(found, expected)
+        self.assertNotIn('mmap', output)
+
+    def test_specialized_extractor_falls_back_to_text_with_warning(self):
+        file_path = self.write('generated.lua', GENERATED + SNACKS)
+        text, mapped = self.extractors()
+        expected, _ = self.extract(text, file_path)
+        found, output = self.extract(mapped, file_path)
+        self.assertIn((52, '<leader>sb', 'Snacks B'), found)
+        self.assertEqual(found, expected)
+        self.assertIn('Aviso:', output)
+        self.assertIn('Snacks keys', output)
+
+    def test_ast_engine_always_reads_text(self):
+        file_path = self.write('generated.lua', "local map = vim.keymap.set\n" + GENERATED)
+        text, mapped = self.extractors(AstKeybindingExtractor)
+        expected, _ = self.extract(text, file_path)
+        found, _ = self.extract(mapped, file_path)
+        self.assertEqual(len(found), 50)
+        self.assertEqual(found, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+"""OptionRuleEngine: reglas de opciones y el cruce de timeoutlen con los atajos ambiguos."""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+from options_lint import OptionModel, OptionRuleEngine  # noqa: E402
+from update_keybindings import KeybindingExtractor  # noqa: E402
+
+OPTIONS_LUA = "vim.opt.updatetime = 50\nvim.o.timeoutlen = 300\n"
+KEYS_LUA = """vim.g.mapleader = ' '
+vim.keymap.set('n', '<leader>g', ':Git<cr>', {{ desc = 'Git' }})
+vim.keymap.set('n', '{second}', ':Git status<cr>', {{ desc = 'Estado' }})
+"""
+
+
+class OptionRulesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.root = self.tmp.name
+        self.write('init.lua', "require('core.options')\nrequire('core.keys')\n")
+        self.write('lua/core/options.lua', OPTIONS_LUA)
+
+    def write(self, rel_path: str, content: str):
+        file_path = os.path.join(self.root, *rel_path.split('/'))
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+
+    def evaluate(self, second_key: str):
+        self.write('lua/core/keys.lua', KEYS_LUA.format(second=second_key))
+        extractor = KeybindingExtractor(self.root)
+        with contextlib.redirect_stdout(io.StringIO()):
+            model = OptionModel.from_files(self.root, extractor.find_lua_files())
+            engine = OptionRuleEngine(model, keybindings_provider=lambda: (extractor.extract_all_keybindings(),
+                                                                           extractor.canonicalizer))
+            return {finding.rule: finding for finding in engine.evaluate()}
+
+    def test_low_updatetime_fires_its_rule(self):
+        finding = self.evaluate('<leader>s')['updatetime-bajo']
+        self.assertEqual(finding.value, 50)
+        self.assertEqual([(os.path.relpath(path, self.root), line) for path, line in finding.locations],
+                         [(os.path.join('lua', 'core', 'options.lua'), 1)])
+
+    def test_timeoutlen_rule_uses_the_ambiguous_mappings(self):
+        finding = self.evaluate('<leader>gs')['timeoutlen-prefijos']
+        self.assertEqual([(d['key'], d['shadowed_by']) for d in finding.details], [('<leader>g', '<leader>gs')])
+        self.assertIn('300 ms', finding.message)
+        self.assertNotIn('timeoutlen-prefijos', self.evaluate('<leader>s'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+"""PagedMarkdownRenderer: sólo se reescriben las páginas que cambian y se borran las obsoletas."""
+
+import contextlib
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+import renderers  # noqa: E402
+from renderers import PagedMarkdownRenderer  # noqa: E402
+from update_keybindings import KeybindingExtractor  # noqa: E402
+
+REPO_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+FINGERPRINT = "0" * 64
+
+
+class PagedRendererTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.root = self.tmp.name
+        shutil.copytree(os.path.join(REPO_ROOT, 'lua'), os.path.join(self.root, 'lua'))
+        shutil.copy(os.path.join(REPO_ROOT, 'init.lua'), self.root)
+        self.extractor = KeybindingExtractor(self.root)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.keybindings = self.extractor.extract_all_keybindings()
+        self.renderer = PagedMarkdownRenderer(self.extractor)
+        self.renderer.write(self.extractor.as_table(self.keybindings), FINGERPRINT)
+
+    def manifest(self) -> dict:
+        with open(self.renderer.page_path(self.renderer.manifest_name), 'r', encoding='utf-8') as f:
+            return json.load(f)['pages']
+
+    def test_unchanged_pages_are_not_rewritten(self):
+        pages = self.manifest()
+        with mock.patch.object(renderers, 'write_atomic', side_effect=AssertionError("página reescrita")):
+            self.renderer.write(self.extractor.as_table(self.keybindings), FINGERPRINT)
+        self.assertEqual(self.renderer.rewritten, [])
+        self.assertEqual(self.renderer.unchanged, len(pages))
+        self.assertEqual(self.renderer.write_summary(), f"0 páginas reescritas, {len(pages)} sin cambios")
+
+    def test_stale_page_is_deleted_and_the_manifest_updated(self):
+        table = self.extractor.as_table(self.keybindings)
+        dropped, _kbs, _priority = self.extractor.ordered_file_groups(table)[-1]
+        dropped_page = self.renderer.file_pages(self.extractor.ordered_file_groups(table))[dropped]
+        self.assertTrue(os.path.exists(self.renderer.page_path(dropped_page)))
+
+        remaining = [kb for kb in self.keybindings if self.renderer.rel_path(kb.file_path) != dropped]
+        self.renderer.write(self.extractor.as_table(remaining), FINGERPRINT)
+        self.assertEqual(self.renderer.removed, [dropped_page])
+        self.assertIn(self.renderer.index_page, self.renderer.rewritten)
+        self.assertFalse(os.path.exists(self.renderer.page_path(dropped_page)))
+        manifest = self.manifest()
+        self.assertNotIn(dropped_page, manifest)
+        self.assertEqual(sorted(manifest), sorted(self.renderer.pages(self.extractor.as_table(remaining), FINGERPRINT)))
+
+
+if __name__ == '__main__':
+    unittest.main()
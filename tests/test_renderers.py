@@ -0,0 +1,106 @@
+"""Renderizadores: formatos coherentes desde una sola extracción y escritura atómica."""
+
+import contextlib
+import html
+import io
+import json
+import os
+import re
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+import lua_ast  # noqa: E402
+from renderers import (HtmlRenderer, JsonRenderer, LuaIndexRenderer, MarkdownRenderer,  # noqa: E402
+                       lua_string, write_atomic)
+from update_keybindings import KeybindingExtractor  # noqa: E402
+
+FINGERPRINT = "0" * 64
+
+
+def failing_chunks():
+    yield "contenido a medias\n"
+    raise RuntimeError("fallo al renderizar")
+
+
+class SingleExtractionTest(unittest.TestCase):
+    """Todos los formatos se generan en memoria a partir de la misma tabla (no se escribe nada)."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.extractor = KeybindingExtractor()
+        with contextlib.redirect_stdout(io.StringIO()):
+            cls.keybindings = cls.extractor.as_table(cls.extractor.extract_all_keybindings())
+
+    def render(self, renderer_cls) -> str:
+        return renderer_cls(self.extractor).render_to_string(self.keybindings, FINGERPRINT)
+
+    def test_html_and_json_list_the_same_bindings_in_the_same_order(self):
+        data = json.loads(self.render(JsonRenderer))
+        page = self.render(HtmlRenderer)
+        html_keys = [html.unescape(key) for key in re.findall(r"<td><kbd>(.*?)</kbd></td>", page)]
+        self.assertEqual(data['fingerprint'], FINGERPRINT)
+        self.assertEqual(data['count'], len(self.keybindings))
+        self.assertEqual([record['key'] for record in data['keybindings']], html_keys)
+        self.assertIn(f"<p>{len(self.keybindings)} atajos.</p>", page)
+
+    def test_every_format_embeds_the_fingerprint(self):
+        for renderer_cls in (MarkdownRenderer, HtmlRenderer, JsonRenderer, LuaIndexRenderer):
+            with self.subTest(renderer=renderer_cls.name):
+                renderer = renderer_cls(self.extractor)
+                text = renderer.render_to_string(self.keybindings, FINGERPRINT)
+                self.assertEqual(renderer.fingerprint_re.search(text).group(1), FINGERPRINT)
+
+    def test_lua_index_parses_and_matches_the_json_records(self):
+        tree, errors = lua_ast.parse_tolerant(self.render(LuaIndexRenderer))
+        self.assertEqual(errors, [])
+        bindings = lua_ast.table_field(tree.body[0].values[0], 'bindings')
+        lua_rows = {(lua_ast.string_value(lua_ast.table_field(entry, 'lhs')),
+                     lua_ast.string_value(lua_ast.table_field(entry, 'mode')))
+                    for entry in lua_ast.positional_values(bindings)}
+        json_rows = {(record['key'], LuaIndexRenderer.vim_modes[mode])
+                     for record in json.loads(self.render(JsonRenderer))['keybindings']
+                     if record['context'] != 'which-key-group'
+                     for mode in record['modes'] or ['Normal'] if mode in LuaIndexRenderer.vim_modes}
+        self.assertEqual(lua_rows, json_rows)
+
+
+class LuaStringTest(unittest.TestCase):
+
+    def test_quotes_and_control_characters_are_escaped(self):
+        self.assertEqual(lua_string('di "hola"\\'), '"di \\"hola\\"\\\\"')
+        self.assertEqual(lua_string("a\nb\t1\x7f"), '"a\\nb\\0091\\127"')
+
+    def test_escaped_strings_round_trip_through_the_lua_parser(self):
+        for value in ('<leader>"', "it's", "\\", "a\nb", "\t1", "\x00\x1f\x7f", "ñ → ü"):
+            with self.subTest(value=value):
+                tree, errors = lua_ast.parse_tolerant(f"return {lua_string(value)}")
+                self.assertEqual(errors, [])
+                self.assertEqual(lua_ast.string_value(tree.body[0].values[0]), value)
+
+
+class WriteAtomicTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, 'docs', 'keybindings.md')
+
+    def test_failed_render_leaves_no_temporary_file(self):
+        with self.assertRaises(RuntimeError):
+            write_atomic(self.path, failing_chunks())
+        self.assertEqual(os.listdir(os.path.dirname(self.path)), [])
+
+    def test_failed_render_keeps_the_previous_output(self):
+        write_atomic(self.path, ["versión anterior\n"])
+        with self.assertRaises(RuntimeError):
+            write_atomic(self.path, failing_chunks())
+        self.assertEqual(os.listdir(os.path.dirname(self.path)), ['keybindings.md'])
+        with open(self.path, 'r', encoding='utf-8') as f:
+            self.assertEqual(f.read(), "versión anterior\n")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+"""ModuleGraph: plazo de parseo, escaneo por regex de respaldo y --rev con la misma regla."""
+
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+from async_pipeline import ExtractionPipeline  # noqa: E402
+from lua_symbols import SymbolIndex  # noqa: E402
+from require_graph import ModuleGraph  # noqa: E402
+from update_keybindings import KeybindingExtractor  # noqa: E402
+
+KEYMAP = "vim.keymap.set('n', '{key}', ':{cmd}<cr>', {{ desc = '{cmd}' }})\n"
+
+
+class RepoTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.root = self.tmp.name
+
+    def write(self, rel_path: str, content: str) -> str:
+        file_path = os.path.join(self.root, *rel_path.split('/'))
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return file_path
+
+    def graph(self, **kwargs):
+        lua_files = KeybindingExtractor(self.root).all_lua_files()
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            graph = ModuleGraph(self.root, lua_files, **kwargs)
+        rel = [os.path.relpath(path, self.root).replace(os.sep, '/') for path in graph.reachable_files()]
+        return graph, rel, out.getvalue()
+
+
+class ModuleGraphFallbackTest(RepoTest):
+
+    def test_budget_exceeded_falls_back_to_regex_and_warns(self):
+        self.write('init.lua', "require('core.big')\n")
+        big = self.write('lua/core/big.lua', "x = = 1\n" * 5000 + "pcall(require, 'core.tail')\n")
+        self.write('lua/core/tail.lua', "return {}\n")
+        graph, reachable, output = self.graph(symbols=SymbolIndex(self.root), file_budget=1e-9)
+        self.assertEqual(reachable, ['init.lua', 'lua/core/big.lua', 'lua/core/tail.lua'])
+        self.assertIn('ParseDeadlineExceeded', graph.partial[big])
+        self.assertIn('Aviso:', output)
+        # Sin símbolos: el motor ast lo indexa después por su cuenta
+        self.assertNotIn(big, graph.symbols.files)
+
+    def test_require_in_a_dropped_statement_is_still_followed(self):
+        self.write('init.lua', "local cfg = require('core.cfg')\nx = = require('core.keys')\n")
+        self.write('lua/core/cfg.lua', "return {}\n")
+        self.write('lua/core/keys.lua', "return {}\n")
+        self.write('lua/core/unused.lua', "return {}\n")
+        graph, reachable, output = self.graph()
+        self.assertEqual(reachable, ['init.lua', 'lua/core/cfg.lua', 'lua/core/keys.lua'])
+        self.assertIn('errores de sintaxis', output)
+
+
+class RevisionFileSetTest(RepoTest):
+
+    def git(self, *args: str):
+        subprocess.run(['git', *args], cwd=self.root, check=True, capture_output=True)
+
+    def test_revision_extracts_only_reachable_modules(self):
+        self.write('init.lua', "require('core.keys')\n")
+        self.write('lua/core/keys.lua', KEYMAP.format(key='<leader>a', cmd='A'))
+        self.write('lua/tools/archived.lua', KEYMAP.format(key='<leader>z', cmd='Z'))
+        self.git('init', '-q')
+        self.git('add', '.')
+        self.git('-c', 'user.name=t', '-c', 'user.email=t@t', 'commit', '-q', '-m', 'init')
+        # El árbol de trabajo cambia después: cuenta lo de la revisión
+        self.write('init.lua', "require('core.keys')\nrequire('tools.archived')\n")
+        extractor = KeybindingExtractor(self.root)
+        pipeline = ExtractionPipeline(extractor, jobs=1)
+        with contextlib.redirect_stdout(io.StringIO()):
+            keybindings = pipeline.run('HEAD')
+        self.assertEqual([kb.key for kb in keybindings], ['<leader>a'])
+        self.assertEqual(sorted(pipeline.file_hashes), ['init.lua', 'lua/core/keys.lua'])
+        self.assertEqual(pipeline.graph.unreachable_files(), [os.path.join(self.root, 'lua', 'tools', 'archived.lua')])
+
+
+if __name__ == '__main__':
+    unittest.main()
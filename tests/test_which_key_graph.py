@@ -0,0 +1,63 @@
+"""WhichKeyTableGraph: bucles for numéricos y table.insert en tablas con nombre."""
+
+import contextlib
+import io
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+import lua_ast  # noqa: E402
+from update_keybindings import KeybindingExtractor  # noqa: E402
+from which_key_graph import WhichKeyTableGraph  # noqa: E402
+
+WHICH_KEY_LUA = """
+local which_key = require('which-key')
+
+local normal_mappings = {
+  mode = 'n',
+  { '<leader>f', group = 'Archivos' },
+}
+
+for i = 1, 9 do
+  table.insert(normal_mappings, {
+    '<leader>f' .. i, ':LualineBuffersJump ' .. i .. '<cr>', desc = string.format('Buffer %d', i),
+  })
+end
+table.insert(normal_mappings, { '<leader>q', ':q<cr>', desc = 'Salir' })
+
+local unused = { { '<leader>z', ':Z<cr>', desc = 'Sin registrar' } }
+
+which_key.add(normal_mappings)
+"""
+BUFFER_KEYS = [f'<leader>f{i}' for i in range(1, 10)]
+
+
+class WhichKeyGraphTest(unittest.TestCase):
+
+    def test_loop_inserts_expand_to_one_entry_per_iteration(self):
+        tree, errors = lua_ast.parse_tolerant(WHICH_KEY_LUA)
+        self.assertEqual(errors, [])
+        entries = list(WhichKeyTableGraph(tree).entries())
+        self.assertEqual([e.key for e in entries], ['<leader>f', *BUFFER_KEYS, '<leader>q'])
+        self.assertEqual({e.table for e in entries}, {'normal_mappings'})
+        self.assertTrue(all(e.modes == ['n'] for e in entries))
+        loop_entries = entries[1:10]
+        self.assertEqual([e.desc for e in loop_entries], [f'Buffer {i}' for i in range(1, 10)])
+        self.assertEqual([e.rhs for e in loop_entries][:2], [':LualineBuffersJump 1<cr>', ':LualineBuffersJump 2<cr>'])
+        self.assertEqual([e.loop_env for e in loop_entries], [{'i': i} for i in range(1, 10)])
+
+    def test_extractor_documents_inserted_entries_of_the_registered_table(self):
+        extractor = KeybindingExtractor()
+        file_path = os.path.join(extractor.repo_root, 'lua', 'plugins', 'ui', 'which-key.lua')
+        with contextlib.redirect_stdout(io.StringIO()):
+            kbs = extractor.extract_which_key_style_keybindings(file_path, WHICH_KEY_LUA)
+        self.assertEqual([kb.key for kb in kbs if kb.context == 'which-key'], [*BUFFER_KEYS, '<leader>q'])
+        self.assertEqual([kb.key for kb in kbs if kb.context == 'which-key-group'], ['<leader>f'])
+        self.assertNotIn('<leader>z', [kb.key for kb in kbs])
+        self.assertEqual(kbs[1].action, ':LualineBuffersJump 1<cr>')
+
+
+if __name__ == '__main__':
+    unittest.main()